@@ -0,0 +1,127 @@
+"""
+Catalog table benchmark.
+Per-product dict loops against typed columns.
+
+Usage:
+    python -m benchmarks.bench_catalog_table
+    python -m benchmarks.bench_catalog_table --items 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from commercetxt.bridge import CommerceAIBridge
+from commercetxt.catalog_table import CatalogTable
+from commercetxt.model import ParseResult
+
+CURRENCIES = ["USD", "EUR", "GBP", "JPY"]
+AVAILABILITY = ["InStock", "OutOfStock", "PreOrder"]
+SPECS = [f"Spec{i}" for i in range(24)]
+
+
+def catalog_results(items: int, seed: int = 3) -> dict[str, ParseResult]:
+    """Validated-looking results with offers, stock, reviews and specs."""
+    rng = random.Random(seed)
+    results = {}
+    for i in range(items):
+        directives: dict[str, Any] = {
+            "PRODUCT": {"Name": f"Item {i}", "Brand": "Acme"},
+            "OFFER": {
+                "Price": f"{rng.uniform(1, 900):.2f}",
+                "Currency": rng.choice(CURRENCIES),
+                "Availability": rng.choice(AVAILABILITY),
+            },
+            "INVENTORY": {"Stock": str(rng.randint(0, 80))},
+            "REVIEWS": {
+                "Rating": f"{rng.uniform(1, 5):.1f}",
+                "Count": str(rng.randint(0, 5000)),
+            },
+            "SPECS": dict.fromkeys(rng.sample(SPECS, rng.randint(0, 8)), "x"),
+        }
+        results[f"/products/{i}.txt"] = ParseResult(
+            directives=directives,
+            version="1.0.3" if i % 10 else None,
+            trust_flags=["inventory_stale"] if i % 17 == 0 else [],
+        )
+    return results
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Best and mean wall time in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": min(times), "mean_ms": sum(times) / len(times)}
+
+
+def run(items: int, repeat: int) -> dict[str, Any]:
+    results = catalog_results(items)
+
+    start = time.perf_counter()
+    table = CatalogTable.from_results(results)
+    ingest_ms = (time.perf_counter() - start) * 1000
+
+    def dict_readiness() -> list[int]:
+        return [
+            CommerceAIBridge(r).calculate_readiness_score()["score"]
+            for r in results.values()
+        ]
+
+    def dict_filter() -> list[str]:
+        return [
+            item_id
+            for item_id, r in results.items()
+            if r.directives["OFFER"]["Currency"] == "USD"
+            and float(r.directives["OFFER"]["Price"]) <= 100
+            and "Spec3" in r.directives["SPECS"]
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        table.save(tmp)
+        save_ms = (time.perf_counter() - start) * 1000
+        load = measure(lambda: CatalogTable.load(tmp), repeat)
+
+    return {
+        "items": items,
+        "ingest_ms": ingest_ms,
+        "save_ms": save_ms,
+        "load_mmap": load,
+        "readiness_columns": measure(table.readiness, repeat),
+        "readiness_dicts": measure(dict_readiness, max(1, repeat // 10)),
+        "filter_columns": measure(
+            lambda: table.filter(
+                table.mask(currency="USD", price=(None, 100), specs=["Spec3"])
+            ),
+            repeat,
+        ),
+        "filter_dicts": measure(dict_filter, max(1, repeat // 10)),
+        "sort_rating": measure(lambda: table.sort("rating", descending=True), repeat),
+        "group_by_mean_price": measure(
+            lambda: table.group_by("currency", "price", "mean"), repeat
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(json.dumps(run(args.items, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
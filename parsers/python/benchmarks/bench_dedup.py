@@ -0,0 +1,131 @@
+"""
+Shard deduplication benchmark.
+Time and memory per backend against the old JSON + SHA-256 hex set.
+
+Usage:
+    python -m benchmarks.bench_dedup
+    python -m benchmarks.bench_dedup --shards 5000000 --duplicates 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from commercetxt.rag.core.dedup import (
+    BloomDeduplicator,
+    DigestSet,
+    DiskDeduplicator,
+    ShardDeduplicator,
+)
+
+ATTR_TYPES = ("subject_anchor", "price", "specification", "variant", "reviews")
+
+
+def shard_keys(count: int, duplicates: float, seed: int = 0) -> list[tuple[str, str]]:
+    """(attr_type, text) pairs, a duplicates fraction of them repeated."""
+    rng = random.Random(seed)
+    unique = max(1, int(count * (1 - duplicates)))
+    keys = [
+        (ATTR_TYPES[i % len(ATTR_TYPES)], f"Spec{i % 40}: value {i} for product {i}")
+        for i in range(unique)
+    ]
+    keys += rng.choices(keys, k=count - unique)
+    rng.shuffle(keys)
+    return keys
+
+
+def legacy(keys: list[tuple[str, str]]) -> int:
+    """The old path: sorted-key JSON, SHA-256 hex, set of strings."""
+    seen: set[str] = set()
+    kept = 0
+    for attr_type, text in keys:
+        json_str = json.dumps({"text": text, "attr_type": attr_type}, sort_keys=True)
+        digest = hashlib.sha256(json_str.encode("utf-8")).hexdigest()
+        if digest not in seen:
+            seen.add(digest)
+            kept += 1
+    return kept
+
+
+def with_backend(backend: ShardDeduplicator) -> Callable[[list], int]:
+    def run(keys: list[tuple[str, str]]) -> int:
+        add = backend.add_shard
+        return sum(add(attr_type, text) for attr_type, text in keys)
+
+    return run
+
+
+def measure(
+    make: Callable[[], Callable[[list], int]], keys: list[tuple[str, str]]
+) -> dict[str, Any]:
+    """
+    Wall time and kept shards of one run, then peak traced memory of a
+    second. Tracing slows allocation, so it is not timed.
+    """
+    fn = make()
+    start = time.perf_counter()
+    kept = fn(keys)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    make()(keys)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": elapsed,
+        "shards_per_second": len(keys) / elapsed,
+        "kept": kept,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def run(shards: int, duplicates: float, error_rate: float) -> dict[str, Any]:
+    keys = shard_keys(shards, duplicates)
+    unique = len(set(keys))
+    report: dict[str, Any] = {"shards": shards, "unique": unique}
+
+    report["legacy_sha256_json"] = measure(lambda: legacy, keys)
+    # Backends are built inside the trace so their memory is counted.
+    report["digest_set"] = measure(lambda: with_backend(DigestSet()), keys)
+    report["bloom"] = measure(
+        lambda: with_backend(BloomDeduplicator(unique, error_rate)), keys
+    )
+    with tempfile.TemporaryDirectory(prefix="commercetxt-dedup-") as directory:
+        disks: list[DiskDeduplicator] = []
+
+        def disk() -> Callable[[list], int]:
+            disks.append(DiskDeduplicator(Path(directory) / f"{len(disks)}.sqlite"))
+            return with_backend(disks[-1])
+
+        report["disk"] = measure(disk, keys)
+        for backend in disks:
+            backend.close()
+        report["disk"]["file_mb"] = (Path(directory) / "0.sqlite").stat().st_size / 1e6
+
+    base = report["legacy_sha256_json"]["seconds"]
+    report["speedup"] = {
+        name: base / report[name]["seconds"] for name in ("digest_set", "bloom", "disk")
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shards", type=int, default=1_000_000)
+    parser.add_argument("--duplicates", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=1e-6)
+    args = parser.parse_args()
+    print(json.dumps(run(args.shards, args.duplicates, args.error_rate), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Query embedding micro-batching benchmark.
+QPS and p99 latency at 1-256 concurrent clients: direct vs EmbedBatcher.
+
+The model is simulated: one encode call takes --base-ms plus --per-text-ms
+per text, and calls run one at a time, as on a single CPU or GPU model
+instance. Direct clients call embed_text() from their own threads;
+batched clients go through EmbedBatcher from threads or asyncio tasks.
+
+Usage:
+    python -m benchmarks.bench_embed_batcher
+    python -m benchmarks.bench_embed_batcher --clients 1 16 256 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from commercetxt.rag.core.embed_batcher import EmbedBatcher
+from commercetxt.rag.interfaces.base_embedder import BaseEmbedder
+
+
+class SimulatedModel(BaseEmbedder):
+    """Encode cost of base + per_text * batch size, one call at a time."""
+
+    def __init__(self, base: float, per_text: float) -> None:
+        self.base = base
+        self.per_text = per_text
+        self._lock = threading.Lock()
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_shards([{"text": text}])[0]["values"]
+
+    def embed_shards(self, shards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        with self._lock:
+            time.sleep(self.base + self.per_text * len(shards))
+        for shard in shards:
+            shard["values"] = [float(len(shard["text"]))]
+        return shards
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, float]:
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return {
+        "qps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+    }
+
+
+def run_threads(
+    embed: Callable[[str], list[float]], clients: int, seconds: float
+) -> dict[str, float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+
+    def client(n: int) -> None:
+        mine = []
+        while (start := time.perf_counter()) < deadline:
+            embed(f"query {n}")
+            mine.append(time.perf_counter() - start)
+        latencies.extend(mine)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def run_tasks(
+    batcher: EmbedBatcher, clients: int, seconds: float
+) -> dict[str, float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def client(n: int) -> None:
+        while (start := time.perf_counter()) < deadline:
+            await batcher.aembed_text(f"query {n}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    model = SimulatedModel(args.base_ms / 1000, args.per_text_ms / 1000)
+    results: dict[str, Any] = {}
+    for clients in args.clients:
+        with EmbedBatcher(model, args.max_batch_size, args.max_wait_ms) as batcher:
+            results[str(clients)] = {
+                "direct": run_threads(model.embed_text, clients, args.seconds),
+                "batched_threads": run_threads(
+                    batcher.embed_text, clients, args.seconds
+                ),
+                "batched_asyncio": asyncio.run(
+                    run_tasks(batcher, clients, args.seconds)
+                ),
+                "mean_batch_size": round(batcher.get_stats()["mean_batch_size"], 1),
+            }
+    return {
+        "model_ms": {"base": args.base_ms, "per_text": args.per_text_ms},
+        "max_batch_size": args.max_batch_size,
+        "max_wait_ms": args.max_wait_ms,
+        "clients": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--base-ms", type=float, default=4.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.4)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
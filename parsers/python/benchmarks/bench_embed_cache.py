@@ -0,0 +1,137 @@
+"""
+Cached shard embedding benchmark.
+AsyncRAGPipeline._embed_shards_cached: per-shard loop vs batched, by hit rate.
+
+Each product has --shards (50) shards. Before a run, the SQLite embedding cache
+holds the given share of each product's texts. The model is simulated
+as in bench_embed_batcher. "loop_blocked_ms" is, per product, how long
+another coroutine (a 1ms ticker) was kept waiting past its wake-up time.
+
+The per-shard loop is the implementation batching replaced: one cache
+lookup per shard, embed_text() for each miss on the event loop thread,
+one cache write per miss.
+
+Usage:
+    python -m benchmarks.bench_embed_cache
+    python -m benchmarks.bench_embed_cache --products 50 --shards 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from typing import Any
+
+from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+from commercetxt.rag.core.caching import EmbeddingCache
+
+from .bench_embed_batcher import SimulatedModel
+
+HIT_RATES = (0.0, 0.5, 1.0)
+
+
+class Container:
+    def __init__(self, embedder: SimulatedModel) -> None:
+        self.embedder = embedder
+        self.vector_store = None
+        self.storage = None
+
+
+async def per_shard(
+    pipeline: AsyncRAGPipeline, shards: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """The pre-batching _embed_shards_cached."""
+    cache = pipeline.embedding_cache
+    assert cache is not None
+    for shard in shards:
+        text = shard["text"]
+        cached_vector = await cache.get_cached_text(text)
+        if cached_vector:
+            shard["values"] = cached_vector
+            shard["model"] = "cached"
+        else:
+            vector = pipeline.container.embedder.embed_text(text)
+            shard["values"] = vector
+            await cache.cache_text(text, vector)
+    return shards
+
+
+async def ticker(stalls: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append(time.perf_counter() - start - 0.001)
+
+
+async def measure(
+    batched: bool, hit_rate: float, args: argparse.Namespace, directory: str
+) -> dict[str, float]:
+    model = SimulatedModel(args.base_ms / 1000, args.per_text_ms / 1000)
+    container = Container(model)
+    pipeline = AsyncRAGPipeline(container, enable_cache=False)  # type: ignore[arg-type]
+    cache = EmbeddingCache(
+        backend="sqlite", db_path=f"{directory}/{batched}-{hit_rate}.db"
+    )
+    pipeline.embedding_cache = cache
+    pipeline.enable_cache = True
+
+    catalog = [
+        [f"product {p} shard {k}" for k in range(args.shards)]
+        for p in range(args.products)
+    ]
+    warm = int(args.shards * hit_rate)
+    await cache.cache_texts({text: [0.0] for texts in catalog for text in texts[:warm]})
+
+    stalls: list[float] = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(stalls, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    for texts in catalog:
+        shards = [{"text": text} for text in texts]
+        if batched:
+            await pipeline._embed_shards_cached(shards)
+        else:
+            await per_shard(pipeline, shards)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return {
+        "ms_per_product": round(elapsed / args.products * 1000, 2),
+        "loop_blocked_ms": round(sum(stalls) / args.products * 1000, 2),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="commercetxt-cache-") as directory:
+        for hit_rate in HIT_RATES:
+            legacy = await measure(False, hit_rate, args, directory)
+            batched = await measure(True, hit_rate, args, directory)
+            results[f"{hit_rate:.0%}"] = {
+                "per_shard": legacy,
+                "batched": batched,
+                "speedup": round(
+                    legacy["ms_per_product"] / batched["ms_per_product"], 1
+                ),
+            }
+    return {"shards_per_product": args.shards, "hit_rates": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--shards", type=int, default=50)
+    parser.add_argument("--base-ms", type=float, default=4.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.4)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
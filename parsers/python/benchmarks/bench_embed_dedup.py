@@ -0,0 +1,89 @@
+"""
+Embedding dedup benchmark.
+Texts sent to the embedder per product batch: plain vs DedupEmbedder.
+
+Each product's shards are embedded as one batch, as RAGPipeline.ingest
+does. The embedder hashes text into vectors and sleeps --cost-us per
+text, standing in for model or API time.
+
+Usage:
+    python -m benchmarks.bench_embed_dedup
+    python -m benchmarks.bench_embed_dedup --products 5000 --cost-us 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from typing import Any
+
+from commercetxt.rag.core.embed_dedup import DedupEmbedder
+from commercetxt.rag.core.generator import RAGGenerator
+from commercetxt.rag.interfaces.base_embedder import BaseEmbedder
+
+from .bench_payloads import product
+
+DIMENSION = 384
+
+
+class HashEmbedder(BaseEmbedder):
+    """Deterministic vectors from text hashes. Counts embedded texts."""
+
+    def __init__(self, cost: float) -> None:
+        self.cost = cost
+        self.texts = 0
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_shards([{"text": text}])[0]["values"]
+
+    def embed_shards(self, shards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for shard in shards:
+            digest = hashlib.blake2b(shard["text"].encode()).digest()
+            shard["values"] = [digest[k % 64] / 255 for k in range(DIMENSION)]
+        self.texts += len(shards)
+        if self.cost:
+            time.sleep(self.cost * len(shards))
+        return shards
+
+
+def embed(catalog: list[list[dict[str, Any]]], embedder: BaseEmbedder) -> float:
+    start = time.perf_counter()
+    for shards in catalog:
+        embedder.embed_shards([dict(s) for s in shards])
+    return time.perf_counter() - start
+
+
+def run(products: int, cost_us: float) -> dict[str, Any]:
+    generator = RAGGenerator()
+    catalog = [generator.generate(product(i)) for i in range(products)]
+
+    plain = HashEmbedder(cost_us / 1e6)
+    plain_seconds = embed(catalog, plain)
+    inner = HashEmbedder(cost_us / 1e6)
+    dedup = DedupEmbedder(inner)
+    dedup_seconds = embed(catalog, dedup)
+    return {
+        "products": products,
+        "shards": plain.texts,
+        "plain": {"embedded_texts": plain.texts, "seconds": plain_seconds},
+        "dedup": {
+            "embedded_texts": inner.texts,
+            "seconds": dedup_seconds,
+            **dedup.get_stats(),
+        },
+        "speedup": plain_seconds / dedup_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--cost-us", type=float, default=50.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.products, args.cost_us), indent=2))
+
+
+if __name__ == "__main__":
+    main()
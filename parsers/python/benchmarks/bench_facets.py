@@ -0,0 +1,101 @@
+"""
+Facet index benchmark.
+A large category. Count, filter and update without scanning.
+
+Usage:
+    python -m benchmarks.bench_facets
+    python -m benchmarks.bench_facets --items 250000 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from commercetxt.facets import FacetIndex
+
+BRANDS = [f"Brand{i}" for i in range(40)]
+COLORS = ["Black", "White", "Silver", "Red", "Blue", "Green", "Gold", "Pink"]
+MATERIALS = ["Steel", "Plastic", "Oak", "Glass", "Fabric", "Leather"]
+
+
+def catalog_records(items: int, seed: int = 7) -> dict[str, dict[str, Any]]:
+    """item_record()-shaped products with a few facet fields."""
+    rng = random.Random(seed)
+    return {
+        f"/products/{i}.txt": {
+            "Brand": rng.choice(BRANDS),
+            "Color": rng.choice(COLORS),
+            "Materials": rng.sample(MATERIALS, 2),
+            "Price": f"{rng.uniform(1, 500):.2f}",
+            "Stock": str(rng.randint(0, 50)),
+        }
+        for i in range(items)
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Best and mean wall time in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": min(times), "mean_ms": sum(times) / len(times)}
+
+
+def run(items: int, repeat: int) -> dict[str, Any]:
+    records = catalog_records(items)
+
+    start = time.perf_counter()
+    index = FacetIndex(
+        fields=["Brand", "Color", "Materials"], numeric=["Price", "Stock"]
+    )
+    index.update_many(records.items())
+    build_ms = (time.perf_counter() - start) * 1000
+
+    where = {"Color": "Black", "Price": (None, 50)}
+    ids = list(records)
+    rng = random.Random(1)
+
+    def update_one() -> None:
+        item_id = rng.choice(ids)
+        index.update(item_id, {**records[item_id], "Color": rng.choice(COLORS)})
+
+    def scan_count() -> int:
+        return sum(
+            1
+            for r in records.values()
+            if r["Color"] == "Black" and float(r["Price"]) <= 50
+        )
+
+    return {
+        "items": items,
+        "facet_values": sum(len(index.facet_counts(f)) for f in index.fields),
+        "matches": index.count(where),
+        "build_ms": build_ms,
+        "count": measure(lambda: index.count(where), repeat),
+        "count_value_only": measure(lambda: index.count({"Color": "Black"}), repeat),
+        "items_list": measure(lambda: index.items(where), repeat),
+        "facet_counts": measure(lambda: index.facet_counts("Brand", where), repeat),
+        "update_then_count": measure(
+            lambda: (update_one(), index.count(where)), repeat
+        ),
+        "linear_scan_count": measure(scan_count, max(1, repeat // 20)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(run(args.items, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
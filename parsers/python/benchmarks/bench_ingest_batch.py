@@ -0,0 +1,106 @@
+"""
+Batch ingest benchmark.
+Products/s into FaissStore: staged ingest_batch vs the per-product loop.
+
+The per-product loop is the ingest_batch that staging replaced: await
+ingest() for each product, which embeds that product's shards and
+upserts them in their own call. FaissStore writes its index on every
+upsert, so the loop slows down as the index grows; it is run on the
+first --legacy-products only, and its throughput there is an upper
+bound for the full catalog.
+
+The embedder hashes text into vectors and sleeps --cost-us per text,
+standing in for model time.
+
+Usage:
+    python -m benchmarks.bench_ingest_batch
+    python -m benchmarks.bench_ingest_batch --products 2000 --legacy-products 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from typing import Any
+
+from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+from commercetxt.rag.drivers.faiss_store import FaissStore
+
+from .bench_embed_dedup import DIMENSION, HashEmbedder
+from .bench_payloads import product
+
+
+class Container:
+    def __init__(self, embedder: HashEmbedder, store: FaissStore) -> None:
+        self.embedder = embedder
+        self.vector_store = store
+        self.storage = None
+
+
+async def per_product(
+    pipeline: AsyncRAGPipeline, products: list[dict[str, Any]]
+) -> int:
+    """The pre-staging ingest_batch, without its bookkeeping."""
+    count = 0
+    for data in products:
+        count += await pipeline.ingest(data)
+    return count
+
+
+async def measure(
+    staged: bool, products: list[dict[str, Any]], args: argparse.Namespace
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="commercetxt-ingest-") as directory:
+        store = FaissStore(root_dir=directory, dimension=DIMENSION)
+        pipeline = AsyncRAGPipeline(
+            Container(HashEmbedder(args.cost_us / 1e6), store),  # type: ignore[arg-type]
+            enable_cache=False,
+        )
+        start = time.perf_counter()
+        if staged:
+            summary = await pipeline.ingest_batch(products)
+            shards = summary["ingested"]
+        else:
+            shards = await per_product(pipeline, products)
+        elapsed = time.perf_counter() - start
+
+    result: dict[str, Any] = {
+        "products": len(products),
+        "shards": shards,
+        "seconds": round(elapsed, 2),
+        "products_per_second": round(len(products) / elapsed, 1),
+    }
+    if staged:
+        result["stages"] = summary["stages"]
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    catalog = [product(i) for i in range(args.products)]
+    legacy = await measure(False, catalog[: args.legacy_products], args)
+    staged = await measure(True, catalog, args)
+    return {
+        "per_product": legacy,
+        "staged": staged,
+        "speedup": round(
+            staged["products_per_second"] / legacy["products_per_second"], 1
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--legacy-products", type=int, default=1000)
+    parser.add_argument("--cost-us", type=float, default=20.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
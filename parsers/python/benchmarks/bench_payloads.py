@@ -0,0 +1,156 @@
+"""
+Payload storage benchmark.
+FaissStore disk and search-result memory: normalized payloads vs inline.
+
+The inline layout is the one FaissStore wrote before payloads were
+normalized: the full original_data JSON in every shard row. It is
+written without the id map, so the disk saving is a lower bound.
+
+Usage:
+    python -m benchmarks.bench_payloads
+    python -m benchmarks.bench_payloads --products 10000 --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from commercetxt.rag.core.generator import RAGGenerator
+from commercetxt.rag.drivers.faiss_store import FaissStore
+
+DIMENSION = 8
+BATCH = 200
+
+
+def product(i: int) -> dict[str, Any]:
+    """A product in the shape RAGGenerator reads."""
+    return {
+        "ITEM": f"Wireless Headphones {i}",
+        "BRAND": "Acme",
+        "PRICE": f"{99 + i % 100}.00",
+        "CURRENCY": "USD",
+        "PRODUCT": {
+            "SKU": f"WH-{i:06d}",
+            "URL": f"https://example.com/p/{i}",
+            "Description": "Noise cancelling over-ear headphones. " * 4,
+        },
+        "SPECS": {f"Spec{k}": f"value {k}" for k in range(12)},
+        "VARIANTS": {
+            "Type": "Color",
+            "Options": [
+                f"{color}: 99.00 | SKU: WH-{i:06d}-{k} | Stock: {k}"
+                for k, color in enumerate(("Black", "Silver", "Blue", "Sand"))
+            ],
+        },
+        "REVIEWS": {"Rating": "4.6", "Count": "1200", "TopTags": "comfortable"},
+    }
+
+
+def embedded_shards(products: int, seed: int = 0) -> list[list[dict[str, Any]]]:
+    """Shards per product with random vectors."""
+    rng = random.Random(seed)
+    generator = RAGGenerator()
+    batches = []
+    for i in range(products):
+        shards = generator.generate(product(i))
+        for shard in shards:
+            shard["values"] = [rng.random() for _ in range(DIMENSION)]
+        batches.append(shards)
+    return batches
+
+
+def inline_db(path: Path, batches: list[list[dict[str, Any]]]) -> None:
+    """The shards table as written before normalization."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE shards (str_id TEXT PRIMARY KEY, faiss_id INTEGER UNIQUE"
+        " NOT NULL, text TEXT NOT NULL, metadata_json TEXT NOT NULL)"
+    )
+    rows = (
+        (f"{p}:{s['metadata']['attr_type']}:{n}", p * 1000 + n, s["text"], meta)
+        for p, shards in enumerate(batches)
+        for n, s in enumerate(shards)
+        for meta in [json.dumps(s["metadata"], ensure_ascii=False)]
+    )
+    conn.executemany("INSERT INTO shards VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def result_memory(rows: list[str]) -> int:
+    """Bytes held by the decoded metadata of search hits."""
+    tracemalloc.start()
+    held = [json.loads(meta) for meta in rows]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size
+
+
+def run(products: int, queries: int, top_k: int) -> dict[str, Any]:
+    batches = embedded_shards(products)
+    shard_count = sum(map(len, batches))
+    rng = random.Random(1)
+    vectors = [[rng.random() for _ in range(DIMENSION)] for _ in range(queries)]
+
+    with tempfile.TemporaryDirectory(prefix="commercetxt-payloads-") as directory:
+        root = Path(directory)
+        store = FaissStore(str(root / "faiss"), DIMENSION, enable_logging=False)
+        start = time.perf_counter()
+        for i in range(0, products, BATCH):
+            store.upsert([s for b in batches[i : i + BATCH] for s in b])
+        ingest_s = time.perf_counter() - start
+
+        normalized_rows = []
+        inline_rows = []
+        for vector in vectors:
+            for hit in store.search(vector, top_k=top_k):
+                normalized_rows.append(json.dumps(hit["metadata"]))
+            # What the inline layout returned: original_data in every hit
+            for hit in store.search(vector, top_k=top_k, with_payloads=True):
+                meta = hit["metadata"]
+                meta.pop("payload_id", None)
+                meta.pop("product_id", None)
+                inline_rows.append(json.dumps(meta))
+        store.close()
+        normalized_bytes = (root / "faiss" / "default.meta.sqlite").stat().st_size
+
+        inline_db(root / "inline.sqlite", batches)
+        inline_bytes = (root / "inline.sqlite").stat().st_size
+
+    normalized_ram = result_memory(normalized_rows)
+    inline_ram = result_memory(inline_rows)
+
+    return {
+        "products": products,
+        "shards": shard_count,
+        "ingest_s": ingest_s,
+        "disk_mb": {"inline": inline_bytes / 1e6, "normalized": normalized_bytes / 1e6},
+        "disk_saved_percent": round((1 - normalized_bytes / inline_bytes) * 100, 1),
+        "search_result_mb": {
+            "inline": inline_ram / 1e6,
+            "normalized": normalized_ram / 1e6,
+        },
+        "ram_saved_percent": round((1 - normalized_ram / inline_ram) * 100, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.products, args.queries, args.top_k), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Prompt packer benchmark.
+A thousand candidates. One context window.
+
+Usage:
+    python -m benchmarks.bench_prompt_packer
+    python -m benchmarks.bench_prompt_packer --candidates 5000 --budget 16000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import Counter
+from typing import Any
+
+from commercetxt.bridge import CommerceAIBridge
+from commercetxt.model import ParseResult
+from commercetxt.prompt_packer import estimate_tokens, pack_prompts
+
+
+def candidates(count: int) -> list[ParseResult]:
+    """Products from two stores with specs and variants."""
+    results = []
+    for i in range(count):
+        store = ("TechStore", "USD") if i % 5 else ("EuroShop", "EUR")
+        results.append(
+            ParseResult(
+                directives={
+                    "IDENTITY": {"Name": store[0], "Currency": store[1]},
+                    "PRODUCT": {
+                        "Name": f"Headphones model {i}",
+                        "SKU": f"HP-{i:05d}",
+                        "Brand": "Acme",
+                        "URL": f"https://example.com/p/{i}",
+                    },
+                    "OFFER": {"Price": f"{20 + i % 300}.99", "Availability": "InStock"},
+                    "INVENTORY": {"Stock": str(i % 40)},
+                    "REVIEWS": {"Rating": "4.4", "Count": str(i * 3)},
+                    "SPECS": {
+                        "Battery": f"{10 + i % 30}h",
+                        "Weight": f"{200 + i % 90}g",
+                        "Driver": "40mm",
+                        "Bluetooth": "5.3",
+                        "ANC": "Yes" if i % 2 else "No",
+                        "Charging": "USB-C",
+                    },
+                    "VARIANTS": {
+                        "Type": "Color",
+                        "Options": [
+                            {"name": c} for c in ("Black", "White", "Blue", "Red")
+                        ],
+                    },
+                }
+            )
+        )
+    return results
+
+
+def run(count: int, budgets: list[int], repeat: int) -> dict[str, Any]:
+    results = candidates(count)
+    naive = [CommerceAIBridge(r).generate_low_token_prompt() for r in results]
+
+    report: dict[str, Any] = {
+        "candidates": count,
+        "full_prompt_tokens_total": sum(estimate_tokens(p) for p in naive),
+        "budgets": {},
+    }
+    for budget in budgets:
+        times = []
+        packed = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            packed = pack_prompts(results, budget)
+            times.append((time.perf_counter() - start) * 1000)
+        assert packed is not None
+
+        # Products a naive "full prompts until full" loop would fit.
+        naive_fit, used = 0, 0
+        for prompt in naive:
+            used += estimate_tokens(prompt + "\n")
+            if used > budget:
+                break
+            naive_fit += 1
+
+        report["budgets"][budget] = {
+            "tokens_used": packed.tokens,
+            "included": len(packed.details),
+            "naive_full_prompts_included": naive_fit,
+            "detail_levels": dict(Counter(packed.details.values())),
+            "best_ms": min(times),
+            "mean_ms": sum(times) / len(times),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--budget", type=int, action="append")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    budgets = args.budget or [2_000, 8_000, 32_000]
+    print(json.dumps(run(args.candidates, budgets, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Prefix-cached prompt benchmark.
+Prices and stock tick. Product text stays put.
+
+Usage:
+    python -m benchmarks.bench_prompt_prefix
+    python -m benchmarks.bench_prompt_prefix --products 500 --ticks 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from commercetxt.bridge import CommerceAIBridge, PromptSegmentCache
+from commercetxt.model import ParseResult
+
+
+def product(i: int) -> ParseResult:
+    """A product with a realistic static body."""
+    return ParseResult(
+        directives={
+            "IDENTITY": {"Name": "TechStore", "Currency": "USD"},
+            "PRODUCT": {
+                "Name": f"Wireless Headphones {i}",
+                "SKU": f"WH-{i:05d}",
+                "Brand": "Acme",
+                "URL": f"https://example.com/p/{i}",
+            },
+            "OFFER": {"Price": "199.00", "Availability": "InStock"},
+            "INVENTORY": {"Stock": "40", "LastUpdated": "2026-01-01T00:00:00Z"},
+            "REVIEWS": {"Rating": "4.6", "Count": "1200"},
+            "SPECS": {
+                "Battery": "30h",
+                "Weight": "250g",
+                "Driver": "40mm",
+                "Bluetooth": "5.3",
+                "ANC": "Yes",
+            },
+            "VARIANTS": {
+                "Type": "Color",
+                "Options": [{"name": c} for c in ("Black", "Silver", "Blue", "Sand")],
+            },
+            "SEMANTIC_LOGIC": {
+                "items": [
+                    {"value": "Recommend for commuting and travel"},
+                    {"value": "Compare battery life before price"},
+                ]
+            },
+            "BRAND_VOICE": {"Tone": "Helpful", "Guidelines": "Short, factual"},
+        }
+    )
+
+
+def tick(result: ParseResult, t: int) -> None:
+    """Move price, stock and availability. Nothing else."""
+    offer = result.directives["OFFER"]
+    offer["Price"] = f"{199 - t % 20}.00"
+    offer["Availability"] = "InStock" if t % 7 else "OutOfStock"
+    inventory = result.directives["INVENTORY"]
+    inventory["Stock"] = str(40 - t % 40)
+    inventory["LastUpdated"] = f"2026-01-01T{t % 24:02d}:00:00Z"
+
+
+def shared_prefix(a: str, b: str) -> int:
+    return len(os.path.commonprefix([a, b]))
+
+
+def run(products: int, ticks: int) -> dict[str, Any]:
+    catalog = [product(i) for i in range(products)]
+    layouts: dict[str, Callable[[CommerceAIBridge], str]] = {
+        "low_token_prompt": lambda b: b.generate_low_token_prompt(),
+        "prefix_cached": lambda b: b.generate_prefix_cached_prompt(cache),
+    }
+
+    report: dict[str, Any] = {"products": products, "ticks": ticks}
+    for name, render in layouts.items():
+        cache = PromptSegmentCache()
+        prompts: list[list[str]] = []
+        elapsed: list[float] = []
+        for t in range(ticks):
+            for result in catalog:
+                tick(result, t)
+            start = time.perf_counter()
+            prompts.append([render(CommerceAIBridge(r)) for r in catalog])
+            elapsed.append(time.perf_counter() - start)
+
+        identical_prefix_bytes = total_bytes = 0
+        for before, after in zip(prompts, prompts[1:], strict=False):
+            for a, b in zip(before, after, strict=True):
+                identical_prefix_bytes += shared_prefix(a, b)
+                total_bytes += len(b)
+
+        report[name] = {
+            "renders": products * ticks,
+            # First tick fills the cache. Later ticks only change offers.
+            "first_tick_us_per_render": elapsed[0] / products * 1e6,
+            "steady_us_per_render": sum(elapsed[1:])
+            / max(1, products * (ticks - 1))
+            * 1e6,
+            # Share of each prompt identical to the same product's last prompt,
+            # counted from the first byte.
+            "prefix_reuse_rate": identical_prefix_bytes / max(1, total_bytes),
+            "cache": cache.stats() if name == "prefix_cached" else None,
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.products, args.ticks), indent=2))
+
+
+if __name__ == "__main__":
+    main()
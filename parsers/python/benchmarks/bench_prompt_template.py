@@ -0,0 +1,105 @@
+"""
+Compiled prompt template benchmark.
+Same text as the method chain. Fewer steps to get there.
+
+Usage:
+    python -m benchmarks.bench_prompt_template
+    python -m benchmarks.bench_prompt_template --products 2000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from commercetxt.bridge import CommerceAIBridge
+from commercetxt.model import ParseResult
+from commercetxt.prompt_template import DEFAULT_TEMPLATE
+
+
+def product(i: int) -> ParseResult:
+    """A product touching most sections of the default template."""
+    return ParseResult(
+        directives={
+            "IDENTITY": {"Name": "TechStore", "Currency": "USD"},
+            "PRODUCT": {
+                "Name": f"Wireless Headphones {i}",
+                "SKU": f"WH-{i:05d}",
+                "Brand": "Acme",
+                "URL": f"https://example.com/p/{i}",
+            },
+            "OFFER": {"Price": f"{99 + i % 100}.00", "Availability": "InStock"},
+            "INVENTORY": {"Stock": str(i % 40), "LastUpdated": "2026-01-01"},
+            "REVIEWS": {"Rating": "4.6", "Count": "1200", "TopTags": "comfort"},
+            "SPECS": {f"Spec{k}": f"value {k}" for k in range(8)},
+            "VARIANTS": {
+                "Type": "Color",
+                "Options": [{"name": c} for c in ("Black", "Silver", "Blue", "Sand")],
+            },
+            "SHIPPING": {"items": [{"name": "Standard", "path": "Free"}]},
+            "PROMOS": {"items": [{"name": "Launch", "value": "10% off"}]},
+            "IMAGES": {"items": [{"name": "Main", "Alt": "Front view"}]},
+            "SEMANTIC_LOGIC": {"items": [{"value": "Recommend for travel"}]},
+            "BRAND_VOICE": {"Tone": "Helpful", "Guidelines": "Short, factual"},
+        },
+        trust_flags=["inventory_stale"] if i % 5 == 0 else [],
+    )
+
+
+def measure(fns: dict[str, Callable[[], Any]], repeat: int) -> dict[str, Any]:
+    """
+    Best and mean wall time in milliseconds per function.
+    Rounds interleave the functions, so machine noise hits all alike.
+    """
+    times: dict[str, list[float]] = {name: [] for name in fns}
+    for _ in range(repeat):
+        for name, fn in fns.items():
+            start = time.perf_counter()
+            fn()
+            times[name].append((time.perf_counter() - start) * 1000)
+    return {
+        name: {"best_ms": min(t), "mean_ms": sum(t) / len(t)}
+        for name, t in times.items()
+    }
+
+
+def run(products: int, repeat: int) -> dict[str, Any]:
+    catalog = [product(i) for i in range(products)]
+    bridges = [CommerceAIBridge(r) for r in catalog]
+    compiled = DEFAULT_TEMPLATE.compile()
+
+    chain = [b.generate_low_token_prompt() for b in bridges]
+    templated = [compiled.render(r) for r in catalog]
+    if chain != templated:
+        raise AssertionError("Default template output differs from the bridge")
+
+    timings = measure(
+        {
+            "method_chain": lambda: [b.generate_low_token_prompt() for b in bridges],
+            "compiled_template": lambda: [compiled.render(r) for r in catalog],
+        },
+        repeat,
+    )
+    best = {name: t["best_ms"] for name, t in timings.items()}
+    return {
+        "products": products,
+        "compile": measure({"default_template": DEFAULT_TEMPLATE.compile}, repeat),
+        **timings,
+        "us_per_prompt": {name: ms / products * 1000 for name, ms in best.items()},
+        "speedup": best["method_chain"] / best["compiled_template"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.products, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Nightly re-ingest benchmark.
+Full re-ingest vs incremental (ShardManifest) after a small catalog change.
+
+Both runs ingest the catalog once, change the price of a fraction of the
+products, then ingest the whole catalog again, as a nightly refresh
+does. The embedder hashes text into vectors and counts the texts it was
+given, which is what an embedding API bills for.
+
+Usage:
+    python -m benchmarks.bench_reingest
+    python -m benchmarks.bench_reingest --products 5000 --changed 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import tempfile
+import time
+from typing import Any
+
+from commercetxt.rag.core.manifest import ShardManifest
+from commercetxt.rag.drivers.faiss_store import FaissStore
+from commercetxt.rag.pipeline import RAGPipeline
+
+from .bench_payloads import product
+
+DIMENSION = 8
+
+
+class CountingEmbedder:
+    """Deterministic vectors from text hashes. Counts embedded texts."""
+
+    def __init__(self) -> None:
+        self.texts = 0
+
+    def embed_shards(self, shards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for shard in shards:
+            digest = hashlib.blake2b(shard["text"].encode(), digest_size=DIMENSION)
+            shard["values"] = [b / 255 for b in digest.digest()]
+        self.texts += len(shards)
+        return shards
+
+
+class Container:
+    def __init__(self, store: FaissStore) -> None:
+        self.embedder = CountingEmbedder()
+        self.vector_store = store
+        self.storage = None
+
+
+class AlwaysHealthy:
+    def assess(self, data: dict[str, Any]) -> dict[str, Any]:
+        return {"score": 100, "warnings": []}
+
+
+def refresh(
+    products: int, changed: float, incremental: bool, seed: int = 0
+) -> dict[str, Any]:
+    """Initial ingest, then a timed nightly re-ingest of the catalog."""
+    catalog = [product(i) for i in range(products)]
+    with tempfile.TemporaryDirectory(prefix="commercetxt-reingest-") as directory:
+        store = FaissStore(
+            root_dir=directory, dimension=DIMENSION, enable_logging=False
+        )
+        manifest = (
+            ShardManifest(f"{directory}/manifest.sqlite") if incremental else None
+        )
+        container = Container(store)
+        pipeline = RAGPipeline(container, manifest)  # type: ignore[arg-type]
+        pipeline.health_checker = AlwaysHealthy()  # type: ignore[assignment]
+        for data in catalog:
+            pipeline.ingest(data)
+
+        rng = random.Random(seed)
+        for data in rng.sample(catalog, int(products * changed)):
+            data["PRICE"] = f"{float(data['PRICE']) + 1:.2f}"
+
+        embedder = container.embedder
+        embedder.texts = 0
+        start = time.perf_counter()
+        upserted = sum(pipeline.ingest(data) for data in catalog)
+        elapsed = time.perf_counter() - start
+        store.close()
+        if manifest is not None:
+            manifest.close()
+    return {
+        "seconds": elapsed,
+        "embedded_texts": embedder.texts,
+        "upserted_vectors": upserted,
+    }
+
+
+def run(products: int, changed: float) -> dict[str, Any]:
+    full = refresh(products, changed, incremental=False)
+    incremental = refresh(products, changed, incremental=True)
+    return {
+        "products": products,
+        "changed_products": int(products * changed),
+        "full": full,
+        "incremental": incremental,
+        "embedding_reduction": full["embedded_texts"]
+        / max(1, incremental["embedded_texts"]),
+        "speedup": full["seconds"] / incremental["seconds"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--changed", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    print(json.dumps(run(args.products, args.changed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Pipeline stage benchmark.
+Read, parse, resolve, validate, prompt, shards, normalize, schema.
+
+Usage:
+    python -m benchmarks.bench_stages
+    python -m benchmarks.bench_stages --scale 20 --repeat 5 > after.json
+    python -m benchmarks.bench_stages --baseline before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from commercetxt.benchmark import compare, run_benchmark
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[3] / "examples" / "ikea-us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("corpus", nargs="?", default=str(DEFAULT_CORPUS))
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--baseline", help="Earlier JSON output. Adds ops/s ratios per stage"
+    )
+    args = parser.parse_args()
+
+    report = run_benchmark(args.corpus, scale=args.scale, repeat=args.repeat)
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        report["speedup"] = compare(baseline, report)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Semantic tagging benchmark.
+Keyword tables: per-keyword substring loops vs compiled matchers.
+
+The legacy_* functions are the loops SemanticTagger and the filters
+ran before the tables were compiled. Products cycle through a pool of
+distinct ones so a 1M run needs no 1M dicts in memory.
+
+Usage:
+    python -m benchmarks.bench_tagging
+    python -m benchmarks.bench_tagging --products 100000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from commercetxt.constants import (
+    CATEGORY_KEYWORDS,
+    MATERIAL_TYPES,
+    SEASONAL_KEYWORDS,
+    SUSTAINABILITY_CERTS,
+)
+from commercetxt.rag.core.filters import (
+    MaterialFilter,
+    SeasonalityFilter,
+    SustainabilityFilter,
+    current_month,
+)
+from commercetxt.rag.core.semantic_tags import SemanticTagger
+
+POOL = 10_000
+
+WORDS = (
+    "wireless headphones laptop stand winter jacket garden chair oak table "
+    "steel frame cotton shirt outdoor lamp beach towel ceramic mug smart watch "
+    "ski gloves holiday gift leather sofa bamboo tray recycled bottle"
+).split()
+
+
+def product(rng: random.Random) -> dict[str, Any]:
+    """A product with the fields the keyword tables read."""
+    materials = [kw for kws in MATERIAL_TYPES.values() for kw in kws]
+    certs = [kw for kws in SUSTAINABILITY_CERTS.values() for kw in kws]
+    return {
+        "ITEM": " ".join(rng.choices(WORDS, k=4)).title(),
+        "BRAND": rng.choice(("Acme", "Nordic", "Zeta")),
+        "PRICE": str(rng.randint(5, 2000)),
+        "SPECS": {
+            "Material": f"{rng.choice(materials)} and {rng.choice(materials)}",
+            "Certification": rng.choice(certs + ["none", "ce"]),
+            "Weight": f"{rng.randint(1, 40)} kg",
+            "Color": "Black",
+        },
+    }
+
+
+def legacy_materials(specs: dict[str, Any]) -> list[str]:
+    tags: list[str] = []
+    val = ""
+    for k, v in specs.items():
+        if k.lower() in ["material", "materials", "fabric"]:
+            val = str(v).lower()
+            break
+    if not val:
+        return tags
+    for category, keywords in MATERIAL_TYPES.items():
+        category_matched = False
+        for kw in keywords:
+            if kw in val:
+                tags.append("wooden" if kw == "wood" else kw)
+                tags.append(category)
+                category_matched = True
+        if category_matched:
+            tags.append(f"{category}_material")
+    return sorted(list(set(tags)))
+
+
+def legacy_seasonality(item_name: str) -> list[str]:
+    tags: list[str] = []
+    if not item_name:
+        return tags
+    current_month = datetime.now(timezone.utc).month
+    name_lower = item_name.lower()
+    for season, config in SEASONAL_KEYWORDS.items():
+        if current_month in config["months"]:
+            if any(kw in name_lower for kw in config["keywords"]):
+                tags.append(f"{season}_seasonal")
+    return tags
+
+
+def legacy_certifications(specs: dict[str, Any]) -> list[str]:
+    tags: list[str] = []
+    val = ""
+    for k, v in specs.items():
+        if any(ck in k.lower() for ck in ["certification", "certified", "compliance"]):
+            val += " " + str(v).lower()
+    if not val:
+        return tags
+    for cert_tag, keywords in SUSTAINABILITY_CERTS.items():
+        if any(kw in val for kw in keywords):
+            tags.append(f"{cert_tag}_certified")
+    return tags
+
+
+def legacy_categories(data: dict[str, Any]) -> list[str]:
+    tags = []
+    item_name = str(data.get("ITEM", "")).lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(kw in item_name for kw in keywords):
+            tags.append(category)
+    return tags
+
+
+def legacy(data: dict[str, Any]) -> list[str]:
+    """Keyword tags the old way: a substring loop per label, clock per product."""
+    specs = data["SPECS"]
+    return (
+        legacy_materials(specs)
+        + legacy_seasonality(data["ITEM"])
+        + legacy_certifications(specs)
+        + legacy_categories(data)
+    )
+
+
+def compiled(tagger: SemanticTagger, data: dict[str, Any]) -> list[str]:
+    """The same tags through the compiled matchers."""
+    specs = data["SPECS"]
+    return (
+        MaterialFilter.detect_materials(specs)
+        + SeasonalityFilter.detect_seasonality(data["ITEM"], tagger.month)
+        + SustainabilityFilter.detect_certifications(specs)
+        + tagger._get_category_tags(data)
+    )
+
+
+def measure(
+    fns: dict[str, Callable[[], Any]], repeat: int
+) -> dict[str, dict[str, float]]:
+    """Best and mean wall time in seconds per function, interleaved."""
+    times: dict[str, list[float]] = {name: [] for name in fns}
+    for _ in range(repeat):
+        for name, fn in fns.items():
+            start = time.perf_counter()
+            fn()
+            times[name].append(time.perf_counter() - start)
+    return {
+        name: {"best_s": min(t), "mean_s": sum(t) / len(t)} for name, t in times.items()
+    }
+
+
+def run(products: int, repeat: int) -> dict[str, Any]:
+    rng = random.Random(0)
+    pool = [product(rng) for _ in range(min(products, POOL))]
+    tagger = SemanticTagger(month=current_month())
+    for data in pool:
+        if legacy(data) != compiled(tagger, data):
+            raise AssertionError(f"Tags differ for {data['ITEM']!r}")
+
+    def each(fn: Callable[[dict[str, Any]], Any]) -> Callable[[], None]:
+        def loop() -> None:
+            size = len(pool)
+            for i in range(products):
+                fn(pool[i % size])
+
+        return loop
+
+    timings = measure(
+        {
+            "legacy_keywords": each(legacy),
+            "compiled_keywords": each(lambda data: compiled(tagger, data)),
+            "generate_tags": each(tagger.generate_tags),
+        },
+        repeat,
+    )
+    return {
+        "products": products,
+        **timings,
+        "products_per_second": {
+            name: products / t["best_s"] for name, t in timings.items()
+        },
+        "keyword_speedup": timings["legacy_keywords"]["best_s"]
+        / timings["compiled_keywords"]["best_s"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(run(args.products, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
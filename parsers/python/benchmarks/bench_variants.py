@@ -0,0 +1,113 @@
+"""
+Variant model benchmark.
+Many dimensions. Hundreds of options. Count the cost per consumer.
+
+Usage:
+    python -m benchmarks.bench_variants
+    python -m benchmarks.bench_variants --dimensions 6 --options 150 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from commercetxt.enhanced_variants_validator import EnhancedVariantsValidator
+from commercetxt.rag.core.generator import RAGGenerator
+from commercetxt.rag.tools.schema_bridge import SchemaBridge
+from commercetxt.variants import VariantMatrix
+
+
+def multi_dimension_variants(dimensions: int, options: int) -> dict[str, Any]:
+    """Items layout: one Type per dimension, parser-shaped options."""
+    items: list[dict[str, Any]] = []
+    for d in range(dimensions):
+        items.append({"Type": f"Dimension{d}"})
+        items.extend(
+            {
+                "name": f"D{d}-Option{i}",
+                "path": f"+{i % 50}.50",
+                "SKU": f"SKU-{d}-{i}",
+                "Stock": str(i % 7),
+            }
+            for i in range(options)
+        )
+    return {"items": items}
+
+
+def flattened_variants(dimensions: int, options: int) -> dict[str, Any]:
+    """Type/Options layout: each option names one listed combination."""
+    rows = []
+    for i in range(options * dimensions):
+        label = " / ".join(f"A{d}-{(i // 4**d) % 4}" for d in range(dimensions))
+        rows.append(
+            {
+                "name": label,
+                "path": f"{100 + i % 900}.00",
+                "SKU": f"FLAT-{i}",
+                "Stock": str(i % 5),
+            }
+        )
+    return {"Type": "Configuration", "Options": rows}
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Best and mean wall time in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": min(times), "mean_ms": sum(times) / len(times)}
+
+
+def run(dimensions: int, options: int, repeat: int) -> dict[str, Any]:
+    offer = {"Price": "499.00", "Currency": "USD"}
+    generator = RAGGenerator()
+    bridge = SchemaBridge()
+    layouts = {
+        "multi_dimension": multi_dimension_variants(dimensions, options),
+        "flattened": flattened_variants(dimensions, options),
+    }
+
+    results: dict[str, Any] = {}
+    for name, variants in layouts.items():
+        data = {"PRODUCT": {"Name": "Bench"}, "OFFER": offer, "VARIANTS": variants}
+        matrix = VariantMatrix.from_directive(variants)
+        results[name] = {
+            "dimensions": len(matrix),
+            "options": matrix.total_options,
+            "combinations": matrix.combinations,
+            "listed_combinations": len(matrix.availability()),
+            "build_model": measure(
+                lambda v=variants: VariantMatrix.from_directive(v), repeat
+            ),
+            "validator": measure(
+                lambda v=variants: EnhancedVariantsValidator().validate(v, offer),
+                repeat,
+            ),
+            "generator": measure(
+                lambda d=data: generator._generate_variant_shards(d, []), repeat
+            ),
+            "schema_bridge": measure(lambda d=data: bridge.to_json_ld(d), repeat),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dimensions", type=int, default=5)
+    parser.add_argument("--options", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(json.dumps(run(args.dimensions, args.options, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Writer benchmark.
+Catalog generation throughput: dumps in memory and dump to files.
+
+Usage:
+    python -m benchmarks.bench_writer
+    python -m benchmarks.bench_writer --products 50000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from commercetxt import CommerceTXTParser, dump, dumps
+
+
+def product(i: int) -> dict[str, Any]:
+    """A product file with metadata, lists and nested variants."""
+    return {
+        "PRODUCT": {
+            "Name": f"Wireless Headphones {i}",
+            "SKU": f"WH-{i:06d}",
+            "Brand": "Acme",
+            "URL": f"https://example.com/p/{i}",
+        },
+        "OFFER": {
+            "Price": f"{99 + i % 100}.00",
+            "Currency": "USD",
+            "Availability": "InStock",
+            "Tax": {"value": "Included", "Note": "EU only"},
+        },
+        "INVENTORY": {"Stock": str(i % 40), "LastUpdated": "2026-01-01"},
+        "SPECS": {f"Spec{k}": f"value {k}" for k in range(8)},
+        "VARIANTS": {
+            "Type": "Color",
+            "Options": [
+                {
+                    "name": color,
+                    "path": f"+{k}.00",
+                    "SKU": f"WH-{i:06d}-{k}",
+                    "children": [{"value": "In stock"}],
+                }
+                for k, color in enumerate(("Black", "Silver", "Blue", "Sand"))
+            ],
+        },
+        "IMAGES": {
+            "items": [
+                {"value": f"https://example.com/img/{i}-{k}.jpg", "Alt": "Front"}
+                for k in range(3)
+            ]
+        },
+    }
+
+
+def measure(fns: dict[str, Callable[[], Any]], repeat: int) -> dict[str, Any]:
+    """Best and mean wall time in milliseconds per function, interleaved."""
+    times: dict[str, list[float]] = {name: [] for name in fns}
+    for _ in range(repeat):
+        for name, fn in fns.items():
+            start = time.perf_counter()
+            fn()
+            times[name].append((time.perf_counter() - start) * 1000)
+    return {
+        name: {"best_ms": min(t), "mean_ms": sum(t) / len(t)}
+        for name, t in times.items()
+    }
+
+
+def run(products: int, repeat: int) -> dict[str, Any]:
+    catalog = [product(i) for i in range(products)]
+    texts = [dumps(p) for p in catalog]
+    parser = CommerceTXTParser()
+    for directives, text in zip(catalog[:100], texts, strict=False):
+        if parser.parse(text).directives != directives:
+            raise AssertionError("Written product does not parse back the same")
+    size_mb = sum(len(t.encode("utf-8")) for t in texts) / 1e6
+
+    with tempfile.TemporaryDirectory(prefix="commercetxt-writer-") as directory:
+        paths = [Path(directory) / f"{i}.txt" for i in range(products)]
+
+        def to_files() -> None:
+            for path, directives in zip(paths, catalog, strict=True):
+                with path.open("w", encoding="utf-8") as fp:
+                    dump(directives, fp)
+
+        timings = measure(
+            {
+                "dumps": lambda: [dumps(p) for p in catalog],
+                "dump_files": to_files,
+            },
+            repeat,
+        )
+
+    return {
+        "products": products,
+        "mb": size_mb,
+        **timings,
+        "files_per_second": {
+            name: products / (t["best_ms"] / 1000) for name, t in timings.items()
+        },
+        "mb_per_second": {
+            name: size_mb / (t["best_ms"] / 1000) for name, t in timings.items()
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.products, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
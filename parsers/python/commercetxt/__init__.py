@@ -3,27 +3,57 @@ CommerceTXT Reference Parser.
 Simple. Secure. Reliable.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .limits import MAX_FILE_SIZE, MAX_LINE_LENGTH
 from .metrics import get_metrics
 from .model import ParseResult
 from .parser import CommerceTXTParser, parse_file, read_commerce_file
-from .rag import RAGGenerator
-from .resolver import CommerceTXTResolver
-from .security import is_safe_url
-from .validator import CommerceTXTValidator
+from .writer import CommerceTXTWriter, dump, dumps
+
+if TYPE_CHECKING:
+    from .rag import RAGGenerator
+    from .resolver import CommerceTXTResolver
+    from .security import is_safe_url
+    from .validator import CommerceTXTValidator
 
 __version__ = "1.0.3"
 
+# Loaded on first access (PEP 562). The parser needs none of them.
+_LAZY_ATTRIBUTES = {
+    "CommerceTXTResolver": ".resolver",
+    "CommerceTXTValidator": ".validator",
+    "RAGGenerator": ".rag",
+    "is_safe_url": ".security",
+}
+
 __all__ = [
     "MAX_FILE_SIZE",
     "MAX_LINE_LENGTH",
     "CommerceTXTParser",
     "CommerceTXTResolver",
     "CommerceTXTValidator",
+    "CommerceTXTWriter",
     "ParseResult",
     "RAGGenerator",
+    "dump",
+    "dumps",
     "get_metrics",
     "is_safe_url",
     "parse_file",
     "read_commerce_file",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,261 @@
+"""
+Stage benchmark.
+Run each pipeline stage over a corpus. Count ops, bytes and time.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .model import ParseResult
+from .parser import CommerceTXTParser, read_commerce_file
+from .resolver import ancestors, inherit, link_parents, link_targets
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# Pipeline stages, in run order. Each stage feeds on the one before.
+STAGES = (
+    "read",
+    "parse",
+    "resolve",
+    "validate",
+    "prompt",
+    "shards",
+    "normalize",
+    "schema",
+)
+
+DEFAULT_REPEAT = 3
+
+# (root, files) of one merchant tree. Absolute links resolve from root.
+Tree = tuple[Path, list[Path]]
+
+# Stage messages would flood stderr and skew the timings.
+_QUIET = logging.getLogger(f"{__name__}.quiet")
+_QUIET.addHandler(logging.NullHandler())
+_QUIET.propagate = False
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values. 0.0 when empty."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(q / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def peak_rss_mb() -> float | None:
+    """High-water mark of this process's resident memory. None on Windows."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def corpus_files(path: Path) -> list[Path]:
+    """The .txt files under a directory, or the file itself."""
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*.txt") if p.is_file())
+    return [path]
+
+
+def scale_corpus(tree: Tree, scale: int, directory: Path) -> list[Tree]:
+    """
+    Copy a tree scale times under directory, one subtree per copy.
+    Links stay inside each copy, so every copy resolves like the original.
+    """
+    root, paths = tree
+    trees = []
+    for i in range(scale):
+        copy = directory / f"copy{i}"
+        copies = []
+        for path in paths:
+            target = copy / path.relative_to(root)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, target)
+            copies.append(target)
+        trees.append((copy, copies))
+    return trees
+
+
+def run_stages(trees: list[Tree], repeat: int = DEFAULT_REPEAT) -> dict[str, Any]:
+    """
+    Time every stage over the files of trees.
+
+    Each stage runs over the whole corpus repeat times. Throughput comes
+    from the fastest round, percentiles from every call of every round.
+    peak_rss_mb is the process high-water mark when the stage ends.
+    """
+    # Imported here: only the later stages need the bridge and RAG tools.
+    from .bridge import CommerceAIBridge
+    from .rag.core.generator import RAGGenerator
+    from .rag.tools.normalizer import SemanticNormalizer
+    from .rag.tools.schema_bridge import SchemaBridge, schema_input
+    from .validator import CommerceTXTValidator
+
+    paths = [path for _, files in trees for path in files]
+    total_bytes = sum(path.stat().st_size for path in paths)
+    stats: dict[str, Any] = {}
+
+    def stage(name: str, op: Callable[[Any], Any], items: Iterable[Any]) -> list:
+        outputs, stats[name] = _time_stage(op, list(items), repeat, total_bytes)
+        return outputs
+
+    contents = stage("read", lambda p: read_commerce_file(p)[0], paths)
+
+    parser = CommerceTXTParser(logger=_QUIET)
+    parsed = dict(zip(paths, stage("parse", parser.parse, contents), strict=True))
+
+    links = {
+        path: tuple(link_targets(parsed[path], path, root))
+        for root, files in trees
+        for path in files
+    }
+    parents = link_parents(links, parsed.keys())
+    chains = {path: ancestors(path, parents) for path in paths}
+    resolved: dict[Path, ParseResult] = {}
+
+    def resolve(path: Path) -> ParseResult:
+        parent = parents.get(path)
+        if parent is None or path in chains[path]:
+            result = parsed[path]
+        else:
+            result = inherit(resolved[parent], parsed[path])
+        resolved[path] = result
+        return result
+
+    # Parents first, so each merge finds its parent resolved.
+    order = sorted(paths, key=lambda p: (len(chains[p]), str(p)))
+    results = stage("resolve", resolve, order)
+
+    validator = CommerceTXTValidator(logger=_QUIET)
+
+    def validate(result: ParseResult) -> ParseResult:
+        # Validation appends messages. Repeat rounds start clean.
+        checked = dataclasses.replace(
+            result,
+            errors=list(result.errors),
+            warnings=list(result.warnings),
+            trust_flags=list(result.trust_flags),
+        )
+        try:
+            return validator.validate(checked)
+        except ValueError:
+            return checked
+
+    validated = stage("validate", validate, results)
+
+    generator = RAGGenerator()
+    normalizer = SemanticNormalizer()
+    schema = SchemaBridge()
+    stage(
+        "prompt", lambda r: CommerceAIBridge(r).generate_low_token_prompt(), validated
+    )
+    stage("shards", lambda r: generator.generate(r.directives), validated)
+    stage(
+        "normalize",
+        lambda r: normalizer.normalize_specs(r.directives.get("SPECS") or {}),
+        validated,
+    )
+    stage("schema", lambda r: schema.to_json_ld(schema_input(r)), validated)
+    return stats
+
+
+def run_benchmark(
+    corpus: str | Path, scale: int = 1, repeat: int = DEFAULT_REPEAT
+) -> dict[str, Any]:
+    """
+    Benchmark a corpus, or scale copies of it, and return a JSON-ready report.
+    Raises FileNotFoundError when the corpus has no .txt files.
+    """
+    if scale < 1:
+        raise ValueError(f"scale must be positive, got: {scale}")
+    if repeat < 1:
+        raise ValueError(f"repeat must be positive, got: {repeat}")
+
+    corpus = Path(corpus).resolve()
+    paths = corpus_files(corpus) if corpus.exists() else []
+    if not paths:
+        raise FileNotFoundError(f"No .txt files in: {corpus}")
+    tree = (corpus if corpus.is_dir() else corpus.parent, paths)
+
+    report: dict[str, Any] = {
+        "corpus": str(corpus),
+        "scale": scale,
+        "repeat": repeat,
+        "files": len(paths) * scale,
+        "bytes": sum(p.stat().st_size for p in paths) * scale,
+        "environment": environment(),
+    }
+    if scale == 1:
+        report["stages"] = run_stages([tree], repeat)
+        return report
+
+    with tempfile.TemporaryDirectory(prefix="commercetxt-bench-") as directory:
+        trees = scale_corpus(tree, scale, Path(directory))
+        report["stages"] = run_stages(trees, repeat)
+    return report
+
+
+def environment() -> dict[str, Any]:
+    """What a result needs to be compared with another run."""
+    return {
+        "commercetxt": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> dict[str, float]:
+    """ops/s of current over baseline per stage. Above 1.0 is faster."""
+    ratios = {}
+    for name, stats in current.get("stages", {}).items():
+        old = baseline.get("stages", {}).get(name, {}).get("ops_per_second")
+        if old:
+            ratios[name] = stats["ops_per_second"] / old
+    return ratios
+
+
+def _time_stage(
+    op: Callable[[Any], Any], items: list[Any], repeat: int, total_bytes: int
+) -> tuple[list[Any], dict[str, Any]]:
+    latencies: list[float] = []
+    best = float("inf")
+    outputs: list[Any] = []
+    for _ in range(repeat):
+        outputs = []
+        start = time.perf_counter()
+        for item in items:
+            call = time.perf_counter()
+            outputs.append(op(item))
+            latencies.append(time.perf_counter() - call)
+        best = min(best, time.perf_counter() - start)
+
+    latencies.sort()
+    return outputs, {
+        "ops": len(items),
+        "seconds": best,
+        "ops_per_second": len(items) / best if best else 0.0,
+        "mb_per_second": total_bytes / 1e6 / best if best else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
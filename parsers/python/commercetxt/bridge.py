@@ -3,6 +3,10 @@ Bridge between CommerceTXT and Large Language Models.
 Optimized for low token usage and high reliability.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from typing import Any
 
 from .constants import (
@@ -11,6 +15,10 @@ from .constants import (
     DEFAULT_ITEM_NAME,
     DEFAULT_PRICE,
     DEFAULT_STORE_NAME,
+    DETAIL_CORE,
+    DETAIL_FULL,
+    DETAIL_MINIMAL,
+    DETAIL_TRIMMED,
     GRADE_A_THRESHOLD,
     GRADE_B_THRESHOLD,
     MAX_SHIPPING_METHODS_DISPLAY,
@@ -20,9 +28,121 @@ from .constants import (
     PENALTY_MISSING_VERSION,
     PENALTY_PER_ERROR,
     PENALTY_STALE_INVENTORY,
+    PROMPT_SEGMENT_CACHE_SIZE,
+    TRIMMED_SPECS_DISPLAY,
+    TRIMMED_VARIANT_OPTIONS_DISPLAY,
 )
 from .metrics import get_metrics
 from .model import ParseResult
+from .prompt_template import CompiledTemplate, default_template
+
+# Sections rendered into the static prompt segment. The dynamic tail holds
+# @OFFER, @INVENTORY, @REVIEWS, @PROMOS and the stale-inventory note.
+STATIC_SECTIONS: tuple[str, ...] = (
+    "IDENTITY",
+    "PRODUCT",
+    "SPECS",
+    "VARIANTS",
+    "SHIPPING",
+    "COMPATIBILITY",
+    "IMAGES",
+    "AGE_RESTRICTION",
+    "SEMANTIC_LOGIC",
+    "BRAND_VOICE",
+)
+
+
+class PromptSegmentCache:
+    """
+    LRU of rendered static prompt segments.
+    Keyed by a hash of the STATIC_SECTIONS content, so it is shared
+    safely across products and bridge instances.
+
+    Hashing means repr() of every section, which costs about as much as
+    rendering. segment() remembers the section objects it last hashed,
+    with a copy of their content. When the same objects come back
+    unchanged, an equality check replaces the hash.
+    """
+
+    def __init__(self, max_size: int = PROMPT_SEGMENT_CACHE_SIZE):
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got: {max_size}")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, str] = OrderedDict()
+        # Section object ids -> (content snapshot, content key).
+        self._seen: dict[tuple[int, ...], tuple[list[Any], bytes]] = {}
+        # The module cache is shared by threads generating prompts.
+        self._lock = threading.Lock()
+
+    def segment(self, sections: list[Any], render: Callable[[], str]) -> str:
+        """Cached text for sections, rendered on a miss."""
+        ids = tuple(map(id, sections))
+        with self._lock:
+            seen = self._seen.get(ids)
+        if seen is not None and seen[0] == sections:
+            key = seen[1]
+        else:
+            key = content_key(sections)
+            snapshot = _snapshot(sections)
+            with self._lock:
+                if len(self._seen) >= self.max_size:
+                    del self._seen[next(iter(self._seen))]
+                self._seen[ids] = (snapshot, key)
+
+        text = self.get(key)
+        if text is None:
+            text = render()
+            self.put(key, text)
+        return text
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> str | None:
+        with self._lock:
+            segment = self._entries.get(key)
+            if segment is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return segment
+
+    def put(self, key: bytes, segment: str) -> None:
+        with self._lock:
+            self._entries[key] = segment
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._seen.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def content_key(sections: list[Any]) -> bytes:
+    """Hash of section content. The parser keeps file order, so repr is stable."""
+    return hashlib.blake2b(repr(sections).encode("utf-8"), digest_size=16).digest()
+
+
+def _snapshot(value: Any) -> Any:
+    """Copy of parsed section content: nested dicts and lists of scalars."""
+    if isinstance(value, dict):
+        return {k: _snapshot(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_snapshot(v) for v in value]
+    return value
+
+
+_segment_cache = PromptSegmentCache()
 
 
 class CommerceAIBridge:
@@ -51,21 +171,103 @@ class CommerceAIBridge:
 
     def generate_low_token_prompt(self) -> str:
         """Create a clean, dense text prompt for LLMs."""
+        return "\n".join(self.render_lines())
+
+    def generate_template_prompt(self, template: CompiledTemplate | None = None) -> str:
+        """
+        Prompt from a compiled template. The default template gives the
+        same text as generate_low_token_prompt(), rendered faster.
+        """
+        return (template or default_template()).render(self.result)
+
+    def generate_prefix_cached_prompt(
+        self, cache: PromptSegmentCache | None = None
+    ) -> str:
+        """
+        Prompt laid out for provider prefix caching.
+
+        The static segment (store, product, specs, variants, shipping,
+        references, AI guidance) comes first and is byte-identical while
+        those sections are unchanged. Price, availability, stock, reviews
+        and promos follow in a short dynamic tail.
+        """
+        static, dynamic = self.prompt_segments(cache)
+        return f"{static}\n{dynamic}" if static and dynamic else static or dynamic
+
+    def prompt_segments(
+        self, cache: PromptSegmentCache | None = None
+    ) -> tuple[str, str]:
+        """
+        (static, dynamic) prompt text. The static text is memoized in
+        cache (a shared default when None), so only the tail is rendered
+        when @OFFER or @INVENTORY change.
+        """
+        cache = _segment_cache if cache is None else cache
         d = self.result.directives
+        static = cache.segment(
+            [d.get(name) for name in STATIC_SECTIONS],
+            lambda: "\n".join(self._static_lines(d)),
+        )
+        return static, "\n".join(self._dynamic_lines(d))
+
+    def _static_lines(self, d: dict[str, Any]) -> list[str]:
+        lines = self.identity_lines()
+        self._add_product(lines, d.get("PRODUCT", {}))
+        self._add_specs(lines, d.get("SPECS", {}))
+        self._add_variants(lines, d.get("VARIANTS", {}))
+        self._add_shipping(lines, d.get("SHIPPING", {}))
+        self._add_reference_extras(lines, d)
+        self._add_ai_guidance(lines, d)
+        return lines
+
+    def _dynamic_lines(self, d: dict[str, Any]) -> list[str]:
         lines: list[str] = []
+        self._add_offer(lines, d.get("OFFER", {}))
+        self._add_inventory(lines, d.get("INVENTORY", {}))
+        self._add_reviews(lines, d.get("REVIEWS", {}))
+        self._add_promos(lines, d)
+        return lines
+
+    def render_lines(
+        self, detail: int = DETAIL_FULL, identity: bool = True
+    ) -> list[str]:
+        """
+        Prompt lines at a detail level (DETAIL_FULL ... DETAIL_MINIMAL).
+
+        DETAIL_FULL with identity is generate_low_token_prompt().
+        identity=False leaves out STORE/CURRENCY, for callers that
+        print them once for many products.
+        """
+        d = self.result.directives
+        lines: list[str] = []
+
+        if identity:
+            lines.extend(self.identity_lines())
+
+        if detail >= DETAIL_MINIMAL:
+            self._add_minimal(lines, d)
+            return lines
 
-        self._add_identity(lines, d.get("IDENTITY", {}))
         self._add_product(lines, d.get("PRODUCT", {}))
         self._add_offer(lines, d.get("OFFER", {}))
         self._add_inventory(lines, d.get("INVENTORY", {}))
         self._add_reviews(lines, d.get("REVIEWS", {}))
+        if detail >= DETAIL_CORE:
+            return lines
+
+        if detail == DETAIL_TRIMMED:
+            self._add_specs(lines, d.get("SPECS", {}), TRIMMED_SPECS_DISPLAY)
+            self._add_variants(
+                lines, d.get("VARIANTS", {}), TRIMMED_VARIANT_OPTIONS_DISPLAY
+            )
+            return lines
+
         self._add_specs(lines, d.get("SPECS", {}))
         self._add_variants(lines, d.get("VARIANTS", {}))
         self._add_shipping(lines, d.get("SHIPPING", {}))
         self._add_extras(lines, d)  # Promos, Compatibility, Images, etc.
         self._add_ai_guidance(lines, d)
-
-        return "\n".join(lines)
+        return lines
 
     def _add_identity(self, lines: list[str], data: dict[str, Any]) -> None:
         """Add store/identity information to prompt."""
@@ -78,6 +280,23 @@ class CommerceAIBridge:
         lines.append(f"STORE: {name}")
         lines.append(f"CURRENCY: {currency}")
 
+    def identity_lines(self) -> list[str]:
+        """STORE/CURRENCY lines. Empty without @IDENTITY."""
+        lines: list[str] = []
+        self._add_identity(lines, self.result.directives.get("IDENTITY", {}))
+        return lines
+
+    def _add_minimal(self, lines: list[str], d: dict[str, Any]) -> None:
+        """Item, price and availability only."""
+        product = d.get("PRODUCT", {})
+        offer = d.get("OFFER", {})
+        if product:
+            lines.append(f"ITEM: {product.get('Name', DEFAULT_ITEM_NAME)}")
+        if offer:
+            lines.append(f"PRICE: {offer.get('Price', DEFAULT_PRICE)}")
+            availability = offer.get("Availability", DEFAULT_AVAILABILITY)
+            lines.append(f"AVAILABILITY: {availability}")
+
     def _add_product(self, lines: list[str], data: dict[str, Any]) -> None:
         """Add product information to prompt."""
         if not data:
@@ -163,23 +382,30 @@ class CommerceAIBridge:
         if top_tags is not None and top_tags != "":
             lines.append(f"TAGS: {top_tags}")
 
-    def _add_specs(self, lines: list[str], data: dict[str, Any]) -> None:
+    def _add_specs(
+        self, lines: list[str], data: dict[str, Any], limit: int = MAX_SPECS_DISPLAY
+    ) -> None:
         """Add specification information to prompt."""
         if not data:
             return
 
         lines.append("SPECS:")
 
-        # Explicitly limit to MAX_SPECS_DISPLAY
+        # Explicitly limit to `limit` specs
         count = 0
         for key, value in data.items():
             if key != "items":  # Skip metadata
                 lines.append(f"  {key}: {value}")
                 count += 1
-                if count >= MAX_SPECS_DISPLAY:
+                if count >= limit:
                     break
 
-    def _add_variants(self, lines: list[str], data: dict[str, Any]) -> None:
+    def _add_variants(
+        self,
+        lines: list[str],
+        data: dict[str, Any],
+        limit: int = MAX_VARIANT_OPTIONS_DISPLAY,
+    ) -> None:
         """Add variant information to prompt."""
         if not data:
             return
@@ -198,7 +424,7 @@ class CommerceAIBridge:
         # Extract names safely, filtering out non-dict items
         names = [
             opt.get("name") or opt.get("value")
-            for opt in options[:MAX_VARIANT_OPTIONS_DISPLAY]
+            for opt in options[:limit]
             if isinstance(opt, dict)
         ]
 
@@ -208,7 +434,7 @@ class CommerceAIBridge:
             if valid_names:
                 lines.append(f"{variant_type.upper()}: {', '.join(valid_names)}")
 
-            remaining = len(options) - MAX_VARIANT_OPTIONS_DISPLAY
+            remaining = len(options) - limit
             if remaining > 0:
                 lines.append(f"  (+{remaining} more)")
 
@@ -230,13 +456,18 @@ class CommerceAIBridge:
 
     def _add_extras(self, lines: list[str], d: dict[str, Any]) -> None:
         """Handles Promos, Compatibility, Images, Age."""
-        # Promos
+        self._add_promos(lines, d)
+        self._add_reference_extras(lines, d)
+
+    def _add_promos(self, lines: list[str], d: dict[str, Any]) -> None:
         promos = d.get("PROMOS", {}).get("items", [])
         if promos:
             lines.append("PROMOS:")
             for p in promos:
                 lines.append(f"  - {p.get('name', 'Promo')}: {p.get('value', '')}")
 
+    def _add_reference_extras(self, lines: list[str], d: dict[str, Any]) -> None:
+        """Compatibility, Images, Age. Rarely change."""
         # Compatibility
         comp = d.get("COMPATIBILITY", {})
         if comp:
@@ -0,0 +1,398 @@
+"""
+Columnar catalog table.
+Ingest resolved results once. Filter, sort, group and score as arrays.
+
+Requires numpy: pip install commercetxt[table]
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .constants import (
+    GRADE_A_THRESHOLD,
+    GRADE_B_THRESHOLD,
+    PENALTY_MISSING_OFFER,
+    PENALTY_MISSING_VERSION,
+    PENALTY_PER_ERROR,
+    PENALTY_STALE_INVENTORY,
+    VALID_AVAILABILITY,
+    VALID_STOCK_STATUS,
+)
+from .model import ParseResult
+
+# Availability enum. Codes are positions. -1 is unknown.
+AVAILABILITY_VALUES: tuple[str, ...] = tuple(
+    sorted(VALID_AVAILABILITY | VALID_STOCK_STATUS)
+)
+
+# On-disk layout version, stored in meta.json.
+FORMAT_VERSION = 1
+
+# Column name -> dtype. Missing values: NaN for floats, -1 for ints.
+COLUMNS: dict[str, str] = {
+    "price": "float64",
+    "currency": "int16",
+    "availability": "int8",
+    "stock": "int64",
+    "rating": "float32",
+    "review_count": "int64",
+    "health": "int16",
+    "error_count": "int32",
+    "has_version": "bool",
+    "has_offer": "bool",
+    "stale": "bool",
+}
+
+_AVAILABILITY_CODES = {value: i for i, value in enumerate(AVAILABILITY_VALUES)}
+
+_AGGREGATES = ("count", "sum", "mean", "min", "max")
+
+
+class CatalogTable:
+    """
+    One row per product. Typed numpy columns.
+
+    Columns: price, currency (code into `currencies`), availability (code
+    into AVAILABILITY_VALUES), stock, rating, review_count, health
+    (AIHealthChecker score), error_count, has_version, has_offer, stale,
+    and spec_mask: one bit per key in `spec_keys`, 64 keys per word.
+
+        table = CatalogTable.from_results(results)
+        cheap = table.filter(table.mask(price=(None, 50), availability="InStock"))
+        cheap.sort("rating", descending=True).ids[:10]
+        table.group_by("currency", "price", "mean")
+        table.readiness()
+
+    save() writes one .npy per column. load() memory-maps them, so other
+    processes open a large table without parsing anything.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        columns: Mapping[str, np.ndarray],
+        spec_mask: np.ndarray,
+        currencies: list[str],
+        spec_keys: list[str],
+    ):
+        self.ids = ids
+        self.columns = dict(columns)
+        self.spec_mask = spec_mask
+        self.currencies = currencies
+        self.spec_keys = spec_keys
+        self._currency_codes = {c: i for i, c in enumerate(currencies)}
+        self._spec_bits = {k: i for i, k in enumerate(spec_keys)}
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Mapping[str, ParseResult] | Iterable[tuple[str, ParseResult]],
+        health: bool = True,
+    ) -> CatalogTable:
+        """
+        Build from {item_id: ParseResult}, validated so errors and
+        trust_flags are set. health=False skips the AIHealthChecker pass
+        (the column is -1).
+        """
+        pairs = results.items() if isinstance(results, Mapping) else results
+        checker = None
+        if health:
+            from .rag.tools.health_check import AIHealthChecker
+
+            checker = AIHealthChecker()
+
+        ids: list[str] = []
+        rows: dict[str, list[Any]] = {name: [] for name in COLUMNS}
+        spec_sets: list[list[int]] = []
+        currencies: dict[str, int] = {}
+        spec_keys: dict[str, int] = {}
+
+        for item_id, result in pairs:
+            ids.append(item_id)
+            for name, value in _row(result, currencies).items():
+                rows[name].append(value)
+            specs = result.directives.get("SPECS")
+            keys = [k for k in specs if k != "items"] if isinstance(specs, dict) else []
+            spec_sets.append([spec_keys.setdefault(k, len(spec_keys)) for k in keys])
+            rows["health"].append(
+                checker.assess(result.directives)["score"] if checker else -1
+            )
+
+        columns = {
+            name: np.array(values, dtype=COLUMNS[name]) for name, values in rows.items()
+        }
+        words = max(1, math.ceil(len(spec_keys) / 64))
+        spec_mask = np.zeros((len(ids), words), dtype=np.uint64)
+        for row, bits in enumerate(spec_sets):
+            for bit in bits:
+                spec_mask[row, bit // 64] |= np.uint64(1 << (bit % 64))
+
+        return cls(ids, columns, spec_mask, list(currencies), list(spec_keys))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def row(self, i: int) -> dict[str, Any]:
+        """One product as plain values, codes decoded."""
+        currency = int(self.columns["currency"][i])
+        availability = int(self.columns["availability"][i])
+        record: dict[str, Any] = {"id": self.ids[i]}
+        record.update({name: col[i].item() for name, col in self.columns.items()})
+        record["currency"] = self.currencies[currency] if currency >= 0 else None
+        record["availability"] = (
+            AVAILABILITY_VALUES[availability] if availability >= 0 else None
+        )
+        record["specs"] = [k for k in self.spec_keys if self._has_spec(i, k)]
+        return record
+
+    # ------------------------------------------------------------------
+    # Filter and sort
+    # ------------------------------------------------------------------
+
+    def mask(
+        self,
+        *,
+        price: tuple[float | None, float | None] | None = None,
+        currency: str | Iterable[str] | None = None,
+        availability: str | Iterable[str] | None = None,
+        specs: Iterable[str] = (),
+        at_least: Mapping[str, float] | None = None,
+    ) -> np.ndarray:
+        """
+        Bool array over rows. Every given condition must hold.
+
+        price bounds are inclusive, None for open. specs must all be
+        present. at_least maps columns to minimums: {"stock": 1,
+        "rating": 4.0, "health": 75}.
+        """
+        cols = self.columns
+        result = np.ones(len(self), dtype=bool)
+        if price is not None:
+            low, high = price
+            if low is not None:
+                result &= cols["price"] >= low
+            if high is not None:
+                result &= cols["price"] <= high
+        if currency is not None:
+            result &= np.isin(
+                cols["currency"], self._codes(currency, self._currency_codes)
+            )
+        if availability is not None:
+            result &= np.isin(
+                cols["availability"], self._codes(availability, _AVAILABILITY_CODES)
+            )
+        for name, minimum in (at_least or {}).items():
+            result &= cols[name] >= minimum
+        specs = list(specs)
+        if specs:
+            result &= self._spec_match(specs)
+        return result
+
+    def filter(self, mask: np.ndarray) -> CatalogTable:
+        """Rows where mask is True, order kept."""
+        return self.take(np.flatnonzero(mask))
+
+    def take(self, rows: np.ndarray) -> CatalogTable:
+        """Rows by position, in the given order."""
+        return CatalogTable(
+            [self.ids[i] for i in rows],
+            {name: col[rows] for name, col in self.columns.items()},
+            self.spec_mask[rows],
+            self.currencies,
+            self.spec_keys,
+        )
+
+    def sort(self, by: str, descending: bool = False) -> CatalogTable:
+        """Sorted copy. Missing values (NaN, -1) go last either way."""
+        values = self.columns[by]
+        if values.dtype.kind == "b":
+            values = values.astype(np.int8)
+            missing = np.zeros(len(values), dtype=bool)
+        elif values.dtype.kind == "f":
+            missing = np.isnan(values)
+        else:
+            missing = values < 0
+        order = np.lexsort((-values if descending else values, missing))
+        return self.take(order)
+
+    # ------------------------------------------------------------------
+    # Aggregation and scoring
+    # ------------------------------------------------------------------
+
+    def group_by(self, key: str, column: str = "price", agg: str = "count") -> dict:
+        """
+        Aggregate column per value of key ("currency" or "availability").
+        NaN and -1 values of column are left out. agg: count, sum, mean,
+        min, max.
+        """
+        if agg not in _AGGREGATES:
+            raise ValueError(f"agg must be one of {_AGGREGATES}, got: {agg}")
+        if key == "currency":
+            labels: tuple[str, ...] = tuple(self.currencies)
+        elif key == "availability":
+            labels = AVAILABILITY_VALUES
+        else:
+            raise ValueError(f"Cannot group by: {key}")
+
+        codes = self.columns[key].astype(np.intp)
+        values = self.columns[column].astype(np.float64)
+        keep = (codes >= 0) & ~np.isnan(values)
+        if self.columns[column].dtype.kind == "i":
+            keep &= values >= 0
+        codes, values = codes[keep], values[keep]
+
+        size = len(labels)
+        counts = np.bincount(codes, minlength=size)
+        if agg == "count":
+            out = counts.astype(np.float64)
+        elif agg in ("sum", "mean"):
+            out = np.bincount(codes, weights=values, minlength=size)
+            if agg == "mean":
+                out = np.divide(
+                    out, counts, out=np.full(size, np.nan), where=counts > 0
+                )
+        else:
+            out = np.full(size, np.inf if agg == "min" else -np.inf)
+            (np.minimum if agg == "min" else np.maximum).at(out, codes, values)
+
+        return {
+            labels[i]: (int(out[i]) if agg == "count" else float(out[i]))
+            for i in np.flatnonzero(counts)
+        }
+
+    def readiness(self) -> np.ndarray:
+        """
+        CommerceAIBridge.calculate_readiness_score() for every row.
+        Same penalties, clipped at zero.
+        """
+        cols = self.columns
+        score = (
+            100
+            - PENALTY_MISSING_VERSION * ~cols["has_version"]
+            - PENALTY_MISSING_OFFER * ~cols["has_offer"]
+            - PENALTY_PER_ERROR * cols["error_count"]
+            - PENALTY_STALE_INVENTORY * cols["stale"]
+        )
+        return np.maximum(score, 0).astype(np.int32)
+
+    def grades(self, scores: np.ndarray | None = None) -> np.ndarray:
+        """Letter grade per row for readiness() scores."""
+        scores = self.readiness() if scores is None else scores
+        return np.where(
+            scores > GRADE_A_THRESHOLD,
+            "A",
+            np.where(scores > GRADE_B_THRESHOLD, "B", "C"),
+        )
+
+    # ------------------------------------------------------------------
+    # On disk
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | Path) -> Path:
+        """Write to a directory: one .npy per column plus meta.json."""
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, col in self.columns.items():
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(col))
+        np.save(directory / "spec_mask.npy", np.ascontiguousarray(self.spec_mask))
+        meta = {
+            "format": FORMAT_VERSION,
+            "ids": self.ids,
+            "currencies": self.currencies,
+            "spec_keys": self.spec_keys,
+        }
+        (directory / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        return directory
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> CatalogTable:
+        """Open a saved table. mmap=True maps columns read-only."""
+        directory = Path(path)
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("format") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported table format: {meta.get('format')} in {directory}"
+            )
+        mode = "r" if mmap else None
+        columns = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in COLUMNS
+        }
+        spec_mask = np.load(directory / "spec_mask.npy", mmap_mode=mode)
+        return cls(
+            meta["ids"], columns, spec_mask, meta["currencies"], meta["spec_keys"]
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _codes(values: str | Iterable[str], codes: Mapping[str, int]) -> list[int]:
+        names = [values] if isinstance(values, str) else list(values)
+        return [codes[name] for name in names if name in codes]
+
+    def _spec_match(self, specs: list[str]) -> np.ndarray:
+        """Rows that have every spec key. Unknown keys match nothing."""
+        if any(key not in self._spec_bits for key in specs):
+            return np.zeros(len(self), dtype=bool)
+        required = np.zeros(self.spec_mask.shape[1], dtype=np.uint64)
+        for key in specs:
+            bit = self._spec_bits[key]
+            required[bit // 64] |= np.uint64(1 << (bit % 64))
+        return np.all((self.spec_mask & required) == required, axis=1)
+
+    def _has_spec(self, i: int, key: str) -> bool:
+        bit = self._spec_bits[key]
+        return bool(self.spec_mask[i, bit // 64] & np.uint64(1 << (bit % 64)))
+
+
+def _row(result: ParseResult, currencies: dict[str, int]) -> dict[str, Any]:
+    """Column values of one result, health excluded."""
+    directives = result.directives
+    offer = _section(directives, "OFFER")
+    inventory = _section(directives, "INVENTORY")
+    reviews = _section(directives, "REVIEWS")
+
+    currency = offer.get("Currency") or _section(directives, "IDENTITY").get("Currency")
+    availability = offer.get("Availability") or inventory.get("StockStatus")
+
+    return {
+        "price": _number(offer.get("Price"), math.nan),
+        "currency": (
+            currencies.setdefault(currency, len(currencies)) if currency else -1
+        ),
+        "availability": _AVAILABILITY_CODES.get(availability, -1),
+        "stock": int(_number(inventory.get("Stock"), -1)),
+        "rating": _number(reviews.get("Rating"), math.nan),
+        "review_count": int(_number(reviews.get("Count"), -1)),
+        "error_count": len(result.errors),
+        "has_version": bool(result.version),
+        "has_offer": bool(offer.get("Price") and offer.get("Availability")),
+        "stale": "inventory_stale" in result.trust_flags,
+    }
+
+
+def _section(directives: Mapping[str, Any], name: str) -> dict[str, Any]:
+    section = directives.get(name)
+    return section if isinstance(section, dict) else {}
+
+
+def _number(value: Any, default: float) -> float:
+    if value is None:
+        return default
+    try:
+        number = float(str(value).replace(",", "").strip().lstrip("$"))
+    except ValueError:
+        return default
+    # "nan" and "inf" parse, but int() of either raises for the count columns.
+    return number if math.isfinite(number) else default
@@ -6,9 +6,13 @@ Enhancement: Added colored output support (optional, graceful fallback).
 """
 
 import argparse
+import glob
 import json
 import logging
 import sys
+import time
+from collections.abc import Iterator
+from contextlib import nullcontext
 from pathlib import Path
 
 # Optional color support (graceful fallback if not installed)
@@ -34,16 +38,21 @@ except ImportError:
     Style = _DummyColor()  # type: ignore[assignment]
 
 from . import __version__
-from .bridge import CommerceAIBridge
 from .constants import CLI_SCORE_EXCELLENT, CLI_SCORE_FAIR, CLI_SCORE_GOOD
+from .parallel import iter_unordered
 from .parser import parse_file
-from .rag.tools.comparator import ProductComparator
-from .rag.tools.health_check import AIHealthChecker
-from .rag.tools.normalizer import SemanticNormalizer
-from .rag.tools.schema_bridge import SchemaBridge
+from .profiling import stage
 from .resolver import CommerceTXTResolver
 from .validator import CommerceTXTValidator
 
+# Action dependencies (bridge, RAG tools) are imported inside the handlers
+# that use them, so `commercetxt file --validate` starts fast.
+
+# Per-file actions available in batch mode.
+BATCH_ACTIONS = ("validate", "health", "schema", "prompt", "normalize")
+
+_GLOB_CHARS = frozenset("*?[")
+
 
 def main() -> None:
     """Main entry point. Uses action routing to avoid complexity."""
@@ -51,6 +60,44 @@ def main() -> None:
     args = parser.parse_args()
 
     _setup_logging(args.log_level)
+    if args.format == "json":
+        args.json = True
+
+    if args.profile or args.memory_report:
+        _run_profiled(args)
+    else:
+        _run(args)
+
+
+def _run_profiled(args: Any) -> None:
+    """
+    Run the command under --profile and/or --memory-report.
+    Reports go to stderr (or --profile-output) even when the command exits.
+    """
+    from .profiling import MemoryReport, Profiler
+
+    report = MemoryReport() if args.memory_report else None
+    profiler = Profiler(args.profile) if args.profile else None
+    try:
+        with report or nullcontext(), profiler or nullcontext():
+            _run(args)
+    finally:
+        if profiler is not None:
+            if args.profile_output:
+                profiler.write(args.profile_output)
+            else:
+                profiler.print_stats(sys.stderr)
+        if report is not None:
+            print(report.format(), file=sys.stderr)
+
+
+def _run(args: Any) -> None:
+    """Route one parsed command line."""
+    # Many files: aggregated report, a watch loop, or one record per file.
+    handler = _many_files_handler(args)
+    if handler:
+        handler(args)
+        return
 
     try:
         file_path = _validate_file_path(args.file)
@@ -61,7 +108,8 @@ def main() -> None:
         # Validate the parsed result (catch ValueError for strict mode errors)
         validator = CommerceTXTValidator()
         try:
-            final_result = validator.validate(final_result)
+            with stage("validate"):
+                final_result = validator.validate(final_result)
         except ValueError as ve:
             # Strict mode validation error - add to result.errors
             final_result.errors.append(str(ve))
@@ -122,7 +170,11 @@ def _create_parser() -> argparse.ArgumentParser:
     )
 
     # Positional arguments
-    parser.add_argument("file", help="Path to the commerce.txt or product file")
+    parser.add_argument(
+        "file",
+        help="Path to the commerce.txt or product file. A directory or a quoted "
+        "glob ('feeds/**/*.txt') processes every matching file",
+    )
     parser.add_argument(
         "compare_file",
         nargs="?",
@@ -133,6 +185,13 @@ def _create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--json", action="store_true", help="Output results in JSON format"
     )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "ndjson"],
+        default=None,
+        help="Output format. ndjson streams one JSON line per file as it "
+        "finishes (implies batch mode)",
+    )
     parser.add_argument(
         "--strict", action="store_true", help="Treat warnings as errors (exit code 1)"
     )
@@ -171,6 +230,99 @@ def _create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--validate", action="store_true", help="Only validate (skip other actions)"
     )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Validate every .txt file under a directory and print one "
+        "aggregated report",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for --report, --import-feed and batch mode "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "collapsed"],
+        default=None,
+        help="Profile the run. cprofile prints the top functions (or writes "
+        "pstats with --profile-output); collapsed writes flamegraph stacks",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=None,
+        metavar="PATH",
+        help="Write the --profile result here instead of stderr",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Report peak memory and top allocation sites per stage "
+        "(parse, merge, validate, generate) on stderr",
+    )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Benchmark every pipeline stage over a corpus directory: "
+        "ops/s, MB/s, p50/p99 and peak RSS (use --json to save results)",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Benchmark N copies of the corpus (default: 1)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Benchmark rounds per stage; the fastest counts (default: 3)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch a merchant directory and re-check files as they change "
+        "(with --health, also re-score them)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Seconds between --watch polls (default: 1.0)",
+    )
+    parser.add_argument(
+        "--polls",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Stop --watch after N polls (default: run until interrupted)",
+    )
+    parser.add_argument(
+        "--import-feed",
+        default=None,
+        metavar="DIR",
+        help="Import a CSV or JSONL product feed into a CommerceTXT tree "
+        "(root, category and product files) under DIR",
+    )
+    parser.add_argument(
+        "--mapping",
+        default=None,
+        metavar="PATH",
+        help="JSON mapping for --import-feed: fields (column -> SECTION.Key), "
+        "id, category, constants, root",
+    )
+    parser.add_argument(
+        "--audit",
+        default=None,
+        metavar="PATH",
+        help="Write per-product token savings of --import-feed to this CSV",
+    )
 
     return parser
 
@@ -210,14 +362,17 @@ def _load_and_merge(path: Path, resolver: CommerceTXTResolver) -> Any:
 
     """
     # Use parse_file which auto-detects encoding
-    target = parse_file(path)
+    with stage("parse"):
+        target = parse_file(path)
 
     # Check for root commerce.txt for inheritance
     potential_root = path.parent / "commerce.txt"
 
     if path.name != "commerce.txt" and potential_root.exists():
-        root = parse_file(potential_root)
-        return resolver.merge(root, target)
+        with stage("parse"):
+            root = parse_file(potential_root)
+        with stage("merge"):
+            return resolver.merge(root, target)
 
     return target
 
@@ -258,6 +413,8 @@ def _handle_compare(args: Any, result_a: Any, resolver: CommerceTXTResolver) ->
         print(str(e), file=sys.stderr)
         sys.exit(1)
 
+    from .rag.tools.comparator import ProductComparator
+
     comparator = ProductComparator()
     comp = comparator.compare(result_a.directives, result_b.directives)
 
@@ -283,6 +440,8 @@ def _handle_health(result: Any) -> None:
         None
     """
 
+    from .rag.tools.health_check import AIHealthChecker
+
     checker = AIHealthChecker()
     report = checker.assess(result.directives)
     _print_health_text(report)
@@ -306,6 +465,8 @@ def _handle_normalize(result: Any, output_json: bool) -> None:
             True, the normalized specifications are printed as a JSON object.
             Otherwise, they are printed as formatted text.
     """
+    from .rag.tools.normalizer import SemanticNormalizer
+
     normalizer = SemanticNormalizer()
     specs = result.directives.get("SPECS", {})
     normalized = normalizer.normalize_specs(specs)
@@ -324,20 +485,10 @@ def _handle_schema(result: Any) -> None:
     """
     Generate Schema.org JSON-LD markup.
     """
-    bridge = SchemaBridge()
-    flat = {}
-
-    # Only flatten relevant sections for Schema.org
-    relevant_sections = {"PRODUCT", "OFFER", "SPECS", "INVENTORY", "REVIEWS"}
+    from .rag.tools.schema_bridge import SchemaBridge, schema_input
 
-    for k, v in result.directives.items():
-        if k in relevant_sections and isinstance(v, dict):
-            flat.update(v)
-        elif k not in relevant_sections and not isinstance(v, dict):
-            # Keep non-conflicting top-level keys
-            flat[k] = v
-
-    print(bridge.to_json_ld(flat))
+    bridge = SchemaBridge()
+    print(bridge.to_json_ld(schema_input(result)))
     sys.exit(0)
 
 
@@ -348,8 +499,309 @@ def _handle_prompt(result: Any) -> None:
     Note: result should already be validated in main() before calling this.
     """
 
-    bridge = CommerceAIBridge(result)
-    print(bridge.generate_low_token_prompt())
+    from .bridge import CommerceAIBridge
+
+    with stage("generate"):
+        prompt = CommerceAIBridge(result).generate_low_token_prompt()
+    print(prompt)
+    sys.exit(0)
+
+
+def _collect_corpus_files(path: Path) -> list[Path]:
+    """Returns the .txt files under a directory, or the file itself."""
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*.txt") if p.is_file())
+    return [path]
+
+
+def _is_glob(pattern: str) -> bool:
+    # An existing file or directory is taken as named, brackets and all
+    return any(c in _GLOB_CHARS for c in pattern) and not Path(pattern).exists()
+
+
+def _collect_inputs(pattern: str) -> list[Path]:
+    """
+    Files for a path argument: a glob pattern, a directory (every .txt
+    below it) or one file. Raises FileNotFoundError when nothing matches.
+    """
+    if _is_glob(pattern):
+        paths = sorted(
+            Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file()
+        )
+        if not paths:
+            raise FileNotFoundError(f"No files match: {pattern}")
+        return paths
+    return _collect_corpus_files(_validate_file_path(pattern))
+
+
+def _many_files_handler(args: Any) -> Any:
+    """The handler for a multi-file run, or None for a single file."""
+    if args.report:
+        return _handle_report
+    if args.watch:
+        return _handle_watch
+    if args.bench:
+        return _handle_bench
+    if args.import_feed:
+        return _handle_import
+    if _is_batch(args):
+        return _handle_batch
+    return None
+
+
+def _is_batch(args: Any) -> bool:
+    return args.format == "ndjson" or _is_glob(args.file) or Path(args.file).is_dir()
+
+
+def _batch_action(args: Any) -> str:
+    """The per-file action, with the same priority as single-file routing."""
+    for action in ("health", "normalize", "schema", "prompt"):
+        if getattr(args, action):
+            return action
+    return "validate"
+
+
+def _run_action(record: dict[str, Any], result: Any, action: str, strict: bool) -> None:
+    """Add one batch action's output for a loaded file to its record."""
+    if action == "validate":
+        if strict:
+            result.errors.extend(
+                f"Strict Mode Error: {w}"
+                for w in result.warnings
+                if f"Strict Mode Error: {w}" not in result.errors
+            )
+        record.update(
+            ok=not result.errors,
+            errors=result.errors,
+            warnings=result.warnings,
+            trust_flags=result.trust_flags,
+        )
+    elif action == "health":
+        from .rag.tools.health_check import AIHealthChecker
+
+        record["report"] = AIHealthChecker().assess(result.directives)
+    elif action == "schema":
+        from .rag.tools.schema_bridge import SchemaBridge, schema_input
+
+        record["schema"] = json.loads(SchemaBridge().to_json_ld(schema_input(result)))
+    elif action == "prompt":
+        from .bridge import CommerceAIBridge
+
+        record["prompt"] = CommerceAIBridge(result).generate_low_token_prompt()
+    else:
+        from .rag.tools.normalizer import SemanticNormalizer
+
+        specs = result.directives.get("SPECS", {})
+        record["specs"] = SemanticNormalizer().normalize_specs(specs)
+
+
+def process_file(path: str, action: str, strict: bool = False) -> dict[str, Any]:
+    """
+    Run one batch action on one file and return a JSON-ready record.
+
+    Module-level so it can run in a process pool. Load and action
+    failures become records with ok=False. They never stop the batch.
+    """
+    start = time.perf_counter()
+    record: dict[str, Any] = {"file": path, "action": action, "ok": True}
+    try:
+        file_path = Path(path)
+        record["bytes"] = file_path.stat().st_size
+        result = _load_and_merge(file_path, CommerceTXTResolver())
+        try:
+            result = CommerceTXTValidator(strict=strict).validate(result)
+        except ValueError as ve:
+            result.errors.append(str(ve))
+    except Exception as e:
+        record.update(ok=False, error=f"Failed to load {path}: {e!s}")
+        record["ms"] = (time.perf_counter() - start) * 1000
+        return record
+
+    try:
+        _run_action(record, result, action, strict)
+    except Exception as e:
+        record.update(ok=False, error=f"Failed to run {action} on {path}: {e!s}")
+
+    record["ms"] = (time.perf_counter() - start) * 1000
+    return record
+
+
+def iter_batch(
+    paths: list[Path], action: str, workers: int = 1, strict: bool = False
+) -> Iterator[dict[str, Any]]:
+    """Yield process_file() records in completion order."""
+    if action not in BATCH_ACTIONS:
+        raise ValueError(f"Unknown batch action: {action}")
+    return iter_unordered(process_file, map(str, paths), workers, (action, strict))
+
+
+def _handle_batch(args: Any) -> None:
+    """
+    Process many files in one interpreter.
+
+    Records stream as files finish: one JSON line each with
+    --format ndjson, a short block each as text. --json prints one
+    document at the end. A throughput footer closes the output (on
+    stderr for ndjson, so stdout stays one record per line).
+    Exits with 1 if any file failed.
+    """
+    if args.compare or args.compare_file:
+        print("Error: --compare takes exactly two files", file=sys.stderr)
+        sys.exit(1)
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    try:
+        paths = _collect_inputs(args.file)
+    except FileNotFoundError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    fmt = args.format or ("json" if args.json else "text")
+    action = _batch_action(args)
+    start = time.perf_counter()
+    records: list[dict[str, Any]] = []
+    failed = total_bytes = 0
+
+    for record in iter_batch(paths, action, args.jobs, args.strict):
+        failed += not record["ok"]
+        total_bytes += record.get("bytes", 0)
+        if fmt == "ndjson":
+            print(json.dumps(record), flush=True)
+        elif fmt == "json":
+            records.append(record)
+        else:
+            _print_batch_record(record)
+
+    summary = _batch_summary(len(paths), failed, total_bytes, start)
+    if fmt == "ndjson":
+        print(json.dumps({"summary": summary}), file=sys.stderr)
+    elif fmt == "json":
+        print(json.dumps({"files": records, "summary": summary}, indent=2))
+    else:
+        _print_batch_footer(summary)
+
+    sys.exit(1 if failed else 0)
+
+
+def _batch_summary(files: int, failed: int, total_bytes: int, start: float) -> dict:
+    wall = time.perf_counter() - start
+    return {
+        "files": files,
+        "failed": failed,
+        "bytes": total_bytes,
+        "wall_time": wall,
+        "files_per_second": files / wall if wall else 0.0,
+        "mb_per_second": total_bytes / 1e6 / wall if wall else 0.0,
+    }
+
+
+def _handle_report(args: Any) -> None:
+    """
+    Validate a corpus and print the aggregated report.
+
+    Exits with 1 if any file has errors.
+    """
+    try:
+        paths = _collect_inputs(args.file)
+    except FileNotFoundError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    validator = CommerceTXTValidator(strict=args.strict)
+    report = validator.validate_many(paths, workers=args.jobs)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report_text(report, Path(args.file))
+
+    sys.exit(1 if report["invalid_files"] else 0)
+
+
+def _handle_watch(args: Any) -> None:
+    """
+    Watch a merchant directory until interrupted.
+
+    The first poll checks every file. Later polls print records only for
+    files that changed and the files that inherit from them. json and
+    ndjson both print one JSON line per record.
+    """
+    from .watch import MerchantWatcher
+
+    actions = ("validate", "health") if args.health else ("validate",)
+    try:
+        watcher = MerchantWatcher(args.file, actions=actions, strict=args.strict)
+    except NotADirectoryError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    as_json = (args.format or ("json" if args.json else "text")) != "text"
+    try:
+        for record in watcher.watch(args.interval, args.polls):
+            if as_json:
+                print(json.dumps(record), flush=True)
+            else:
+                _print_watch_record(record)
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
+
+
+def _handle_bench(args: Any) -> None:
+    """Benchmark the pipeline stages over a corpus and print the results."""
+    from .benchmark import run_benchmark
+
+    try:
+        report = run_benchmark(args.file, scale=args.scale, repeat=args.repeat)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json or args.format:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_bench_text(report)
+    sys.exit(0)
+
+
+def _handle_import(args: Any) -> None:
+    """Import a product feed and print the token savings summary."""
+    from .importer import FeedMapping, import_feed, read_feed
+
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    try:
+        spec = {}
+        if args.mapping:
+            spec = json.loads(Path(args.mapping).read_text(encoding="utf-8"))
+        mapping = FeedMapping.from_dict(spec)
+        audit_file = (
+            open(args.audit, "w", newline="", encoding="utf-8")
+            if args.audit
+            else nullcontext()
+        )
+        with audit_file as audit:
+            report = import_feed(
+                read_feed(args.file),
+                args.import_feed,
+                mapping,
+                workers=args.jobs,
+                audit=audit,
+            )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json or args.format:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_import_text(report, args.import_feed)
     sys.exit(0)
 
 
@@ -404,6 +856,129 @@ def _print_comparison_text(comp: dict, name_a: str, name_b: str) -> None:
     print(f"\nRecommendation: {comp.get('recommendation')}")
 
 
+def _print_report_text(report: dict, root: Path) -> None:
+    print(f"--- Corpus Report: {root.name} ---")
+    print(
+        f"Files: {report['files']} "
+        f"(valid: {report['valid_files']}, invalid: {report['invalid_files']})"
+    )
+    print(f"Errors: {report['total_errors']}  Warnings: {report['total_warnings']}")
+
+    for title, counts in (
+        ("Error types:", report["error_types"]),
+        ("Warning types:", report["warning_types"]),
+        ("Trust flags:", report["trust_flags"]),
+    ):
+        if counts:
+            print(title)
+            for name, count in counts.items():
+                print(f"  {count:>6}  {name}")
+
+    if report["worst_files"]:
+        print("Worst files:")
+        for entry in report["worst_files"]:
+            print(
+                f"  {entry['source']} "
+                f"({entry['errors']} errors, {entry['warnings']} warnings)"
+            )
+
+    print(f"Wall time: {report['wall_time']:.3f}s  CPU time: {report['cpu_time']:.3f}s")
+
+
+def _print_batch_record(record: dict) -> None:
+    name = record["file"]
+    if "error" in record:
+        print(f"✗ {name}: {record['error']}")
+        return
+
+    action = record["action"]
+    if action == "validate":
+        mark = "✓" if record["ok"] else "✗"
+        print(
+            f"{mark} {name} ({len(record['errors'])} errors, "
+            f"{len(record['warnings'])} warnings)"
+        )
+        for error in record["errors"]:
+            print(f"    ERROR: {error}")
+        return
+
+    print(f"--- {name} ---")
+    if action == "health":
+        _print_health_text(record["report"])
+    elif action == "schema":
+        print(json.dumps(record["schema"], indent=2))
+    elif action == "prompt":
+        print(record["prompt"])
+    else:
+        for k, v in record["specs"].items():
+            print(f"  {k}: {v}")
+
+
+def _print_watch_record(record: dict) -> None:
+    name = record["file"]
+    event = record["event"]
+    if event == "removed":
+        print(f"- {name} (removed)", flush=True)
+        return
+
+    mark = "✓" if record["ok"] else "✗"
+    line = f"{mark} {name} ({event}"
+    if "errors" in record:
+        line += f", {len(record['errors'])} errors, {len(record['warnings'])} warnings"
+    if "health" in record:
+        line += f", health {record['health'].get('score', 0)}/100"
+    print(f"{line})")
+    for error in record.get("errors", []):
+        print(f"    ERROR: {error}")
+    sys.stdout.flush()
+
+
+def _print_bench_text(report: dict) -> None:
+    print(
+        f"--- Benchmark: {report['files']} files, "
+        f"{report['bytes'] / 1e6:.2f} MB, best of {report['repeat']} ---"
+    )
+    print(
+        f"{'Stage':<10} {'ops/s':>10} {'MB/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'RSS MB':>8}"
+    )
+    for name, stats in report["stages"].items():
+        rss = stats["peak_rss_mb"]
+        print(
+            f"{name:<10} {stats['ops_per_second']:>10.1f} "
+            f"{stats['mb_per_second']:>8.2f} {stats['p50_ms']:>8.3f} "
+            f"{stats['p99_ms']:>8.3f} {'-' if rss is None else f'{rss:.1f}':>8}"
+        )
+
+
+def _print_import_text(report: dict, out_dir: str) -> None:
+    print(
+        f"Imported {report['products']} products in {report['categories']} "
+        f"categories to {out_dir} in {report['seconds']:.2f}s"
+    )
+    if report["skipped"] or report["duplicates"]:
+        print(
+            f"Skipped {report['skipped']} rows without id, "
+            f"{report['duplicates']} duplicate ids"
+        )
+    for error in report["errors"]:
+        print(f"Failed {error['product_id']}: {error['error']}", file=sys.stderr)
+    print(
+        f"Tokens: {report['json_tokens']} JSON -> "
+        f"{report['commercetxt_tokens']} CommerceTXT, "
+        f"{report['tokens_saved']} saved ({report['savings_percent']}%)"
+    )
+
+
+def _print_batch_footer(summary: dict) -> None:
+    print(
+        f"Processed {summary['files']} files "
+        f"({summary['failed']} failed) in {summary['wall_time']:.3f}s: "
+        f"{summary['files_per_second']:.1f} files/s, "
+        f"{summary['mb_per_second']:.2f} MB/s"
+    )
+
+
 def _print_health_text(report: dict) -> None:
     score = report.get("score", 0)
     print(f"AI Health Score: {score}/100")
@@ -95,6 +95,17 @@ MAX_VARIANT_OPTIONS_DISPLAY: int = 3
 MAX_SPECS_DISPLAY: int = 5
 MAX_SHIPPING_METHODS_DISPLAY: int = 2
 
+# Prompt detail levels for multi-product packing. Lower is richer.
+DETAIL_FULL: int = 0  # generate_low_token_prompt() output
+DETAIL_TRIMMED: int = 1  # Core lines, specs and variants capped lower
+DETAIL_CORE: int = 2  # Product, offer, inventory and reviews
+DETAIL_MINIMAL: int = 3  # Item, price and availability
+TRIMMED_SPECS_DISPLAY: int = 2
+TRIMMED_VARIANT_OPTIONS_DISPLAY: int = 2
+
+# Rendered static prompt segments kept by PromptSegmentCache
+PROMPT_SEGMENT_CACHE_SIZE: int = 10_000
+
 # Default values for missing data in bridge (used to catch mutations)
 DEFAULT_STORE_NAME: str = "Unknown"
 DEFAULT_CURRENCY: str = "USD"
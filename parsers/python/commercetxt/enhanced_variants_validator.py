@@ -4,10 +4,12 @@ Enhanced Variants Validator.
 Validates @VARIANTS section per Protocol Section 4.10.
 """
 
+import math
 import re
 from typing import Any
 
 from .constants import MAX_VARIANT_COMBINATIONS, MAX_VARIANT_GROUPS
+from .variants import PRICE_PATTERN, VariantDimension, VariantMatrix
 
 
 class EnhancedVariantsValidator:
@@ -23,7 +25,7 @@ class EnhancedVariantsValidator:
     """
 
     # Regex for price modifiers (+50.00, -20.00, 348.00)
-    MODIFIER_PATTERN = re.compile(r"^([+\-]?)(\d+\.?\d*)$")
+    MODIFIER_PATTERN: re.Pattern[str] = PRICE_PATTERN
 
     def __init__(self, strict: bool = False):
         self.strict = strict
@@ -67,18 +69,20 @@ class EnhancedVariantsValidator:
             self._warning("@VARIANTS section is empty")
             return True
 
-        # Step 4: Validate each variant group
+        # Step 4: Validate each variant group.
+        # Options are parsed once into columns. Combinations are counted,
+        # never enumerated.
+        matrix = VariantMatrix.from_groups(variant_groups, dict_only=True)
         total_combinations = 1
-        for group_idx, group in enumerate(variant_groups):
+        for group_idx, dimension in enumerate(matrix.dimensions):
             is_valid = self._validate_variant_group(
-                group, base_price, product_name, group_idx
+                dimension, base_price, product_name, group_idx
             )
             if not is_valid:
                 continue
 
             # Track combinations
-            options_count = len(group.get("options", []))
-            total_combinations *= options_count
+            total_combinations *= dimension.size
 
         # Step 5: Check complexity
         self._check_complexity(total_combinations, len(variant_groups))
@@ -139,7 +143,7 @@ class EnhancedVariantsValidator:
 
     def _validate_variant_group(
         self,
-        group: dict[str, Any],
+        dimension: VariantDimension,
         base_price: float,
         product_name: str,
         group_idx: int,
@@ -147,27 +151,24 @@ class EnhancedVariantsValidator:
         """
         Validates a single variant group.
         """
-        variant_type = group.get("type", f"Group {group_idx}")
-        options = group.get("options", [])
-
-        if not options:
+        variant_type = dimension.name
+        if variant_type is None:
+            variant_type = f"Group {group_idx}"
+        if not dimension.size:
             self._warning(f"@VARIANTS '{variant_type}': No options defined")
             return False
 
+        skipped = iter(dimension.skipped)
+        pending = next(skipped, None)
+
         # Track option names for duplicates
         seen_names: set[str] = set()
 
-        for opt_idx, option in enumerate(options):
-            if not isinstance(option, dict):
-                self._warning(
-                    f"@VARIANTS '{variant_type}' option {opt_idx}: "
-                    f"Expected dict, got {type(option)}"
-                )
-                continue
-
-            # Extract option name and price
-            opt_name = option.get("name") or option.get("value", f"Option {opt_idx}")
-            opt_price = option.get("path") or option.get("value")
+        for i, opt_name in enumerate(dimension.labels):
+            # Report unreadable options in file order
+            while pending is not None and pending[0] < dimension.positions[i]:
+                self._warn_not_dict(variant_type, *pending)
+                pending = next(skipped, None)
 
             # Check for duplicate names
             if opt_name in seen_names:
@@ -178,12 +179,25 @@ class EnhancedVariantsValidator:
             seen_names.add(opt_name)
 
             # Validate price
-            self._validate_option_price(opt_name, opt_price, base_price, variant_type)
+            self._validate_option_price(dimension, i, base_price, variant_type)
+
+        while pending is not None:
+            self._warn_not_dict(variant_type, *pending)
+            pending = next(skipped, None)
 
         return True
 
+    def _warn_not_dict(self, variant_type: Any, opt_idx: int, kind: type) -> None:
+        self._warning(
+            f"@VARIANTS '{variant_type}' option {opt_idx}: Expected dict, got {kind}"
+        )
+
     def _validate_option_price(
-        self, option_name: str, price_str: Any, base_price: float, variant_type: str
+        self,
+        dimension: VariantDimension,
+        i: int,
+        base_price: float,
+        variant_type: str,
     ) -> None:
         """
         Validates individual option price with modifier support.
@@ -192,37 +206,26 @@ class EnhancedVariantsValidator:
         # 1. Absolute: "999.00" (final price)
         # 2. Modifiers: "+50.00" or "-20.00" (relative to base)
         """
+        price_str = dimension.prices[i]
         if price_str is None:
             # No price specified - use base price
             return
 
-        price_str = str(price_str).strip()
-
-        # Parse price/modifier
-        match = self.MODIFIER_PATTERN.match(price_str)
-        if not match:
+        option_name = dimension.labels[i]
+        amount = dimension.amounts[i]
+        if math.isnan(amount):
             self._error(
                 f"@VARIANTS '{variant_type}' option '{option_name}': "
-                f"Invalid price format '{price_str}'. "
+                f"Invalid price format '{str(price_str).strip()}'. "
                 f"Expected: 999.00, +50.00, or -20.00"
             )
             return
 
-        sign, amount_str = match.groups()
-
-        try:
-            amount = float(amount_str)
-        except ValueError:
-            self._error(
-                f"@VARIANTS '{variant_type}' option '{option_name}': "
-                f"Cannot parse amount '{amount_str}' as number"
-            )
-            return
-
-        # Calculate final price
-        if sign in ("+", "-"):
+        modifier = dimension.modifiers[i]
+        if modifier:
             # It's a modifier
-            final_price = base_price + (amount if sign == "+" else -amount)
+            sign = "+" if modifier > 0 else "-"
+            final_price = dimension.final_price(i, base_price)
 
             # Validate final price is positive
             if final_price < 0:
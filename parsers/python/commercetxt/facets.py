@@ -0,0 +1,350 @@
+"""
+Facet index for category listings.
+One bitmap per facet value. Sorted columns for numeric ranges.
+Count without scanning.
+
+Requires numpy: pip install commercetxt[facets]
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+
+from .model import ParseResult
+
+# Sections read by item_record(), in priority order.
+RECORD_SECTIONS = ("PRODUCT", "OFFER", "INVENTORY", "SPECS")
+
+# Rows allocated before the first grow.
+_INITIAL_CAPACITY = 1024
+
+# Re-sort a numeric column when more than 1/N of its rows changed.
+# Fewer changes are patched into the sorted arrays in place.
+_RESORT_FRACTION = 8
+
+# facet_counts gathers matching rows when fewer than 1/N rows match.
+_SPARSE_FRACTION = 8
+
+# First number in "$1,299.00", "22 units" or "-3.5".
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def item_record(result: ParseResult | Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Flatten a product result into {field: value}.
+
+    Scalar keys from @PRODUCT, @OFFER, @INVENTORY and @SPECS, first
+    section wins. Lists are kept as lists (multi-valued facets).
+    """
+    directives = result.directives if isinstance(result, ParseResult) else result
+    record: dict[str, Any] = {}
+    for section in RECORD_SECTIONS:
+        data = directives.get(section)
+        if not isinstance(data, dict):
+            continue
+        for key, value in data.items():
+            if key == "items" or key in record:
+                continue
+            if isinstance(value, dict):
+                value = value.get("values") or value.get("value")
+            if value is not None:
+                record[key] = value
+    return record
+
+
+def to_number(value: Any) -> float:
+    """Read a number from a field value. NaN when there is none."""
+    if isinstance(value, bool):
+        return float("nan")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    match = _NUMBER_PATTERN.search(str(value).replace(",", ""))
+    return float(match.group()) if match else float("nan")
+
+
+class FacetIndex:
+    """
+    Facet counts and filtered item lists over a set of products.
+
+    fields are categorical: each distinct value gets a bool bitmap with
+    one slot per row. numeric fields are float columns, kept sorted for
+    range filters. Pick low-cardinality fields (Brand, Color), not SKU.
+
+    Filters are {field: spec}. A spec is a value, a list of values (any
+    of), or a (low, high) tuple for numeric fields, bounds inclusive,
+    None for open. Fields combine with AND.
+
+        index = FacetIndex(fields=["Brand", "Color"], numeric=["Price"])
+        index.update_many(products.items())
+        index.count({"Color": "Black", "Price": (None, 49.99)})
+        index.facet_counts("Brand", {"Color": "Black"})
+
+    Updates are incremental: update() rewrites one row's bits, remove()
+    clears them. Row slots of removed items are reused.
+    """
+
+    def __init__(self, fields: Iterable[str] = (), numeric: Iterable[str] = ()):
+        self.fields = tuple(fields)
+        self.numeric = tuple(numeric)
+        overlap = set(self.fields) & set(self.numeric)
+        if overlap:
+            raise ValueError(f"Fields cannot be both facet and numeric: {overlap}")
+
+        self._capacity = _INITIAL_CAPACITY
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._bitmaps: dict[str, dict[Any, np.ndarray]] = {f: {} for f in self.fields}
+        self._columns = {f: np.full(self._capacity, np.nan) for f in self.numeric}
+        # Per numeric field: (sorted values, their rows). None until built.
+        self._sorted: dict[str, tuple[np.ndarray, np.ndarray] | None] = dict.fromkeys(
+            self.numeric
+        )
+        # Per numeric field: rows changed since the sorted arrays were built.
+        self._dirty: dict[str, set[int]] = {f: set() for f in self.numeric}
+        # Item id per row. "" marks a free slot.
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._values: list[dict[str, tuple[Any, ...]] | None] = []
+        self._free: list[int] = []
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Mapping[str, ParseResult | Mapping[str, Any]],
+        fields: Iterable[str] = (),
+        numeric: Iterable[str] = (),
+    ) -> FacetIndex:
+        """Build from {item_id: product result} (ParseResult or directives)."""
+        index = cls(fields, numeric)
+        index.update_many((item_id, item_record(r)) for item_id, r in results.items())
+        return index
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._rows
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, item_id: str, record: Mapping[str, Any]) -> None:
+        """Add or replace one item. record is item_record() output."""
+        self.update_many([(item_id, record)])
+
+    def update_many(self, items: Iterable[tuple[str, Mapping[str, Any]]]) -> None:
+        """
+        Add or replace many items.
+        Bits are set per facet value in one numpy call each.
+        """
+        pending: dict[tuple[str, Any], list[int]] = {}
+        for item_id, record in items:
+            row = self._rows.get(item_id)
+            if row is None:
+                row = self._new_row(item_id)
+            else:
+                # Bits queued for this row must land before they are cleared.
+                self._set_bits(pending)
+                pending = {}
+                self._clear_row(row)
+
+            values: dict[str, tuple[Any, ...]] = {}
+            for field in self.fields:
+                raw = record.get(field)
+                if raw is None:
+                    continue
+                field_values = tuple(raw) if isinstance(raw, list) else (raw,)
+                values[field] = field_values
+                for value in field_values:
+                    pending.setdefault((field, value), []).append(row)
+            self._values[row] = values
+
+            for field in self.numeric:
+                self._columns[field][row] = to_number(record.get(field))
+                self._dirty[field].add(row)
+
+        self._set_bits(pending)
+
+    def remove(self, item_id: str) -> bool:
+        """Drop one item. False if it was not indexed."""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        self._clear_row(row)
+        self._alive[row] = False
+        self._ids[row] = ""
+        self._values[row] = None
+        self._free.append(row)
+        return True
+
+    def _new_row(self, item_id: str) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._ids[row] = item_id
+        else:
+            row = len(self._ids)
+            if row >= self._capacity:
+                self._grow()
+            self._ids.append(item_id)
+            self._values.append(None)
+        self._rows[item_id] = row
+        self._alive[row] = True
+        return row
+
+    def _clear_row(self, row: int) -> None:
+        for field, field_values in (self._values[row] or {}).items():
+            for value in field_values:
+                self._bitmaps[field][value][row] = False
+        for field in self.numeric:
+            self._columns[field][row] = np.nan
+            self._dirty[field].add(row)
+
+    def _grow(self) -> None:
+        old = self._capacity
+        self._capacity = old * 2
+
+        def grown(array: np.ndarray, fill: Any) -> np.ndarray:
+            out = np.full(self._capacity, fill, dtype=array.dtype)
+            out[:old] = array
+            return out
+
+        self._alive = grown(self._alive, False)
+        for bitmaps in self._bitmaps.values():
+            for value, bitmap in bitmaps.items():
+                bitmaps[value] = grown(bitmap, False)
+        for field, column in self._columns.items():
+            self._columns[field] = grown(column, np.nan)
+
+    def _set_bits(self, pending: dict[tuple[str, Any], list[int]]) -> None:
+        for (field, value), rows in pending.items():
+            self._bitmap(field, value)[rows] = True
+
+    def _bitmap(self, field: str, value: Any) -> np.ndarray:
+        bitmaps = self._bitmaps[field]
+        bitmap = bitmaps.get(value)
+        if bitmap is None:
+            bitmap = bitmaps[value] = np.zeros(self._capacity, dtype=bool)
+        return bitmap
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def mask(self, where: Mapping[str, Any] | None = None) -> np.ndarray:
+        """Bool array over rows. True where the item matches every filter."""
+        result = self._alive.copy()
+        for field, spec in (where or {}).items():
+            result &= self._match(field, spec)
+        return result
+
+    def count(self, where: Mapping[str, Any] | None = None) -> int:
+        """Number of matching items."""
+        if not where:
+            return len(self._rows)
+        return int(np.count_nonzero(self.mask(where)))
+
+    def items(self, where: Mapping[str, Any] | None = None) -> list[str]:
+        """Ids of matching items, in row order."""
+        ids = self._ids
+        return [ids[row] for row in np.flatnonzero(self.mask(where))]
+
+    def facet_counts(
+        self, field: str, where: Mapping[str, Any] | None = None
+    ) -> dict[Any, int]:
+        """
+        Matching items per value of one facet field.
+
+        The filter on field itself is ignored, so a shopper who picked
+        Color=Black still sees counts for the other colors.
+        """
+        if field not in self._bitmaps:
+            raise KeyError(f"Not a facet field: {field}")
+        others = {k: v for k, v in (where or {}).items() if k != field}
+        base = self.mask(others)
+        bitmaps = self._bitmaps[field]
+        rows = np.flatnonzero(base)
+        if len(rows) * _SPARSE_FRACTION < self._capacity:
+            # Few matches: read each bitmap at the matching rows only.
+            counts = {
+                value: int(np.count_nonzero(bitmap[rows]))
+                for value, bitmap in bitmaps.items()
+            }
+        else:
+            counts = {
+                value: int(np.count_nonzero(bitmap & base))
+                for value, bitmap in bitmaps.items()
+            }
+        return {value: n for value, n in counts.items() if n}
+
+    def value_range(self, field: str) -> tuple[float, float] | None:
+        """(min, max) of a numeric field over indexed items. None if empty."""
+        values, _ = self._sorted_column(field)
+        if not len(values):
+            return None
+        return float(values[0]), float(values[-1])
+
+    def _match(self, field: str, spec: Any) -> np.ndarray:
+        if field in self._columns:
+            low, high = spec if isinstance(spec, tuple) else (spec, spec)
+            return self._range(field, low, high)
+
+        bitmaps = self._bitmaps.get(field)
+        if bitmaps is None:
+            raise KeyError(f"Field is not indexed: {field}")
+        if isinstance(spec, (list, set, frozenset)):
+            result = np.zeros(self._capacity, dtype=bool)
+            for value in spec:
+                bitmap = bitmaps.get(value)
+                if bitmap is not None:
+                    result |= bitmap
+            return result
+        bitmap = bitmaps.get(spec)
+        if bitmap is None:
+            return np.zeros(self._capacity, dtype=bool)
+        return bitmap
+
+    def _range(self, field: str, low: float | None, high: float | None) -> np.ndarray:
+        values, rows = self._sorted_column(field)
+        start = 0 if low is None else int(np.searchsorted(values, low, "left"))
+        stop = (
+            len(values) if high is None else int(np.searchsorted(values, high, "right"))
+        )
+        result = np.zeros(self._capacity, dtype=bool)
+        result[rows[start:stop]] = True
+        return result
+
+    def _sorted_column(self, field: str) -> tuple[np.ndarray, np.ndarray]:
+        """Values of live rows sorted ascending, NaN dropped, with their rows."""
+        cached = self._sorted[field]
+        dirty = self._dirty[field]
+        if cached is not None and not dirty:
+            return cached
+
+        column = self._columns[field]
+        if cached is None or len(dirty) * _RESORT_FRACTION > len(cached[1]):
+            rows = np.flatnonzero(self._alive & ~np.isnan(column))
+            order = np.argsort(column[rows], kind="stable")
+            cached = (column[rows][order], rows[order])
+        else:
+            # Drop the changed rows, then insert their current values.
+            changed = np.fromiter(dirty, dtype=np.intp, count=len(dirty))
+            values, rows = cached
+            keep = ~np.isin(rows, changed)
+            values, rows = values[keep], rows[keep]
+            changed = changed[self._alive[changed] & ~np.isnan(column[changed])]
+            changed = changed[np.argsort(column[changed], kind="stable")]
+            at = np.searchsorted(values, column[changed], "right")
+            cached = (
+                np.insert(values, at, column[changed]),
+                np.insert(rows, at, changed),
+            )
+
+        dirty.clear()
+        self._sorted[field] = cached
+        return cached
@@ -0,0 +1,340 @@
+"""
+Feed importer.
+CSV or JSONL rows in, a fractal CommerceTXT tree out.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+import re
+import time
+import unicodedata
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, TextIO
+
+from .parallel import iter_unordered
+from .prompt_packer import estimate_tokens
+from .writer import dumps
+
+# Feed formats read by read_feed(), by file suffix.
+CSV_SUFFIXES = (".csv",)
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+# Products per worker task. One small file per task would spend more on
+# inter-process transfer than on writing.
+WRITE_CHUNK = 256
+
+# Category of rows without one.
+DEFAULT_CATEGORY = "Uncategorized"
+
+# Columns of the audit CSV, as in examples/ikea-us/token_savings_audit.csv.
+AUDIT_COLUMNS = (
+    "product_id",
+    "product_name",
+    "category",
+    "json_tokens",
+    "commercetxt_tokens",
+    "tokens_saved",
+    "savings_percent",
+)
+
+_TARGET_RE = re.compile(r"([A-Z][A-Z0-9_]*)\.(\w[\w-]*)")
+
+
+@dataclass(frozen=True)
+class FeedMapping:
+    """
+    How feed columns become directives.
+
+        FeedMapping(
+            {"title": "PRODUCT.Name", "offer.price": "OFFER.Price"},
+            id_column="sku",
+            constants={"OFFER": {"Currency": "USD"}},
+        )
+
+    Columns can be dotted paths into nested JSONL objects. Without
+    fields, columns already named like a target (PRODUCT.Name) map to it.
+    constants are written into every product; row values win. root
+    holds the directives of commerce.txt (IDENTITY, POLICIES, ...).
+    """
+
+    fields: Mapping[str, str] = field(default_factory=dict)
+    id_column: str = "id"
+    category_column: str = "category"
+    constants: Mapping[str, Mapping[str, str]] = field(default_factory=dict)
+    root: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for column, target in self.fields.items():
+            if not _TARGET_RE.fullmatch(target):
+                raise ValueError(
+                    f"Column {column!r} must map to SECTION.Key, got: {target!r}"
+                )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> FeedMapping:
+        """From the JSON form: fields, id, category, constants, root."""
+        return cls(
+            fields=dict(data.get("fields", {})),
+            id_column=data.get("id", "id"),
+            category_column=data.get("category", "category"),
+            constants={k: dict(v) for k, v in data.get("constants", {}).items()},
+            root=dict(data.get("root", {})),
+        )
+
+    def directives(self, row: Mapping[str, Any]) -> dict[str, dict[str, str]]:
+        """The product directives of one row."""
+        directives = {section: dict(keys) for section, keys in self.constants.items()}
+        targets = self.fields or {c: c for c in row if _TARGET_RE.fullmatch(c)}
+        for column, target in targets.items():
+            value = clean_value(_lookup(row, column))
+            if value:
+                section, key = target.split(".", 1)
+                directives.setdefault(section, {})[key] = value
+        return directives
+
+
+def read_feed(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Rows of a CSV or JSONL feed, one at a time."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in CSV_SUFFIXES:
+        with path.open(newline="", encoding="utf-8-sig") as fp:
+            yield from csv.DictReader(fp)
+    elif suffix in JSONL_SUFFIXES:
+        with path.open(encoding="utf-8") as fp:
+            for line_no, line in enumerate(fp, 1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError(f"Line {line_no}: expected a JSON object")
+                yield row
+    else:
+        raise ValueError(f"Unknown feed format: {path.suffix or path.name}")
+
+
+def import_feed(
+    rows: Iterable[Mapping[str, Any]],
+    out_dir: str | Path,
+    mapping: FeedMapping | None = None,
+    workers: int = 1,
+    audit: TextIO | None = None,
+) -> dict[str, Any]:
+    """
+    Write a root commerce.txt, category files and product files.
+
+    One pass over rows. Product files are written as rows arrive, by
+    workers processes with a bounded queue, so memory holds the category
+    indexes, not the feed. Layout:
+
+        commerce.txt                      mapping.root + @CATALOG
+        categories/<category>.txt         @CATEGORY, @FILTERS, @ITEMS
+        products/<category>/<id>.txt      one per row
+
+    Rows without an id are skipped; repeated ids in a category are
+    written once. A row that cannot be written (a value too long for
+    the format, say) is counted as failed and left out of its category;
+    "errors" lists why. audit, if given, gets one CSV row per product
+    with the token savings over the JSON of its source row.
+    """
+    mapping = mapping or FeedMapping()
+    out = Path(out_dir)
+    start = time.perf_counter()
+    categories: dict[str, dict[str, Any]] = {}
+    counts = {"skipped": 0, "duplicates": 0, "failed": 0}
+    errors: list[dict[str, str]] = []
+    totals = {"products": 0, "json_tokens": 0, "commercetxt_tokens": 0}
+
+    writer = csv.DictWriter(audit, AUDIT_COLUMNS) if audit is not None else None
+    if writer is not None:
+        writer.writeheader()
+
+    jobs = _product_jobs(rows, mapping, out, categories, counts)
+    chunks = iter(lambda: list(islice(jobs, WRITE_CHUNK)), [])
+    for records in iter_unordered(_write_products, chunks, workers):
+        for record in records:
+            if "error" in record:
+                counts["failed"] += 1
+                errors.append(_drop_product(categories, record))
+                continue
+            totals["products"] += 1
+            totals["json_tokens"] += record["json_tokens"]
+            totals["commercetxt_tokens"] += record["commercetxt_tokens"]
+            if writer is not None:
+                writer.writerow(record)
+
+    categories = {slug: c for slug, c in categories.items() if c["items"]}
+    for slug, category in categories.items():
+        _write_file(out / "categories" / f"{slug}.txt", _category_directives(category))
+    catalog = [
+        {"name": _item_name(c["name"]), "path": f"/categories/{slug}.txt"}
+        for slug, c in categories.items()
+    ]
+    _write_file(out / "commerce.txt", {**mapping.root, "CATALOG": {"items": catalog}})
+
+    saved = totals["json_tokens"] - totals["commercetxt_tokens"]
+    return {
+        **totals,
+        "categories": len(categories),
+        **counts,
+        "tokens_saved": saved,
+        "savings_percent": _percent(saved, totals["json_tokens"]),
+        "errors": errors,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def slugify(text: str) -> str:
+    """ASCII file name part: "Accent & throw pillows" -> accent-and-throw-pillows."""
+    text = unicodedata.normalize("NFKD", text.replace("&", " and "))
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+
+
+def clean_value(value: Any) -> str:
+    """
+    One writable line. The format has no escaping, so line breaks and
+    runs of whitespace become one space and pipes become slashes.
+    Lists are joined with commas. Objects are left out.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(filter(None, map(clean_value, value)))
+    if isinstance(value, dict):
+        return ""
+    return " ".join(str(value).split()).replace("|", "/")
+
+
+def _product_jobs(
+    rows: Iterable[Mapping[str, Any]],
+    mapping: FeedMapping,
+    out: Path,
+    categories: dict[str, dict[str, Any]],
+    counts: dict[str, int],
+) -> Iterator[tuple[Any, ...]]:
+    """Write jobs of the rows, indexing each product under its category."""
+    for row in rows:
+        product_id = clean_value(_lookup(row, mapping.id_column))
+        file_id = slugify(product_id)
+        if not file_id:
+            counts["skipped"] += 1
+            continue
+        name = clean_value(_lookup(row, mapping.category_column)) or DEFAULT_CATEGORY
+        slug = slugify(name) or slugify(DEFAULT_CATEGORY)
+        category = categories.setdefault(
+            slug, {"name": name, "items": [], "ids": set(), "prices": {}}
+        )
+        if file_id in category["ids"]:
+            counts["duplicates"] += 1
+            continue
+        category["ids"].add(file_id)
+
+        directives = mapping.directives(row)
+        title = directives.get("PRODUCT", {}).get("Name") or product_id
+        rel = f"products/{slug}/{file_id}.txt"
+        category["items"].append({"name": _item_name(title), "path": f"/{rel}"})
+        price = _price(directives.get("OFFER", {}).get("Price"))
+        if price is not None:
+            category["prices"][file_id] = price
+
+        source = json.dumps(row, ensure_ascii=False, default=str)
+        yield (out, rel, directives, source, product_id, title, name)
+
+
+def _write_products(jobs: list[tuple[Any, ...]]) -> list[dict[str, Any]]:
+    """Write product files. Module-level for the process pool."""
+    return [_write_product(job) for job in jobs]
+
+
+def _write_product(job: tuple[Any, ...]) -> dict[str, Any]:
+    out, rel, directives, source, product_id, title, category = job
+    try:
+        text = dumps(directives)
+        _write_text(out / rel, text)
+    except (ValueError, TypeError, OSError) as e:
+        # One bad row must not stop the import. The caller unlists it.
+        return {"product_id": product_id, "path": rel, "error": str(e)}
+    json_tokens = estimate_tokens(source)
+    txt_tokens = estimate_tokens(text)
+    return {
+        "product_id": product_id,
+        "product_name": title,
+        "category": category,
+        "json_tokens": json_tokens,
+        "commercetxt_tokens": txt_tokens,
+        "tokens_saved": json_tokens - txt_tokens,
+        "savings_percent": _percent(json_tokens - txt_tokens, json_tokens),
+    }
+
+
+def _drop_product(
+    categories: dict[str, dict[str, Any]], record: dict[str, Any]
+) -> dict[str, str]:
+    """Unlist a product whose file was not written. Returns its error entry."""
+    _, slug, name = record["path"].split("/")
+    category = categories[slug]
+    path = f"/{record['path']}"
+    category["items"] = [i for i in category["items"] if i["path"] != path]
+    category["prices"].pop(name.removesuffix(".txt"), None)
+    return {"product_id": record["product_id"], "error": record["error"]}
+
+
+def _category_directives(category: dict[str, Any]) -> dict[str, Any]:
+    directives: dict[str, Any] = {
+        "CATEGORY": {
+            "Name": category["name"],
+            "ProductCount": str(len(category["items"])),
+        }
+    }
+    if category["prices"]:
+        low = min(category["prices"].values())
+        high = max(category["prices"].values())
+        directives["FILTERS"] = {"PriceRange": f"{low:g} - {high:g}"}
+    directives["ITEMS"] = {"items": category["items"]}
+    return directives
+
+
+def _write_file(path: Path, directives: Mapping[str, Any]) -> None:
+    _write_text(path, dumps(dict(directives)))
+
+
+def _write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _lookup(row: Mapping[str, Any], column: str) -> Any:
+    """row[column], or a dotted path into nested objects."""
+    if column in row:
+        return row[column]
+    value: Any = row
+    for part in column.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _item_name(name: str) -> str:
+    # List entries split name and path at the first colon.
+    return name.replace(":", " -")
+
+
+def _price(value: str | None) -> float | None:
+    try:
+        price = float(value.lstrip("$").replace(",", "")) if value else None
+    except ValueError:
+        return None
+    # float() also reads "nan" and "inf", which would end up in PriceRange.
+    return price if price is not None and math.isfinite(price) else None
+
+
+def _percent(part: int, whole: int) -> float:
+    return round(part / whole * 100, 2) if whole else 0.0
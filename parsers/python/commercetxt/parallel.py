@@ -0,0 +1,92 @@
+"""
+Parallel map helpers for batch commands.
+Bounded in flight. Lazy on input. Process pool only when asked.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# Pending futures per worker. Bounds memory on huge inputs.
+PENDING_PER_WORKER = 4
+
+
+def iter_unordered(
+    fn: Callable[..., Any],
+    items: Iterable[Any],
+    workers: int | None = None,
+    args: tuple[Any, ...] = (),
+) -> Iterator[Any]:
+    """
+    Yield fn(item, *args) per item, in completion order.
+
+    With workers > 1 the calls go to a process pool, so fn must be
+    module-level. At most PENDING_PER_WORKER * workers items are in
+    flight at once, so the input iterable is consumed lazily.
+    """
+    if workers is not None and workers < 0:
+        raise ValueError(f"workers must be non-negative, got: {workers}")
+
+    if not workers or workers == 1:
+        for item in items:
+            yield fn(item, *args)
+        return
+
+    # Imported here: the pool loads multiprocessing. Single-process runs skip it.
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    max_pending = workers * PENDING_PER_WORKER
+    pending: set[Future] = set()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            pending.add(executor.submit(fn, item, *args))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def iter_ordered(
+    fn: Callable[..., Any],
+    items: Iterable[Any],
+    workers: int | None = None,
+    args: tuple[Any, ...] = (),
+) -> Iterator[Any]:
+    """
+    Yield fn(item, *args) per item, in input order.
+
+    Like iter_unordered, with the same bound on items in flight. A slow
+    item holds back the results after it instead of being overtaken.
+    """
+    if workers is not None and workers < 0:
+        raise ValueError(f"workers must be non-negative, got: {workers}")
+
+    if not workers or workers == 1:
+        for item in items:
+            yield fn(item, *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_pending = workers * PENDING_PER_WORKER
+    pending: deque[Future] = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            pending.append(executor.submit(fn, item, *args))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
@@ -655,6 +655,12 @@ class CommerceTXTParser:
         if not indent_widths:
             return 2  # Default fallback
 
+        # Nested lists: every indent is a multiple of the smallest one.
+        # Deeper levels can outnumber the first, so frequency would pick them.
+        smallest = min(indent_widths)
+        if smallest in (2, 4, 8) and all(w % smallest == 0 for w in indent_widths):
+            return smallest
+
         # Frequency-based detection: find most common indent
         from collections import Counter
 
@@ -0,0 +1,296 @@
+"""
+Profiling hooks.
+CPU time as pstats or collapsed stacks. Memory per stage with tracemalloc.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import Counter
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, TextIO
+
+# Output formats of profile().
+PROFILE_MODES = ("cprofile", "collapsed")
+
+# Allocation sites listed per stage.
+DEFAULT_TOP_SITES = 10
+
+# Rows printed by Profiler.print_stats() for cprofile.
+DEFAULT_STATS_LIMIT = 25
+
+# Collapsed stacks below this self time round to 0 microseconds.
+_MIN_STACK_NS = 500
+
+# Stages record into this report while it is active.
+_active_report: ContextVar[MemoryReport | None] = ContextVar(
+    "commercetxt_memory_report", default=None
+)
+
+
+class Profiler:
+    """
+    CPU profile of a with block.
+
+    cprofile uses cProfile and writes pstats files (snakeviz, pstats).
+    collapsed traces every call and writes "a;b;c <microseconds>" lines
+    of self time, the input of flamegraph.pl and speedscope. It is
+    exact, not sampled, so it slows the block down more than cprofile.
+    Only the thread that enters the block is profiled.
+    """
+
+    def __init__(self, mode: str = "cprofile", output: str | Path | None = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.output = output
+        self.stacks: Counter[str] = Counter()
+        self._profile: Any = None
+        self._tracer: _StackTracer | None = None
+
+    def __enter__(self) -> Profiler:
+        if self.mode == "cprofile":
+            # Imported here: cProfile and pstats are only needed when profiling.
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._tracer = _StackTracer(self.stacks)
+            sys.setprofile(self._tracer)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        else:
+            sys.setprofile(None)
+            if self._tracer is not None:
+                self._tracer.flush()
+        if self.output is not None:
+            self.write(self.output)
+
+    def write(self, path: str | Path) -> None:
+        """pstats dump for cprofile, collapsed stacks otherwise."""
+        if self._profile is not None:
+            self._profile.dump_stats(str(path))
+        else:
+            Path(path).write_text(self.collapsed(), encoding="utf-8")
+
+    def collapsed(self) -> str:
+        """One "frame;frame;frame microseconds" line per stack."""
+        lines = [
+            f"{stack} {round(ns / 1000)}"
+            for stack, ns in sorted(self.stacks.items())
+            if ns >= _MIN_STACK_NS
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def print_stats(
+        self, stream: TextIO | None = None, limit: int = DEFAULT_STATS_LIMIT
+    ) -> None:
+        """Top functions by cumulative time, or the collapsed stacks."""
+        stream = stream or sys.stderr
+        if self._profile is None:
+            stream.write(self.collapsed())
+            return
+
+        import pstats
+
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+
+
+def profile(mode: str = "cprofile", output: str | Path | None = None) -> Profiler:
+    """
+    Profile a with block. The profile is written to output on exit.
+
+        with profile("collapsed", "ingest.folded"):
+            pipeline.ingest(product)
+    """
+    return Profiler(mode, output)
+
+
+class _StackTracer:
+    """sys.setprofile() hook that charges self time to call stacks."""
+
+    def __init__(self, stacks: Counter[str]):
+        self.stacks = stacks
+        # One [stack key, start ns, child ns] per open frame.
+        self.frames: list[list[Any]] = []
+        # Open frame of MemoryReport bookkeeping. Its calls are not traced.
+        self.opaque: Any = None
+
+    def __call__(self, frame: Any, event: str, arg: Any) -> None:
+        if self.opaque is not None:
+            if event != "return" or frame is not self.opaque:
+                return
+            self.opaque = None
+        now = time.perf_counter_ns()
+        if event in ("call", "c_call"):
+            name = _c_name(arg) if event == "c_call" else _frame_name(frame)
+            parent = self.frames[-1][0] + ";" if self.frames else ""
+            self.frames.append([parent + name, now, 0])
+            if event == "call" and frame.f_code in _OPAQUE_CODES:
+                self.opaque = frame
+        elif self.frames and event in ("return", "c_return", "c_exception"):
+            self._close(now)
+
+    def _close(self, now: int) -> None:
+        key, start, child = self.frames.pop()
+        elapsed = now - start
+        self.stacks[key] += elapsed - child
+        if self.frames:
+            self.frames[-1][2] += elapsed
+
+    def flush(self) -> None:
+        """Close frames still open when profiling stopped."""
+        now = time.perf_counter_ns()
+        while self.frames:
+            self._close(now)
+
+
+def _frame_name(frame: Any) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _c_name(func: Any) -> str:
+    module = getattr(func, "__module__", None) or "builtins"
+    return f"{module}.{getattr(func, '__qualname__', repr(func))}"
+
+
+class MemoryReport:
+    """
+    Memory use per stage, from tracemalloc.
+
+    While the report is active (its with block), stage("parse") and the
+    other instrumented stages record how many bytes they left allocated,
+    their own peak, and the lines that allocated most. Starts tracemalloc
+    if it is not running yet. Snapshots are slow: use it to diagnose, not
+    in production. Concurrent tasks share the process peak, so their
+    stages can include each other's allocations.
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP_SITES, frames: int = 1):
+        self.top = top
+        self.frames = frames
+        self.stages: dict[str, dict[str, Any]] = {}
+        self._open: list[dict[str, Any]] = []
+        self._started = False
+        self._token: Any = None
+
+    def __enter__(self) -> MemoryReport:
+        # Imported here: tracemalloc pulls in pickle and linecache.
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+        self._token = _active_report.set(self)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        import tracemalloc
+
+        _active_report.reset(self._token)
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def stage(self, name: str) -> Any:
+        """Measure the with block as one call of stage name."""
+        import tracemalloc
+
+        snapshot = _snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        # Outer stages keep the peak reached so far before it is reset.
+        for outer in self._open:
+            outer["peak"] = max(outer["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current}
+        self._open.append(frame)
+        try:
+            yield
+        finally:
+            self._open.remove(frame)
+            after, peak = tracemalloc.get_traced_memory()
+            for outer in self._open:
+                outer["peak"] = max(outer["peak"], peak)
+            self._record(name, frame, after, max(frame["peak"], peak), snapshot)
+
+    def _record(
+        self, name: str, frame: dict, after: int, peak: int, before: Any
+    ) -> None:
+        stats = self.stages.setdefault(
+            name,
+            {"calls": 0, "net_bytes": 0, "peak_bytes": 0, "sites": Counter()},
+        )
+        stats["calls"] += 1
+        stats["net_bytes"] += after - frame["start"]
+        stats["peak_bytes"] = max(stats["peak_bytes"], peak - frame["start"])
+        for diff in _snapshot().compare_to(before, "lineno"):
+            if diff.size_diff > 0:
+                site = diff.traceback[0]
+                stats["sites"][f"{site.filename}:{site.lineno}"] += diff.size_diff
+
+    def to_dict(self) -> dict[str, Any]:
+        """Per stage: calls, net and peak bytes, top allocation sites."""
+        return {
+            name: {
+                "calls": stats["calls"],
+                "net_bytes": stats["net_bytes"],
+                "peak_bytes": stats["peak_bytes"],
+                "top_sites": [
+                    {"site": site, "bytes": size}
+                    for site, size in stats["sites"].most_common(self.top)
+                ],
+            }
+            for name, stats in self.stages.items()
+        }
+
+    def format(self) -> str:
+        """Text report, one block per stage."""
+        lines = ["--- Memory Report ---"]
+        for name, stats in self.to_dict().items():
+            lines.append(
+                f"{name}: peak {_kib(stats['peak_bytes'])}, "
+                f"net {_kib(stats['net_bytes'])}, {stats['calls']} call(s)"
+            )
+            lines.extend(
+                f"  {_kib(site['bytes']):>12}  {site['site']}"
+                for site in stats["top_sites"]
+            )
+        return "\n".join(lines)
+
+
+def stage(name: str) -> AbstractContextManager[Any]:
+    """Record the with block in the active MemoryReport. No-op without one."""
+    report = _active_report.get()
+    return nullcontext() if report is None else report.stage(name)
+
+
+def _snapshot() -> Any:
+    import tracemalloc
+
+    # Leave out tracemalloc's own bookkeeping and this module's.
+    return tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+    )
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:.1f} KiB"
+
+
+# Snapshots make thousands of calls. The collapsed tracer shows each of
+# these as one frame, so profiling with a memory report stays usable.
+_OPAQUE_CODES = frozenset({_snapshot.__code__, MemoryReport._record.__code__})
@@ -0,0 +1,128 @@
+"""
+Multi-product prompt packing.
+Fit as many products as possible into one token budget.
+Cover first. Add detail with what is left.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from .bridge import CommerceAIBridge
+from .constants import DETAIL_FULL, DETAIL_MINIMAL
+from .model import ParseResult
+
+# Line placed before each product block.
+PRODUCT_SEPARATOR = "---"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: four characters per token, rounded up."""
+    return math.ceil(len(text) / 4)
+
+
+class PackedPrompt(NamedTuple):
+    """A packed multi-product prompt."""
+
+    text: str
+    # estimator(text) for the whole prompt.
+    tokens: int
+    budget: int
+    # Candidate index -> detail level, for every product included.
+    details: dict[int, int]
+    # Indexes of candidates that did not fit.
+    dropped: list[int]
+
+
+class PromptPacker:
+    """
+    Greedy packer over ranked candidates.
+
+    1. Every candidate that fits is added at DETAIL_MINIMAL, in rank order.
+    2. Included products are upgraded one level at a time, in rank order,
+       while the budget allows (minimal -> core -> trimmed -> full).
+
+    STORE/CURRENCY lines shared by the most products are printed once in a
+    header. Products from other stores keep their own.
+
+    The estimator must be roughly additive: block costs are summed while
+    packing, and the sum is kept within the budget.
+
+        packer = PromptPacker(estimator=my_tokenizer_count)
+        packed = packer.pack(results, budget=4000)
+        packed.text, packed.tokens, packed.dropped
+    """
+
+    def __init__(self, estimator: Callable[[str], int] = estimate_tokens):
+        self.estimator = estimator
+
+    def pack(self, results: Iterable[ParseResult], budget: int) -> PackedPrompt:
+        """Pack candidates, best first, into budget tokens."""
+        if budget < 1:
+            raise ValueError(f"budget must be positive, got: {budget}")
+
+        bridges = [CommerceAIBridge(result) for result in results]
+        identities = [tuple(b.identity_lines()) for b in bridges]
+        header = Counter(identities).most_common(1)[0][0] if identities else ()
+        header_cost = self._cost(header)
+
+        blocks: dict[tuple[int, int], list[str]] = {}
+        costs: dict[tuple[int, int], int] = {}
+
+        def cost(i: int, detail: int) -> int:
+            key = (i, detail)
+            if key not in costs:
+                lines = [PRODUCT_SEPARATOR]
+                if identities[i] != header:
+                    lines.extend(identities[i])
+                lines.extend(bridges[i].render_lines(detail, identity=False))
+                blocks[key] = lines
+                costs[key] = self._cost(lines)
+            return costs[key]
+
+        # Pass 1: coverage. Skip what does not fit, keep trying smaller ones.
+        used = header_cost
+        details: dict[int, int] = {}
+        for i in range(len(bridges)):
+            c = cost(i, DETAIL_MINIMAL)
+            if used + c <= budget:
+                details[i] = DETAIL_MINIMAL
+                used += c
+
+        # Pass 2: detail. One level per product per round.
+        for detail in range(DETAIL_MINIMAL - 1, DETAIL_FULL - 1, -1):
+            for i in details:
+                extra = cost(i, detail) - cost(i, details[i])
+                if used + extra <= budget:
+                    details[i] = detail
+                    used += extra
+
+        lines = list(header) if details else []
+        for i, detail in details.items():
+            lines.extend(blocks[(i, detail)])
+        text = "\n".join(lines)
+
+        return PackedPrompt(
+            text=text,
+            tokens=self.estimator(text) if text else 0,
+            budget=budget,
+            details=details,
+            dropped=[i for i in range(len(bridges)) if i not in details],
+        )
+
+    def _cost(self, lines: Iterable[str]) -> int:
+        """Tokens of lines, each with its newline."""
+        text = "".join(f"{line}\n" for line in lines)
+        return self.estimator(text) if text else 0
+
+
+def pack_prompts(
+    results: Iterable[ParseResult],
+    budget: int,
+    estimator: Callable[[str], int] = estimate_tokens,
+) -> PackedPrompt:
+    """Shortcut for PromptPacker(estimator).pack(results, budget)."""
+    return PromptPacker(estimator).pack(results, budget)
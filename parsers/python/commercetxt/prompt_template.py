@@ -0,0 +1,420 @@
+"""
+Compiled prompt templates.
+Declare the layout once. Compile it to one flat function. Render fast.
+"""
+
+from __future__ import annotations
+
+import string
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from typing import Any
+
+from .constants import (
+    DEFAULT_AVAILABILITY,
+    DEFAULT_CURRENCY,
+    DEFAULT_ITEM_NAME,
+    DEFAULT_PRICE,
+    DEFAULT_STORE_NAME,
+    MAX_SHIPPING_METHODS_DISPLAY,
+    MAX_SPECS_DISPLAY,
+    MAX_VARIANT_OPTIONS_DISPLAY,
+)
+from .model import ParseResult
+
+# Section kinds understood by the compiler.
+# fields:  one line per Field, skipped when the section is empty.
+# mapping: header, then item_format per key ({key}, {value}), "items" skipped.
+# list:    header, then one line per dict in "items" (Fields read the item).
+# options: "TYPE: a, b, c" from "Options", plus "(+N more)" past the cap.
+# visuals: header, then "- name: Describes alt" per image in "items".
+# rules:   header, then "- name -> path" or "- value" per rule in "items".
+SECTION_KINDS = ("fields", "mapping", "list", "options", "visuals", "rules")
+
+# Field.when values.
+# present:      every placeholder without a default is not None and not "".
+# truthy:       every placeholder without a default is truthy.
+# non_negative: the first placeholder reads as a number >= 0.
+FIELD_CONDITIONS = ("present", "truthy", "non_negative")
+
+_formatter = string.Formatter()
+
+# "{key!r}" conversions and the builtins that apply them.
+_CONVERSIONS = {"r": "repr", "s": "str", "a": "ascii"}
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One output line. {Key} placeholders read keys of the section
+    (or list item). Keys in defaults are always printed, falling back
+    to the default when missing. The others decide, through when,
+    whether the line is printed at all.
+
+    flag prints the line only when the result carries that trust flag.
+    """
+
+    format: str
+    defaults: Mapping[str, Any] = field(default_factory=dict)
+    when: str = "present"
+    flag: str | None = None
+
+
+@dataclass(frozen=True)
+class Section:
+    """One directive in the prompt. See SECTION_KINDS."""
+
+    directive: str
+    kind: str = "fields"
+    fields: tuple[Field, ...] = ()
+    header: str | None = None
+    item_format: str = "  {key}: {value}"
+    # Most entries printed. None prints all.
+    cap: int | None = None
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    Ordered sections of a prompt.
+
+        template = PromptTemplate((
+            Section("PRODUCT", fields=(Field("{Name}", {"Name": "?"}),)),
+            Section("OFFER", fields=(Field("{Price} {Currency}"),)),
+        ))
+        compiled = template.compile()
+        compiled.render(result)
+    """
+
+    sections: tuple[Section, ...]
+
+    def compile(self) -> CompiledTemplate:
+        return CompiledTemplate(self)
+
+
+class CompiledTemplate:
+    """
+    A template turned into Python source and compiled once.
+
+    Spec values enter the source only as repr() literals (strings,
+    ints, None) or as bound constants, and caps must be ints, so a
+    template from merchant config cannot inject code. source is kept
+    for debugging.
+    """
+
+    def __init__(self, template: PromptTemplate):
+        self.template = template
+        builder = _Builder()
+        self.source = builder.build(template)
+        namespace: dict[str, Any] = {"_non_negative": _non_negative, "islice": islice}
+        namespace.update(builder.constants)
+        code = compile(self.source, "<prompt template>", "exec")
+        exec(code, namespace)  # noqa: S102 - spec values are literals or constants
+        self._render: Callable[[Mapping[str, Any], Iterable[str]], str] = namespace[
+            "render"
+        ]
+
+    def render(self, result: ParseResult) -> str:
+        """Prompt text for a parse result."""
+        return self._render(result.directives, result.trust_flags)
+
+    def render_directives(
+        self, directives: Mapping[str, Any], trust_flags: Iterable[str] = ()
+    ) -> str:
+        """Prompt text for raw directives."""
+        return self._render(directives, trust_flags)
+
+
+def _non_negative(value: Any) -> bool:
+    """Stock-style check: a number, or numeric string, >= 0."""
+    if value is None or not isinstance(value, (int, float, str)):
+        return False
+    try:
+        return (float(value) if isinstance(value, str) else value) >= 0
+    except (ValueError, TypeError):
+        return False
+
+
+class _Builder:
+    """Emits the render function source. Spec values become constants."""
+
+    def __init__(self) -> None:
+        self.constants: dict[str, Any] = {}
+        self.lines: list[str] = []
+        self._vars = 0
+
+    def build(self, template: PromptTemplate) -> str:
+        self.lines = ["def render(d, flags):", "    out = []", "    a = out.append"]
+        for section in template.sections:
+            if section.kind not in SECTION_KINDS:
+                raise ValueError(f"Unknown section kind: {section.kind}")
+            cap = section.cap
+            if cap is not None and (type(cap) is not int or cap < 1):
+                raise ValueError(f"cap must be a positive int, got: {cap!r}")
+            self._emit(1, f"s = d.get({self.const(section.directive)})")
+            self._emit(1, "if s:")
+            getattr(self, f"_section_{section.kind}")(section)
+        self._emit(1, 'return "\\n".join(out)')
+        return "\n".join(self.lines) + "\n"
+
+    def const(self, value: Any) -> str:
+        """
+        Source for value: a repr() literal for plain strings, ints, bools
+        and None, else a name bound in the render namespace.
+        """
+        if value is None or type(value) in (str, int, bool):
+            return repr(value)
+        return self.bind(value)
+
+    def bind(self, value: Any) -> str:
+        """Name bound to value in the render namespace."""
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def _emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+
+    def _header(self, depth: int, section: Section) -> None:
+        if section.header is not None:
+            self._emit(depth, f"a({self.const(section.header)})")
+
+    def _items(self, depth: int, section: Section) -> int:
+        """Open the loop over dicts in a capped "items" list. Returns its depth."""
+        self._emit(depth, "items = s.get('items')")
+        self._emit(depth, "if isinstance(items, list) and items:")
+        self._header(depth + 1, section)
+        sliced = "items" if section.cap is None else f"items[:{section.cap}]"
+        self._emit(depth + 1, f"for it in {sliced}:")
+        self._emit(depth + 2, "if isinstance(it, dict):")
+        return depth + 3
+
+    def _format(self, fmt: str, names: dict[str, str]) -> str:
+        """
+        f-string body for fmt. Placeholders map to local variables through
+        names. New keys get fresh variables v0, v1, ...
+        """
+        parts: list[str] = []
+        for literal, key, spec, conversion in _formatter.parse(fmt):
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if key is None:
+                continue
+            if not key:
+                raise ValueError(f"Placeholders need a key name: {fmt!r}")
+            if conversion not in (None, *_CONVERSIONS):
+                raise ValueError(f"Bad conversion !{conversion} in {fmt!r}")
+            if key not in names:
+                names[key] = f"v{self._vars}"
+                self._vars += 1
+            expr = names[key]
+            if conversion:
+                expr = f"{_CONVERSIONS[conversion]}({expr})"
+            if spec:
+                # Bound, not a literal: an f-string expression cannot hold
+                # the backslashes repr() needs for mixed quotes.
+                expr = f"format({expr}, {self.bind(spec)})"
+            parts.append("{" + expr + "}")
+        return "".join(parts)
+
+    def _field(self, depth: int, item: Field, source: str) -> tuple[list[str], str]:
+        """Emit the key reads of one Field. Returns (conditions, f-string body)."""
+        if item.when not in FIELD_CONDITIONS:
+            raise ValueError(f"Unknown field condition: {item.when}")
+        names: dict[str, str] = {}
+        text = self._format(item.format, names)
+
+        checks = []
+        if item.flag is not None:
+            checks.append(f"{self.const(item.flag)} in flags")
+        for key, var in names.items():
+            if key in item.defaults:
+                default = self.const(item.defaults[key])
+                self._emit(depth, f"{var} = {source}.get({self.const(key)}, {default})")
+                continue
+            self._emit(depth, f"{var} = {source}.get({self.const(key)})")
+            if item.when == "present":
+                checks.append(f"{var} is not None and {var} != ''")
+            elif item.when == "truthy":
+                checks.append(var)
+        if item.when == "non_negative" and names:
+            checks.append(f"_non_negative({next(iter(names.values()))})")
+
+        return checks, text
+
+    def _fields(self, depth: int, fields: tuple[Field, ...], source: str) -> None:
+        """Emit fields in order. Unconditional neighbours share one append."""
+        pending: list[str] = []
+        for item in fields:
+            checks, text = self._field(depth, item, source)
+            if not checks:
+                pending.append(text)
+                continue
+            if pending:
+                self._append(depth, pending)
+                pending = []
+            self._emit(depth, f"if {' and '.join(checks)}:")
+            self._append(depth + 1, [text])
+        if pending:
+            self._append(depth, pending)
+        if not fields:
+            self._emit(depth, "pass")
+
+    def _append(self, depth: int, texts: list[str]) -> None:
+        """One append of f-string bodies joined as lines."""
+        body = "\n".join(texts)
+        self._emit(depth, f"a(f{body!r})")
+
+    def _section_fields(self, section: Section) -> None:
+        self._fields(2, section.fields, "s")
+
+    def _section_mapping(self, section: Section) -> None:
+        self._header(2, section)
+        names = {"key": "k", "value": "v"}
+        text = self._format(section.item_format, names)
+        extra = names.keys() - {"key", "value"}
+        if extra:
+            raise ValueError(f"item_format takes {{key}} and {{value}} only: {extra}")
+        if section.cap is None:
+            self._emit(
+                2, f"out.extend([f{text!r} for k, v in s.items() if k != 'items'])"
+            )
+            return
+        self._emit(2, "if 'items' in s:")
+        self._emit(3, "pairs = [(k, v) for k, v in s.items() if k != 'items']")
+        self._emit(2, "else:")
+        self._emit(3, "pairs = s.items()")
+        self._emit(
+            2, f"out.extend([f{text!r} for k, v in islice(pairs, {section.cap})])"
+        )
+
+    def _section_list(self, section: Section) -> None:
+        self._fields(self._items(2, section), section.fields, "it")
+
+    def _section_options(self, section: Section) -> None:
+        sliced = "opts" if section.cap is None else f"opts[:{section.cap}]"
+        self._emit(2, "opts = s.get('Options')")
+        self._emit(2, "if isinstance(opts, list) and opts:")
+        self._emit(3, "names = [")
+        self._emit(4, "o.get('name') or o.get('value')")
+        self._emit(4, f"for o in {sliced} if isinstance(o, dict)")
+        self._emit(3, "]")
+        self._emit(3, "if names:")
+        self._emit(4, "valid = [str(n) for n in names if n is not None]")
+        self._emit(4, "if valid:")
+        self._emit(5, "t = s.get('Type', 'Options').upper()")
+        self._emit(5, "a(f\"{t}: {', '.join(valid)}\")")
+        if section.cap is not None:
+            self._emit(4, f"if len(opts) > {section.cap}:")
+            self._emit(5, f"a(f'  (+{{len(opts) - {section.cap}}} more)')")
+
+    def _section_visuals(self, section: Section) -> None:
+        depth = self._items(2, section)
+        self._emit(depth, "alt = it.get('Alt', '').strip('\"')")
+        self._emit(depth, "if alt:")
+        self._emit(depth + 1, "a(f\"  - {it.get('name', 'Image')}: Describes {alt}\")")
+        self._emit(depth, "else:")
+        self._emit(
+            depth + 1,
+            "a(f\"  - {it.get('name', 'Image')}: Available at {it.get('path')}\")",
+        )
+
+    def _section_rules(self, section: Section) -> None:
+        self._emit(2, "items = s.get('items')")
+        self._emit(2, "if isinstance(items, list) and items:")
+        self._header(3, section)
+        sliced = "items" if section.cap is None else f"items[:{section.cap}]"
+        self._emit(3, f"for it in {sliced}:")
+        self._emit(4, "if isinstance(it, dict):")
+        self._emit(5, "if it.get('name') and it.get('path'):")
+        self._emit(6, "a(f\"  - {it['name']} -> {it['path']}\")")
+        self._emit(5, "else:")
+        self._emit(6, "a(f\"  - {it.get('value')}\")")
+        self._emit(4, "else:")
+        self._emit(5, 'a(f"  - {it}")')
+
+
+# Reproduces CommerceAIBridge.generate_low_token_prompt() byte for byte.
+DEFAULT_TEMPLATE = PromptTemplate(
+    (
+        Section(
+            "IDENTITY",
+            fields=(
+                Field("STORE: {Name}", {"Name": DEFAULT_STORE_NAME}),
+                Field("CURRENCY: {Currency}", {"Currency": DEFAULT_CURRENCY}),
+            ),
+        ),
+        Section(
+            "PRODUCT",
+            fields=(
+                Field("ITEM: {Name}", {"Name": DEFAULT_ITEM_NAME}),
+                Field("SKU: {SKU}"),
+                Field("BRAND: {Brand}"),
+                Field("URL: {URL}"),
+            ),
+        ),
+        Section(
+            "OFFER",
+            fields=(
+                Field("PRICE: {Price}", {"Price": DEFAULT_PRICE}),
+                Field(
+                    "AVAILABILITY: {Availability}",
+                    {"Availability": DEFAULT_AVAILABILITY},
+                ),
+                Field("CONDITION: {Condition}"),
+                Field("URL: {URL}"),
+            ),
+        ),
+        Section(
+            "INVENTORY",
+            fields=(
+                Field("STOCK: {Stock} units", when="non_negative"),
+                Field("STOCK_UPDATED: {LastUpdated}"),
+                Field("NOTE: Inventory data may be outdated", flag="inventory_stale"),
+            ),
+        ),
+        Section(
+            "REVIEWS",
+            fields=(
+                Field("RATING: {Rating}/5 ({Count} reviews)"),
+                Field("TAGS: {TopTags}"),
+            ),
+        ),
+        Section("SPECS", "mapping", header="SPECS:", cap=MAX_SPECS_DISPLAY),
+        Section("VARIANTS", "options", cap=MAX_VARIANT_OPTIONS_DISPLAY),
+        Section(
+            "SHIPPING",
+            "list",
+            fields=(Field("  {name}: {path}", {"name": "", "path": ""}),),
+            header="SHIPPING:",
+            cap=MAX_SHIPPING_METHODS_DISPLAY,
+        ),
+        Section(
+            "PROMOS",
+            "list",
+            fields=(Field("  - {name}: {value}", {"name": "Promo", "value": ""}),),
+            header="PROMOS:",
+        ),
+        Section("COMPATIBILITY", "mapping", header="COMPATIBILITY:"),
+        Section("IMAGES", "visuals", header="VISUALS:"),
+        Section(
+            "AGE_RESTRICTION",
+            fields=(Field("SAFETY: Restricted to ages {MinimumAge}+", when="truthy"),),
+        ),
+        Section("SEMANTIC_LOGIC", "rules", header="AI_LOGIC_RULES:"),
+        Section(
+            "BRAND_VOICE",
+            fields=(
+                Field("TONE_OF_VOICE: {Tone}", {"Tone": "Neutral"}),
+                Field("VOICE_GUIDELINES: {Guidelines}", when="truthy"),
+            ),
+        ),
+    )
+)
+
+
+@lru_cache(maxsize=1)
+def default_template() -> CompiledTemplate:
+    """DEFAULT_TEMPLATE, compiled on first use."""
+    return DEFAULT_TEMPLATE.compile()
@@ -7,28 +7,80 @@ with semantic tagging for intelligent filtering.
 Features async architecture, caching, and production metrics.
 """
 
-from .async_pipeline import AsyncRAGPipeline
-from .container import RAGContainer
-from .core.generator import RAGGenerator
-from .core.rate_limiter import RateLimiter, rate_limit
-from .core.semantic_tags import SemanticTagger
-from .core.shards import ShardBuilder
-from .exceptions import (
-    EmbeddingError,
-    HealthCheckError,
-    RAGError,
-    RateLimitError,
-    StorageError,
-    ValidationError,
-    VectorStoreError,
-)
-from .monitoring import HealthMonitor, create_health_endpoint
-from .pipeline import RAGPipeline
-from .tools import AIHealthChecker, SchemaBridge, SemanticNormalizer
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_pipeline import AsyncRAGPipeline
+    from .container import RAGContainer
+    from .core.dedup import (
+        BloomDeduplicator,
+        DigestSet,
+        DiskDeduplicator,
+        ShardDeduplicator,
+    )
+    from .core.embed_batcher import EmbedBatcher
+    from .core.embed_dedup import AsyncDedupEmbedder, DedupEmbedder
+    from .core.generator import RAGGenerator
+    from .core.manifest import ShardManifest
+    from .core.rate_limiter import RateLimiter, rate_limit
+    from .core.semantic_tags import SemanticTagger
+    from .core.shards import ShardBuilder
+    from .exceptions import (
+        EmbeddingError,
+        HealthCheckError,
+        RAGError,
+        RateLimitError,
+        StorageError,
+        ValidationError,
+        VectorStoreError,
+    )
+    from .monitoring import HealthMonitor, create_health_endpoint
+    from .pipeline import RAGPipeline
+    from .tools import AIHealthChecker, SchemaBridge, SemanticNormalizer
+
+# Loaded on first access (PEP 562), so importing one submodule, or the
+# generator alone, does not pull in the async pipeline, caches and metrics.
+_LAZY_ATTRIBUTES = {
+    "AIHealthChecker": ".tools",
+    "AsyncDedupEmbedder": ".core.embed_dedup",
+    "AsyncRAGPipeline": ".async_pipeline",
+    "BloomDeduplicator": ".core.dedup",
+    "DedupEmbedder": ".core.embed_dedup",
+    "DigestSet": ".core.dedup",
+    "DiskDeduplicator": ".core.dedup",
+    "EmbedBatcher": ".core.embed_batcher",
+    "EmbeddingError": ".exceptions",
+    "HealthCheckError": ".exceptions",
+    "HealthMonitor": ".monitoring",
+    "create_health_endpoint": ".monitoring",
+    "RAGContainer": ".container",
+    "RAGError": ".exceptions",
+    "RAGGenerator": ".core.generator",
+    "RAGPipeline": ".pipeline",
+    "RateLimitError": ".exceptions",
+    "RateLimiter": ".core.rate_limiter",
+    "rate_limit": ".core.rate_limiter",
+    "SchemaBridge": ".tools",
+    "SemanticNormalizer": ".tools",
+    "SemanticTagger": ".core.semantic_tags",
+    "ShardBuilder": ".core.shards",
+    "ShardDeduplicator": ".core.dedup",
+    "ShardManifest": ".core.manifest",
+    "StorageError": ".exceptions",
+    "ValidationError": ".exceptions",
+    "VectorStoreError": ".exceptions",
+}
 
 __all__ = [
     "AIHealthChecker",
+    "AsyncDedupEmbedder",
     "AsyncRAGPipeline",
+    "BloomDeduplicator",
+    "DedupEmbedder",
+    "DigestSet",
+    "DiskDeduplicator",
+    "EmbedBatcher",
     "EmbeddingError",
     "HealthCheckError",
     "HealthMonitor",
@@ -44,9 +96,24 @@ __all__ = [
     "SemanticNormalizer",
     "SemanticTagger",
     "ShardBuilder",
+    "ShardDeduplicator",
+    "ShardManifest",
     "StorageError",
     "ValidationError",
     "VectorStoreError",
 ]
 
 __version__ = "1.0.0"
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -6,17 +6,24 @@ Native async operations with multi-layer caching for production workloads.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from typing import Any
 
+from ..profiling import Profiler, profile, stage
 from .container import RAGContainer
 from .core.caching import EmbeddingCache, SearchResultCache
+from .core.embed_batcher import EmbedBatcher
 from .core.generator import RAGGenerator
+from .core.manifest import ManifestDiff, ShardManifest, product_key
+from .interfaces.async_embedder import AsyncBaseEmbedder
 from .metrics import (
     embedding_api_calls,
     ingest_latency,
+    ingest_stage_latency,
     ingest_total,
     search_latency,
     search_total,
@@ -27,6 +34,12 @@ from .tools.realtime_enricher import RealtimeEnricher
 
 logger = logging.getLogger(__name__)
 
+STAGES = ("prepare", "embed", "upsert")
+DEFAULT_STAGE_CONCURRENCY = {"prepare": 1, "embed": 2, "upsert": 1}
+DEFAULT_EMBED_BATCH_SIZE = 256
+DEFAULT_UPSERT_BATCH_SIZE = 4096
+DEFAULT_QUEUE_SIZE = 4
+
 
 class AsyncRAGPipeline:
     """
@@ -60,6 +73,9 @@ class AsyncRAGPipeline:
         embedding_cache_ttl: int = 86400,  # 24 hours
         search_cache_ttl: int = 3600,  # 1 hour
         min_health_score: int = 50,
+        *,
+        manifest: ShardManifest | None = None,
+        volatile_fields: Iterable[str] | None = None,
     ) -> None:
         """
         Initialize enhanced async pipeline.
@@ -71,14 +87,18 @@ class AsyncRAGPipeline:
             embedding_cache_ttl: Embedding cache TTL in seconds
             search_cache_ttl: Search cache TTL in seconds
             min_health_score: Minimum health score for ingest
+            manifest: Enables incremental ingest of changed shards only
+            volatile_fields: Fields written to realtime storage, not shards
         """
         self.container = container or RAGContainer()
         self.min_health_score = min_health_score
 
         # Core components
-        self.generator = RAGGenerator()
+        self.volatile_fields = frozenset(volatile_fields or ())
+        self.generator = RAGGenerator(volatile_fields=self.volatile_fields)
         self.health_checker = AIHealthChecker()
         self.enricher = RealtimeEnricher(storage=self.container.storage)
+        self.manifest = manifest
 
         # Caching
         self.enable_cache = enable_cache
@@ -117,66 +137,138 @@ class AsyncRAGPipeline:
             Number of vectors ingested (0 if skipped)
         """
         start_time = time.time()
-        product_id = product_data.get("ITEM", "Unknown")
 
         try:
-            # Health check
-            health = self.health_checker.assess(product_data)
-            if health["score"] < self.min_health_score:
-                logger.info(
-                    "Skipped low-quality product",
-                    extra={
-                        "product_id": product_id,
-                        "health_score": health["score"],
-                        "duration_ms": (time.time() - start_time) * 1000,
-                    },
-                )
-                if ingest_total:
-                    ingest_total.labels(status="skipped").inc()
+            prepared = self._prepare(product_data, namespace)
+            if prepared is None:
                 return 0
+            shards, diff = prepared
+
+            count = 0
+            if shards:
+                # Embed shards with caching
+                with stage("embed"):
+                    shards = await self._embed_shards_cached(shards)
+
+                # Store vectors
+                with stage("upsert"):
+                    count = self.container.vector_store.upsert(
+                        shards, namespace=namespace
+                    )
 
-            # Generate shards
-            shards = self.generator.generate(product_data)
-            if not shards or isinstance(shards, str):
-                if ingest_total:
-                    ingest_total.labels(status="failed").inc()
-                return 0
+            self._finish(product_data, namespace, diff, count, start_time)
+            return count
 
-            # Embed shards with caching
-            shards = await self._embed_shards_cached(shards)
+        except Exception as e:
+            self._fail(product_data, e, start_time)
+            raise
 
-            # Store vectors
-            self.container.vector_store.connect()
-            count = self.container.vector_store.upsert(shards, namespace=namespace)
+    def _prepare(
+        self, product_data: dict[str, Any], namespace: str
+    ) -> tuple[list[dict[str, Any]], ManifestDiff | None] | None:
+        """
+        Health check, generate, publish live fields and diff with the manifest.
 
+        Returns:
+            Shards to embed and the manifest diff, or None if skipped
+        """
+        start_time = time.time()
+        product_id = product_data.get("ITEM", "Unknown")
+
+        # Health check
+        health = self.health_checker.assess(product_data)
+        if health["score"] < self.min_health_score:
             logger.info(
-                "Successfully ingested product",
+                "Skipped low-quality product",
                 extra={
                     "product_id": product_id,
-                    "vectors_count": count,
-                    "namespace": namespace,
+                    "health_score": health["score"],
                     "duration_ms": (time.time() - start_time) * 1000,
                 },
             )
+            if ingest_total:
+                ingest_total.labels(status="skipped").inc()
+            return None
 
+        # Generate shards
+        with stage("generate"):
+            shards = self.generator.generate(product_data)
+        if not shards or isinstance(shards, str):
             if ingest_total:
-                ingest_total.labels(status="success").inc()
+                ingest_total.labels(status="failed").inc()
+            return None
 
-            return count
+        vector_store = self.container.vector_store
 
-        except Exception as e:
-            logger.error(
-                "Failed to ingest product",
-                extra={
-                    "product_id": product_id,
-                    "error": str(e),
-                    "duration_ms": (time.time() - start_time) * 1000,
-                },
-                exc_info=True,
+        # Route volatile fields to realtime storage
+        key = product_key(product_data) if self.volatile_fields else None
+        if key is not None:
+            with stage("publish"):
+                self.enricher.publish(
+                    key, shards, self.generator.live_attributes(product_data)
+                )
+
+        # Drop shards unchanged since the last ingest
+        diff = None
+        if self.manifest is not None:
+            diff = self.manifest.diff_product(
+                namespace, product_data, shards, vector_store
             )
-            if ingest_total:
-                ingest_total.labels(status="error").inc()
-            raise
+            if diff is not None:
+                shards = diff.changed
+
+        vector_store.connect()
+        return shards, diff
+
+    def _finish(
+        self,
+        product_data: dict[str, Any],
+        namespace: str,
+        diff: ManifestDiff | None,
+        count: int,
+        start_time: float,
+    ) -> None:
+        """Record a stored product in the manifest. Log and count it."""
+        if self.manifest is not None and diff is not None:
+            self.manifest.commit(namespace, diff, self.container.vector_store)
+
+        logger.info(
+            "Successfully ingested product",
+            extra={
+                "product_id": product_data.get("ITEM", "Unknown"),
+                "vectors_count": count,
+                "namespace": namespace,
+                "duration_ms": (time.time() - start_time) * 1000,
+                "shards": diff.counts() if diff is not None else None,
+            },
+        )
+
+        if ingest_total:
+            ingest_total.labels(status="success").inc()
+
+    def _fail(
+        self, product_data: dict[str, Any], error: Exception, start_time: float
+    ) -> None:
+        logger.error(
+            "Failed to ingest product",
+            extra={
+                "product_id": product_data.get("ITEM", "Unknown"),
+                "error": str(error),
+                "duration_ms": (time.time() - start_time) * 1000,
+            },
+            exc_info=error,
+        )
+        if ingest_total:
+            ingest_total.labels(status="error").inc()
+
+    def profile(self, mode: str = "cprofile", output: str | None = None) -> Profiler:
+        """
+        Profile the calls made inside a with block.
+
+        Inside a commercetxt.profiling.MemoryReport block, ingest() also
+        records the generate, embed and upsert stages.
+        """
+        return profile(mode, output)
 
     async def _embed_shards_cached(
         self, shards: list[dict[str, Any]]
@@ -184,6 +276,9 @@ class AsyncRAGPipeline:
         """
         Embed shards with caching support.
 
+        One cache multi-get, one embed call for all misses, one multi-set.
+        Nothing runs on the event loop thread but the cache I/O.
+
         Args:
             shards: List of shard dictionaries
 
@@ -192,30 +287,40 @@ class AsyncRAGPipeline:
         """
         if not self.enable_cache or not self.embedding_cache:
             # No caching - use embedder directly
-            return self.container.embedder.embed_shards(shards)
-
-        # Check cache for each shard
-        for shard in shards:
-            text = shard["text"]
-            cached_vector = await self.embedding_cache.get_cached_text(text)
+            return await self._embed_batch(shards)
 
+        cached = await self.embedding_cache.get_cached_texts(
+            [shard["text"] for shard in shards]
+        )
+        misses: list[dict[str, Any]] = []
+        for shard, cached_vector in zip(shards, cached, strict=True):
             if cached_vector:
-                # Cache hit
                 shard["values"] = cached_vector
                 shard["model"] = "cached"
             else:
-                # Cache miss - embed and cache
-                vector = self.container.embedder.embed_text(text)
-                shard["values"] = vector
-
-                # Store in cache
-                await self.embedding_cache.cache_text(text, vector)
-
-                if embedding_api_calls:
-                    embedding_api_calls.labels(provider="local").inc()
+                misses.append(shard)
+
+        if misses:
+            embedded = await self._embed_batch(misses)
+            for shard, result in zip(misses, embedded, strict=True):
+                shard["values"] = result["values"]
+                if "model" in result:
+                    shard["model"] = result["model"]
+            await self.embedding_cache.cache_texts(
+                {shard["text"]: shard["values"] for shard in misses}
+            )
+            if embedding_api_calls:
+                embedding_api_calls.labels(provider="local").inc()
 
         return shards
 
+    async def _embed_batch(self, shards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """One embed_shards() call, in a worker thread for sync embedders."""
+        embedder = self.container.embedder
+        if isinstance(embedder, AsyncBaseEmbedder):
+            return await embedder.embed_shards(shards)
+        return await asyncio.to_thread(embedder.embed_shards, shards)
+
     @track_latency(search_latency)
     async def search(
         self, query: str, top_k: int = 5, namespace: str = "default"
@@ -304,7 +409,7 @@ class AsyncRAGPipeline:
             Embedding vector
         """
         if not self.enable_cache or not self.embedding_cache:
-            return self.container.embedder.embed_text(text)
+            return await self._embed_query(text)
 
         # Check cache
         cached_vector = await self.embedding_cache.get_cached_text(text)
@@ -312,7 +417,7 @@ class AsyncRAGPipeline:
             return cached_vector
 
         # Cache miss
-        vector = self.container.embedder.embed_text(text)
+        vector = await self._embed_query(text)
 
         # Store in cache
         await self.embedding_cache.cache_text(text, vector)
@@ -322,49 +427,67 @@ class AsyncRAGPipeline:
 
         return vector
 
+    async def _embed_query(self, text: str) -> list[float]:
+        """Embed one text, batched with concurrent searches under EmbedBatcher."""
+        embedder = self.container.embedder
+        if isinstance(embedder, EmbedBatcher):
+            return await embedder.aembed_text(text)
+        return embedder.embed_text(text)
+
     async def ingest_batch(
         self,
         products: list[dict[str, Any]],
         namespace: str = "default",
         on_progress: Callable[[int, int], None] | None = None,
+        *,
+        embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+        upsert_batch_size: int = DEFAULT_UPSERT_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        concurrency: dict[str, int] | None = None,
     ) -> dict[str, Any]:
         """
-        Batch ingest with progress tracking.
+        Batch ingest in three stages joined by bounded queues.
+
+        prepare (health check, generate, manifest diff) -> embed -> upsert.
+        Stages overlap: products are generated while earlier ones embed
+        and store. Embed calls take shards of several products at once,
+        and each upsert stores up to upsert_batch_size shards in one call.
+        A full queue pauses the stage feeding it, so memory stays bounded.
 
         Args:
             products: List of product dictionaries
             namespace: Vector store namespace
-            on_progress: Progress callback
+            on_progress: Progress callback, called in input order
+            embed_batch_size: Shards per embed call
+            upsert_batch_size: Shards per vector store upsert
+            queue_size: Batches held between two stages
+            concurrency: Workers per stage, over the defaults
+                {"prepare": 1, "embed": 2, "upsert": 1}
 
         Returns:
-            Summary with counts and errors
+            Summary with counts and errors. With a manifest, "shards" has
+            the shards changed, unchanged and removed by this batch.
+            "stages" has each stage's calls, seconds and p50/p99 call ms.
         """
-        total = len(products)
-        completed = 0
-        ingested = 0
-        skipped = 0
-        errors = []
-
-        for product in products:
-            try:
-                count = await self.ingest(product, namespace)
-                if count > 0:
-                    ingested += count
-                else:
-                    skipped += 1
-            except Exception as e:
-                errors.append({"item": product.get("ITEM", "Unknown"), "error": str(e)})
-
-            completed += 1
-            if on_progress:
-                on_progress(completed, total)
-
-        return {
-            "total": total,
-            "ingested": ingested,
-            "skipped": skipped,
-            "errors": errors,
-        }
+        before = dict(self.manifest.stats) if self.manifest is not None else None
+
+        run = _BatchIngest(
+            self,
+            products,
+            namespace,
+            on_progress,
+            embed_batch_size=embed_batch_size,
+            upsert_batch_size=upsert_batch_size,
+            queue_size=queue_size,
+            workers={**DEFAULT_STAGE_CONCURRENCY, **(concurrency or {})},
+        )
+        summary = await run.run()
+
+        if self.manifest is not None and before is not None:
+            stats = self.manifest.stats
+            summary["shards"] = {name: stats[name] - before[name] for name in stats}
+        summary["stages"] = run.times.summary()
+        return summary
 
     def get_cache_stats(self) -> dict[str, Any]:
         """
@@ -405,3 +528,268 @@ class AsyncRAGPipeline:
 
         overall = "healthy"
         return {"status": overall, "timestamp": time.time(), "components": checks}
+
+
+class _Product:
+    """One product on its way through the ingest_batch stages."""
+
+    __slots__ = ("data", "diff", "index", "shards", "start")
+
+    def __init__(self, index: int, data: dict[str, Any]):
+        self.index = index
+        self.data = data
+        self.shards: list[dict[str, Any]] = []
+        self.diff: ManifestDiff | None = None
+        self.start = time.time()
+
+
+_Batch = list[_Product]
+
+
+class _StageTimes:
+    """Per-stage call latencies, for the summary and the Prometheus histogram."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = {name: [] for name in STAGES}
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with stage(name):
+                yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.samples[name].append(elapsed)
+            if ingest_stage_latency:
+                ingest_stage_latency.labels(stage=name).observe(elapsed)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        result = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples) or [0.0]
+            result[name] = {
+                "calls": len(samples),
+                "seconds": round(sum(samples), 4),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+                "p99_ms": round(ordered[int((len(ordered) - 1) * 0.99)] * 1000, 2),
+            }
+        return result
+
+
+class _BatchIngest:
+    """
+    One ingest_batch() run.
+
+    Prepare workers take products in input order and run the blocking
+    prepare step in threads. A batcher groups prepared products into
+    embed batches of about embed_batch_size shards. Embed workers fill
+    in vectors; upsert workers gather embedded products up to
+    upsert_batch_size shards, store them in one call and commit each
+    product to the manifest. None on a queue tells its readers to stop.
+    """
+
+    def __init__(
+        self,
+        pipeline: AsyncRAGPipeline,
+        products: list[dict[str, Any]],
+        namespace: str,
+        on_progress: Callable[[int, int], None] | None,
+        *,
+        embed_batch_size: int,
+        upsert_batch_size: int,
+        queue_size: int,
+        workers: dict[str, int],
+    ):
+        if min(embed_batch_size, upsert_batch_size, queue_size) < 1:
+            raise ValueError("Batch and queue sizes must be at least 1")
+        if set(workers) - set(STAGES) or min(workers.values()) < 1:
+            raise ValueError(f"concurrency takes at least 1 worker for {STAGES}")
+        self.pipeline = pipeline
+        self.namespace = namespace
+        self.on_progress = on_progress
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.queue_size = queue_size
+        self.workers = workers
+        self.times = _StageTimes()
+
+        self._pending = iter(enumerate(products))
+        self.total = len(products)
+        self._counts: list[int | None] = [None] * self.total
+        self._errors: dict[int, dict[str, str]] = {}
+        self._reported = 0
+
+    async def run(self) -> dict[str, Any]:
+        prepared: asyncio.Queue[_Product | None] = asyncio.Queue(self.queue_size)
+        to_embed: asyncio.Queue[_Batch | None] = asyncio.Queue(self.queue_size)
+        to_upsert: asyncio.Queue[_Batch | None] = asyncio.Queue(self.queue_size)
+        tasks = [
+            asyncio.create_task(self._prepare_stage(prepared)),
+            asyncio.create_task(self._batch_stage(prepared, to_embed)),
+            asyncio.create_task(self._embed_stage(to_embed, to_upsert)),
+            *(
+                asyncio.create_task(self._upsert_worker(to_upsert))
+                for _ in range(self.workers["upsert"])
+            ),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # A stage failed outside any product: stop the others, which
+            # may be waiting on a queue that will never move again.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        counts = [count or 0 for count in self._counts]
+        return {
+            "total": self.total,
+            "ingested": sum(counts),
+            "skipped": sum(
+                1
+                for i, count in enumerate(counts)
+                if count == 0 and i not in self._errors
+            ),
+            "errors": [self._errors[i] for i in sorted(self._errors)],
+        }
+
+    async def _prepare_stage(self, out: asyncio.Queue[_Product | None]) -> None:
+        await asyncio.gather(
+            *(self._prepare_worker(out) for _ in range(self.workers["prepare"]))
+        )
+        await out.put(None)
+
+    async def _prepare_worker(self, out: asyncio.Queue[_Product | None]) -> None:
+        for index, data in self._pending:
+            product = _Product(index, data)
+            try:
+                # Prepare threads share the pipeline: generate() dedupes
+                # per call and the manifest locks its connection.
+                with self.times.measure("prepare"):
+                    prepared = await asyncio.to_thread(
+                        self.pipeline._prepare, data, self.namespace
+                    )
+            except Exception as e:
+                self._failed([product], e)
+                continue
+            if prepared is None:
+                self._done(product, 0)
+                continue
+            product.shards, product.diff = prepared
+            await out.put(product)
+
+    async def _batch_stage(
+        self,
+        prepared: asyncio.Queue[_Product | None],
+        out: asyncio.Queue[_Batch | None],
+    ) -> None:
+        batch: _Batch = []
+        size = 0
+        while (product := await prepared.get()) is not None:
+            batch.append(product)
+            size += len(product.shards)
+            if size >= self.embed_batch_size:
+                await out.put(batch)
+                batch, size = [], 0
+        if batch:
+            await out.put(batch)
+        for _ in range(self.workers["embed"]):
+            await out.put(None)
+
+    async def _embed_stage(
+        self,
+        batches: asyncio.Queue[_Batch | None],
+        out: asyncio.Queue[_Batch | None],
+    ) -> None:
+        await asyncio.gather(
+            *(self._embed_worker(batches, out) for _ in range(self.workers["embed"]))
+        )
+        for _ in range(self.workers["upsert"]):
+            await out.put(None)
+
+    async def _embed_worker(
+        self,
+        batches: asyncio.Queue[_Batch | None],
+        out: asyncio.Queue[_Batch | None],
+    ) -> None:
+        while (batch := await batches.get()) is not None:
+            shards = [shard for product in batch for shard in product.shards]
+            if shards:
+                try:
+                    with self.times.measure("embed"):
+                        embedded = await self.pipeline._embed_shards_cached(shards)
+                except Exception as e:
+                    self._failed(batch, e)
+                    continue
+                # Embedders may return new shard dicts: split them back.
+                offset = 0
+                for product in batch:
+                    end = offset + len(product.shards)
+                    product.shards = embedded[offset:end]
+                    offset = end
+            await out.put(batch)
+
+    async def _upsert_worker(self, batches: asyncio.Queue[_Batch | None]) -> None:
+        batch: _Batch = []
+        size = 0
+        while (embedded := await batches.get()) is not None:
+            batch.extend(embedded)
+            size += sum(len(product.shards) for product in embedded)
+            if size >= self.upsert_batch_size:
+                await self._upsert(batch)
+                batch, size = [], 0
+        if batch:
+            await self._upsert(batch)
+
+    async def _upsert(self, batch: _Batch) -> None:
+        try:
+            with self.times.measure("upsert"):
+                errors = await asyncio.to_thread(self._store, batch)
+        except Exception as e:
+            self._failed(batch, e)
+            return
+        for product in batch:
+            if product.index in errors:
+                self._failed([product], errors[product.index])
+            else:
+                self._done(product, len(product.shards))
+
+    def _store(self, batch: _Batch) -> dict[int, Exception]:
+        """Upsert a batch in one call, then commit each product. In a thread."""
+        shards = [shard for product in batch for shard in product.shards]
+        if shards:
+            self.pipeline.container.vector_store.upsert(
+                shards, namespace=self.namespace
+            )
+        errors = {}
+        for product in batch:
+            try:
+                self.pipeline._finish(
+                    product.data,
+                    self.namespace,
+                    product.diff,
+                    len(product.shards),
+                    product.start,
+                )
+            except Exception as e:
+                errors[product.index] = e
+        return errors
+
+    def _failed(self, batch: _Batch, error: Exception) -> None:
+        for product in batch:
+            self.pipeline._fail(product.data, error, product.start)
+            self._errors[product.index] = {
+                "item": product.data.get("ITEM", "Unknown"),
+                "error": str(error),
+            }
+            self._done(product, 0)
+
+    def _done(self, product: _Product, count: int) -> None:
+        """Record a finished product. Report progress up to the first unfinished."""
+        self._counts[product.index] = count
+        while self._reported < self.total and self._counts[self._reported] is not None:
+            self._reported += 1
+            if self.on_progress:
+                self.on_progress(self._reported, self.total)
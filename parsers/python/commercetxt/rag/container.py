@@ -43,6 +43,18 @@ class RAGContainer:
 
                 self._embedder = LocalEmbedder()
 
+            # Embed each distinct text once (opt-in)
+            if self.config.get("RAG_EMBED_DEDUP", "").lower() in ("1", "true"):
+                from .core.embed_dedup import DedupEmbedder
+
+                self._embedder = DedupEmbedder(self._embedder)
+
+            # Batch concurrent query embeddings (opt-in)
+            if self.config.get("RAG_EMBED_MICROBATCH", "").lower() in ("1", "true"):
+                from .core.embed_batcher import EmbedBatcher
+
+                self._embedder = EmbedBatcher(self._embedder)
+
         assert self._embedder is not None
         return self._embedder
 
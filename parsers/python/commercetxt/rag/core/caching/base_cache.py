@@ -6,6 +6,7 @@ Defines the contract for all cache implementations.
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import Any
@@ -82,6 +83,36 @@ class BaseCache(ABC):
         """
         pass
 
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """
+        Retrieve several values at once.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Key -> value for the keys found. Misses are left out.
+        """
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.get(key) for key in keys))
+        return {k: v for k, v in zip(keys, values, strict=True) if v is not None}
+
+    async def set_many(self, items: dict[str, Any], ttl: int | None = None) -> bool:
+        """
+        Store several values at once.
+
+        Args:
+            items: Key -> value
+            ttl: Time-to-live in seconds (None = default TTL)
+
+        Returns:
+            True if all were stored
+        """
+        results = await asyncio.gather(
+            *(self.set(key, value, ttl=ttl) for key, value in items.items())
+        )
+        return all(results)
+
     async def get_or_compute(
         self, key: str, compute_fn: Callable[[], Any], ttl: int | None = None
     ) -> Any:
@@ -6,6 +6,7 @@ Reduces API calls and speeds up repeated embeddings.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import pickle
@@ -16,6 +17,9 @@ from .base_cache import BaseCache, NoOpCache
 
 logger = logging.getLogger(__name__)
 
+# Keys per SQLite IN (...) query, under the default 999-variable limit.
+SQLITE_MAX_KEYS = 500
+
 
 class EmbeddingCache(BaseCache):
     """
@@ -174,6 +178,40 @@ class EmbeddingCache(BaseCache):
                 )
                 await conn.commit()
 
+            async def get_many(self, keys: list[str]) -> dict[str, Any]:
+                import time
+
+                conn = await self._get_conn()
+                now = time.time()
+                found: dict[str, Any] = {}
+                for i in range(0, len(keys), SQLITE_MAX_KEYS):
+                    chunk = keys[i : i + SQLITE_MAX_KEYS]
+                    marks = ",".join("?" * len(chunk))
+                    # S608: Safe - only "?" placeholders are interpolated
+                    query = (
+                        "SELECT key, value FROM embeddings"  # noqa: S608
+                        f" WHERE expires_at > ? AND key IN ({marks})"
+                    )
+                    async with conn.execute(query, (now, *chunk)) as cursor:
+                        async for key, value_blob in cursor:
+                            # S301: Safe - only deserializing internally cached data
+                            found[key] = pickle.loads(value_blob)  # noqa: S301
+                return found
+
+            async def set_many(self, items: dict[str, Any], ttl: int):
+                import time
+
+                conn = await self._get_conn()
+                expires_at = int(time.time() + ttl)
+                await conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO embeddings (key, value, expires_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    [(k, pickle.dumps(v), expires_at) for k, v in items.items()],
+                )
+                await conn.commit()
+
             async def delete(self, key: str):
                 conn = await self._get_conn()
                 await conn.execute("DELETE FROM embeddings WHERE key = ?", (key,))
@@ -232,6 +270,45 @@ class EmbeddingCache(BaseCache):
             logger.warning(f"Cache set failed: {e}")
             return False
 
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get embeddings for several keys in one backend round trip."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        try:
+            get_many = getattr(self._backend, "get_many", None)
+            if get_many is not None:
+                found = await get_many(keys)
+            else:
+                values = await asyncio.gather(*(self._backend.get(k) for k in keys))
+                found = {
+                    k: v for k, v in zip(keys, values, strict=True) if v is not None
+                }
+        except Exception as e:
+            logger.warning(f"Cache get_many failed: {e}")
+            found = {}
+        self._hits += len(found)
+        self._misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, items: dict[str, Any], ttl: int | None = None) -> bool:
+        """Store several embeddings in one backend round trip."""
+        if not items:
+            return True
+        try:
+            ttl = ttl or self.default_ttl
+            set_many = getattr(self._backend, "set_many", None)
+            if set_many is not None:
+                await set_many(items, ttl)
+            else:
+                await asyncio.gather(
+                    *(self._backend.set(k, v, ttl) for k, v in items.items())
+                )
+            return True
+        except Exception as e:
+            logger.warning(f"Cache set_many failed: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
         """Delete embedding from cache."""
         try:
@@ -294,6 +371,43 @@ class EmbeddingCache(BaseCache):
         key = self._compute_key(text, model)
         return await self.get(key)
 
+    async def get_cached_texts(
+        self, texts: list[str], model: str = "default"
+    ) -> list[list[float] | None]:
+        """
+        Retrieve cached embeddings for several texts at once.
+
+        Args:
+            texts: Original texts
+            model: Model identifier
+
+        Returns:
+            One cached vector or None per text, in order
+        """
+        keys = [self._compute_key(text, model) for text in texts]
+        found = await self.get_many(keys)
+        return [found.get(key) for key in keys]
+
+    async def cache_texts(
+        self,
+        vectors: dict[str, list[float]],
+        model: str = "default",
+        ttl: int | None = None,
+    ) -> bool:
+        """
+        Cache several embeddings with text-based keys at once.
+
+        Args:
+            vectors: Original text -> embedding vector
+            model: Model identifier
+            ttl: Time-to-live (optional)
+
+        Returns:
+            True if cached
+        """
+        items = {self._compute_key(t, model): v for t, v in vectors.items()}
+        return await self.set_many(items, ttl=ttl)
+
     def get_stats(self) -> dict[str, Any]:
         """
         Get cache statistics.
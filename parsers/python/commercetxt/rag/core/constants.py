@@ -34,9 +34,18 @@ KNOWN_SECTIONS = frozenset(
 # Generator constants
 MIN_VARIANT_GROUP_PARTS = 2  # Minimum parts needed to extract variant attributes
 
+# Fields that change daily. With volatile_fields set, the generator leaves
+# them out of shards and tags, and pipelines write them to realtime storage.
+# VARIANT_PRICE and VARIANT_STOCK stand for the price and stock of each
+# @VARIANTS option.
+DEFAULT_VOLATILE_FIELDS = frozenset(
+    {"PRICE", "CURRENCY", "AVAILABILITY", "VARIANT_PRICE", "VARIANT_STOCK"}
+)
+
 __all__ = [
     "CATEGORY_KEYWORDS",
     "DEFAULT_PLURAL_ATTRIBUTES",
+    "DEFAULT_VOLATILE_FIELDS",
     "KNOWN_SECTIONS",
     "MATERIAL_TYPES",
     "MAX_LIST_ITEMS",
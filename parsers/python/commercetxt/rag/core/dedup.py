@@ -0,0 +1,230 @@
+"""
+Shard deduplication backends.
+
+RAGGenerator asks a backend whether it has seen a shard's content
+before. Backends hold raw keyed digests of (attr_type, text), not hex
+strings, so a multi-million-shard batch stays small:
+
+- DigestSet: exact, in memory.
+- BloomDeduplicator: fixed memory, rare false positives.
+- DiskDeduplicator: exact, in SQLite, survives restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+DIGEST_SIZE = 16
+
+# Separates attr_type from text in the digest input.
+_SEP = b"\x1f"
+
+
+def content_digest(
+    attr_type: str, text: str, key: bytes = b"", digest_size: int = DIGEST_SIZE
+) -> bytes:
+    """BLAKE2b digest of a shard's identity, keyed if key is given."""
+    h = hashlib.blake2b(key=key, digest_size=digest_size)
+    h.update(attr_type.encode("utf-8"))
+    h.update(_SEP)
+    h.update(text.encode("utf-8"))
+    return h.digest()
+
+
+class ShardDeduplicator(ABC):
+    """
+    Contract for seen-shard tracking.
+
+    Subclasses store digests. The digest is keyed, so shard text chosen
+    by a merchant cannot be crafted to collide with another shard.
+    """
+
+    # True when contents outlive the process. Batches resume instead of
+    # starting empty.
+    persistent = False
+
+    def __init__(self, key: bytes | None = None, digest_size: int = DIGEST_SIZE):
+        self.key = os.urandom(16) if key is None else key
+        self.digest_size = digest_size
+
+    def digest(self, attr_type: str, text: str) -> bytes:
+        """Digest under this backend's key."""
+        return content_digest(attr_type, text, self.key, self.digest_size)
+
+    def add_shard(self, attr_type: str, text: str) -> bool:
+        """Record a shard. False if it was seen before."""
+        return self.add(self.digest(attr_type, text))
+
+    @abstractmethod
+    def add(self, digest: bytes) -> bool:
+        """Record a digest. False if it was seen before."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget everything seen."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of distinct digests recorded."""
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Release resources. Only backends that hold any override it."""
+
+
+class DigestSet(ShardDeduplicator):
+    """Exact in-memory set of raw digests."""
+
+    def __init__(self, key: bytes | None = None, digest_size: int = DIGEST_SIZE):
+        super().__init__(key, digest_size)
+        self._seen: set[bytes] = set()
+
+    def add(self, digest: bytes) -> bool:
+        seen = self._seen
+        size = len(seen)
+        seen.add(digest)
+        return len(seen) != size
+
+    def clear(self) -> None:
+        self._seen.clear()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class BloomDeduplicator(ShardDeduplicator):
+    """
+    Bloom filter sized for capacity digests at error_rate.
+
+    Memory is fixed up front. A false positive drops a unique shard, at
+    about error_rate per shard while under capacity. Never keeps a
+    duplicate.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 1e-6,
+        key: bytes | None = None,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        super().__init__(key, DIGEST_SIZE)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = max(bits, 8)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _hashes(self, digest: bytes) -> tuple[int, int]:
+        # Double hashing over the two halves of the digest.
+        return (
+            int.from_bytes(digest[:8], "little"),
+            int.from_bytes(digest[8:16], "little") | 1,
+        )
+
+    def add(self, digest: bytes) -> bool:
+        h, step = self._hashes(digest)
+        bits, m = self._bits, self.num_bits
+        new = False
+        for _ in range(self.num_hashes):
+            bit = h % m
+            mask = 1 << (bit & 7)
+            if not bits[bit >> 3] & mask:
+                bits[bit >> 3] |= mask
+                new = True
+            h += step
+        if new:
+            self._count += 1
+        return new
+
+    def __contains__(self, digest: bytes) -> bool:
+        h, step = self._hashes(digest)
+        bits, m = self._bits, self.num_bits
+        for _ in range(self.num_hashes):
+            bit = h % m
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+            h += step
+        return True
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array."""
+        return len(self._bits)
+
+
+class DiskDeduplicator(ShardDeduplicator):
+    """
+    Exact digest set in SQLite, for batches that resume after a restart.
+
+    The key is stored with the digests, so a reopened file recognizes
+    shards from earlier runs. Writes are committed every commit_every
+    new digests and on close().
+    """
+
+    persistent = True
+
+    def __init__(self, path: str | Path, commit_every: int = 10_000):
+        self.path = Path(path)
+        self.commit_every = commit_every
+        self._pending = 0
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (digest BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value BLOB)"
+        )
+        row = self.conn.execute(
+            "SELECT value FROM settings WHERE name = 'key'"
+        ).fetchone()
+        if row is None:
+            key = os.urandom(16)
+            self.conn.execute("INSERT INTO settings VALUES ('key', ?)", (key,))
+            self.conn.commit()
+        else:
+            key = bytes(row[0])
+        super().__init__(key, DIGEST_SIZE)
+
+    def add(self, digest: bytes) -> bool:
+        cur = self.conn.execute("INSERT OR IGNORE INTO seen VALUES (?)", (digest,))
+        if cur.rowcount != 1:
+            return False
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """Commit pending digests."""
+        self.conn.commit()
+        self._pending = 0
+
+    def clear(self) -> None:
+        self.conn.execute("DELETE FROM seen")
+        self.flush()
+
+    def __len__(self) -> int:
+        return int(self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0])
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
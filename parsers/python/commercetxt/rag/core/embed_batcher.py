@@ -0,0 +1,163 @@
+"""
+Micro-batching for query embeddings.
+
+Each search embeds one query, so under load a model that encodes a
+batch about as fast as one text runs once per request. EmbedBatcher
+queues embed_text() calls from any thread or asyncio task, and a worker
+thread encodes them together: up to max_batch_size texts, waiting at
+most max_wait_ms after the first for more to arrive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+
+from ..exceptions import EmbeddingError
+from ..interfaces.base_embedder import BaseEmbedder
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 2.0
+
+_Request = tuple[str, "Future[list[float]]"]
+
+
+class EmbedBatcher(BaseEmbedder):
+    """
+    Coalesces concurrent embed_text() calls into one embed_shards() call.
+
+        embedder = EmbedBatcher(LocalEmbedder(), max_batch_size=32)
+        vector = embedder.embed_text(query)          # From threads
+        vector = await embedder.aembed_text(query)   # From asyncio tasks
+
+    embed_shards() is not batched further: ingest batches already are.
+    The worker thread starts on first use. close() stops it, after which
+    submit() raises RuntimeError.
+    """
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._texts = 0
+
+    def submit(self, text: str) -> Future[list[float]]:
+        """Queue a text. The future resolves to its vector."""
+        future: Future[list[float]] = Future()
+        # Under the lock, so nothing is queued behind close()'s sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EmbedBatcher is closed")
+            self._ensure_worker()
+            self._queue.put((text, future))
+        return future
+
+    def embed_text(self, text: str) -> list[float]:
+        """Embed a text in the next batch. Blocks the calling thread."""
+        return self.submit(text).result()
+
+    async def aembed_text(self, text: str) -> list[float]:
+        """Embed a text in the next batch without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def embed_shards(self, shards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Passed straight to the wrapped embedder."""
+        return self.embedder.embed_shards(shards)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Batches run, texts embedded and the mean batch size."""
+        return {
+            "batches": self._batches,
+            "texts": self._texts,
+            "mean_batch_size": self._texts / self._batches if self._batches else 0.0,
+        }
+
+    def close(self) -> None:
+        """Embed what is queued, then stop the worker thread."""
+        with self._lock:
+            self._closed = True
+            worker, self._worker = self._worker, None
+            if worker is not None:
+                self._queue.put(None)
+        if worker is not None:
+            worker.join()
+
+    def __enter__(self) -> EmbedBatcher:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread. The caller holds _lock."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name="commercetxt-embed-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _collect(self, first: _Request) -> tuple[list[_Request], bool]:
+        """Gather requests until the batch is full or max_wait has passed."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    request = self._queue.get(timeout=timeout)
+                else:
+                    # Past the deadline, still take what has already queued.
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _dispatch(self, batch: list[_Request]) -> None:
+        batch = [(t, f) for t, f in batch if f.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            shards = self.embedder.embed_shards([{"text": t} for t, _ in batch])
+            vectors = [shard["values"] for shard in shards]
+            if len(vectors) != len(batch):
+                raise EmbeddingError(
+                    "Embedder returned a vector count unlike the batch size",
+                    {"texts": len(batch), "vectors": len(vectors)},
+                )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self._batches += 1
+        self._texts += len(batch)
+        for (_, future), vector in zip(batch, vectors, strict=True):
+            future.set_result(vector)
@@ -0,0 +1,260 @@
+"""
+Text-level embedding deduplication.
+
+Shards of different products often carry the same text: every currency
+shard reads "USD", and availability, condition and spec values repeat
+across a catalog. The wrappers here sit in front of any embedder, embed
+each distinct (normalized) text once and fan the vector out to every
+shard that has it. Vectors are remembered across batches in a bounded
+LRU memo.
+
+Shard-level dedup (core.dedup) drops repeated shards altogether. This
+keeps every shard and only skips the repeated embedding call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from ..interfaces.async_embedder import AsyncBaseEmbedder
+from ..interfaces.base_embedder import BaseEmbedder
+
+DEFAULT_MEMO_SIZE = 4096
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace, as embedding APIs read them the same."""
+    return " ".join(text.split())
+
+
+class _VectorMemo:
+    """
+    Normalized text -> vector, least recently used evicted first.
+
+    Vectors are kept as float64 arrays (a fraction of a float list's
+    size) and handed out as fresh lists, so shards never share one.
+    Safe to share between threads: embedders run in to_thread() and
+    EmbedBatcher workers.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._vectors: OrderedDict[str, array] = OrderedDict()
+        self._lock = threading.Lock()
+        self.model: Any = None
+        self.texts = 0
+        self.embedded = 0
+
+    def get(self, key: str) -> list[float] | None:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is None:
+                return None
+            self._vectors.move_to_end(key)
+            return vector.tolist()
+
+    def put(self, key: str, vector: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._vectors[key] = array("d", vector)
+            self._vectors.move_to_end(key)
+            if len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+
+    def count(self, texts: int, embedded: int) -> None:
+        """Add to the texts seen and texts embedded."""
+        with self._lock:
+            self.texts += texts
+            self.embedded += embedded
+
+    def assign(self, shard: dict[str, Any], vector: list[float]) -> None:
+        shard["values"] = vector
+        if self.model is not None:
+            shard["model"] = self.model
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            texts, embedded = self.texts, self.embedded
+            size = len(self._vectors)
+        duplicates = texts - embedded
+        return {
+            "texts": texts,
+            "embedded": embedded,
+            "duplicates": duplicates,
+            "dedup_ratio": duplicates / texts if texts else 0.0,
+            "memo_size": size,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+
+def _group(
+    shards: list[dict[str, Any]],
+    normalize: Callable[[str], str],
+    memo: _VectorMemo,
+) -> dict[str, list[dict[str, Any]]]:
+    """Fill shards whose text is memoized. Group the rest by text."""
+    pending: dict[str, list[dict[str, Any]]] = {}
+    for shard in shards:
+        key = normalize(shard["text"])
+        vector = memo.get(key)
+        if vector is None:
+            pending.setdefault(key, []).append(shard)
+        else:
+            memo.assign(shard, vector)
+    memo.count(len(shards), len(pending))
+    return pending
+
+
+def _fan_out(
+    pending: dict[str, list[dict[str, Any]]],
+    vectors: list[list[float]],
+    memo: _VectorMemo,
+) -> None:
+    for (key, group), vector in zip(pending.items(), vectors, strict=True):
+        memo.put(key, vector)
+        memo.assign(group[0], vector)
+        for shard in group[1:]:
+            memo.assign(shard, list(vector))
+
+
+class DedupEmbedder(BaseEmbedder):
+    """
+    Embeds each distinct text once, within and across batches.
+
+        embedder = DedupEmbedder(LocalEmbedder())
+        embedder.embed_shards(shards)
+        embedder.get_stats()["dedup_ratio"]  # Share of texts not embedded
+
+    Args:
+        embedder: The embedder to call for texts not seen yet.
+        memo_size: Vectors remembered across batches. 0 dedups within a
+            batch only.
+        normalize: Maps a text to its dedup key. Its output is also what
+            gets embedded.
+    """
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        normalize: Callable[[str], str] = normalize_text,
+    ):
+        self.embedder = embedder
+        self.normalize = normalize
+        self._memo = _VectorMemo(memo_size)
+
+    def embed_text(self, text: str) -> list[float]:
+        """Embed one text, or return its remembered vector."""
+        return self.embed_shards([{"text": text}])[0]["values"]
+
+    def embed_shards(self, shards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Set 'values' on every shard, embedding distinct texts in one batch."""
+        if not shards:
+            return []
+        pending = _group(shards, self.normalize, self._memo)
+        if pending:
+            embedded = self.embedder.embed_shards([{"text": k} for k in pending])
+            self._memo.model = embedded[0].get("model", self._memo.model)
+            _fan_out(pending, [s["values"] for s in embedded], self._memo)
+        return shards
+
+    def get_stats(self) -> dict[str, Any]:
+        """Texts seen, texts embedded, and the share deduplicated."""
+        return self._memo.stats()
+
+    def clear(self) -> None:
+        """Forget remembered vectors. Stats are kept."""
+        self._memo.clear()
+
+
+class AsyncDedupEmbedder(AsyncBaseEmbedder):
+    """
+    DedupEmbedder for async embedders.
+
+    Concurrent batches share work too: a text already being embedded
+    for another batch is awaited, not embedded again.
+    """
+
+    def __init__(
+        self,
+        embedder: AsyncBaseEmbedder,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        normalize: Callable[[str], str] = normalize_text,
+    ):
+        self.embedder = embedder
+        self.normalize = normalize
+        self._memo = _VectorMemo(memo_size)
+        self._in_flight: dict[str, asyncio.Future[list[float]]] = {}
+
+    @property
+    def model(self) -> Any:
+        return getattr(self.embedder, "model", None)
+
+    async def embed_text(self, text: str) -> list[float]:
+        """Embed one text, or return its remembered vector."""
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Vectors for texts, embedding each distinct one once."""
+        shards = [{"text": text} for text in texts]
+        await self._embed(shards)
+        return [shard["values"] for shard in shards]
+
+    async def embed_shards(self, shards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Set 'values' and 'model' on every shard."""
+        if not shards:
+            return []
+        self._memo.model = self.model
+        await self._embed(shards)
+        return shards
+
+    async def _embed(self, shards: list[dict[str, Any]]) -> None:
+        pending = _group(shards, self.normalize, self._memo)
+        waiting = {k: self._in_flight[k] for k in pending if k in self._in_flight}
+        mine = [k for k in pending if k not in waiting]
+        self._memo.count(0, -len(waiting))
+
+        if mine:
+            loop = asyncio.get_running_loop()
+            futures = {k: loop.create_future() for k in mine}
+            self._in_flight.update(futures)
+            try:
+                vectors = await self.embedder.embed_texts(mine)
+            except asyncio.CancelledError:
+                for future in futures.values():
+                    future.cancel()
+                raise
+            except Exception as e:
+                for future in futures.values():
+                    future.set_exception(e)
+                    # Retrieved here: no other batch may be waiting on it.
+                    future.exception()
+                raise
+            finally:
+                for k in mine:
+                    self._in_flight.pop(k, None)
+            for k, vector in zip(mine, vectors, strict=True):
+                futures[k].set_result(vector)
+            _fan_out({k: pending[k] for k in mine}, vectors, self._memo)
+
+        for k, future in waiting.items():
+            vector = await future
+            for shard in pending[k]:
+                self._memo.assign(shard, list(vector))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Texts seen, texts embedded, and the share deduplicated."""
+        return self._memo.stats()
+
+    def clear(self) -> None:
+        """Forget remembered vectors. Stats are kept."""
+        self._memo.clear()
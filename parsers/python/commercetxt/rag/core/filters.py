@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 from commercetxt.constants import (
@@ -24,6 +25,41 @@ from commercetxt.constants import (
     SUSTAINABILITY_CERTS,
 )
 
+from .keywords import KeywordMatcher
+
+
+def _material_tag_table() -> dict[str, list[str]]:
+    """Tag -> material keywords that produce it."""
+    table: dict[str, list[str]] = {}
+    for category, keywords in MATERIAL_TYPES.items():
+        table.setdefault(category, []).extend(keywords)
+        table.setdefault(f"{category}_material", []).extend(keywords)
+        for kw in keywords:
+            table.setdefault("wooden" if kw == "wood" else kw, []).append(kw)
+    return table
+
+
+# Keyword tables compiled once. Material labels are the tags themselves.
+MATERIAL_MATCHER = KeywordMatcher(_material_tag_table())
+CERTIFICATION_MATCHER = KeywordMatcher(SUSTAINABILITY_CERTS)
+
+
+@lru_cache(maxsize=12)
+def season_matcher(month: int) -> KeywordMatcher:
+    """Keywords of the seasons that include month."""
+    return KeywordMatcher(
+        {
+            season: config["keywords"]
+            for season, config in SEASONAL_KEYWORDS.items()
+            if month in config["months"]
+        }
+    )
+
+
+def current_month() -> int:
+    """Month of the year in UTC, the one seasonal tags are chosen for."""
+    return datetime.now(timezone.utc).month
+
 
 class PriceFilter:
     """Price-based semantic tagging."""
@@ -65,38 +101,32 @@ class MaterialFilter:
         if not val:
             return tags
 
-        for category, keywords in MATERIAL_TYPES.items():
-            category_matched = False
-            for kw in keywords:
-                if kw in val:
-                    tag_name = "wooden" if kw == "wood" else kw
-                    tags.append(tag_name)
-                    tags.append(category)
-                    category_matched = True
-
-            if category_matched:
-                tags.append(f"{category}_material")
-
-        return sorted(list(set(tags)))
+        return sorted(MATERIAL_MATCHER.labels(val))
 
 
 class SeasonalityFilter:
     """Seasonal product detection."""
 
     @staticmethod
-    def detect_seasonality(item_name: str) -> list[str]:
-        """Detects seasonal tags based on current month and keywords."""
+    def detect_seasonality(item_name: str, month: int | None = None) -> list[str]:
+        """
+        Detects seasonal tags based on the month and keywords.
+
+        Pass month when tagging a batch. Default: current_month().
+        """
         tags: list[str] = []
         if not item_name:
             return tags
 
-        current_month = datetime.now(timezone.utc).month
-        name_lower = item_name.lower()
+        if month is None:
+            month = current_month()
+        seasons = season_matcher(month).labels(item_name.lower())
+        if not seasons:
+            return tags
 
-        for season, config in SEASONAL_KEYWORDS.items():
-            if current_month in config["months"]:
-                if any(kw in name_lower for kw in config["keywords"]):
-                    tags.append(f"{season}_seasonal")
+        for season in SEASONAL_KEYWORDS:
+            if season in seasons:
+                tags.append(f"{season}_seasonal")
 
         return tags
 
@@ -198,8 +228,9 @@ class SustainabilityFilter:
         if not val:
             return tags
 
-        for cert_tag, keywords in SUSTAINABILITY_CERTS.items():
-            if any(kw in val for kw in keywords):
+        certs = CERTIFICATION_MATCHER.labels(val)
+        for cert_tag in SUSTAINABILITY_CERTS:
+            if cert_tag in certs:
                 tags.append(f"{cert_tag}_certified")
 
         return tags
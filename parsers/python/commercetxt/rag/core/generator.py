@@ -5,17 +5,39 @@ Main RAG Generator class.
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from itertools import islice
 from typing import Any
 
+from ...variants import (
+    UNKNOWN_STOCK,
+    VariantDimension,
+    VariantMatrix,
+    VariantOption,
+    parse_option_text,
+    split_label,
+)
 from .constants import (
     DEFAULT_PLURAL_ATTRIBUTES,
     MAX_LIST_ITEMS,
     MAX_SHARDS,
     MIN_VARIANT_GROUP_PARTS,
 )
+from .dedup import DigestSet, ShardDeduplicator
+from .filters import current_month
 from .semantic_tags import SemanticTagger
 from .shards import ShardBuilder
 
+# Products per worker task in iter_generate_batch. One product per task
+# would spend more on inter-process transfer than on generating.
+GENERATE_CHUNK = 32
+
+# (include_metadata, plural_attributes, include_confidence,
+#  include_negative_tags, volatile_fields): what a worker needs to
+#  rebuild a generator.
+_Config = tuple[bool, frozenset[str], bool, bool, frozenset[str]]
+
 
 class RAGGenerator:
     """
@@ -29,7 +51,8 @@ class RAGGenerator:
     tagger: SemanticTagger
     shard_builder: ShardBuilder
     plural_attributes: set[str]
-    _seen_hashes: set[str]
+    volatile_fields: frozenset[str]
+    _seen_hashes: ShardDeduplicator
 
     def __init__(
         self,
@@ -37,7 +60,19 @@ class RAGGenerator:
         extra_plural: set[str] | None = None,
         include_confidence: bool = True,
         include_negative_tags: bool = True,
+        dedup: ShardDeduplicator | None = None,
+        *,
+        volatile_fields: Iterable[str] | None = None,
     ) -> None:
+        """
+        Args:
+            dedup: Seen-shard backend. Default: an in-memory DigestSet.
+                Use BloomDeduplicator for fixed memory on huge batches,
+                DiskDeduplicator for batches that resume.
+            volatile_fields: Fields left out of shard text, metadata and
+                tags, e.g. DEFAULT_VOLATILE_FIELDS. live_attributes()
+                returns their values for realtime storage.
+        """
         self.include_metadata = include_metadata
         self.tagger = SemanticTagger()
         self.shard_builder = ShardBuilder(
@@ -51,14 +86,19 @@ class RAGGenerator:
         if extra_plural:
             self.plural_attributes.update(extra_plural)
 
-        # Deduplication tracking (explicit type annotation)
-        self._seen_hashes: set[str] = set()
+        self.volatile_fields = frozenset(volatile_fields or ())
+
+        # Deduplication tracking
+        self._seen_hashes = dedup if dedup is not None else DigestSet()
 
         # Batch mode flag (explicit initialization instead of hasattr check)
         self._batch_mode: bool = False
 
     def _add_unique_shard(
-        self, shard: dict[str, Any], shards_list: list[dict[str, Any]]
+        self,
+        shard: dict[str, Any],
+        shards_list: list[dict[str, Any]],
+        seen: ShardDeduplicator,
     ) -> bool:
         """
         Add shard to list only if it's unique (not seen before).
@@ -66,26 +106,62 @@ class RAGGenerator:
         Returns:
             True if shard was added, False if it was a duplicate.
         """
-        shard_hash = self.shard_builder.compute_content_hash(shard)
-
-        if shard_hash not in self._seen_hashes:
-            self._seen_hashes.add(shard_hash)
+        if self._is_new(shard, seen):
             shards_list.append(shard)
             return True
         return False
 
+    @staticmethod
+    def _is_new(shard: dict[str, Any], seen: ShardDeduplicator) -> bool:
+        """Record shard as seen. False if its content was seen before."""
+        attr_type = str(shard.get("metadata", {}).get("attr_type", ""))
+        return seen.add_shard(attr_type, str(shard.get("text", "")))
+
     def reset_deduplication(self) -> None:
-        """Reset the deduplication cache. Useful for batch processing."""
+        """Clear the seen-shard backend. Persistent backends too: nothing else does."""
         self._seen_hashes.clear()
 
+    def live_attributes(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Values of the volatile fields generate() leaves out.
+
+        Keys are lowercase field names, as RealtimeEnricher reads them.
+        Variant prices and stock go under "variants", by SKU or label.
+        """
+        live: dict[str, Any] = {
+            field.lower(): data[field]
+            for field in self.volatile_fields
+            if data.get(field) not in (None, "")
+        }
+        with_price = "VARIANT_PRICE" in self.volatile_fields
+        with_stock = "VARIANT_STOCK" in self.volatile_fields
+        variants = data.get("VARIANTS")
+        if not (with_price or with_stock) or not isinstance(variants, dict):
+            return live
+
+        options: dict[str, dict[str, Any]] = {}
+        for dimension in VariantMatrix.from_directive(variants).dimensions:
+            for option in dimension:
+                values: dict[str, Any] = {}
+                if with_price and option.price:
+                    values["price"] = option.price
+                if with_stock and option.stock != UNKNOWN_STOCK:
+                    values["stock"] = option.stock
+                if values:
+                    options[option.sku or option.label] = values
+        if options:
+            live["variants"] = options
+        return live
+
     def generate(
         self, data: dict[str, Any], as_text: bool = False
     ) -> str | list[dict[str, Any]]:
         """
         Main generation method.
 
-        Automatically resets deduplication cache in single-product mode.
-        For batch processing, use generate_batch() which controls deduplication.
+        In single-product mode shards are deduplicated within the product
+        only, against a temporary set: the generator's backend is neither
+        read nor cleared. generate_batch() dedupes across products.
 
         Args:
             data: Product data dictionary
@@ -94,10 +170,11 @@ class RAGGenerator:
         Returns:
             List of shards or concatenated text string
         """
-        # Auto-reset deduplication for single-product mode
-        # (batch mode is controlled by generate_batch)
-        if not self._batch_mode:
-            self.reset_deduplication()
+        # Batch mode (set by iter_generate_batch) dedupes across products
+        seen = self._seen_hashes if self._batch_mode else DigestSet()
+
+        if self.volatile_fields:
+            data = {k: v for k, v in data.items() if k not in self.volatile_fields}
 
         all_shards: list[dict[str, Any]] = []
         semantic_tags = self.tagger.generate_tags(data)
@@ -112,7 +189,7 @@ class RAGGenerator:
         shard = self.shard_builder.create_shard(
             item_id, data, "subject_anchor", 0, semantic_tags
         )
-        self._add_unique_shard(shard, all_shards)
+        self._add_unique_shard(shard, all_shards, seen)
 
         # Price & Currency
         if data.get("PRICE"):
@@ -120,14 +197,14 @@ class RAGGenerator:
             shard = self.shard_builder.create_shard(
                 price, data, "price", 1, semantic_tags
             )
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         if data.get("CURRENCY"):
             currency = ShardBuilder.truncate_text(str(data["CURRENCY"]))
             shard = self.shard_builder.create_shard(
                 currency, data, "currency", 2, semantic_tags
             )
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Specs
         specs = data.get("SPECS", {})
@@ -143,7 +220,7 @@ class RAGGenerator:
                 shard = self.shard_builder.create_shard(
                     value_str, data, "specification", idx + 3, semantic_tags
                 )
-                self._add_unique_shard(shard, all_shards)
+                self._add_unique_shard(shard, all_shards, seen)
 
         # Description
         if data.get("DESCRIPTION"):
@@ -151,7 +228,7 @@ class RAGGenerator:
             shard = self.shard_builder.create_shard(
                 desc, data, "description", len(all_shards), semantic_tags
             )
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Brand voice
         if data.get("BRAND_VOICE"):
@@ -159,51 +236,51 @@ class RAGGenerator:
             shard = self.shard_builder.create_shard(
                 voice, data, "brand_voice", len(all_shards), semantic_tags
             )
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Variants
         variant_shards = self._generate_variant_shards(data, semantic_tags)
         for shard in variant_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Reviews
         review_shards = self._generate_reviews_shards(data, semantic_tags)
         for shard in review_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Subscription
         subscription_shards = self._generate_subscription_shards(data, semantic_tags)
         for shard in subscription_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Images
         image_shards = self._generate_image_shards(data, semantic_tags)
         for shard in image_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Compatibility
         compatibility_shards = self._generate_compatibility_shards(data, semantic_tags)
         for shard in compatibility_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Promotions
         promo_shards = self._generate_promo_shards(data, semantic_tags)
         for shard in promo_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Sustainability
         sustainability_shards = self._generate_sustainability_shards(
             data, semantic_tags
         )
         for shard in sustainability_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Semantic logic
         semantic_logic_shards = self._generate_semantic_logic_shards(
             data, semantic_tags
         )
         for shard in semantic_logic_shards:
-            self._add_unique_shard(shard, all_shards)
+            self._add_unique_shard(shard, all_shards, seen)
 
         # Limit total shards
         all_shards = all_shards[:MAX_SHARDS]
@@ -225,52 +302,100 @@ class RAGGenerator:
             items: List of product data dictionaries
             as_text: Return as text instead of list of shards
             deduplicate_across_products: If True, deduplicate across all products.
-                                        If False, reset cache between products.
+                                        If False, within each product only.
 
         Returns:
             List of shards or text output
 
         Note:
-            Sets _batch_mode flag to prevent auto-reset in generate().
+            Collects iter_generate_batch(). Use that to stream shards or
+            to generate in parallel.
+        """
+        all_shards = list(
+            self.iter_generate_batch(
+                items, deduplicate_across_products=deduplicate_across_products
+            )
+        )
+        if as_text:
+            return "\n\n".join([s["text"] for s in all_shards])
+        return all_shards
+
+    def iter_generate_batch(
+        self,
+        items: Iterable[dict[str, Any]],
+        workers: int = 1,
+        deduplicate_across_products: bool = True,
+    ) -> Iterator[dict[str, Any]]:
         """
-        all_shards = []
-        errors = []
+        Yield shards product by product, as each one is generated.
 
-        # Enable batch mode to prevent auto-reset in generate()
-        original_batch_mode = self._batch_mode
-        self._batch_mode = True
+        Items are read lazily, so embedding and upserting can start
+        before generation ends and memory stays flat. With workers > 1
+        products are generated in a process pool, GENERATE_CHUNK per
+        task. Shards still come out in input order and are deduplicated
+        here, so the output matches workers=1.
 
-        try:
-            # Reset deduplication cache for batch
-            if deduplicate_across_products:
-                self.reset_deduplication()
+        Products that fail to generate are skipped, as in generate_batch().
+        """
+        # A persistent dedup backend resumes where the last run stopped
+        if deduplicate_across_products and not self._seen_hashes.persistent:
+            self.reset_deduplication()
 
-            for idx, item_data in enumerate(items):
-                try:
-                    # Reset per-product if not deduplicating across products
-                    if not deduplicate_across_products:
-                        self.reset_deduplication()
+        # One clock read per batch for seasonal tags
+        month = self.tagger.month or current_month()
+        if workers > 1:
+            yield from self._iter_generate_parallel(
+                items, workers, deduplicate_across_products, month
+            )
+            return
 
+        # Batch mode makes generate() use the backend. Without it each
+        # product gets a temporary set, so a persistent backend is kept.
+        original_batch_mode = self._batch_mode
+        original_month = self.tagger.month
+        self._batch_mode = deduplicate_across_products
+        self.tagger.month = month
+        try:
+            for item_data in items:
+                try:
                     product_shards = self.generate(item_data, as_text=False)
-                    if isinstance(product_shards, list):
-                        all_shards.extend(product_shards)
-                except Exception as e:
-                    errors.append(
-                        {
-                            "index": idx,
-                            "item": item_data.get("ITEM", "Unknown"),
-                            "error": str(e),
-                        }
-                    )
+                except Exception:  # noqa: S112 - skip broken products
                     continue
-
-            if as_text:
-                return "\n\n".join([s["text"] for s in all_shards])
-            return all_shards
-
+                yield from product_shards
         finally:
             # Restore original batch mode state
             self._batch_mode = original_batch_mode
+            self.tagger.month = original_month
+
+    def _iter_generate_parallel(
+        self,
+        items: Iterable[dict[str, Any]],
+        workers: int,
+        deduplicate_across_products: bool,
+        month: int,
+    ) -> Iterator[dict[str, Any]]:
+        # Imported here: the pool is only needed for parallel batches
+        from ...parallel import iter_ordered
+
+        config: _Config = (
+            self.include_metadata,
+            frozenset(self.plural_attributes),
+            self.shard_builder.include_confidence,
+            self.shard_builder.include_negative_tags,
+            self.volatile_fields,
+        )
+        products = iter(items)
+        chunks = iter(lambda: list(islice(products, GENERATE_CHUNK)), [])
+        # Workers dedupe within a product. Across products it happens
+        # here, in input order, against this generator's backend.
+        args = (config, month)
+        for results in iter_ordered(_generate_chunk, chunks, workers, args):
+            for product_shards in results:
+                for shard in product_shards:
+                    if not deduplicate_across_products or self._is_new(
+                        shard, self._seen_hashes
+                    ):
+                        yield shard
 
     def _generate_variant_shards(
         self, data: dict[str, Any], semantic_tags: list[str]
@@ -297,58 +422,68 @@ class RAGGenerator:
         if not isinstance(variants, dict):
             return shards
 
-        variant_type = variants.get("Type", "Variant")
         options = variants.get("Options", [])
-
         if not isinstance(options, list):
             return shards
 
-        for _idx, option in enumerate(options):
-            if not isinstance(option, str):
-                continue
-
-            parsed = self._parse_variant_option(option)
-
-            if not parsed:
-                continue
-
-            # Extract structured attributes (color, storage, size, etc)
-            attributes = self._extract_variant_attributes(parsed["name"])
-
-            # Generate searchable text
-            text = f"{variant_type}: {parsed['name']}"
-            if parsed.get("price"):
-                text += f" - ${parsed['price']}"
-            if parsed.get("stock"):
-                text += f" ({parsed['stock']} in stock)"
-
-            # Add note if present
-            if parsed.get("note"):
-                text += f" - {parsed['note']}"
+        # Parsed once into columns. Text and parser-shaped options both work.
+        matrix = VariantMatrix.from_directive(variants)
 
-            # Create shard with variant metadata
-            metadata = data.copy() if self.include_metadata else {}
-            metadata.update(
-                {
-                    "attr_type": "variant",
-                    "variant_type": variant_type,
-                    "variant_name": parsed["name"],
-                    "variant_sku": parsed.get("sku"),
-                    "variant_price": parsed.get("price"),
-                    "variant_stock": parsed.get("stock"),
-                    "variant_hex": parsed.get("hex_color"),
-                    "variant_attributes": attributes,
-                    "original_data": option,
-                }
+        for dimension in matrix.dimensions:
+            variant_type = (
+                dimension.name
+                if dimension.name is not None
+                else variants.get("Type", "Variant")
             )
+            for option in dimension:
+                shards.append(self._variant_shard(data, variant_type, option))
 
-            shard = {
-                "text": ShardBuilder.truncate_text(text),
-                "metadata": metadata,
+        return shards
+
+    def _variant_shard(
+        self, data: dict[str, Any], variant_type: Any, option: VariantOption
+    ) -> dict[str, Any]:
+        """Build one variant shard from a parsed option."""
+        stock = str(option.stock) if option.stock != UNKNOWN_STOCK else None
+        if "VARIANT_STOCK" in self.volatile_fields:
+            stock = None
+        if "VARIANT_PRICE" in self.volatile_fields:
+            option = option._replace(price=None)
+
+        # Extract structured attributes (color, storage, size, etc)
+        attributes = self._extract_variant_attributes(option.label)
+
+        # Generate searchable text
+        text = f"{variant_type}: {option.label}"
+        if option.price:
+            text += f" - ${option.price}"
+        if stock:
+            text += f" ({stock} in stock)"
+
+        # Add note if present
+        if option.note:
+            text += f" - {option.note}"
+
+        # Create shard with variant metadata
+        metadata = data.copy() if self.include_metadata else {}
+        metadata.update(
+            {
+                "attr_type": "variant",
+                "variant_type": variant_type,
+                "variant_name": option.label,
+                "variant_sku": option.sku,
+                "variant_price": option.price,
+                "variant_stock": stock,
+                "variant_hex": option.hex_color,
+                "variant_attributes": attributes,
+                "original_data": option.source,
             }
-            shards.append(shard)
+        )
 
-        return shards
+        return {
+            "text": ShardBuilder.truncate_text(text),
+            "metadata": metadata,
+        }
 
     def _parse_variant_option(self, option: str) -> dict[str, Any]:
         """
@@ -363,44 +498,7 @@ class RAGGenerator:
         Returns:
             Dictionary with parsed variant data
         """
-        result: dict[str, Any] = {}
-
-        # Split by pipe
-        parts = [p.strip() for p in option.split("|")]
-
-        if not parts:
-            return result
-
-        # First part: "Name: Price"
-        first = parts[0]
-        if ":" in first:
-            name_part, price_part = first.split(":", 1)
-            result["name"] = name_part.strip()
-            result["price"] = price_part.strip()
-        else:
-            result["name"] = first.strip()
-
-        # Remaining parts: "Key: Value"
-        for part in parts[1:]:
-            if ":" not in part:
-                continue
-            key, value = part.split(":", 1)
-            key = key.strip().lower()
-            value = value.strip()
-
-            if key == "sku":
-                result["sku"] = value
-            elif key == "stock":
-                # Extract number from "22" or "22 units"
-                match = re.search(r"\d+", value)
-                if match:
-                    result["stock"] = str(match.group())
-            elif key == "hex":
-                result["hex_color"] = value
-            elif key == "note":
-                result["note"] = value
-
-        return result
+        return parse_option_text(option)
 
     def _generate_reviews_shards(
         self, data: dict[str, Any], semantic_tags: list[str]
@@ -933,16 +1031,16 @@ class RAGGenerator:
             Dictionary mapping primary attributes to variant lists
         """
         groups: dict[str, list[dict[str, Any]]] = {}
+        dimension = VariantDimension(None, variants)
 
-        for variant in variants:
-            name = variant.get("name", "")
+        for name, variant in zip(dimension.labels, dimension.sources, strict=True):
             if not name:
                 continue
 
             # Extract primary attribute (first part before /)
-            parts = name.split("/")
+            parts = split_label(name)
             if len(parts) >= MIN_VARIANT_GROUP_PARTS:
-                primary = parts[0].strip()
+                primary = parts[0]
                 if primary not in groups:
                     groups[primary] = []
                 groups[primary].append(variant)
@@ -1019,7 +1117,7 @@ class RAGGenerator:
             Dictionary of attribute name to value
         """
         attributes = {}
-        parts = [p.strip() for p in variant_name.split("/")]
+        parts = split_label(variant_name)
 
         # Common attribute patterns
         storage_pattern = re.compile(r"(\d+)(GB|TB|MB)", re.IGNORECASE)
@@ -1048,3 +1146,34 @@ class RAGGenerator:
                 attributes[f"attr_{len(attributes)}"] = part
 
         return attributes
+
+
+@lru_cache(maxsize=4)
+def _worker_generator(config: _Config) -> RAGGenerator:
+    include_metadata, plural, include_confidence, include_negative_tags, volatile = (
+        config
+    )
+    generator = RAGGenerator(
+        include_metadata=include_metadata,
+        include_confidence=include_confidence,
+        include_negative_tags=include_negative_tags,
+        volatile_fields=volatile,
+    )
+    generator.plural_attributes = set(plural)
+    return generator
+
+
+def _generate_chunk(
+    chunk: list[dict[str, Any]], config: _Config, month: int
+) -> list[list[dict[str, Any]]]:
+    """Shards of each product. Module-level for the process pool."""
+    generator = _worker_generator(config)
+    generator.tagger.month = month
+    results: list[list[dict[str, Any]]] = []
+    for data in chunk:
+        try:
+            shards = generator.generate(data)
+        except Exception:
+            shards = []
+        results.append(shards if isinstance(shards, list) else [])
+    return results
@@ -0,0 +1,45 @@
+"""
+Multi-keyword matching for semantic tag tables.
+One pass over a compiled table instead of a loop per label.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+
+
+class KeywordMatcher:
+    """
+    A keyword table compiled once for repeated matching.
+
+        matcher = KeywordMatcher({"natural": ["wool", "wood"], "metal": ["steel"]})
+        matcher.labels("hardwood and steel")  # {"natural", "metal"}
+
+    Finds a keyword wherever `keyword in text` would, overlapping ones
+    included. Keywords shared by several labels are tested once.
+
+    The tables are small (tens of keywords) and texts short, so each
+    keyword is one C-level substring search. That beats a regex
+    alternation, which the re engine tries alternative by alternative
+    at every position.
+    """
+
+    def __init__(self, table: Mapping[str, Iterable[str]]):
+        self._labels: dict[str, set[str]] = {}
+        for label, keywords in table.items():
+            for keyword in keywords:
+                if keyword:
+                    self._labels.setdefault(keyword, set()).add(label)
+        self._keywords = tuple(self._labels)
+
+    def keywords(self, text: str) -> set[str]:
+        """Every keyword of the table that occurs in text."""
+        return {keyword for keyword in self._keywords if keyword in text}
+
+    def labels(self, text: str) -> set[str]:
+        """Labels of every keyword that occurs in text."""
+        labels: set[str] = set()
+        for keyword in self._keywords:
+            if keyword in text:
+                labels |= self._labels[keyword]
+        return labels
@@ -0,0 +1,204 @@
+"""
+Ingest manifest for incremental re-ingestion.
+
+Records, per namespace and product, the content hash of every shard
+last written to the vector store. A pipeline diffs regenerated shards
+against it and embeds and upserts only what changed.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from ..exceptions import VectorStoreError
+from .dedup import content_digest
+
+
+def shard_hash(shard: dict[str, Any]) -> str:
+    """
+    Hash of what a stored shard depends on: attr_type, text and tags.
+
+    original_data is left out. It is shared by every shard of a product,
+    so one changed field would otherwise re-embed all of them.
+    """
+    metadata = shard.get("metadata", {}) or {}
+    tags = json.dumps(metadata.get("semantic_tags", []), sort_keys=True, default=str)
+    text = f"{shard.get('text', '')}\x1f{tags}"
+    return content_digest(str(metadata.get("attr_type", "")), text).hex()
+
+
+def product_key(data: dict[str, Any]) -> str | None:
+    """Identity a product's manifest entry is kept under: SKU, URL or ITEM."""
+    product = data.get("PRODUCT")
+    if not isinstance(product, dict):
+        product = {}
+    for key in (
+        data.get("SKU"),
+        product.get("SKU"),
+        product.get("URL"),
+        data.get("ITEM"),
+    ):
+        if key:
+            return str(key)
+    return None
+
+
+class ManifestDiff(NamedTuple):
+    """Regenerated shards compared with the manifest."""
+
+    product_id: str
+    changed: list[dict[str, Any]]  # New or changed: embed and upsert
+    removed: list[str]  # Shard IDs no longer generated: delete
+    unchanged: int  # Skipped
+    hashes: dict[str, str]  # Shard ID -> hash, to record once stored
+    kept: list[dict[str, Any]]  # Unchanged: refresh metadata, no embedding
+
+    def counts(self) -> dict[str, int]:
+        """Shards changed, unchanged and removed."""
+        return {
+            "changed": len(self.changed),
+            "unchanged": self.unchanged,
+            "removed": len(self.removed),
+        }
+
+
+class ShardManifest:
+    """
+    product -> {shard_id: content_hash} per namespace, in SQLite.
+
+        manifest = ShardManifest("manifest.sqlite")
+        pipeline = RAGPipeline(manifest=manifest)
+
+    Pass a file path to keep it between runs. The default ":memory:"
+    lasts as long as the object. stats counts shards changed, unchanged
+    (skipped) and removed by commit() since creation. Safe to share
+    between threads: one lock serializes the connection.
+    """
+
+    def __init__(self, path: str | Path = ":memory:"):
+        self.path = path
+        self.stats = {"changed": 0, "unchanged": 0, "removed": 0}
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS manifest (
+                namespace TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                shard_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (namespace, product_id, shard_id)
+            ) WITHOUT ROWID
+            """)
+        self.conn.commit()
+
+    def get(self, namespace: str, product_id: str) -> dict[str, str]:
+        """Shard ID -> hash recorded for a product."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT shard_id, content_hash FROM manifest"
+                " WHERE namespace = ? AND product_id = ?",
+                (namespace, product_id),
+            )
+            return dict(rows.fetchall())
+
+    def diff(
+        self,
+        namespace: str,
+        product_id: str,
+        shards: Iterable[dict[str, Any]],
+        shard_id: Callable[[dict[str, Any]], str],
+    ) -> ManifestDiff:
+        """
+        Compare a product's regenerated shards with the manifest.
+
+        shard_id must give the ID the vector store keeps the shard under,
+        so removed IDs can be passed to its delete().
+        """
+        recorded = self.get(namespace, product_id)
+        changed: list[dict[str, Any]] = []
+        kept: list[dict[str, Any]] = []
+        hashes: dict[str, str] = {}
+        for shard in shards:
+            key = shard_id(shard)
+            hashes[key] = shard_hash(shard)
+            if recorded.get(key) != hashes[key]:
+                changed.append(shard)
+            else:
+                kept.append(shard)
+        removed = [key for key in recorded if key not in hashes]
+        unchanged = len(hashes) - len(changed)
+        return ManifestDiff(product_id, changed, removed, unchanged, hashes, kept)
+
+    def diff_product(
+        self,
+        namespace: str,
+        data: dict[str, Any],
+        shards: list[dict[str, Any]],
+        vector_store: Any,
+    ) -> ManifestDiff | None:
+        """
+        diff() keyed by product_key() and the store's shard IDs.
+
+        None when the product has no identity: ingest it in full.
+        """
+        key = product_key(data)
+        if key is None:
+            return None
+        shard_id = getattr(vector_store, "shard_id", None)
+        if shard_id is None:
+            raise VectorStoreError(
+                "Incremental ingest needs a vector store with stable shard IDs",
+                {"vector_store": type(vector_store).__name__},
+            )
+        return self.diff(namespace, key, shards, shard_id)
+
+    def commit(self, namespace: str, diff: ManifestDiff, vector_store: Any) -> None:
+        """
+        Delete removed shards from the store, then record the product.
+
+        Unchanged shards keep their vectors, but their stored metadata
+        and payload still come from the last time they were upserted.
+        Stores with update_metadata() get the current ones.
+        """
+        if diff.removed:
+            vector_store.delete(diff.removed, namespace=namespace)
+        update_metadata = getattr(vector_store, "update_metadata", None)
+        if diff.kept and update_metadata is not None:
+            update_metadata(diff.kept, namespace=namespace)
+        if diff.changed or diff.removed:
+            self.record(namespace, diff.product_id, diff.hashes)
+        with self._lock:
+            for name, count in diff.counts().items():
+                self.stats[name] += count
+
+    def record(self, namespace: str, product_id: str, hashes: dict[str, str]) -> None:
+        """Replace a product's entry once its shards are stored."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM manifest WHERE namespace = ? AND product_id = ?",
+                (namespace, product_id),
+            )
+            self.conn.executemany(
+                "INSERT INTO manifest VALUES (?, ?, ?, ?)",
+                [(namespace, product_id, k, h) for k, h in hashes.items()],
+            )
+
+    def __len__(self) -> int:
+        """Number of products recorded, over all namespaces."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM"
+                " (SELECT DISTINCT namespace, product_id FROM manifest)"
+            ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
@@ -16,10 +16,21 @@ from .filters import (
     SeasonalityFilter,
     SustainabilityFilter,
 )
+from .keywords import KeywordMatcher
+
+CATEGORY_MATCHER = KeywordMatcher(CATEGORY_KEYWORDS)
 
 
 class SemanticTagger:
-    """Orchestrates different filters to generate semantic tags for product data."""
+    """
+    Orchestrates different filters to generate semantic tags for product data.
+
+    month fixes the month seasonal tags are chosen for. Batches set it
+    once instead of reading the clock per product. None: current month.
+    """
+
+    def __init__(self, month: int | None = None) -> None:
+        self.month = month
 
     def generate_tags(self, data: dict[str, Any]) -> list[str]:
         """Runs all filters and aggregates tags."""
@@ -36,7 +47,7 @@ class SemanticTagger:
         tags.extend(MaterialFilter.detect_materials(specs))
 
         # 3. Seasonality
-        tags.extend(SeasonalityFilter.detect_seasonality(item_name))
+        tags.extend(SeasonalityFilter.detect_seasonality(item_name, self.month))
 
         # 4. Logistics
         tags.extend(LogisticsFilter.classify_weight(specs))
@@ -98,10 +109,12 @@ class SemanticTagger:
     def _get_category_tags(self, data: dict[str, Any]) -> list[str]:
         """Category detection from item name."""
         tags = []
-        item_name = str(data.get("ITEM", "")).lower()
+        categories = CATEGORY_MATCHER.labels(str(data.get("ITEM", "")).lower())
+        if not categories:
+            return tags
 
-        for category, keywords in CATEGORY_KEYWORDS.items():
-            if any(kw in item_name for kw in keywords):
+        for category in CATEGORY_KEYWORDS:
+            if category in categories:
                 tags.append(category)
 
         return tags
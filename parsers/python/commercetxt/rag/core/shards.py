@@ -4,11 +4,10 @@ RAG shard creation and formatting.
 
 from __future__ import annotations
 
-import hashlib
-import json
 from typing import Any
 
 from .constants import MAX_TEXT_LENGTH
+from .dedup import content_digest
 
 
 class ShardBuilder:
@@ -92,17 +91,6 @@ class ShardBuilder:
         Uses text and attr_type to identify duplicate content.
         Excludes index and original_data from hash to catch semantic duplicates.
         """
-        # Extract core content that defines uniqueness
-        text = shard.get("text", "")
         metadata = shard.get("metadata", {})
-        attr_type = metadata.get("attr_type", "")
-
-        # Create stable hash input
-        hash_input = {
-            "text": text,
-            "attr_type": attr_type,
-        }
-
-        # Convert to stable JSON string and hash
-        json_str = json.dumps(hash_input, sort_keys=True)
-        return hashlib.sha256(json_str.encode("utf-8")).hexdigest()
+        attr_type = str(metadata.get("attr_type", ""))
+        return content_digest(attr_type, str(shard.get("text", ""))).hex()
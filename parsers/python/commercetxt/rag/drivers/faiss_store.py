@@ -17,6 +17,9 @@ from ..interfaces.base_vector_store import BaseVectorStore
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Keys per IN (...) query: older SQLite builds allow 999 parameters
+SQLITE_MAX_KEYS = 500
+
 
 def _l2_normalize(x: np.ndarray) -> np.ndarray:
     """Normalize vectors to unit length for cosine similarity."""
@@ -26,6 +29,70 @@ def _l2_normalize(x: np.ndarray) -> np.ndarray:
     return normalized
 
 
+def _payload_id(payload: Any) -> str:
+    """Content address of a payload. Equal payloads share one row."""
+    data = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+# Shards without an index, one per metadata value: the value keys them.
+# Variants fall back to type and name when they have no SKU.
+_SHARD_DISCRIMINATORS = {
+    "variant": ("variant_sku",),
+    "subscription_plan": ("plan_name",),
+    "image": ("image_path",),
+    "compatibility": ("compatibility_type",),
+    "promo": ("promo_type",),
+    "sustainability": ("sustainability_type",),
+}
+
+# Shards without an index that a product has at most one of.
+_SINGLE_SHARD_TYPES = frozenset(
+    {
+        "reviews",
+        "reviews_sentiment",
+        "subscription_benefits",
+        "semantic_tags",
+        "semantic_context",
+    }
+)
+
+
+def _shard_discriminator(attr_type: str, meta: dict[str, Any], text: str) -> str:
+    """
+    Stand-in for the index of a shard that has none.
+
+    Taken from metadata that names the shard, never from its text: a
+    variant's text carries price and stock, and keying on it left a
+    stale row behind each time they changed.
+    """
+    if attr_type in _SINGLE_SHARD_TYPES:
+        return "0"
+    for field in _SHARD_DISCRIMINATORS.get(attr_type, ()):
+        if meta.get(field):
+            return str(meta[field])
+    if attr_type == "variant" and meta.get("variant_name"):
+        return f"{meta.get('variant_type')}={meta['variant_name']}"
+    # Unknown shard types: the text is all there is to tell them apart.
+    return hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+
+
+def _select_in(
+    cur: sqlite3.Cursor, query: str, keys: list[str]
+) -> list[tuple[Any, ...]]:
+    """
+    Run query once per SQLITE_MAX_KEYS keys and concatenate the rows.
+
+    query holds one IN list written as "IN ({})".
+    """
+    rows: list[tuple[Any, ...]] = []
+    for i in range(0, len(keys), SQLITE_MAX_KEYS):
+        chunk = keys[i : i + SQLITE_MAX_KEYS]
+        # S608: Safe - using parameterized "?" placeholders
+        rows += cur.execute(query.format(",".join("?" * len(chunk))), chunk).fetchall()
+    return rows
+
+
 def _tmp_path(path: Path) -> Path:
     """Generate temporary path for atomic file operations."""
     return path.with_name(path.name + ".tmp")
@@ -168,15 +235,19 @@ class FaissIDMapper:
                 else:
                     missing.append(str_id)
 
-        # Batch query for missing IDs
+        # Batch query for missing IDs, under SQLite's bound-parameter limit
         if missing:
             cur = self.conn.cursor()
-            placeholders = ",".join("?" * len(missing))
-            # S608: Safe - using parameterized "?" placeholders, not user data
-            rows = cur.execute(  # noqa: S608
-                f"SELECT str_id, faiss_id FROM id_map WHERE str_id IN ({placeholders})",
-                missing,
-            ).fetchall()
+            rows = []
+            for i in range(0, len(missing), SQLITE_MAX_KEYS):
+                chunk = missing[i : i + SQLITE_MAX_KEYS]
+                placeholders = ",".join("?" * len(chunk))
+                # S608: Safe - using parameterized "?" placeholders, not user data
+                rows += cur.execute(  # noqa: S608
+                    "SELECT str_id, faiss_id FROM id_map"
+                    f" WHERE str_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
 
             with self._cache_lock:
                 for str_id, faiss_id in rows:
@@ -191,6 +262,38 @@ class FaissIDMapper:
 
         return results
 
+    def get_or_create_batch(self, str_ids: list[str]) -> dict[str, int]:
+        """get_or_create() for many IDs: one lookup and one commit."""
+        found = self.get_batch(str_ids)
+        results = {k: v for k, v in found.items() if v is not None}
+        new = [k for k, v in found.items() if v is None]
+        if not new:
+            return results
+
+        cur = self.conn.cursor()
+        for str_id in new:
+            for salt in range(100):
+                faiss_id = self._hash63(str_id, salt=salt)
+                try:
+                    cur.execute(
+                        "INSERT INTO id_map(str_id, faiss_id) VALUES(?, ?)",
+                        (str_id, faiss_id),
+                    )
+                    break
+                except sqlite3.IntegrityError:
+                    # str_ids are unique here: this is a faiss_id collision
+                    continue
+            else:
+                self.conn.rollback()
+                raise RuntimeError(f"Failed to create ID mapping for {str_id}")
+            results[str_id] = faiss_id
+        self.conn.commit()
+
+        with self._cache_lock:
+            for str_id in new:
+                self._cache[str_id] = results[str_id]
+        return results
+
 
 class FaissStore(BaseVectorStore):
     """
@@ -198,6 +301,8 @@ class FaissStore(BaseVectorStore):
     - IndexIVFFlat + IndexIDMap2 (arbitrary IDs)
     - Real upsert via remove_ids + add_with_ids
     - SQLite metadata store with caching
+    - Normalized payloads: each shard's original_data is stored once in
+      a payloads table and referenced by payload_id
     - Cosine similarity via normalization + inner product
     - Thread-safe with per-namespace RLock
     - Batch operations for better performance
@@ -286,6 +391,25 @@ class FaissStore(BaseVectorStore):
                 ON shards (faiss_id)
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS payloads
+            (
+                payload_id   TEXT PRIMARY KEY,
+                payload_json TEXT NOT NULL
+            )
+            """
+        )
+        # Databases written before payloads were normalized lack the column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(shards)")}
+        if "payload_id" not in columns:
+            conn.execute("ALTER TABLE shards ADD COLUMN payload_id TEXT")
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_shards_payload_id
+                ON shards (payload_id)
+            """
+        )
         conn.commit()
 
         self._conns[namespace] = conn
@@ -429,6 +553,20 @@ class FaissStore(BaseVectorStore):
 
         return "unknown"
 
+    @staticmethod
+    def _shard_key(meta: dict[str, Any], product_key: str, text: str) -> str:
+        attr_type = meta.get("attr_type", "misc")
+        index = meta.get("index")
+        if index is None:
+            index = _shard_discriminator(attr_type, meta, text)
+        return f"{product_key}:{attr_type}:{index}"
+
+    def shard_id(self, shard: dict[str, Any]) -> str:
+        """ID upsert() stores a shard under. Stable across runs."""
+        meta = shard.get("metadata", {}) or {}
+        text = shard.get("text", "") or ""
+        return self._shard_key(meta, self._extract_product_key(meta), text)
+
     def upsert(self, shards: list[dict[str, Any]], namespace: str = "default") -> int:
         """
         Upsert shards with optimized batch processing.
@@ -448,40 +586,15 @@ class FaissStore(BaseVectorStore):
                 conn = self._open_db(namespace)
                 mapper = self._mappers[namespace]
 
-                # Prepare batch data
-                str_ids: list[str] = []
-                vectors: list[list[float]] = []
-                payloads: list[tuple[str, int, str, str]] = []
-
-                for s in shards:
-                    meta = s.get("metadata", {}) or {}
-
-                    product_key = self._extract_product_key(meta)
-                    attr_type = meta.get("attr_type", "misc")
-                    shard_index = meta.get("index", 0)
-
-                    shard_key = f"{product_key}:{attr_type}:{shard_index}"
-                    faiss_id = mapper.get_or_create(shard_key)
-
-                    str_ids.append(shard_key)
-                    vectors.append(s["values"])
-
-                    meta2 = meta.copy()
-                    meta2["id"] = shard_key
-                    meta2["faiss_id"] = faiss_id
-
-                    payloads.append(
-                        (
-                            shard_key,
-                            faiss_id,
-                            s.get("text", "") or "",
-                            json.dumps(meta2, ensure_ascii=False),
-                        )
-                    )
+                keys = self._keys(shards)
+                faiss_ids = mapper.get_or_create_batch([k for _, _, k in keys])
+                rows, payloads = self._rows(shards, keys, faiss_ids)
+                str_ids = [row[0] for row in rows]
+                vectors = [s["values"] for s in shards]
 
                 # Process vectors
                 x = _l2_normalize(np.array(vectors, dtype="float32"))
-                ids64 = np.array([mapper.get(i) for i in str_ids], dtype="int64")
+                ids64 = np.array([faiss_ids[i] for i in str_ids], dtype="int64")
 
                 # Ensure trained
                 self._ensure_trained(index, x)
@@ -500,17 +613,7 @@ class FaissStore(BaseVectorStore):
                 self._persist_index(namespace)
 
                 # Batch insert into SQLite
-                cur = conn.cursor()
-                cur.executemany(
-                    """
-                    INSERT INTO shards(str_id, faiss_id, text, metadata_json)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(str_id) DO UPDATE SET faiss_id=excluded.faiss_id,
-                                                      text=excluded.text,
-                                                      metadata_json=excluded.metadata_json
-                    """,
-                    payloads,
-                )
+                self._write_rows(conn.cursor(), rows, payloads)
                 conn.commit()
 
                 logger.info(f"Upserted {len(shards)} shards to '{namespace}'")
@@ -520,10 +623,205 @@ class FaissStore(BaseVectorStore):
                 logger.error(f"Upsert failed: {e}")
                 raise
 
+    def update_metadata(
+        self, shards: list[dict[str, Any]], namespace: str = "default"
+    ) -> int:
+        """
+        Rewrite the stored metadata and payload of shards, keeping vectors.
+
+        For shards whose text is unchanged but whose product data is not:
+        nothing is embedded. Shards not stored yet, or stored with the
+        same metadata, are skipped. Returns the number of rows rewritten.
+        """
+        if not shards:
+            return 0
+        if not self._connected:
+            self.connect()
+
+        with self._lock(namespace):
+            conn = self._open_db(namespace)
+            keys = self._keys(shards)
+            faiss_ids = self._mappers[namespace].get_batch([k for _, _, k in keys])
+            stored = [i for i, key in enumerate(keys) if faiss_ids.get(key[2])]
+            if not stored:
+                return 0
+            rows, payloads = self._rows(
+                [shards[i] for i in stored], [keys[i] for i in stored], faiss_ids
+            )
+            cur = conn.cursor()
+            current = self._stored_metadata(cur, [row[0] for row in rows])
+            rows = [row for row in rows if current.get(row[0]) != row[3]]
+            if rows:
+                referenced = {row[4] for row in rows}
+                self._write_rows(
+                    cur,
+                    rows,
+                    {k: v for k, v in payloads.items() if k in referenced},
+                )
+                conn.commit()
+            return len(rows)
+
+    def _keys(self, shards: list[dict[str, Any]]) -> list[tuple[dict, str, str]]:
+        """(metadata, product key, shard key) per shard."""
+        keys = []
+        for s in shards:
+            meta = s.get("metadata", {}) or {}
+            product_key = self._extract_product_key(meta)
+            shard_key = self._shard_key(meta, product_key, s.get("text", "") or "")
+            keys.append((meta, product_key, shard_key))
+        return keys
+
+    def _rows(
+        self,
+        shards: list[dict[str, Any]],
+        keys: list[tuple[dict, str, str]],
+        faiss_ids: dict[str, Any],
+    ) -> tuple[list[tuple[str, int, str, str, str | None]], dict[str, str]]:
+        """Shard rows to store, and the payloads they reference by id."""
+        rows: list[tuple[str, int, str, str, str | None]] = []
+        # Shards of one product share one original_data object
+        payload_ids: dict[int, str] = {}
+        payloads: dict[str, str] = {}
+
+        for s, (meta, product_key, shard_key) in zip(shards, keys, strict=True):
+            faiss_id = faiss_ids[shard_key]
+
+            meta2 = meta.copy()
+            meta2["id"] = shard_key
+            meta2["faiss_id"] = faiss_id
+
+            payload_id = self._split_payload(meta2, product_key, payload_ids, payloads)
+
+            rows.append(
+                (
+                    shard_key,
+                    faiss_id,
+                    s.get("text", "") or "",
+                    json.dumps(meta2, ensure_ascii=False),
+                    payload_id,
+                )
+            )
+        return rows, payloads
+
+    def _write_rows(
+        self,
+        cur: sqlite3.Cursor,
+        rows: list[tuple[str, int, str, str, str | None]],
+        payloads: dict[str, str],
+    ) -> None:
+        """Insert or replace shard rows. Drop payloads they stopped using."""
+        replaced = self._payload_refs(cur, [row[0] for row in rows])
+        cur.executemany(
+            "INSERT OR IGNORE INTO payloads(payload_id, payload_json) VALUES (?, ?)",
+            payloads.items(),
+        )
+        cur.executemany(
+            """
+            INSERT INTO shards(str_id, faiss_id, text, metadata_json,
+                               payload_id)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(str_id) DO UPDATE SET faiss_id=excluded.faiss_id,
+                                              text=excluded.text,
+                                              metadata_json=excluded.metadata_json,
+                                              payload_id=excluded.payload_id
+            """,
+            rows,
+        )
+        self._drop_orphan_payloads(cur, replaced - payloads.keys())
+
+    @staticmethod
+    def _stored_metadata(cur: sqlite3.Cursor, str_ids: list[str]) -> dict[str, str]:
+        """str_id -> metadata_json of the given shards that are stored."""
+        return dict(
+            _select_in(
+                cur,
+                "SELECT str_id, metadata_json FROM shards WHERE str_id IN ({})",
+                str_ids,
+            )
+        )
+
+    @staticmethod
+    def _split_payload(
+        meta: dict[str, Any],
+        product_key: str,
+        payload_ids: dict[int, str],
+        payloads: dict[str, str],
+    ) -> str | None:
+        """Replace original_data in meta with a payload_id reference."""
+        original = meta.pop("original_data", None)
+        if original is None:
+            return None
+        payload_id = payload_ids.get(id(original))
+        if payload_id is None:
+            payload_id = _payload_id(original)
+            payload_ids[id(original)] = payload_id
+            payloads[payload_id] = json.dumps(original, ensure_ascii=False)
+        if product_key != "unknown":
+            meta.setdefault("product_id", product_key)
+        meta["payload_id"] = payload_id
+        return payload_id
+
+    @staticmethod
+    def _payload_refs(cur: sqlite3.Cursor, str_ids: list[str]) -> set[str]:
+        """Payload ids the given shards reference now."""
+        rows = _select_in(
+            cur,
+            "SELECT DISTINCT payload_id FROM shards WHERE str_id IN ({})"
+            " AND payload_id IS NOT NULL",
+            str_ids,
+        )
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def _drop_orphan_payloads(cur: sqlite3.Cursor, payload_ids: set[str]) -> None:
+        """Delete payloads no shard references any more."""
+        cur.executemany(
+            """
+            DELETE FROM payloads
+            WHERE payload_id = ?
+              AND NOT EXISTS (SELECT 1 FROM shards WHERE payload_id = ?)
+            """,
+            [(p, p) for p in payload_ids],
+        )
+
+    def get_payloads(
+        self, payload_ids: Iterable[str | None], namespace: str = "default"
+    ) -> dict[str, Any]:
+        """
+        Resolve payload references from search results.
+
+        Returns payload_id -> original_data for the ids that exist.
+        """
+        ids = [p for p in dict.fromkeys(payload_ids) if p]
+        if not ids:
+            return {}
+        if not self._connected:
+            self.connect()
+
+        with self._lock(namespace):
+            cur = self._open_db(namespace).cursor()
+            rows = _select_in(
+                cur,
+                "SELECT payload_id, payload_json FROM payloads"
+                " WHERE payload_id IN ({})",
+                ids,
+            )
+        return {payload_id: json.loads(data) for payload_id, data in rows}
+
     def search(
-        self, query_vector: list[float], top_k: int = 5, namespace: str | None = None
+        self,
+        query_vector: list[float],
+        top_k: int = 5,
+        namespace: str | None = None,
+        with_payloads: bool = False,
     ) -> list[dict[str, Any]]:
-        """Search for similar vectors with metadata."""
+        """
+        Search for similar vectors with metadata.
+
+        Metadata holds a payload_id instead of original_data. Pass
+        with_payloads=True to resolve it in the same call, or resolve
+        the hits you need later with get_payloads().
+        """
         # Use default namespace if None provided
         ns = namespace if namespace is not None else "default"
         if not self._connected:
@@ -580,12 +878,24 @@ class FaissStore(BaseVectorStore):
                         }
                     )
 
+                if with_payloads:
+                    self._attach_payloads(results, ns)
                 return results
 
             except Exception as e:
                 logger.error(f"Search failed: {e}")
                 return []
 
+    def _attach_payloads(self, results: list[dict[str, Any]], namespace: str) -> None:
+        """Put original_data back into result metadata."""
+        payloads = self.get_payloads(
+            (r["metadata"].get("payload_id") for r in results), namespace
+        )
+        for result in results:
+            payload_id = result["metadata"].get("payload_id")
+            if payload_id in payloads:
+                result["metadata"]["original_data"] = payloads[payload_id]
+
     def delete(self, str_ids: Iterable[str], namespace: str = "default") -> int:
         """Delete vectors by string IDs."""
         if not self._connected:
@@ -623,9 +933,11 @@ class FaissStore(BaseVectorStore):
 
                 # Batch delete from SQLite
                 cur = conn.cursor()
+                referenced = self._payload_refs(cur, to_delete)
                 cur.executemany(
                     "DELETE FROM shards WHERE str_id = ?", [(s,) for s in to_delete]
                 )
+                self._drop_orphan_payloads(cur, referenced)
                 conn.commit()
 
                 logger.info(f"Deleted {removed} vectors from '{namespace}'")
@@ -90,6 +90,8 @@ class LocalStorage(BaseRealtimeStorage):
 
         self._cache: dict[str, dict[str, Any]] = {}
         self._cache_timestamps: dict[str, float] = {}
+        # Written by set_live_attributes(). Outlives the TTL and rebuilds.
+        self._live: dict[str, dict[str, Any]] = {}
         self._file_index: dict[str, Path] = {}
         self._id_normalization_cache: dict[str, str] = {}
 
@@ -153,6 +155,7 @@ class LocalStorage(BaseRealtimeStorage):
                     # New format with metadata
                     self._cache = data.get("cache", {})
                     self._cache_timestamps = data.get("timestamps", {})
+                    self._live = data.get("live", {})
                 else:
                     # Old format (plain dict)
                     self._cache = data
@@ -174,6 +177,7 @@ class LocalStorage(BaseRealtimeStorage):
                 cache_data = {
                     "cache": self._cache,
                     "timestamps": self._cache_timestamps,
+                    "live": self._live,
                     "metadata": {
                         "created_at": time.time(),
                         "entry_count": len(self._cache),
@@ -381,6 +385,13 @@ class LocalStorage(BaseRealtimeStorage):
         if files_to_parse:
             self._batch_parse_files(files_to_parse, fields, results)
 
+        # Written values win over the cache and the file
+        if self._live:
+            for pid in product_ids:
+                live = self._live.get(self._normalize_product_id(pid))
+                if live:
+                    results[pid].update({k: v for k, v in live.items() if k in fields})
+
         return results
 
     def _check_cache_for_products(
@@ -472,6 +483,23 @@ class LocalStorage(BaseRealtimeStorage):
 
         return False
 
+    def set_live_attributes(self, product_id: str, attributes: dict[str, Any]) -> bool:
+        """
+        Overlay volatile fields on what the files say for a product.
+
+        Each call replaces the product's overlay, so a field left out of
+        the latest publish falls back to the file value. The overlay is
+        kept apart from the TTL cache: expiry, refreshes and
+        rebuild_cache() leave it in place, clear_cache() drops it. With a
+        cache_file it is saved alongside the cache. The source file is
+        not rewritten.
+        """
+        if not attributes:
+            return False
+        clean_id = self._normalize_product_id(product_id)
+        self._live[clean_id] = dict(attributes)
+        return True
+
     def batch_refresh(self, product_ids: list[str]) -> int:
         """
         Refresh cache for multiple products efficiently.
@@ -542,6 +570,7 @@ class LocalStorage(BaseRealtimeStorage):
         """Clear all cached data."""
         self._cache.clear()
         self._cache_timestamps.clear()
+        self._live.clear()
         self._id_normalization_cache.clear()
         logger.info("Cache cleared")
 
@@ -193,6 +193,10 @@ class RedisStorage(BaseRealtimeStorage):
         results = pipe.execute()
         return all(results)
 
+    def set_live_attributes(self, product_id: str, attributes: dict[str, Any]) -> bool:
+        """Store volatile fields for a product with the default TTL."""
+        return self.set_product_data(product_id, attributes)
+
     def set_field(
         self,
         product_id: str,
@@ -23,3 +23,12 @@ class BaseRealtimeStorage(ABC):
         Returns: { "product_123": {"price": 99.00, "stock": "InStock"} }
         """
         pass
+
+    def set_live_attributes(self, product_id: str, attributes: dict[str, Any]) -> bool:
+        """
+        Stores volatile fields for a Product ID, as get_live_attributes() returns them.
+        Read-only backends do not implement it.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not accept live attribute writes"
+        )
@@ -93,6 +93,17 @@ embedding_latency = (
     else None
 )
 
+ingest_stage_latency = (
+    Histogram(
+        "rag_ingest_stage_latency_seconds",
+        "Batch ingest latency per stage call",
+        ["stage"],  # prepare, embed, upsert
+        buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    )
+    if PROMETHEUS_AVAILABLE
+    else None
+)
+
 # Gauges (point-in-time measurements)
 cache_hit_ratio = (
     Gauge(
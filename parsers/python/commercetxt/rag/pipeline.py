@@ -8,10 +8,13 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Iterable
 from typing import Any
 
+from ..profiling import Profiler, profile, stage
 from .container import RAGContainer
 from .core.generator import RAGGenerator
+from .core.manifest import ShardManifest, product_key
 from .tools.health_check import AIHealthChecker
 from .tools.realtime_enricher import RealtimeEnricher
 
@@ -31,19 +34,39 @@ class RAGPipeline:
     generator: RAGGenerator
     health_checker: AIHealthChecker
     enricher: RealtimeEnricher
-
-    def __init__(self, container: RAGContainer | None = None) -> None:
+    manifest: ShardManifest | None
+
+    def __init__(
+        self,
+        container: RAGContainer | None = None,
+        manifest: ShardManifest | None = None,
+        *,
+        volatile_fields: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Args:
+            manifest: Enables incremental ingest. Only shards that changed
+                since a product was last ingested are embedded and upserted,
+                and shards it no longer has are deleted.
+            volatile_fields: Fields kept out of shards and written to
+                realtime storage instead, e.g. DEFAULT_VOLATILE_FIELDS.
+                A price change then leaves every shard unchanged.
+        """
         # 1. Setup Dependency Injection
         self.container: RAGContainer = container or RAGContainer()
 
         # 2. Core Logic (Business Rules)
-        self.generator: RAGGenerator = RAGGenerator()
+        self.volatile_fields = frozenset(volatile_fields or ())
+        self.generator: RAGGenerator = RAGGenerator(
+            volatile_fields=self.volatile_fields
+        )
         self.health_checker: AIHealthChecker = AIHealthChecker()
 
         # 3. Tools (injected via container)
         self.enricher: RealtimeEnricher = RealtimeEnricher(
             storage=self.container.storage
         )
+        self.manifest = manifest
 
     def ingest(self, product_data: dict[str, Any], namespace: str = "default") -> int:
         """
@@ -68,7 +91,8 @@ class RAGPipeline:
                 return 0
 
             # Step 2: Generate Shards
-            generated = self.generator.generate(product_data)
+            with stage("generate"):
+                generated = self.generator.generate(product_data)
             if isinstance(generated, str):
                 logger.warning(
                     "Text mode not supported for ingest",
@@ -76,13 +100,35 @@ class RAGPipeline:
                 )
                 return 0  # Text mode not supported for ingest
             shards: list[dict[str, Any]] = generated
+            vector_store = self.container.vector_store
+
+            # Step 3: Route volatile fields to realtime storage
+            if self.volatile_fields:
+                self._publish_live(product_data, shards)
+
+            # Step 4: Drop shards unchanged since the last ingest
+            manifest = self.manifest
+            diff = None
+            if manifest is not None:
+                diff = manifest.diff_product(
+                    namespace, product_data, shards, vector_store
+                )
+                if diff is not None:
+                    shards = diff.changed
 
-            # Step 3: Vectorize (Lazy loaded embedder)
-            shards = self.container.embedder.embed_shards(shards)
+            count = 0
+            vector_store.connect()
+            if shards:
+                # Step 5: Vectorize (Lazy loaded embedder)
+                with stage("embed"):
+                    shards = self.container.embedder.embed_shards(shards)
 
-            # Step 4: Store (Lazy loaded vector DB)
-            self.container.vector_store.connect()
-            count = self.container.vector_store.upsert(shards, namespace=namespace)
+                # Step 6: Store (Lazy loaded vector DB)
+                with stage("upsert"):
+                    count = vector_store.upsert(shards, namespace=namespace)
+
+            if manifest is not None and diff is not None:
+                manifest.commit(namespace, diff, vector_store)
 
             logger.info(
                 "Successfully ingested product",
@@ -91,6 +137,7 @@ class RAGPipeline:
                     "vectors_count": count,
                     "namespace": namespace,
                     "duration_ms": (time.time() - start_time) * 1000,
+                    "shards": diff.counts() if diff is not None else None,
                 },
             )
             return count
@@ -109,6 +156,27 @@ class RAGPipeline:
             )
             raise
 
+    def _publish_live(
+        self, product_data: dict[str, Any], shards: list[dict[str, Any]]
+    ) -> None:
+        """Write a product's volatile values to storage, keyed like its shards."""
+        key = product_key(product_data)
+        if key is None:
+            return
+        with stage("publish"):
+            self.enricher.publish(
+                key, shards, self.generator.live_attributes(product_data)
+            )
+
+    def profile(self, mode: str = "cprofile", output: str | None = None) -> Profiler:
+        """
+        Profile the calls made inside a with block.
+
+        Inside a commercetxt.profiling.MemoryReport block, ingest() also
+        records the generate, embed and upsert stages.
+        """
+        return profile(mode, output)
+
     def search(
         self, query: str, top_k: int = 5, namespace: str = "default"
     ) -> list[dict[str, Any]]:
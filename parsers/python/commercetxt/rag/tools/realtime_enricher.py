@@ -43,6 +43,23 @@ class RealtimeEnricher:
         self.product_id_key = product_id_key
         self.output_prefix = output_prefix
 
+    def publish(
+        self,
+        product_id: str,
+        shards: list[dict[str, Any]],
+        attributes: dict[str, Any],
+    ) -> None:
+        """
+        Ingest-side half of the join.
+
+        Stamps product_id on each shard's metadata so enrich() can find it,
+        and writes the volatile values the shards leave out to storage.
+        """
+        for shard in shards:
+            shard.setdefault("metadata", {})[self.product_id_key] = product_id
+        if attributes:
+            self.storage.set_live_attributes(product_id, attributes)
+
     def enrich(
         self,
         search_results: list[dict[str, Any]],
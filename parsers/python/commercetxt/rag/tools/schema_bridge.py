@@ -8,12 +8,29 @@ Supports all 12 CommerceTXT sections with proper Schema.org mappings.
 from __future__ import annotations
 
 import json
-import re
 from typing import Any
 
+from ...variants import UNKNOWN_STOCK, VariantMatrix, parse_option_text
 from ..core.constants import KNOWN_SECTIONS
 
 
+def schema_input(result: Any) -> dict:
+    """Flatten a ParseResult's directives into the shape SchemaBridge expects."""
+    flat = {}
+
+    # Only flatten relevant sections for Schema.org
+    relevant_sections = {"PRODUCT", "OFFER", "SPECS", "INVENTORY", "REVIEWS"}
+
+    for k, v in result.directives.items():
+        if k in relevant_sections and isinstance(v, dict):
+            flat.update(v)
+        elif k not in relevant_sections and not isinstance(v, dict):
+            # Keep non-conflicting top-level keys
+            flat[k] = v
+
+    return flat
+
+
 class SchemaBridge:
     """
     Converts CommerceTXT data to Schema.org Product JSON-LD.
@@ -192,56 +209,45 @@ class SchemaBridge:
         # Map to schema.org offers array with different variants
         variants = data.get("VARIANTS", {})
         if variants and isinstance(variants, dict):
-            variants.get("Type", "Variant")
-            options = variants.get("Options", [])
-
-            if isinstance(options, list) and options:
-                variant_offers = []
-                for option in options:
-                    if not isinstance(option, str):
-                        continue
-
-                    parsed = self._parse_variant_option(option)
-                    if parsed:
-                        # Get currency from schema offers or default to USD
-                        currency = "USD"
-                        if "offers" in schema and isinstance(schema["offers"], dict):
-                            currency = schema["offers"].get("priceCurrency", "USD")
-
-                        variant_offer = {
-                            "@type": "Offer",
-                            "name": parsed["name"],
-                            "price": parsed.get("price", ""),
-                            "priceCurrency": currency,
-                        }
+            # Get currency from schema offers or default to USD
+            currency = "USD"
+            if "offers" in schema and isinstance(schema["offers"], dict):
+                currency = schema["offers"].get("priceCurrency", "USD")
+
+            variant_offers = []
+            for dimension in VariantMatrix.from_directive(variants).dimensions:
+                for option in dimension:
+                    variant_offer = {
+                        "@type": "Offer",
+                        "name": option.label,
+                        "price": option.price or "",
+                        "priceCurrency": currency,
+                    }
 
-                        if parsed.get("sku"):
-                            variant_offer["sku"] = parsed["sku"]
-
-                        # Map stock to availability
-                        if parsed.get("stock") is not None:
-                            stock_num = parsed["stock"]
-                            if stock_num > 0:
-                                variant_offer["availability"] = (
-                                    "https://schema.org/InStock"
-                                )
-                                variant_offer["inventoryLevel"] = {
-                                    "@type": "QuantitativeValue",
-                                    "value": stock_num,
-                                }
-                            else:
-                                variant_offer["availability"] = (
-                                    "https://schema.org/OutOfStock"
-                                )
+                    if option.sku:
+                        variant_offer["sku"] = option.sku
+
+                    # Map stock to availability
+                    if option.stock != UNKNOWN_STOCK:
+                        if option.stock > 0:
+                            variant_offer["availability"] = "https://schema.org/InStock"
+                            variant_offer["inventoryLevel"] = {
+                                "@type": "QuantitativeValue",
+                                "value": option.stock,
+                            }
+                        else:
+                            variant_offer["availability"] = (
+                                "https://schema.org/OutOfStock"
+                            )
 
-                        variant_offers.append(variant_offer)
+                    variant_offers.append(variant_offer)
 
-                if variant_offers:
-                    # Convert single offer to array and add variants
-                    if "offers" in schema and not isinstance(schema["offers"], list):
-                        schema["offers"] = [schema["offers"]] + variant_offers
-                    else:
-                        schema["offers"] = variant_offers
+            if variant_offers:
+                # Convert single offer to array and add variants
+                if "offers" in schema and not isinstance(schema["offers"], list):
+                    schema["offers"] = [schema["offers"]] + variant_offers
+                else:
+                    schema["offers"] = variant_offers
 
         # === SUBSCRIPTION ===
         # Map to schema.org Offer with priceSpecification
@@ -428,41 +434,7 @@ class SchemaBridge:
         Format: "Name: Price | Key: Value | Key: Value"
         Example: "Obsidian / 128GB: 999.00 | SKU: GA05843-128-OBS | Stock: 22"
         """
-
-        result: dict[str, Any] = {}
-        parts = [p.strip() for p in option.split("|")]
-
-        if not parts:
-            return result
-
-        # First part: "Name: Price"
-        first = parts[0]
-        if ":" in first:
-            name_part, price_part = first.split(":", 1)
-            result["name"] = name_part.strip()
-            result["price"] = price_part.strip()
-        else:
-            result["name"] = first.strip()
-
-        # Remaining parts: "Key: Value"
-        for part in parts[1:]:
-            if ":" not in part:
-                continue
-            key, value = part.split(":", 1)
-            key = key.strip().lower()
-            value = value.strip()
-
-            if key == "sku":
-                result["sku"] = value
-            elif key == "stock":
-                # Extract number
-                match = re.search(r"\d+", value)
-                if match:
-                    result["stock"] = (
-                        match.group()
-                    )  # Store as string to match dict[str, str]
-
-        return result
+        return parse_option_text(option)
 
     def _parse_subscription_plan(self, plan: str) -> dict[str, str]:
         """
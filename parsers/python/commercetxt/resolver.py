@@ -7,13 +7,24 @@ FIX: Robust Windows drive letter detection to prevent false positives.
 
 from __future__ import annotations
 
+import os
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Collection, Iterator, Mapping
+from pathlib import Path
 from typing import Any
 
 from .model import ParseResult
 from .security import is_safe_url
 
+# Sections whose items link a file to its children.
+LINK_SECTIONS = ("CATALOG", "ITEMS")
+
+# Sections that describe a file's own listing. Children do not inherit them.
+LOCAL_SECTIONS = ("CATALOG", "ITEMS", "FILTERS")
+
+# Files with no linking parent inherit from this file in their directory.
+ROOT_FILE = "commerce.txt"
+
 
 class CommerceTXTResolver:
     """
@@ -121,6 +132,74 @@ class CommerceTXTResolver:
         return result
 
 
+def link_targets(result: ParseResult, path: Path, root: Path) -> Iterator[Path]:
+    """
+    Local files named in @CATALOG / @ITEMS of the file at path.
+    "/x" is relative to root, "x" to the file's directory. URLs are skipped.
+    """
+    for section in LINK_SECTIONS:
+        data = result.directives.get(section)
+        items = data.get("items", []) if isinstance(data, dict) else []
+        for item in items:
+            target = item.get("path") if isinstance(item, dict) else None
+            if not isinstance(target, str) or ":" in target:
+                continue
+            base = root if target.startswith("/") else path.parent
+            yield Path(os.path.normpath(base / target.lstrip("/")))
+
+
+def link_parents(
+    links: Mapping[Path, Collection[Path]], files: Collection[Path]
+) -> dict[Path, Path]:
+    """
+    Parent of each file: the first file (by path) that links to it,
+    else commerce.txt in its own directory.
+    """
+    parents: dict[Path, Path] = {}
+    for path in sorted(links):
+        for child in links[path]:
+            if child != path and child in files:
+                parents.setdefault(child, path)
+    for path in files:
+        if path in parents or path.name == ROOT_FILE:
+            continue
+        fallback = path.parent / ROOT_FILE
+        if fallback in files:
+            parents[path] = fallback
+    return parents
+
+
+def ancestors(path: Path, parents: Mapping[Path, Path]) -> list[Path]:
+    """
+    Parents of path up to the top. Stops at the first repeat, so cycles
+    end. path is in the result only when it is part of a cycle.
+    """
+    chain: list[Path] = []
+    seen = {path}
+    parent = parents.get(path)
+    while parent is not None:
+        chain.append(parent)
+        if parent in seen:
+            break
+        seen.add(parent)
+        parent = parents.get(parent)
+    return chain
+
+
+def inherit(parent: ParseResult, child: ParseResult) -> ParseResult:
+    """
+    Merge a resolved parent into a child file.
+    The child keeps its own level, source and listing sections.
+    """
+    merged = CommerceTXTResolver().merge(parent, child)
+    for section in LOCAL_SECTIONS:
+        if section not in child.directives:
+            merged.directives.pop(section, None)
+    merged.level = child.level
+    merged.source_file = child.source_file
+    return merged
+
+
 # =============================================================================
 # FIX #3: Robust Windows Drive Letter Detection
 # =============================================================================
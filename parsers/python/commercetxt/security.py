@@ -6,7 +6,6 @@ Protect the internal perimeter.
 
 import ipaddress
 import re
-import socket
 from functools import lru_cache
 from urllib.parse import urlparse
 
@@ -81,6 +80,9 @@ def _resolve_host(host: str) -> str | None:
 
     Performance: ~1000x faster for repeated checks of the same host.
     """
+    # Imported on first lookup. Parsing and validation never resolve hosts.
+    import socket
+
     try:
         return socket.gethostbyname(host)
     except (socket.gaierror, ValueError):
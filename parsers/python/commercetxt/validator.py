@@ -3,21 +3,40 @@
 Main validator facade. Delegates to focused sub-validators.
 """
 
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
 from .logging_config import get_logger
 from .metrics import get_metrics
 from .model import ParseResult
 from .validators import AttributeValidator, CoreValidator, PolicyValidator
+from .validators.corpus import DEFAULT_TOP_FILES, iter_validate, validate_corpus
+
+if TYPE_CHECKING:
+    from .validators.incremental import ValidationCache
 
 
 class CommerceTXTValidator:
     """
     Main validator orchestrator.
     Delegates to specialized validators for better organization.
+
+    Pass a ValidationCache to validate incrementally: rules whose input
+    sections are unchanged replay their stored result instead of re-running.
     """
 
-    def __init__(self, strict: bool = False, logger=None):
+    def __init__(
+        self,
+        strict: bool = False,
+        logger=None,
+        cache: ValidationCache | None = None,
+    ):
         self.strict = strict
         self.logger = logger or get_logger(__name__)
+        self.cache = cache
 
         # Initialize sub-validators
         self.core = CoreValidator(strict=strict, logger=self.logger)
@@ -33,9 +52,19 @@ class CommerceTXTValidator:
         self.logger.debug("Starting validation")
 
         # Delegate to specialized validators
-        self.core.validate(result)
-        self.attributes.validate(result)
-        self.policies.validate(result)
+        if self.cache is None:
+            self.core.validate(result)
+            self.attributes.validate(result)
+            self.policies.validate(result)
+        else:
+            from .validators.incremental import run_incremental
+
+            run_incremental(
+                (self.core, self.attributes, self.policies),
+                result,
+                self.cache,
+                strict=self.strict,
+            )
 
         if result.errors:
             self.logger.error(f"Validation failed with {len(result.errors)} errors")
@@ -47,3 +76,38 @@ class CommerceTXTValidator:
         metrics.gauge("validation_warnings", len(result.warnings))
 
         return result
+
+    def validate_many(
+        self,
+        results_or_paths: Iterable[ParseResult | str | Path],
+        workers: int | None = None,
+        on_outcome: Callable[[dict], None] | None = None,
+        top_n: int = DEFAULT_TOP_FILES,
+    ) -> dict[str, Any]:
+        """
+        Validate a whole corpus and return an aggregated report.
+
+        Paths are parsed inside the workers. With workers > 1 the corpus is
+        spread over a process pool; ParseResults are then validated as copies.
+        Per-file outcomes stream to on_outcome as they finish.
+
+        Example:
+            validator = CommerceTXTValidator()
+            report = validator.validate_many(Path("shop").rglob("*.txt"), workers=8)
+            print(report["error_types"], report["trust_flags"])
+        """
+        return validate_corpus(
+            results_or_paths,
+            workers=workers,
+            strict=self.strict,
+            on_outcome=on_outcome,
+            top_n=top_n,
+        )
+
+    def iter_validate_many(
+        self,
+        results_or_paths: Iterable[ParseResult | str | Path],
+        workers: int | None = None,
+    ):
+        """Yield per-file outcomes in completion order. See validate_many()."""
+        return iter_validate(results_or_paths, workers=workers, strict=self.strict)
@@ -3,8 +3,22 @@ Validator package for CommerceTXT.
 Split into 3 focused modules: Core, Attributes, Policies.
 """
 
+from typing import TYPE_CHECKING, Any
+
 from .attributes import AttributeValidator
 from .core import CoreValidator
 from .policies import PolicyValidator
 
-__all__ = ["CoreValidator", "AttributeValidator", "PolicyValidator"]
+if TYPE_CHECKING:
+    from .incremental import ValidationCache
+
+__all__ = ["CoreValidator", "AttributeValidator", "PolicyValidator", "ValidationCache"]
+
+
+def __getattr__(name: str) -> Any:
+    # ValidationCache loads hashlib. Plain validation never needs it.
+    if name == "ValidationCache":
+        from .incremental import ValidationCache
+
+        return ValidationCache
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
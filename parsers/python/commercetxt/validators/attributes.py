@@ -25,18 +25,28 @@ class AttributeValidator:
 
     TRUSTED_REVIEW_DOMAINS: ClassVar[list[str]] = TRUSTED_REVIEW_DOMAINS
 
+    # Rules in run order. Each lists the sections it reads.
+    # @VARIANTS checks prices against @OFFER and names against @PRODUCT.
+    RULE_DEPENDENCIES: ClassVar[dict[str, tuple[str, ...]]] = {
+        "_validate_specs": ("SPECS",),
+        "_validate_images": ("IMAGES",),
+        "_validate_reviews": ("REVIEWS",),
+        "_validate_compatibility": ("COMPATIBILITY",),
+        "_validate_in_the_box": ("IN_THE_BOX",),
+        "_validate_variants": ("VARIANTS", "OFFER", "PRODUCT"),
+    }
+
+    # Rules that read the clock. Never cached.
+    VOLATILE_RULES: ClassVar[frozenset[str]] = frozenset()
+
     def __init__(self, strict: bool = False, logger=None):
         self.strict = strict
         self.logger = logger or get_logger(__name__)
 
     def validate(self, result: ParseResult) -> None:
         """Run all attribute validations."""
-        self._validate_specs(result)
-        self._validate_images(result)
-        self._validate_reviews(result)
-        self._validate_compatibility(result)
-        self._validate_in_the_box(result)
-        self._validate_variants(result)
+        for rule in self.RULE_DEPENDENCIES:
+            getattr(self, rule)(result)
 
     def _validate_specs(self, result: ParseResult) -> None:
         """Validates @SPECS (Spec Section 4.15)."""
@@ -35,16 +35,28 @@ class CoreValidator:
     VALID_CONDITION: ClassVar[set[str]] = VALID_CONDITION
     VALID_STOCK_STATUS: ClassVar[set[str]] = VALID_STOCK_STATUS
 
+    # Rules in run order. Each lists the sections it reads.
+    RULE_DEPENDENCIES: ClassVar[dict[str, tuple[str, ...]]] = {
+        "_validate_identity": ("IDENTITY", "PRODUCT", "ITEMS"),
+        "_validate_product": ("PRODUCT",),
+        "_validate_offer": ("OFFER",),
+        "_validate_inventory": ("INVENTORY",),
+    }
+
+    # Rules that read the clock. Never cached.
+    VOLATILE_RULES: ClassVar[frozenset[str]] = frozenset({"_validate_inventory"})
+
+    # Messages carry "Line N:" prefixes from source_map.
+    LINE_NUMBERS: ClassVar[bool] = True
+
     def __init__(self, strict: bool = False, logger=None):
         self.strict = strict
         self.logger = logger or get_logger(__name__)
 
     def validate(self, result: ParseResult) -> None:
         """Run all core validations."""
-        self._validate_identity(result)
-        self._validate_product(result)
-        self._validate_offer(result)
-        self._validate_inventory(result)
+        for rule in self.RULE_DEPENDENCIES:
+            getattr(self, rule)(result)
 
     def _validate_identity(self, result: ParseResult) -> None:
         """Validates @IDENTITY (Spec Section 4.1)."""
@@ -0,0 +1,195 @@
+"""
+Corpus validation: many files, one report.
+Stream the outcomes. Keep the totals. Memory stays flat.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from ..model import ParseResult
+from ..parallel import iter_unordered
+
+# Default number of worst files kept in the report.
+DEFAULT_TOP_FILES = 10
+
+_LINE_PREFIX_RE = re.compile(r"^Line \d+:\s*")
+_TRAILING_VALUE_RE = re.compile(r"^([^:'\"]{1,60}): .+$", re.DOTALL)
+_QUOTED_RE = re.compile(r"(?<!required )(?<!recommended )'[^']*'")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def message_type(message: str) -> str:
+    """
+    Reduce a validation message to its type.
+
+    Line numbers, free-form values and numbers are dropped so that
+    "Line 12: Invalid Availability: Foo" and "Invalid Availability: Bar"
+    count as the same issue. Field names after "required"/"recommended"
+    are kept because they tell the issues apart.
+    """
+    text = _LINE_PREFIX_RE.sub("", message.strip())
+    trailing = _TRAILING_VALUE_RE.match(text)
+    if trailing:
+        text = trailing.group(1)
+    text = _QUOTED_RE.sub("'…'", text)
+    return _NUMBER_RE.sub("N", text)
+
+
+def validate_item(item: ParseResult | str | Path, strict: bool = False) -> dict:
+    """
+    Validate one corpus entry and return a compact outcome.
+
+    Module-level so it can run in a process pool.
+    Load and validator failures become errors. They never stop the batch.
+    """
+    # Import here to avoid circular dependency
+    from ..validator import CommerceTXTValidator
+
+    start_cpu = time.process_time()
+
+    if isinstance(item, ParseResult):
+        result = item
+        source = item.source_file or "<memory>"
+    else:
+        source = str(item)
+        try:
+            from ..parser import parse_file
+
+            result = parse_file(item)
+        except Exception as e:
+            return {
+                "source": source,
+                "valid": False,
+                "errors": [f"Failed to load {source}: {e!s}"],
+                "warnings": [],
+                "trust_flags": [],
+                "cpu_time": time.process_time() - start_cpu,
+            }
+
+    try:
+        CommerceTXTValidator(strict=strict).validate(result)
+    except ValueError as ve:
+        # Strict mode stops at the first error. Record it like the CLI does.
+        result.errors.append(str(ve))
+    except Exception as e:
+        result.errors.append(f"Failed to validate {source}: {e!s}")
+
+    return {
+        "source": source,
+        "valid": not result.errors,
+        "errors": list(result.errors),
+        "warnings": list(result.warnings),
+        "trust_flags": list(result.trust_flags),
+        "cpu_time": time.process_time() - start_cpu,
+    }
+
+
+def iter_validate(
+    items: Iterable[ParseResult | str | Path],
+    workers: int | None = None,
+    strict: bool = False,
+) -> Iterator[dict]:
+    """
+    Yield per-file outcomes as they finish.
+    See iter_unordered() for how workers are used.
+    """
+    return iter_unordered(validate_item, items, workers, (strict,))
+
+
+class CorpusReport:
+    """
+    Aggregates validation outcomes.
+
+    Holds counters and a bounded heap only. Per-file messages are
+    reduced to counts as they arrive, so memory does not grow with
+    the number of files.
+    """
+
+    def __init__(self, top_n: int = DEFAULT_TOP_FILES):
+        self.top_n = top_n
+        self.files = 0
+        self.valid_files = 0
+        self.total_errors = 0
+        self.total_warnings = 0
+        self.error_types: Counter[str] = Counter()
+        self.warning_types: Counter[str] = Counter()
+        self.trust_flags: Counter[str] = Counter()
+        self.cpu_time = 0.0
+        self.wall_time = 0.0
+        # Min-heap of (errors, warnings, seq, source). Smallest is evicted.
+        self._worst: list[tuple[int, int, int, str]] = []
+
+    def add(self, outcome: dict) -> None:
+        """Fold one outcome into the totals."""
+        errors = outcome.get("errors", [])
+        warnings = outcome.get("warnings", [])
+
+        self.files += 1
+        if outcome.get("valid"):
+            self.valid_files += 1
+        self.total_errors += len(errors)
+        self.total_warnings += len(warnings)
+        self.error_types.update(message_type(m) for m in errors)
+        self.warning_types.update(message_type(m) for m in warnings)
+        self.trust_flags.update(set(outcome.get("trust_flags", [])))
+        self.cpu_time += outcome.get("cpu_time", 0.0)
+
+        if self.top_n <= 0 or not (errors or warnings):
+            return
+
+        entry = (len(errors), len(warnings), -self.files, outcome.get("source", ""))
+        if len(self._worst) < self.top_n:
+            heapq.heappush(self._worst, entry)
+        elif entry > self._worst[0]:
+            heapq.heapreplace(self._worst, entry)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the aggregated report."""
+        worst = sorted(self._worst, reverse=True)
+        return {
+            "files": self.files,
+            "valid_files": self.valid_files,
+            "invalid_files": self.files - self.valid_files,
+            "total_errors": self.total_errors,
+            "total_warnings": self.total_warnings,
+            "error_types": dict(self.error_types.most_common()),
+            "warning_types": dict(self.warning_types.most_common()),
+            "trust_flags": dict(self.trust_flags.most_common()),
+            "worst_files": [
+                {"source": source, "errors": errors, "warnings": warnings}
+                for errors, warnings, _, source in worst
+            ],
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+        }
+
+
+def validate_corpus(
+    items: Iterable[ParseResult | str | Path],
+    workers: int | None = None,
+    strict: bool = False,
+    on_outcome: Callable[[dict], None] | None = None,
+    top_n: int = DEFAULT_TOP_FILES,
+) -> dict[str, Any]:
+    """
+    Validate a corpus and return the aggregated report.
+
+    on_outcome receives each per-file outcome as soon as it is ready.
+    """
+    report = CorpusReport(top_n=top_n)
+    start = time.perf_counter()
+
+    for outcome in iter_validate(items, workers=workers, strict=strict):
+        report.add(outcome)
+        if on_outcome:
+            on_outcome(outcome)
+
+    report.wall_time = time.perf_counter() - start
+    return report.to_dict()
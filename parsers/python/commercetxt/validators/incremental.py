@@ -0,0 +1,238 @@
+"""
+Incremental validation.
+Hash each section. Re-run only the rules whose inputs changed.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from ..model import ParseResult
+
+# Default number of rule outcomes kept in a ValidationCache.
+DEFAULT_CACHE_SIZE = 4096
+
+
+class RuleOutcome(NamedTuple):
+    """What one rule reported for one set of inputs."""
+
+    errors: tuple[str, ...]
+    warnings: tuple[str, ...]
+    trust_flags: tuple[str, ...]
+    # Strict mode only: the message the rule raised with.
+    raised: str | None = None
+
+
+def section_digest(section: Any) -> bytes | None:
+    """
+    Content hash of one directive section. Missing sections hash to None.
+
+    Hashes repr(): the parser emits keys in file order, so the same text
+    gives the same digest. Reordered keys only cost a cache miss.
+    """
+    if section is None:
+        return None
+    return hashlib.blake2b(repr(section).encode("utf-8"), digest_size=16).digest()
+
+
+class ValidationCache:
+    """
+    LRU store of rule outcomes keyed by the content of their inputs.
+    Holds single rule outcomes and whole-validator blocks of them.
+
+    Keys are content based, so one cache can be shared by many files
+    and many validator instances.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got: {max_size}")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Any:
+        outcome = self._entries.get(key)
+        if outcome is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return outcome
+
+    def put(self, key: tuple, outcome: Any) -> None:
+        self._entries[key] = outcome
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def run_incremental(
+    validators: tuple[Any, ...],
+    result: ParseResult,
+    cache: ValidationCache,
+    strict: bool = False,
+) -> None:
+    """
+    Run every rule of every sub-validator against result.
+
+    Keys are built from the digests of the sections named in
+    RULE_DEPENDENCIES, the file level and, for validators that put line
+    numbers in messages, the source lines of those sections.
+
+    Two levels. If no section a validator reads has changed, one lookup
+    replays all its rules. Otherwise each rule is looked up on its own,
+    so a change to @INVENTORY re-runs only the rules that read it.
+    VOLATILE_RULES always run live, in their usual place.
+
+    Replayed messages are not logged again.
+    """
+    state = _RunState(result, strict)
+
+    for validator in validators:
+        plan = _rule_plan(type(validator))
+        block_key = state.key(type(validator).__name__, plan.sections, plan.lines)
+        block = cache.get(block_key)
+
+        if block is None:
+            cache.put(block_key, _run_rules(validator, plan, state, cache))
+            continue
+
+        for (rule, _, volatile), outcome in zip(plan.rules, block, strict=True):
+            if volatile:
+                getattr(validator, rule)(result)
+            else:
+                _apply(outcome, result)
+
+
+class _Plan(NamedTuple):
+    """Rules of one validator class, in run order."""
+
+    # One (rule, sections, volatile) entry per rule.
+    rules: tuple[tuple[str, tuple[str, ...], bool], ...]
+    # Every section read by a non-volatile rule.
+    sections: tuple[str, ...]
+    # Whether messages embed source line numbers.
+    lines: bool
+
+
+@functools.cache
+def _rule_plan(cls: type) -> _Plan:
+    volatile = getattr(cls, "VOLATILE_RULES", frozenset())
+    rules = tuple(
+        (rule, tuple(sections), rule in volatile)
+        for rule, sections in cls.RULE_DEPENDENCIES.items()
+    )
+    sections = {
+        name for _, deps, is_volatile in rules if not is_volatile for name in deps
+    }
+    return _Plan(rules, tuple(sorted(sections)), getattr(cls, "LINE_NUMBERS", False))
+
+
+class _RunState:
+    """Digests computed once per validate() call."""
+
+    def __init__(self, result: ParseResult, strict: bool):
+        self.result = result
+        self.strict = strict
+        self._digests: dict[str, bytes] = {}
+
+    def key(self, name: str, sections: tuple[str, ...], lines: bool) -> tuple:
+        directives = self.result.directives
+        digests = self._digests
+        parts: list[Any] = [name, self.strict, self.result.level]
+        for section in sections:
+            if section not in directives:
+                parts.append(None)
+            elif section in digests:
+                parts.append(digests[section])
+            else:
+                digest = digests[section] = section_digest(directives[section])
+                parts.append(digest)
+        if lines:
+            parts.append(_source_lines(self.result.source_map, sections))
+        return tuple(parts)
+
+
+def _run_rules(
+    validator: Any, plan: _Plan, state: _RunState, cache: ValidationCache
+) -> tuple[RuleOutcome | None, ...]:
+    """
+    Block miss: look up each rule on its own.
+
+    Returns the outcomes in plan order, None for volatile rules.
+    A strict error propagates before the block is stored.
+    """
+    result = state.result
+    owner = type(validator).__name__
+    outcomes: list[RuleOutcome | None] = []
+
+    for rule, sections, volatile in plan.rules:
+        if volatile:
+            getattr(validator, rule)(result)
+            outcomes.append(None)
+            continue
+
+        key = state.key(f"{owner}.{rule}", sections, plan.lines)
+        outcome = cache.get(key)
+        if outcome is None:
+            outcome = _run_rule(getattr(validator, rule), result, state.strict)
+            cache.put(key, outcome)
+
+        _apply(outcome, result)
+        outcomes.append(outcome)
+
+    return tuple(outcomes)
+
+
+def _apply(outcome: RuleOutcome, result: ParseResult) -> None:
+    """Replay a stored outcome. Strict errors raise again."""
+    if outcome.errors:
+        result.errors.extend(outcome.errors)
+    if outcome.warnings:
+        result.warnings.extend(outcome.warnings)
+    if outcome.trust_flags:
+        result.trust_flags.extend(outcome.trust_flags)
+    if outcome.raised is not None:
+        raise ValueError(outcome.raised)
+
+
+def _run_rule(method: Any, result: ParseResult, strict: bool) -> RuleOutcome:
+    """Run one rule against a scratch copy and capture what it reports."""
+    scratch = dataclasses.replace(result, errors=[], warnings=[], trust_flags=[])
+    raised = None
+    try:
+        method(scratch)
+    except ValueError as e:
+        if not strict:
+            raise
+        raised = str(e)
+    return RuleOutcome(
+        tuple(scratch.errors),
+        tuple(scratch.warnings),
+        tuple(scratch.trust_flags),
+        raised,
+    )
+
+
+def _source_lines(source_map: dict[str, int], sections: tuple[str, ...]) -> tuple:
+    """source_map entries of the given sections. Messages may embed them."""
+    return tuple(
+        item for item in source_map.items() if item[0].partition(".")[0] in sections
+    )
@@ -5,6 +5,7 @@ These define store-level policies and are typically in Root files.
 
 import re
 from datetime import datetime, timezone
+from typing import ClassVar
 
 from ..logging_config import get_logger
 from ..model import ParseResult
@@ -29,25 +30,34 @@ class PolicyValidator:
     - @BRAND_VOICE: Communication style
     """
 
+    # Rules in run order. Each lists the sections it reads.
+    RULE_DEPENDENCIES: ClassVar[dict[str, tuple[str, ...]]] = {
+        "_validate_shipping": ("SHIPPING",),
+        "_validate_payment": ("PAYMENT",),
+        "_validate_policies": ("POLICIES",),
+        "_validate_support": ("SUPPORT",),
+        "_validate_locales": ("LOCALES",),
+        "_validate_catalog": ("CATALOG",),
+        "_validate_filters": ("FILTERS",),
+        "_validate_subscription": ("SUBSCRIPTION",),
+        "_validate_age_restriction": ("AGE_RESTRICTION",),
+        "_validate_semantic_logic": ("SEMANTIC_LOGIC",),
+        "_validate_promos": ("PROMOS",),
+        "_validate_brand_voice": ("BRAND_VOICE",),
+        "_validate_items": ("ITEMS",),
+    }
+
+    # Rules that read the clock. Never cached.
+    VOLATILE_RULES: ClassVar[frozenset[str]] = frozenset({"_validate_promos"})
+
     def __init__(self, strict: bool = False, logger=None):
         self.strict = strict
         self.logger = logger or get_logger(__name__)
 
     def validate(self, result: ParseResult) -> None:
         """Run all policy validations."""
-        self._validate_shipping(result)
-        self._validate_payment(result)
-        self._validate_policies(result)
-        self._validate_support(result)
-        self._validate_locales(result)
-        self._validate_catalog(result)
-        self._validate_filters(result)
-        self._validate_subscription(result)
-        self._validate_age_restriction(result)
-        self._validate_semantic_logic(result)
-        self._validate_promos(result)
-        self._validate_brand_voice(result)
-        self._validate_items(result)
+        for rule in self.RULE_DEPENDENCIES:
+            getattr(self, rule)(result)
 
     def _validate_shipping(self, result: ParseResult) -> None:
         """Validates @SHIPPING (Spec Section 4.12)."""
@@ -0,0 +1,404 @@
+"""
+Shared @VARIANTS model.
+One option grammar, one column layout. The validator, the RAG generator
+and the schema bridge each build a VariantMatrix from the section they
+are given; the validator reads it in dict_only mode.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple
+
+# Stock value for options that do not state one.
+UNKNOWN_STOCK = -1
+
+# Price is absolute ("999.00") or a modifier ("+50.00", "-20.00").
+PRICE_PATTERN = re.compile(r"^([+\-]?)(\d+\.?\d*)$")
+
+_STOCK_PATTERN = re.compile(r"\d+")
+
+
+def parse_option_text(option: str) -> dict[str, Any]:
+    """
+    Parse a text variant option.
+
+    Format: "Name: Price | Key: Value | Key: Value"
+    Example: "Obsidian / 128GB: 999.00 | SKU: GA05843-128-OBS | Stock: 22"
+
+    Returns name, price, sku, stock (digits as text), hex_color and note,
+    each only when present.
+    """
+    result: dict[str, Any] = {}
+    parts = [p.strip() for p in option.split("|")]
+
+    # First part: "Name: Price"
+    first = parts[0]
+    if ":" in first:
+        name_part, price_part = first.split(":", 1)
+        result["name"] = name_part.strip()
+        result["price"] = price_part.strip()
+    else:
+        result["name"] = first.strip()
+
+    # Remaining parts: "Key: Value"
+    for part in parts[1:]:
+        if ":" not in part:
+            continue
+        key, value = part.split(":", 1)
+        key = key.strip().lower()
+        value = value.strip()
+
+        if key == "sku":
+            result["sku"] = value
+        elif key == "stock":
+            # Extract number from "22" or "22 units"
+            match = _STOCK_PATTERN.search(value)
+            if match:
+                result["stock"] = match.group()
+        elif key == "hex":
+            result["hex_color"] = value
+        elif key == "note":
+            result["note"] = value
+
+    return result
+
+
+def split_label(label: str) -> list[str]:
+    """Split a flattened label. "Obsidian / 128GB" -> ["Obsidian", "128GB"]."""
+    return [part.strip() for part in label.split("/")]
+
+
+class VariantOption(NamedTuple):
+    """One row of a dimension. Built on demand."""
+
+    label: str
+    price: str | None
+    stock: int
+    sku: str | None
+    hex_color: str | None
+    note: str | None
+    source: Any
+
+
+class VariantDimension:
+    """
+    One variant dimension (a Type) held as parallel columns.
+
+    Text columns are tuples. Numeric columns are arrays:
+    amounts ('d', NaN when the price is missing or malformed),
+    modifiers ('b', +1/-1 for "+x"/"-x", 0 for absolute prices) and
+    stocks ('q', UNKNOWN_STOCK when absent).
+
+    SKU, stock, hex and note columns are read on first access. The
+    validator only needs labels and prices.
+
+    Options that could not be read are kept in `skipped` as
+    (position, type) so validators can report them.
+
+    dict_only reads options the way the validator does: text options are
+    skipped, and dicts without a name are labelled "Option N".
+    """
+
+    __slots__ = (
+        "_details",
+        "_hex_colors",
+        "_notes",
+        "_skus",
+        "_stocks",
+        "amounts",
+        "labels",
+        "modifiers",
+        "name",
+        "positions",
+        "prices",
+        "size",
+        "skipped",
+        "sources",
+    )
+
+    def __init__(self, name: Any, options: Iterable[Any], dict_only: bool = False):
+        self.name = name
+
+        labels: list[str] = []
+        prices: list[str | None] = []
+        sources: list[Any] = []
+        # Per row: the source dict, or (sku, stock, hex, note) for text.
+        details: list[Any] = []
+        amounts: list[float] = []
+        modifiers: list[int] = []
+        positions: list[int] = []
+        skipped: list[tuple[int, type]] = []
+        # Modifiers like "+0" repeat across options. Parse each text once.
+        parsed_prices: dict[Any, tuple[float, int]] = {}
+        size = 0
+
+        for position, option in enumerate(options):
+            size += 1
+            if isinstance(option, dict):
+                label = option.get("name") or option.get("value")
+                if label is None and dict_only:
+                    label = f"Option {position}"
+                price = option.get("path") or option.get("value")
+                detail: Any = option
+            elif not dict_only and isinstance(option, str):
+                label, price, detail = _text_option(option)
+            else:
+                skipped.append((position, type(option)))
+                continue
+
+            if label is None:
+                skipped.append((position, type(option)))
+                continue
+
+            parsed = parsed_prices.get(price)
+            if parsed is None:
+                parsed = parsed_prices[price] = _parse_price(price)
+
+            labels.append(label)
+            prices.append(price)
+            sources.append(option)
+            details.append(detail)
+            amounts.append(parsed[0])
+            modifiers.append(parsed[1])
+            positions.append(position)
+
+        self.labels = tuple(labels)
+        self.prices = tuple(prices)
+        self.sources = tuple(sources)
+        self.amounts = array("d", amounts)
+        self.modifiers = array("b", modifiers)
+        self.positions = array("l", positions)
+        self.skipped = tuple(skipped)
+        # Raw option count, readable or not.
+        self.size = size
+
+        self._details = details
+        self._skus: tuple[str | None, ...] | None = None
+        self._stocks: array | None = None
+        self._hex_colors: tuple[str | None, ...] | None = None
+        self._notes: tuple[str | None, ...] | None = None
+
+    @property
+    def skus(self) -> tuple[str | None, ...]:
+        if self._skus is None:
+            self._read_details()
+        return self._skus
+
+    @property
+    def stocks(self) -> array:
+        """Stock per option ('q' array). UNKNOWN_STOCK when absent."""
+        if self._stocks is None:
+            self._read_details()
+        return self._stocks
+
+    @property
+    def hex_colors(self) -> tuple[str | None, ...]:
+        if self._hex_colors is None:
+            self._read_details()
+        return self._hex_colors
+
+    @property
+    def notes(self) -> tuple[str | None, ...]:
+        if self._notes is None:
+            self._read_details()
+        return self._notes
+
+    def _read_details(self) -> None:
+        rows = [
+            detail if isinstance(detail, tuple) else _dict_details(detail)
+            for detail in self._details
+        ]
+        skus, stocks, hex_colors, notes = (
+            zip(*rows, strict=True) if rows else ((), (), (), ())
+        )
+        self._skus = tuple(skus)
+        self._stocks = array(
+            "q", (UNKNOWN_STOCK if stock is None else int(stock) for stock in stocks)
+        )
+        self._hex_colors = tuple(hex_colors)
+        self._notes = tuple(notes)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __iter__(self) -> Iterator[VariantOption]:
+        for i in range(len(self.labels)):
+            yield self.option(i)
+
+    def option(self, i: int) -> VariantOption:
+        return VariantOption(
+            self.labels[i],
+            self.prices[i],
+            self.stocks[i],
+            self.skus[i],
+            self.hex_colors[i],
+            self.notes[i],
+            self.sources[i],
+        )
+
+    def final_price(self, i: int, base_price: float) -> float:
+        """Price of option i. Modifiers apply to base_price. NaN if unreadable."""
+        amount = self.amounts[i]
+        modifier = self.modifiers[i]
+        return base_price + modifier * amount if modifier else amount
+
+    def price_deltas(self, base_price: float) -> array:
+        """Difference from base_price for every option ('d' array)."""
+        return array(
+            "d",
+            (
+                modifier * amount if modifier else amount - base_price
+                for amount, modifier in zip(self.amounts, self.modifiers, strict=True)
+            ),
+        )
+
+    def in_stock(self) -> list[int]:
+        """Indexes of options with stock above zero."""
+        return [i for i, stock in enumerate(self.stocks) if stock > 0]
+
+
+class VariantMatrix:
+    """
+    All dimensions of one product.
+
+    The Cartesian product is never built. `combinations` is a count,
+    and `availability()` only holds the combinations a file lists.
+    """
+
+    __slots__ = ("dimensions",)
+
+    def __init__(self, dimensions: Iterable[VariantDimension]):
+        self.dimensions = tuple(dimensions)
+
+    @classmethod
+    def from_groups(
+        cls, groups: Iterable[dict[str, Any]], dict_only: bool = False
+    ) -> VariantMatrix:
+        """Build from [{"type": ..., "options": [...]}, ...] groups."""
+        return cls(
+            VariantDimension(group.get("type"), group.get("options", []), dict_only)
+            for group in groups
+        )
+
+    @classmethod
+    def from_directive(
+        cls, variants_data: Any, dict_only: bool = False
+    ) -> VariantMatrix:
+        """
+        Build from a @VARIANTS section.
+
+        Handles both layouts:
+        1. Single dimension: Type: Storage, Options: [...]
+        2. Several dimensions: an items list of Type entries, each
+           followed by its options
+        """
+        if not isinstance(variants_data, dict):
+            return cls(())
+        return cls.from_groups(variant_groups(variants_data), dict_only)
+
+    def __len__(self) -> int:
+        return len(self.dimensions)
+
+    @property
+    def combinations(self) -> int:
+        """Size of the full Cartesian product. Counted, not built."""
+        return math.prod(len(d) for d in self.dimensions) if self.dimensions else 0
+
+    @property
+    def total_options(self) -> int:
+        return sum(len(d) for d in self.dimensions)
+
+    def availability(self) -> dict[tuple[str, ...], int]:
+        """
+        Stock per listed combination, keyed by label parts.
+
+        Flattened labels ("Obsidian / 128GB") name a combination directly.
+        Only listed combinations appear. Missing keys are not offered.
+        """
+        sparse: dict[tuple[str, ...], int] = {}
+        for dimension in self.dimensions:
+            for label, stock in zip(dimension.labels, dimension.stocks, strict=True):
+                sparse[tuple(split_label(label))] = stock
+        return sparse
+
+
+def variant_groups(variants_data: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Group a @VARIANTS section into [{"type", "options"}] without parsing.
+
+    Options without a Type (text-only feeds) form one unnamed group.
+    """
+    groups: list[dict[str, Any]] = []
+
+    # Format 1: Flat structure with Options (and usually Type) keys
+    if "Options" in variants_data:
+        groups.append(
+            {
+                "type": variants_data.get("Type"),
+                "options": variants_data.get("Options") or [],
+            }
+        )
+
+    # Format 2: Items list contains type/options pairs
+    current_type = None
+    for item in variants_data.get("items", []):
+        if isinstance(item, dict):
+            if "Type" in item or "type" in item:
+                current_type = item.get("Type") or item.get("type")
+                groups.append({"type": current_type, "options": []})
+            elif current_type and groups:
+                groups[-1]["options"].append(item)
+
+    return groups
+
+
+def _text_option(option: str) -> tuple[Any, Any, tuple[Any, ...]]:
+    """(name, price, (sku, stock, hex_color, note)) of a text option."""
+    fields = parse_option_text(option)
+    return (
+        fields.get("name"),
+        fields.get("price"),
+        (
+            fields.get("sku"),
+            fields.get("stock"),
+            fields.get("hex_color"),
+            fields.get("note"),
+        ),
+    )
+
+
+def _dict_details(option: dict[str, Any]) -> tuple[Any, ...]:
+    """
+    (sku, stock, hex_color, note) of a parser-shaped option.
+
+    The parser keeps key case from the file, so "SKU" and "sku" are
+    both read. Stock is reduced to its digits.
+    """
+    get = option.get
+    stock = get("Stock", get("stock"))
+    if stock is not None:
+        stock = str(stock)
+        if not stock.isdigit():
+            match = _STOCK_PATTERN.search(stock)
+            stock = match.group() if match else None
+    return (
+        get("SKU", get("sku")),
+        stock,
+        get("Hex", get("hex")),
+        get("Note", get("note")),
+    )
+
+
+def _parse_price(price: Any) -> tuple[float, int]:
+    """(amount, modifier sign) for a price string. NaN when unreadable."""
+    if price is None:
+        return math.nan, 0
+    match = PRICE_PATTERN.match(str(price).strip())
+    if not match:
+        return math.nan, 0
+    sign, amount = match.groups()
+    return float(amount), (1 if sign == "+" else -1 if sign == "-" else 0)
@@ -0,0 +1,231 @@
+"""
+Watch a merchant directory.
+Poll stat signatures. Re-check what changed and what inherits from it.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import stat
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .model import ParseResult
+from .parser import parse_file
+from .resolver import ancestors, inherit, link_parents, link_targets
+from .validator import CommerceTXTValidator
+from .validators.incremental import ValidationCache
+
+# Checks a watcher can run on each affected file.
+WATCH_ACTIONS = ("validate", "health")
+
+# Seconds between polls.
+DEFAULT_INTERVAL = 1.0
+
+# (mtime_ns, size, inode). Same signature, same file: it is not re-read.
+Signature = tuple[int, int, int]
+
+
+def scan(root: Path) -> dict[Path, Signature]:
+    """Stat signature of every .txt file under root."""
+    signatures = {}
+    for path in root.rglob("*.txt"):
+        try:
+            st = path.stat()
+        except OSError:
+            # Removed between listing and stat. The next poll sees it gone.
+            continue
+        if stat.S_ISREG(st.st_mode):
+            signatures[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return signatures
+
+
+class MerchantWatcher:
+    """
+    Keeps a merchant directory parsed, resolved and checked between polls.
+
+    A file inherits from the file that lists it in @CATALOG or @ITEMS,
+    else from commerce.txt in its own directory (see resolver.inherit).
+    Each poll() re-parses only files whose stat signature changed. A file
+    whose content really changed is re-resolved and re-checked along with
+    all its descendants.
+    Everything else keeps its result from the previous poll.
+
+    Signatures use nanosecond mtimes. On filesystems with coarse mtimes
+    an edit that keeps the size within the same tick can go unseen.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        actions: Iterable[str] = ("validate",),
+        strict: bool = False,
+    ):
+        self.root = Path(root).resolve()
+        if not self.root.is_dir():
+            raise NotADirectoryError(f"Not a directory: {self.root}")
+        self.actions = tuple(actions)
+        unknown = set(self.actions) - set(WATCH_ACTIONS)
+        if unknown:
+            raise ValueError(f"Unknown watch actions: {sorted(unknown)}")
+        self.strict = strict
+        self.polls = 0
+
+        self.signatures: dict[Path, Signature] = {}
+        # Raw parse per file, and the paths it links to.
+        self.parsed: dict[Path, ParseResult] = {}
+        self.links: dict[Path, tuple[Path, ...]] = {}
+        self.parents: dict[Path, Path] = {}
+        # Merged with every ancestor, before validation.
+        self.resolved: dict[Path, ParseResult] = {}
+        # Latest record per file.
+        self.records: dict[Path, dict[str, Any]] = {}
+
+        # Rules whose sections did not change replay across polls.
+        self._validator = CommerceTXTValidator(strict=strict, cache=ValidationCache())
+        self._health = None
+        if "health" in self.actions:
+            # Imported here: the RAG tools are only needed for health.
+            from .rag.tools.health_check import AIHealthChecker
+
+            self._health = AIHealthChecker()
+        # Files planned by a poll whose records were not consumed yet.
+        self._pending: dict[Path, str] = {}
+
+    def poll(self) -> Iterator[dict[str, Any]]:
+        """
+        Detect changes and yield one record per re-checked file.
+
+        Parents come before their children. The change set is computed
+        up front; the checks run as the records are consumed. Files not
+        reached before the next poll are carried over to it.
+        """
+        self.polls += 1
+        current = scan(self.root)
+        previous = self.signatures
+        self.signatures = current
+
+        removed = sorted(previous.keys() - current.keys())
+        for path in removed:
+            for store in (self.parsed, self.links, self.resolved, self.records):
+                store.pop(path, None)
+            self._pending.pop(path, None)
+
+        events = dict(self._pending)
+        for path, signature in current.items():
+            if previous.get(path) == signature:
+                continue
+            result = _load(path)
+            # A touch or a save without edits changes nothing downstream.
+            if result == self.parsed.get(path):
+                continue
+            self.parsed[path] = result
+            self.links[path] = tuple(link_targets(result, path, self.root))
+            events[path] = "added" if path not in previous else "changed"
+
+        parents = link_parents(self.links, self.parsed.keys())
+        moved = {p for p in current if parents.get(p) != self.parents.get(p)}
+        self.parents = parents
+
+        # A new parent (or none) changes what a file inherits.
+        for path in moved | self._descendants(events.keys() | moved):
+            events.setdefault(path, "inherited")
+        self._pending = events
+
+        return self._run(removed, events)
+
+    def watch(
+        self, interval: float = DEFAULT_INTERVAL, polls: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Poll every interval seconds, forever or polls times."""
+        count = 0
+        while polls is None or count < polls:
+            if count:
+                time.sleep(interval)
+            yield from self.poll()
+            count += 1
+
+    def _run(
+        self, removed: list[Path], events: dict[Path, str]
+    ) -> Iterator[dict[str, Any]]:
+        for path in removed:
+            yield {"file": self._name(path), "event": "removed", "ok": True}
+        for path in sorted(events, key=self._order):
+            # A later poll may have handled it already.
+            event = self._pending.pop(path, None)
+            if event is not None:
+                yield self._check(path, event)
+
+    def _check(self, path: Path, event: str) -> dict[str, Any]:
+        start = time.perf_counter()
+        result = self.resolved[path] = self._resolve(path)
+        # Validation appends messages. Keep the resolved tree clean.
+        checked = dataclasses.replace(
+            result,
+            errors=list(result.errors),
+            warnings=list(result.warnings),
+            trust_flags=list(result.trust_flags),
+        )
+
+        record: dict[str, Any] = {"file": self._name(path), "event": event}
+        if "validate" in self.actions:
+            try:
+                self._validator.validate(checked)
+            except ValueError as ve:
+                checked.errors.append(str(ve))
+            record.update(
+                ok=not checked.errors and not (self.strict and checked.warnings),
+                errors=checked.errors,
+                warnings=checked.warnings,
+                trust_flags=checked.trust_flags,
+            )
+        if self._health is not None:
+            record["health"] = self._health.assess(checked.directives)
+        record.setdefault("ok", True)
+        record["ms"] = (time.perf_counter() - start) * 1000
+        self.records[path] = record
+        return record
+
+    def _resolve(self, path: Path) -> ParseResult:
+        parsed = self.parsed[path]
+        parent = self.parents.get(path)
+        if parent is None:
+            return parsed
+        chain = ancestors(path, self.parents)
+        if path in chain:
+            names = " -> ".join(self._name(p) for p in [path, *chain])
+            return dataclasses.replace(
+                parsed, errors=[*parsed.errors, f"Circular dependency: {names}"]
+            )
+        return inherit(self.resolved[parent], parsed)
+
+    def _order(self, path: Path) -> tuple[int, str]:
+        # Depth first: every parent is resolved before its children.
+        return len(ancestors(path, self.parents)), str(path)
+
+    def _descendants(self, paths: Iterable[Path]) -> set[Path]:
+        children: dict[Path, list[Path]] = {}
+        for child, parent in self.parents.items():
+            children.setdefault(parent, []).append(child)
+
+        found: set[Path] = set()
+        stack = list(paths)
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in found:
+                    found.add(child)
+                    stack.append(child)
+        return found
+
+    def _name(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+
+def _load(path: Path) -> ParseResult:
+    """Parse one file. Read failures become errors."""
+    try:
+        return parse_file(path)
+    except Exception as e:
+        return ParseResult(errors=[f"Failed to load {path}: {e!s}"])
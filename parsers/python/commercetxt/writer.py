@@ -0,0 +1,254 @@
+"""
+CommerceTXT writer.
+Directives in, CommerceTXT out. The parser reads back what was written.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from typing import Any, TextIO
+
+from .limits import MAX_LINE_LENGTH, MAX_NESTING_DEPTH, MAX_SECTIONS
+from .model import ParseResult
+
+# Nested list items. Two spaces per level, like the spec examples.
+INDENT = "  "
+
+_SECTION_NAME_RE = re.compile(r"\w+")
+_KEY_RE = re.compile(r"\w[\w-]*")
+
+# The parser splits values on pipes and lines on these characters.
+_UNSAFE_RE = re.compile(r"[|\n\r\v\f\x1c-\x1e\x85\u2028\u2029]")
+
+# What the parser reads as a URL, and as "scheme: //..." list entries.
+_URL_SCHEMES = ("http://", "https://", "ftp://", "ws://", "wss://")
+_MIN_URL_LENGTH = 7
+_LINK_SCHEMES = ("http", "https", "ftp", "ftps", "ws", "wss", "file", "data", "blob")
+
+
+class CommerceTXTWriter:
+    """
+    Streaming writer. One section per call, straight to fp.
+
+        writer = CommerceTXTWriter(fp)
+        writer.write_header(version="1.0")
+        writer.write_section("PRODUCT", {"Name": "Lamp", "SKU": "L-1"})
+
+    Values take the shapes the parser produces: strings, pipe metadata
+    dicts, and lists of entry dicts (name/path or value, metadata,
+    children). Numbers and booleans are written with str(). Empty values
+    (None, "", [], {}) are left out, as the parser drops them too.
+    Anything the parser would read back differently raises ValueError.
+    """
+
+    def __init__(self, fp: TextIO):
+        self.fp = fp
+        self.sections: set[str] = set()
+        self._blocks = 0
+
+    def write_header(
+        self, version: str | None = None, last_updated: str | None = None
+    ) -> None:
+        """Version and LastUpdated. Only before the first section."""
+        if self.sections:
+            raise ValueError("Header must come before the first section")
+        lines = [
+            _kv_line(key, _text(value))
+            for key, value in (("Version", version), ("LastUpdated", last_updated))
+            if value
+        ]
+        if lines:
+            self._write(lines)
+
+    def write_section(self, name: str, data: dict[str, Any]) -> None:
+        """Write one @SECTION with its keys and lists."""
+        if not _SECTION_NAME_RE.fullmatch(name) or name != name.upper():
+            raise ValueError(f"Section name must be uppercase word characters: {name}")
+        if name in self.sections:
+            raise ValueError(f"Section already written: {name}")
+        if len(self.sections) >= MAX_SECTIONS:
+            raise ValueError(f"Max sections limit ({MAX_SECTIONS}) reached")
+        self.sections.add(name)
+
+        lines = [f"# @{name}"]
+        seen: set[str] = set()
+        # A bare list must come first. After "Key:" the parser adds
+        # list items to Key until the next key.
+        for key in sorted(data, key=lambda k: k != "items"):
+            value = data[key]
+            if value is None or value in ("", [], {}):
+                continue
+            if key.lower() in seen:
+                raise ValueError(f"Duplicate key in {name}: {key}")
+            seen.add(key.lower())
+
+            if isinstance(value, list):
+                if key != "items":
+                    lines.append(_kv_line(key, ""))
+                for entry in value:
+                    _entry_lines(entry, 0, lines)
+            elif isinstance(value, dict):
+                text = _multi_value(value, key)
+                if text:
+                    lines.append(_kv_line(key, text))
+            else:
+                lines.append(_kv_line(key, _text(value)))
+        self._write(lines)
+
+    def write_result(self, result: ParseResult | dict[str, Any]) -> None:
+        """Header and every section of a ParseResult or a directives dict."""
+        if isinstance(result, ParseResult):
+            self.write_header(result.version, result.last_updated)
+            directives = result.directives
+        else:
+            directives = result
+        for name, data in directives.items():
+            self.write_section(name, data)
+
+    def _write(self, lines: list[str]) -> None:
+        for line in lines:
+            if len(line) > MAX_LINE_LENGTH:
+                raise ValueError(f"Line exceeds max length ({len(line)} chars)")
+        # Blank line between blocks, none before the first.
+        prefix = "\n" if self._blocks else ""
+        self.fp.write(prefix + "\n".join(lines) + "\n")
+        self._blocks += 1
+
+
+def dump(result: ParseResult | dict[str, Any], fp: TextIO) -> None:
+    """Write a ParseResult or a directives dict to a text file."""
+    CommerceTXTWriter(fp).write_result(result)
+
+
+def dumps(result: ParseResult | dict[str, Any]) -> str:
+    """CommerceTXT text of a ParseResult or a directives dict."""
+    buffer = io.StringIO()
+    dump(result, buffer)
+    return buffer.getvalue()
+
+
+def _kv_line(key: str, value: str) -> str:
+    if not _KEY_RE.fullmatch(key):
+        raise ValueError(f"Invalid key: {key!r}")
+    return f"{key}: {value}" if value else f"{key}:"
+
+
+def _entry_lines(entry: Any, depth: int, lines: list[str]) -> None:
+    if not isinstance(entry, dict):
+        raise TypeError(f"List entries must be dicts, got: {type(entry).__name__}")
+    if depth >= MAX_NESTING_DEPTH - 1:
+        raise ValueError(f"Max nesting depth ({MAX_NESTING_DEPTH}) exceeded")
+
+    if "name" in entry:
+        item = _named_item(entry)
+        meta = _meta(entry, ("name", "path", "children"))
+        scheme, _, path = item.partition(": ")
+        if not meta and _is_url_scheme(scheme) and path.startswith("//"):
+            raise ValueError(f"Entry reads back as a URL: {item}")
+    elif "value" in entry:
+        item = _text(entry["value"])
+        meta = _meta(entry, ("value", "children"))
+        if meta and not _is_url(item):
+            raise ValueError(f"Only URL entries take metadata: {item!r}")
+        if "values" in meta:
+            raise ValueError(f"URL entry metadata cannot set values: {item!r}")
+        if ":" in item and not _is_url(item):
+            raise ValueError(f"Entry value cannot hold ':': {item!r}")
+    else:
+        raise ValueError(f"List entry needs a name or a value: {entry!r}")
+
+    if meta:
+        item += " | " + " | ".join(_parts(meta, item))
+    lines.append(f"{INDENT * depth}- {item}".rstrip())
+
+    for child in entry.get("children") or ():
+        _entry_lines(child, depth + 1, lines)
+
+
+def _named_item(entry: dict[str, Any]) -> str:
+    """ "name: path", or "name:" when path is None."""
+    name = _text(entry["name"])
+    if ":" in name:
+        raise ValueError(f"Entry name cannot hold ':': {name!r}")
+    if entry.get("path") is None:
+        return f"{name}:"
+    path = _text(entry["path"])
+    if not path:
+        raise ValueError(f"Entry path must be None, not empty: {name!r}")
+    return f"{name}: {path}"
+
+
+def _meta(entry: dict[str, Any], layout: tuple[str, ...]) -> dict[str, Any]:
+    return {k: v for k, v in entry.items() if k not in layout and v is not None}
+
+
+def _multi_value(value: dict[str, Any], key: str) -> str:
+    """Pipe-separated value of a key. Empty when no part is left."""
+    value = {k: v for k, v in value.items() if v is not None}
+    if not value:
+        return ""
+    if len(value) == 1 and ("value" in value or "url" in value):
+        raise ValueError(f"{key}: a lone value or url reads back as a string")
+    parts = _parts(value, key)
+    # One part needs a pipe, or it reads back as a string.
+    return " | ".join(parts) if len(parts) > 1 else "| " + parts[0]
+
+
+def _parts(meta: dict[str, Any], owner: str) -> list[str]:
+    """Pipe parts that the parser reads back as meta."""
+    if len({k.lower() for k in meta}) != len(meta):
+        raise ValueError(f"{owner}: metadata keys differ only in case")
+    values = meta.get("values")
+    parts = []
+    for key, value in meta.items():
+        if key == "values":
+            # Unnamed parts. The parser keeps all in values, the first in value.
+            if not isinstance(values, list) or not values[1:]:
+                raise ValueError(f"{owner}: values must list two or more items")
+            if meta.get("value") != values[0]:
+                raise ValueError(f"{owner}: value must be the first of values")
+            parts.extend(_unnamed(_text(v), owner) for v in values)
+            continue
+        text = _text(value)
+        if key == "value" and values is not None:
+            continue
+        if key == "value" and text and ":" not in text:
+            parts.append(text)
+        elif key == "url" and _is_url(text):
+            parts.append(text)
+        else:
+            if ":" in key or _UNSAFE_RE.search(key) or key != key.strip():
+                raise ValueError(f"{owner}: invalid metadata key: {key!r}")
+            if key.lower() in ("http", "https") and text.startswith("//"):
+                raise ValueError(f"{owner}: {key}: {text} reads back as a URL")
+            parts.append(f"{key}: {text}" if text else f"{key}:")
+    return parts
+
+
+def _unnamed(text: str, owner: str) -> str:
+    if not text or ":" in text:
+        raise ValueError(f"{owner}: unnamed value cannot be empty or hold ':'")
+    return text
+
+
+def _text(value: Any) -> str:
+    """A value as one line the parser keeps as is."""
+    if isinstance(value, (bool, int, float)):
+        return str(value)
+    if not isinstance(value, str):
+        raise TypeError(f"Cannot write {type(value).__name__} as a value")
+    if _UNSAFE_RE.search(value) or value != value.strip():
+        raise ValueError(
+            f"Value cannot hold pipes, line breaks or edge spaces: {value!r}"
+        )
+    return value
+
+
+def _is_url(text: str) -> bool:
+    # Same test as the parser: a scheme in the first 8 of at least 8 chars.
+    return len(text) > _MIN_URL_LENGTH and text[:8].lower().startswith(_URL_SCHEMES)
+
+
+def _is_url_scheme(text: str) -> bool:
+    return text.lower() in _LINK_SCHEMES
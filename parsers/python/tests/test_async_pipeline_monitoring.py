@@ -118,13 +118,27 @@ class TestAsyncRAGPipelineComprehensive:
 
         assert result == 0
 
+    @staticmethod
+    def _batch_pipeline():
+        """Pipeline with a mocked store; embedding copies the text length."""
+        from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+
+        def embed(shards):
+            return [{**s, "values": [float(len(s["text"]))]} for s in shards]
+
+        pipeline = AsyncRAGPipeline(enable_cache=False)
+        pipeline.health_checker = MagicMock()
+        pipeline.health_checker.assess.return_value = {"score": 90}
+        pipeline.container = MagicMock()
+        pipeline.container.embedder.embed_shards.side_effect = embed
+        store = pipeline.container.vector_store
+        store.upsert.side_effect = lambda shards, namespace: len(shards)
+        return pipeline, store
+
     @pytest.mark.asyncio
     async def test_ingest_batch_progress_callback(self):
         """Batch ingest calls progress callback."""
-        from commercetxt.rag.async_pipeline import AsyncRAGPipeline
-
-        pipeline = AsyncRAGPipeline()
-        pipeline.ingest = AsyncMock(return_value=5)
+        pipeline, _ = self._batch_pipeline()
 
         progress_calls = []
 
@@ -134,30 +148,224 @@ class TestAsyncRAGPipelineComprehensive:
         products = [{"ITEM": f"Product-{i}"} for i in range(3)]
         await pipeline.ingest_batch(products, on_progress=on_progress)
 
-        assert len(progress_calls) == 3
+        assert progress_calls == [(1, 3), (2, 3), (3, 3)]
 
     @pytest.mark.asyncio
     async def test_ingest_batch_collects_errors(self):
         """Batch ingest collects errors without stopping."""
-        from commercetxt.rag.async_pipeline import AsyncRAGPipeline
-
-        pipeline = AsyncRAGPipeline()
-
-        call_count = [0]
+        pipeline, store = self._batch_pipeline()
+        generate = pipeline.generator.generate
 
-        async def mock_ingest(product, namespace="default"):
-            call_count[0] += 1
-            if call_count[0] == 2:
+        def failing_generate(product):
+            if product["ITEM"] == "Product-1":
                 raise ValueError("Test error")
-            return 1
+            return generate(product)
 
-        pipeline.ingest = mock_ingest
+        pipeline.generator.generate = failing_generate
 
         products = [{"ITEM": f"Product-{i}"} for i in range(3)]
         result = await pipeline.ingest_batch(products)
 
         assert result["total"] == 3
-        assert len(result["errors"]) == 1
+        assert result["errors"] == [{"item": "Product-1", "error": "Test error"}]
+        assert result["ingested"] == len(store.upsert.call_args.args[0]) > 0
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch_batches_across_products(self):
+        """Embeds span products; one upsert stores the whole batch in order."""
+        pipeline, store = self._batch_pipeline()
+        products = [{"ITEM": f"Product-{i}", "PRICE": "10"} for i in range(20)]
+        per_product = len(pipeline.generator.generate(products[0]))
+
+        result = await pipeline.ingest_batch(
+            products, embed_batch_size=per_product * 5, concurrency={"embed": 3}
+        )
+
+        embed_calls = pipeline.container.embedder.embed_shards.call_args_list
+        assert len(embed_calls) == 4
+        assert all(len(call.args[0]) == per_product * 5 for call in embed_calls)
+        assert store.upsert.call_count == 1
+        stored = store.upsert.call_args.args[0]
+        assert result["ingested"] == len(stored) == per_product * 20
+        assert all("values" in shard for shard in stored)
+        assert stored[0]["metadata"]["original_data"]["ITEM"] == "Product-0"
+        assert stored[-1]["metadata"]["original_data"]["ITEM"] == "Product-19"
+        assert result["stages"]["embed"]["calls"] == 4
+        assert result["stages"]["upsert"]["calls"] == 1
+        assert result["stages"]["prepare"]["calls"] == 20
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch_splits_upserts(self):
+        """upsert_batch_size caps the shards stored per call."""
+        pipeline, store = self._batch_pipeline()
+        products = [{"ITEM": f"Product-{i}"} for i in range(10)]
+        per_product = len(pipeline.generator.generate(products[0]))
+
+        result = await pipeline.ingest_batch(
+            products, embed_batch_size=1, upsert_batch_size=per_product * 3
+        )
+
+        sizes = [len(call.args[0]) for call in store.upsert.call_args_list]
+        assert sizes == [per_product * 3] * 3 + [per_product]
+        assert result["ingested"] == per_product * 10
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch_embed_failure_fails_its_batch(self):
+        """A failed embed call fails its products only, in input order."""
+        pipeline, store = self._batch_pipeline()
+        embed = pipeline.container.embedder.embed_shards.side_effect
+
+        def flaky_embed(shards):
+            if any(
+                s["metadata"]["original_data"]["ITEM"] == "Product-2" for s in shards
+            ):
+                raise RuntimeError("API down")
+            return embed(shards)
+
+        pipeline.container.embedder.embed_shards.side_effect = flaky_embed
+        products = [{"ITEM": f"Product-{i}"} for i in range(6)]
+        per_product = len(pipeline.generator.generate(products[0]))
+        progress = []
+
+        result = await pipeline.ingest_batch(
+            products,
+            on_progress=lambda done, total: progress.append(done),
+            embed_batch_size=per_product * 2,
+        )
+
+        assert [e["item"] for e in result["errors"]] == ["Product-2", "Product-3"]
+        assert result["ingested"] == per_product * 4
+        assert result["skipped"] == 0
+        assert progress == [1, 2, 3, 4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch_bounds_queued_batches(self):
+        """A stalled upsert stops prepare once the queues are full."""
+        import asyncio
+        import threading
+
+        pipeline, store = self._batch_pipeline()
+        release = threading.Event()
+        store.upsert.side_effect = lambda shards, namespace: release.wait(5) and 0
+        generated = []
+        generate = pipeline.generator.generate
+        pipeline.generator.generate = lambda p: generated.append(p) or generate(p)
+        products = [{"ITEM": f"Product-{i}"} for i in range(100)]
+
+        task = asyncio.create_task(
+            pipeline.ingest_batch(
+                products, embed_batch_size=1, upsert_batch_size=1, queue_size=1
+            )
+        )
+        await asyncio.sleep(0.3)
+        stalled = len(generated)
+        release.set()
+        result = await task
+
+        assert stalled < 10
+        assert len(generated) == 100
+        assert result["errors"] == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("manifest", [False, True])
+    async def test_ingest_batch_prepare_workers_keep_every_shard(self, manifest):
+        """Parallel prepare stores the same shards as one worker."""
+        import sys
+
+        from commercetxt.rag.core.manifest import ShardManifest
+
+        products = [
+            {"ITEM": f"Product-{i}", "PRICE": "10", "SPECS": {"Color": "Red"}}
+            for i in range(300)
+        ]
+        stored = []
+        for workers in (1, 4):
+            pipeline, store = self._batch_pipeline()
+            if manifest:
+                pipeline.manifest = ShardManifest()
+                store.shard_id.side_effect = lambda s: s["metadata"]["attr_type"]
+            # Switch threads often so prepare workers interleave mid-product
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+                result = await pipeline.ingest_batch(
+                    products, concurrency={"prepare": workers}
+                )
+            finally:
+                sys.setswitchinterval(interval)
+            assert result["errors"] == []
+            shards = [s for c in store.upsert.call_args_list for s in c.args[0]]
+            assert result["ingested"] == len(shards)
+            if manifest:
+                assert len(pipeline.manifest) == len(products)
+                assert pipeline.manifest.stats["changed"] == len(shards)
+            stored.append(sorted(s["text"] for s in shards))
+        assert stored[0] == stored[1]
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch_rejects_bad_options(self):
+        """Unknown stages and sizes below 1 raise ValueError."""
+        pipeline, _ = self._batch_pipeline()
+
+        with pytest.raises(ValueError):
+            await pipeline.ingest_batch([], concurrency={"rerank": 2})
+        with pytest.raises(ValueError):
+            await pipeline.ingest_batch([], embed_batch_size=0)
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch_with_manifest_skips_unchanged(self):
+        """A re-ingested batch upserts and embeds nothing unchanged."""
+        from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+        from commercetxt.rag.core.manifest import ShardManifest
+
+        pipeline = AsyncRAGPipeline(enable_cache=False, manifest=ShardManifest())
+        pipeline.health_checker = MagicMock()
+        pipeline.health_checker.assess.return_value = {"score": 90}
+        pipeline.container = MagicMock()
+        pipeline.container.embedder.embed_shards.side_effect = lambda s: s
+        store = pipeline.container.vector_store
+        store.upsert.side_effect = lambda shards, namespace: len(shards)
+        store.shard_id.side_effect = lambda s: s["metadata"]["attr_type"]
+
+        products = [{"ITEM": f"Product-{i}", "PRICE": "10"} for i in range(3)]
+        first = await pipeline.ingest_batch(products)
+        assert first["shards"]["changed"] == first["ingested"] > 0
+
+        second = await pipeline.ingest_batch(products)
+        assert second["ingested"] == 0
+        assert second["shards"] == {
+            "changed": 0,
+            "unchanged": first["ingested"],
+            "removed": 0,
+        }
+        assert store.upsert.call_count == 1
+        store.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ingest_publishes_volatile_fields(self):
+        """Volatile fields reach storage, keyed like the stored shards."""
+        from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+
+        pipeline = AsyncRAGPipeline(
+            enable_cache=False, volatile_fields=["PRICE", "CURRENCY"]
+        )
+        pipeline.health_checker = MagicMock()
+        pipeline.health_checker.assess.return_value = {"score": 90}
+        pipeline.container = MagicMock()
+        pipeline.container.embedder.embed_shards.side_effect = lambda s: s
+        store = pipeline.container.vector_store
+        store.upsert.side_effect = lambda shards, namespace: len(shards)
+        pipeline.enricher.storage = MagicMock()
+
+        product = {"SKU": "p-1", "ITEM": "Product", "PRICE": "10", "CURRENCY": "EUR"}
+        assert await pipeline.ingest(product) > 0
+
+        shards = store.upsert.call_args.args[0]
+        assert "10" not in [s["text"] for s in shards]
+        assert {s["metadata"]["product_id"] for s in shards} == {"p-1"}
+        pipeline.enricher.storage.set_live_attributes.assert_called_once_with(
+            "p-1", {"price": "10", "currency": "EUR"}
+        )
 
     @pytest.mark.asyncio
     async def test_embed_shards_cached_no_cache(self):
@@ -176,6 +384,61 @@ class TestAsyncRAGPipelineComprehensive:
         pipeline.container.embedder.embed_shards.assert_called_once()
         assert result == [{"text": "test", "values": [0.1] * 384}]
 
+    @pytest.mark.asyncio
+    async def test_embed_shards_cached_batches_misses(self):
+        """One multi-get, one off-loop embed call for misses, one multi-set."""
+        import threading
+
+        from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+
+        pipeline = AsyncRAGPipeline(enable_cache=False)
+        pipeline.embedding_cache = MagicMock()
+        pipeline.enable_cache = True
+        pipeline.embedding_cache.get_cached_texts = AsyncMock(
+            return_value=[[0.5], None, None]
+        )
+        pipeline.embedding_cache.cache_texts = AsyncMock(return_value=True)
+        threads: list[int] = []
+
+        def embed_shards(shards):
+            threads.append(threading.get_ident())
+            return [
+                {**s, "values": [float(len(s["text"]))], "model": "m"} for s in shards
+            ]
+
+        pipeline.container = MagicMock()
+        pipeline.container.embedder.embed_shards.side_effect = embed_shards
+
+        shards = [{"text": "hit"}, {"text": "miss"}, {"text": "miss 2"}]
+        result = await pipeline._embed_shards_cached(shards)
+
+        assert [s["values"] for s in result] == [[0.5], [4.0], [6.0]]
+        assert [s["model"] for s in result] == ["cached", "m", "m"]
+        pipeline.embedding_cache.get_cached_texts.assert_awaited_once_with(
+            ["hit", "miss", "miss 2"]
+        )
+        pipeline.embedding_cache.cache_texts.assert_awaited_once_with(
+            {"miss": [4.0], "miss 2": [6.0]}
+        )
+        assert threads != [threading.get_ident()]
+        pipeline.container.embedder.embed_text.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_embed_shards_cached_awaits_async_embedder(self):
+        """AsyncBaseEmbedders are awaited, not run in a thread."""
+        from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+        from commercetxt.rag.interfaces.async_embedder import AsyncBaseEmbedder
+
+        pipeline = AsyncRAGPipeline(enable_cache=False)
+        pipeline.container = MagicMock()
+        embedder = MagicMock(spec=AsyncBaseEmbedder)
+        embedder.embed_shards = AsyncMock(side_effect=lambda s: s)
+        pipeline.container.embedder = embedder
+
+        shards = [{"text": "a"}, {"text": "b"}]
+        assert await pipeline._embed_shards_cached(shards) == shards
+        embedder.embed_shards.assert_awaited_once_with(shards)
+
     @pytest.mark.asyncio
     async def test_embed_text_cached_no_cache(self):
         """Embed text without cache uses embedder directly."""
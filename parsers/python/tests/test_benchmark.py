@@ -0,0 +1,111 @@
+"""
+Stage benchmark tests.
+
+Covers the report shape, corpus scaling with links kept per copy,
+percentiles and baseline comparison.
+"""
+
+import json
+
+import pytest
+
+from commercetxt.benchmark import (
+    STAGES,
+    compare,
+    percentile,
+    run_benchmark,
+    scale_corpus,
+)
+
+ROOT = """# @IDENTITY
+Name: Shop
+Currency: USD
+
+# @CATALOG
+- Audio: /categories/audio.txt
+"""
+
+CATEGORY = """# @ITEMS
+- Phone: /products/phone.txt
+"""
+
+PRODUCT = """# @PRODUCT
+Name: Phone
+SKU: P-1
+
+# @OFFER
+Price: 10
+Availability: InStock
+
+# @SPECS
+Weight: 1500g
+"""
+
+
+@pytest.fixture
+def shop(tmp_path):
+    (tmp_path / "categories").mkdir()
+    (tmp_path / "products").mkdir()
+    (tmp_path / "commerce.txt").write_text(ROOT)
+    (tmp_path / "categories" / "audio.txt").write_text(CATEGORY)
+    (tmp_path / "products" / "phone.txt").write_text(PRODUCT)
+    return tmp_path
+
+
+def test_report_covers_every_stage(shop):
+    report = run_benchmark(shop, repeat=2)
+    assert report["files"] == 3
+    assert report["bytes"] == sum(len(t) for t in (ROOT, CATEGORY, PRODUCT))
+    assert tuple(report["stages"]) == STAGES
+    for stats in report["stages"].values():
+        assert stats["ops"] == 3
+        assert stats["ops_per_second"] > 0
+        assert stats["mb_per_second"] > 0
+        assert 0 <= stats["p50_ms"] <= stats["p99_ms"]
+    assert report["environment"]["python"]
+    json.dumps(report)
+
+
+def test_scaled_copies_resolve_independently(shop, tmp_path_factory):
+    paths = sorted(shop.rglob("*.txt"))
+    trees = scale_corpus((shop, paths), 3, tmp_path_factory.mktemp("scaled"))
+    assert len(trees) == 3
+    for root, files in trees:
+        assert sorted(p.relative_to(root) for p in files) == sorted(
+            p.relative_to(shop) for p in paths
+        )
+
+    report = run_benchmark(shop, scale=3, repeat=1)
+    assert report["files"] == 9
+    assert report["stages"]["resolve"]["ops"] == 9
+
+
+def test_single_file_corpus(shop):
+    report = run_benchmark(shop / "products" / "phone.txt", repeat=1)
+    assert report["files"] == 1
+
+
+def test_invalid_arguments(shop, tmp_path_factory):
+    with pytest.raises(FileNotFoundError):
+        run_benchmark(tmp_path_factory.mktemp("empty"))
+    with pytest.raises(ValueError):
+        run_benchmark(shop, scale=0)
+    with pytest.raises(ValueError):
+        run_benchmark(shop, repeat=0)
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_compare():
+    baseline = {"stages": {"parse": {"ops_per_second": 100.0}}}
+    current = {
+        "stages": {"parse": {"ops_per_second": 150.0}, "read": {"ops_per_second": 1}}
+    }
+    assert compare(baseline, current) == {"parse": 1.5}
@@ -7,7 +7,7 @@ Covers defaults, boundaries, collections, type validation.
 
 import pytest
 
-from commercetxt.bridge import CommerceAIBridge
+from commercetxt.bridge import CommerceAIBridge, PromptSegmentCache
 from commercetxt.constants import (
     DEFAULT_AVAILABILITY,
     DEFAULT_CURRENCY,
@@ -420,6 +420,89 @@ class TestComplexDirectives:
         assert "- Rule One" in prompt
 
 
+# =============================================================================
+# Prefix-Cached Layout
+# =============================================================================
+
+
+class TestPrefixCachedPrompt:
+    """Static segment first, memoized. Volatile lines last."""
+
+    def test_static_then_dynamic(self, result):
+        result.directives["INVENTORY"] = {"Stock": "5"}
+        result.directives["SPECS"] = {"Color": "Red"}
+        prompt = CommerceAIBridge(result).generate_prefix_cached_prompt(
+            PromptSegmentCache()
+        )
+        assert prompt.splitlines() == [
+            "STORE: Store",
+            "CURRENCY: USD",
+            "ITEM: Widget",
+            "SPECS:",
+            "  Color: Red",
+            "PRICE: 10",
+            "AVAILABILITY: InStock",
+            "URL: http://buy.com",
+            "STOCK: 5 units",
+        ]
+
+    def test_same_lines_as_low_token_prompt(self, result):
+        """Only the order changes."""
+        bridge = CommerceAIBridge(result)
+        cached = bridge.generate_prefix_cached_prompt(PromptSegmentCache())
+        assert sorted(cached.splitlines()) == sorted(
+            bridge.generate_low_token_prompt().splitlines()
+        )
+
+    def test_price_change_reuses_static_segment(self, result):
+        cache = PromptSegmentCache()
+        first, _ = CommerceAIBridge(result).prompt_segments(cache)
+        result.directives["OFFER"]["Price"] = "12"
+        second, dynamic = CommerceAIBridge(result).prompt_segments(cache)
+        assert second is first
+        assert "PRICE: 12" in dynamic
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_static_change_misses(self, result):
+        cache = PromptSegmentCache()
+        CommerceAIBridge(result).prompt_segments(cache)
+        result.directives["PRODUCT"]["Name"] = "Gadget"
+        static, _ = CommerceAIBridge(result).prompt_segments(cache)
+        assert "ITEM: Gadget" in static
+        assert cache.misses == 2
+
+    def test_cache_is_bounded(self):
+        cache = PromptSegmentCache(max_size=1)
+        cache.put(b"a", "A")
+        cache.put(b"b", "B")
+        assert len(cache) == 1
+        assert cache.get(b"a") is None
+        with pytest.raises(ValueError, match="max_size must be positive"):
+            PromptSegmentCache(max_size=0)
+
+    def test_eviction_waits_for_a_lookup(self):
+        """A put() from another thread cannot evict a key mid-get()."""
+        import threading
+        from collections import OrderedDict
+
+        cache = PromptSegmentCache(max_size=1)
+        cache.put(b"a", "A")
+        writer = threading.Thread(target=cache.put, args=(b"b", "B"))
+
+        class Entries(OrderedDict):
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                # Evict key between its lookup and move_to_end().
+                writer.start()
+                writer.join(timeout=0.2)
+                return value
+
+        cache._entries = Entries(cache._entries)
+        assert cache.get(b"a") == "A"
+        writer.join()
+        assert list(cache._entries) == [b"b"]
+
+
 # =============================================================================
 # Internal Methods
 # =============================================================================
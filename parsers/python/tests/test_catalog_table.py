@@ -0,0 +1,183 @@
+"""
+Columnar catalog table tests.
+
+Covers ingest, filter/sort/group-by, vectorized readiness parity
+with CommerceAIBridge and the memory-mapped on-disk form.
+"""
+
+import logging
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np  # noqa: E402
+
+from commercetxt.bridge import CommerceAIBridge  # noqa: E402
+from commercetxt.catalog_table import CatalogTable  # noqa: E402
+from commercetxt.model import ParseResult  # noqa: E402
+from commercetxt.parser import parse_file  # noqa: E402
+from commercetxt.rag.tools.health_check import AIHealthChecker  # noqa: E402
+from commercetxt.validator import CommerceTXTValidator  # noqa: E402
+
+VALID_DIR = Path(__file__).parent / "vectors" / "valid"
+
+
+def result(price, currency="USD", availability="InStock", **extra):
+    directives = {
+        "PRODUCT": {"Name": "Item", "Brand": "Acme"},
+        "OFFER": {"Price": price, "Currency": currency, "Availability": availability},
+    }
+    directives.update(extra.pop("directives", {}))
+    return ParseResult(directives=directives, version="1.0.3", **extra)
+
+
+@pytest.fixture
+def table():
+    return CatalogTable.from_results(
+        {
+            "a": result(
+                "49.99",
+                directives={
+                    "INVENTORY": {"Stock": "3"},
+                    "REVIEWS": {"Rating": "4.5", "Count": "120"},
+                    "SPECS": {"Battery": "10h", "Weight": "200g"},
+                },
+            ),
+            "b": result("129.00", "EUR", "OutOfStock"),
+            "c": result(
+                "19.00",
+                directives={
+                    "REVIEWS": {"Rating": "3.9", "Count": "8"},
+                    "SPECS": {"Battery": "5h"},
+                },
+            ),
+            "d": result("n/a", "EUR", errors=["bad"], trust_flags=["inventory_stale"]),
+        }
+    )
+
+
+class TestIngest:
+    """Typed columns from results."""
+
+    def test_columns(self, table):
+        assert len(table) == 4
+        assert table.currencies == ["USD", "EUR"]
+        assert list(table["currency"]) == [0, 1, 0, 1]
+        assert list(table["stock"]) == [3, -1, -1, -1]
+        assert np.isnan(table["price"][3])
+        assert table["review_count"].dtype == np.int64
+
+    def test_row_decodes_codes(self, table):
+        row = table.row(0)
+        assert row["id"] == "a"
+        assert row["currency"] == "USD"
+        assert row["availability"] == "InStock"
+        assert row["specs"] == ["Battery", "Weight"]
+
+    def test_spec_mask_spans_words(self):
+        specs = {f"Spec{i}": "x" for i in range(70)}
+        table = CatalogTable.from_results(
+            {"a": result("1", directives={"SPECS": specs})}, health=False
+        )
+        assert table.spec_mask.shape == (1, 2)
+        assert table.mask(specs=["Spec0", "Spec69"]).tolist() == [True]
+        assert table["health"][0] == -1
+
+    def test_non_finite_numbers_read_as_missing(self):
+        table = CatalogTable.from_results(
+            {
+                "a": result(
+                    "inf",
+                    directives={
+                        "INVENTORY": {"Stock": "inf"},
+                        "REVIEWS": {"Rating": "nan", "Count": "nan"},
+                    },
+                )
+            },
+            health=False,
+        )
+        assert np.isnan(table["price"][0])
+        assert np.isnan(table["rating"][0])
+        assert table["stock"][0] == -1
+        assert table["review_count"][0] == -1
+
+
+class TestOperations:
+    """Filter, sort, group-by."""
+
+    def test_mask(self, table):
+        assert table.filter(table.mask(price=(None, 50))).ids == ["a", "c"]
+        assert table.filter(table.mask(currency="EUR")).ids == ["b", "d"]
+        assert table.filter(table.mask(availability=["OutOfStock"])).ids == ["b"]
+        assert table.filter(table.mask(specs=["Battery"])).ids == ["a", "c"]
+        assert table.filter(table.mask(specs=["Color"])).ids == []
+        assert table.filter(table.mask(at_least={"rating": 4.0})).ids == ["a"]
+
+    def test_sort_puts_missing_last(self, table):
+        assert table.sort("price").ids == ["c", "a", "b", "d"]
+        assert table.sort("price", descending=True).ids == ["b", "a", "c", "d"]
+        assert table.sort("rating", descending=True).ids[:2] == ["a", "c"]
+
+    def test_group_by(self, table):
+        assert table.group_by("currency") == {"USD": 2, "EUR": 1}
+        assert table.group_by("currency", "price", "max") == {
+            "USD": 49.99,
+            "EUR": 129.0,
+        }
+        assert table.group_by("availability", "price", "mean")["InStock"] == (
+            pytest.approx(34.495)
+        )
+
+    def test_group_by_rejects_unknown(self, table):
+        with pytest.raises(ValueError, match="agg must be"):
+            table.group_by("currency", "price", "median")
+        with pytest.raises(ValueError, match="Cannot group by"):
+            table.group_by("price")
+
+
+class TestScoring:
+    """Vectorized scores match the per-product implementations."""
+
+    def test_readiness_matches_bridge(self):
+        logging.disable(logging.CRITICAL)
+        try:
+            paths = sorted(VALID_DIR.glob("*.txt"))
+            results = {}
+            for path in paths:
+                parsed = parse_file(str(path))
+                CommerceTXTValidator().validate(parsed)
+                results[path.name] = parsed
+        finally:
+            logging.disable(logging.NOTSET)
+        results["stale"] = result("", errors=["x"], trust_flags=["inventory_stale"])
+
+        table = CatalogTable.from_results(results)
+        expected = [
+            CommerceAIBridge(r).calculate_readiness_score() for r in results.values()
+        ]
+        assert table.readiness().tolist() == [e["score"] for e in expected]
+        assert table.grades().tolist() == [e["grade"] for e in expected]
+        assert table["health"].tolist() == [
+            AIHealthChecker().assess(r.directives)["score"] for r in results.values()
+        ]
+
+
+class TestOnDisk:
+    """Memory-mapped columns."""
+
+    def test_save_and_load(self, table, tmp_path):
+        table.save(tmp_path / "catalog")
+        loaded = CatalogTable.load(tmp_path / "catalog")
+        assert isinstance(loaded["price"], np.memmap)
+        assert loaded.ids == table.ids
+        assert loaded.currencies == table.currencies
+        assert loaded.filter(loaded.mask(specs=["Battery"])).ids == ["a", "c"]
+        np.testing.assert_array_equal(loaded.readiness(), table.readiness())
+
+    def test_load_rejects_other_formats(self, table, tmp_path):
+        directory = table.save(tmp_path / "catalog")
+        (directory / "meta.json").write_text('{"format": 99}', encoding="utf-8")
+        with pytest.raises(ValueError, match="Unsupported table format"):
+            CatalogTable.load(directory)
@@ -2,7 +2,8 @@
 CommerceTXT CLI Tests.
 
 Tests command-line interface flags, output formats, and error handling.
-Covers --json, --prompt, --validate, --health, --schema, --normalize, --compare.
+Covers --json, --prompt, --validate, --health, --schema, --normalize, --compare,
+and batch mode (directories, globs, --jobs, --format ndjson).
 """
 
 import json
@@ -10,6 +11,7 @@ import re
 import sys
 from datetime import datetime, timezone
 from io import StringIO
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -1024,3 +1026,230 @@ def test_schema_logic_mutation(capsys):
     # If the mutation exists, EXTRA_SECTION would be added to the output.
     # In original, it should be discarded to avoid conflicts.
     assert "EXTRA_SECTION" not in captured.out
+
+
+def test_cli_corpus_report(tmp_path):
+    """A directory goes in. One aggregated report comes out."""
+    (tmp_path / "a.txt").write_text(
+        "# @IDENTITY\nName: Store\nCurrency: USD", encoding="utf-8"
+    )
+    (tmp_path / "b.txt").write_text("# @IDENTITY\nCurrency: USD", encoding="utf-8")
+
+    code, stdout, _ = run_cli_internal([str(tmp_path), "--report", "--json"])
+    report = json.loads(stdout)
+    assert code == 1
+    assert report["files"] == 2
+    assert report["invalid_files"] == 1
+
+    code, stdout, _ = run_cli_internal([str(tmp_path), "--report", "--jobs", "2"])
+    assert code == 1
+    assert "Files: 2 (valid: 1, invalid: 1)" in stdout
+    assert "Worst files:" in stdout
+
+
+def test_cli_corpus_report_rejects_zero_jobs(tmp_path):
+    """Zero workers is an error."""
+    code, _, stderr = run_cli_internal([str(tmp_path), "--report", "--jobs", "0"])
+    assert code == 1
+    assert "--jobs" in stderr
+
+
+def _batch_dir(tmp_path):
+    (tmp_path / "a.txt").write_text(
+        "# @IDENTITY\nName: Store\nCurrency: USD\n# @PRODUCT\nName: Lamp\nSKU: L-1",
+        encoding="utf-8",
+    )
+    (tmp_path / "b.txt").write_text("# @IDENTITY\nCurrency: USD", encoding="utf-8")
+    return tmp_path
+
+
+def test_cli_batch_ndjson_streams_one_line_per_file(tmp_path):
+    """A directory goes in. One JSON line per file comes out."""
+    _batch_dir(tmp_path)
+    code, stdout, stderr = run_cli_internal(
+        [str(tmp_path), "--format", "ndjson", "--jobs", "2"]
+    )
+    records = [json.loads(line) for line in stdout.splitlines()]
+    assert code == 1
+    assert sorted(Path(r["file"]).name for r in records) == ["a.txt", "b.txt"]
+    assert {r["action"] for r in records} == {"validate"}
+    assert [r["ok"] for r in sorted(records, key=lambda r: r["file"])] == [
+        True,
+        False,
+    ]
+    summary = json.loads(stderr.strip().splitlines()[-1])["summary"]
+    assert summary["files"] == 2
+    assert summary["failed"] == 1
+    assert summary["files_per_second"] > 0
+
+
+@pytest.mark.parametrize(
+    ("flag", "key"),
+    [
+        ("--prompt", "prompt"),
+        ("--health", "report"),
+        ("--schema", "schema"),
+        ("--normalize", "specs"),
+    ],
+)
+def test_cli_batch_actions(tmp_path, flag, key):
+    """Every action runs per file in batch mode."""
+    _batch_dir(tmp_path)
+    code, stdout, _ = run_cli_internal([str(tmp_path / "*.txt"), flag, "--json"])
+    document = json.loads(stdout)
+    assert code == 0
+    assert len(document["files"]) == 2
+    assert all(key in record for record in document["files"])
+    assert document["summary"]["bytes"] > 0
+
+
+def test_cli_batch_action_failure_is_a_record(tmp_path, monkeypatch):
+    """An action that raises fails its file only."""
+    from commercetxt.rag.tools.health_check import AIHealthChecker
+
+    def assess(self, directives):
+        if directives.get("PRODUCT"):
+            raise RuntimeError("boom")
+        return {"score": 50}
+
+    monkeypatch.setattr(AIHealthChecker, "assess", assess)
+    _batch_dir(tmp_path)
+    code, stdout, _ = run_cli_internal([str(tmp_path), "--health", "--json"])
+    records = {Path(r["file"]).name: r for r in json.loads(stdout)["files"]}
+    assert code == 1
+    assert records["a.txt"]["ok"] is False
+    assert "boom" in records["a.txt"]["error"]
+    assert records["b.txt"]["report"] == {"score": 50}
+
+
+def test_cli_batch_prompt_matches_single_file(tmp_path):
+    _batch_dir(tmp_path)
+    _, single, _ = run_cli_internal([str(tmp_path / "a.txt"), "--prompt"])
+    _, stdout, _ = run_cli_internal([str(tmp_path), "--prompt", "--format", "ndjson"])
+    records = {Path(r["file"]).name: r for r in map(json.loads, stdout.splitlines())}
+    assert records["a.txt"]["prompt"] == single.rstrip("\n")
+
+
+def test_cli_batch_text_footer(tmp_path):
+    _batch_dir(tmp_path)
+    code, stdout, _ = run_cli_internal([str(tmp_path)])
+    assert code == 1
+    assert "✓" in stdout and "✗" in stdout
+    assert re.search(r"Processed 2 files \(1 failed\) in .*files/s", stdout)
+
+
+def test_cli_existing_path_with_glob_characters(tmp_path):
+    """A file named like a pattern is read as that one file."""
+    path = tmp_path / "store[1].txt"
+    path.write_text(
+        (_batch_dir(tmp_path) / "a.txt").read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+    code, stdout, _ = run_cli_internal([str(path)])
+    assert code == 0
+    assert "Status: VALID" in stdout
+
+
+def test_cli_batch_errors(tmp_path):
+    code, _, stderr = run_cli_internal([str(tmp_path / "*.txt")])
+    assert code == 1
+    assert "No files match" in stderr
+
+    _batch_dir(tmp_path)
+    code, _, stderr = run_cli_internal([str(tmp_path), "--jobs", "0"])
+    assert code == 1
+    assert "--jobs" in stderr
+
+    code, _, stderr = run_cli_internal([str(tmp_path), "--compare"])
+    assert code == 1
+    assert "--compare" in stderr
+
+
+def test_cli_watch_polls(tmp_path):
+    """--watch checks every file on the first poll, then only changes."""
+    _batch_dir(tmp_path)
+    args = [str(tmp_path), "--watch", "--polls", "2", "--interval", "0"]
+    code, stdout, _ = run_cli_internal([*args, "--format", "ndjson", "--health"])
+    records = [json.loads(line) for line in stdout.splitlines()]
+    assert code == 0
+    assert [(r["file"], r["event"]) for r in records] == [
+        ("a.txt", "added"),
+        ("b.txt", "added"),
+    ]
+    assert all("health" in r for r in records)
+
+    code, stdout, _ = run_cli_internal(args)
+    assert code == 0
+    assert "✓ a.txt (added" in stdout
+    assert "✗ b.txt (added" in stdout
+
+    code, _, stderr = run_cli_internal([str(tmp_path / "a.txt"), "--watch"])
+    assert code == 1
+    assert "Not a directory" in stderr
+
+
+def test_cli_bench(tmp_path):
+    """--bench times every stage over a corpus."""
+    _batch_dir(tmp_path)
+    code, stdout, _ = run_cli_internal(
+        [str(tmp_path), "--bench", "--repeat", "1", "--scale", "2", "--json"]
+    )
+    report = json.loads(stdout)
+    assert code == 0
+    assert report["files"] == 4
+    assert "normalize" in report["stages"]
+
+    code, stdout, _ = run_cli_internal([str(tmp_path), "--bench", "--repeat", "1"])
+    assert code == 0
+    assert "ops/s" in stdout
+    assert re.search(r"^parse\s+\d", stdout, re.MULTILINE)
+
+    code, _, stderr = run_cli_internal([str(tmp_path), "--bench", "--scale", "0"])
+    assert code == 1
+    assert "scale" in stderr
+
+
+def test_cli_import_feed(tmp_path):
+    """--import-feed writes a tree and reports token savings."""
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text(
+        '{"sku": "A-1", "name": "Lamp", "cat": "Lights", "price": "10"}\n'
+        '{"sku": "A-2", "name": "Rug", "cat": "Rugs", "price": "20"}\n'
+    )
+    mapping = tmp_path / "mapping.json"
+    mapping.write_text(
+        json.dumps(
+            {
+                "id": "sku",
+                "category": "cat",
+                "fields": {"name": "PRODUCT.Name", "price": "OFFER.Price"},
+                "root": {"IDENTITY": {"Name": "Shop", "Currency": "USD"}},
+            }
+        )
+    )
+    out = tmp_path / "tree"
+    audit = tmp_path / "audit.csv"
+    code, stdout, _ = run_cli_internal(
+        [
+            str(feed),
+            "--import-feed",
+            str(out),
+            "--mapping",
+            str(mapping),
+            "--audit",
+            str(audit),
+            "--json",
+        ]
+    )
+    assert code == 0
+    assert json.loads(stdout)["products"] == 2
+    assert (out / "products" / "rugs" / "a-2.txt").is_file()
+    assert len(audit.read_text().splitlines()) == 3
+
+    code, stdout, _ = run_cli_internal([str(feed), "--import-feed", str(out)])
+    assert code == 0
+    assert "Skipped 2 rows without id" in stdout
+
+    code, _, stderr = run_cli_internal([str(mapping), "--import-feed", str(out)])
+    assert code == 1
+    assert "Unknown feed format" in stderr
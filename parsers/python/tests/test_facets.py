@@ -0,0 +1,168 @@
+"""
+Facet index tests.
+
+Covers record flattening, facet counts, numeric ranges,
+incremental updates and row reuse.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from commercetxt.facets import FacetIndex, item_record, to_number  # noqa: E402
+from commercetxt.model import ParseResult  # noqa: E402
+
+
+def product(brand, color, price, stock=None):
+    directives = {
+        "PRODUCT": {"Name": f"{brand} {color}", "Brand": brand, "Color": color},
+        "OFFER": {"Price": price, "Currency": "USD"},
+    }
+    if stock is not None:
+        directives["INVENTORY"] = {"Stock": stock}
+    return directives
+
+
+@pytest.fixture
+def index():
+    return FacetIndex.from_results(
+        {
+            "a": product("Sony", "Black", "49.99", "3"),
+            "b": product("Sony", "White", "129.00", "0"),
+            "c": product("Bose", "Black", "299.00"),
+            "d": product("JBL", "Black", "$19.50"),
+            "e": product("Bose", "Silver", "not listed"),
+        },
+        fields=["Brand", "Color"],
+        numeric=["Price", "Stock"],
+    )
+
+
+class TestRecords:
+    """Flattening product results."""
+
+    def test_item_record_reads_sections_in_order(self):
+        """PRODUCT wins over OFFER for the same key."""
+        result = ParseResult(
+            directives={
+                "PRODUCT": {"Name": "X", "Price": "1.00"},
+                "OFFER": {"Price": "2.00", "Currency": "USD"},
+                "SPECS": {"Features": {"value": "A", "values": ["A", "B"]}},
+            }
+        )
+        record = item_record(result)
+        assert record["Price"] == "1.00"
+        assert record["Currency"] == "USD"
+        assert record["Features"] == ["A", "B"]
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("$1,299.00", 1299.0), ("22 units", 22.0), (5, 5.0), ("-3.5", -3.5)],
+    )
+    def test_to_number(self, value, expected):
+        assert to_number(value) == expected
+
+    def test_to_number_without_digits_is_nan(self):
+        assert to_number("n/a") != to_number("n/a")
+
+
+class TestQueries:
+    """Counts and item lists."""
+
+    def test_count_all(self, index):
+        assert index.count() == 5
+        assert len(index) == 5
+
+    def test_value_filter(self, index):
+        assert index.items({"Color": "Black"}) == ["a", "c", "d"]
+
+    def test_any_of_filter(self, index):
+        assert index.count({"Brand": ["Sony", "JBL"]}) == 3
+
+    def test_range_filter(self, index):
+        """Bounds are inclusive. Unreadable prices never match."""
+        assert index.items({"Color": "Black", "Price": (None, 49.99)}) == ["a", "d"]
+        assert index.count({"Price": (100, None)}) == 2
+        assert index.count({"Price": 129}) == 1
+
+    def test_unknown_value_matches_nothing(self, index):
+        assert index.count({"Brand": "Apple"}) == 0
+
+    def test_unknown_field_raises(self, index):
+        with pytest.raises(KeyError):
+            index.count({"SKU": "x"})
+
+    def test_facet_counts_ignore_own_filter(self, index):
+        """Other colors keep their counts while Black is picked."""
+        counts = index.facet_counts("Color", {"Color": "Black", "Brand": "Sony"})
+        assert counts == {"Black": 1, "White": 1}
+
+    def test_facet_counts(self, index):
+        assert index.facet_counts("Brand", {"Color": "Black"}) == {
+            "Sony": 1,
+            "Bose": 1,
+            "JBL": 1,
+        }
+
+    def test_value_range(self, index):
+        assert index.value_range("Price") == (19.5, 299.0)
+
+    def test_overlapping_fields_rejected(self):
+        with pytest.raises(ValueError, match="both facet and numeric"):
+            FacetIndex(fields=["Price"], numeric=["Price"])
+
+
+class TestUpdates:
+    """Incremental changes."""
+
+    def test_update_replaces_bits_and_values(self, index):
+        index.update("a", item_record(product("JBL", "White", "10.00")))
+        assert index.count({"Brand": "Sony"}) == 1
+        assert index.items({"Color": "White"}) == ["a", "b"]
+        assert index.value_range("Price") == (10.0, 299.0)
+
+    def test_remove_and_reuse_row(self, index):
+        assert index.remove("c") is True
+        assert index.remove("c") is False
+        assert index.facet_counts("Brand") == {"Sony": 2, "JBL": 1, "Bose": 1}
+
+        index.update("f", item_record(product("Bose", "Black", "5.00")))
+        assert "f" in index
+        assert index.items({"Brand": "Bose", "Color": "Black"}) == ["f"]
+
+    def test_same_item_twice_in_one_batch(self):
+        """The later record wins."""
+        index = FacetIndex(fields=["Color"])
+        index.update_many([("x", {"Color": "Red"}), ("x", {"Color": "Blue"})])
+        assert index.facet_counts("Color") == {"Blue": 1}
+
+    def test_grows_past_initial_capacity(self):
+        index = FacetIndex(fields=["Color"], numeric=["Price"])
+        index.update_many(
+            (str(i), {"Color": "Red" if i % 2 else "Blue", "Price": i})
+            for i in range(3000)
+        )
+        assert index.count({"Color": "Red"}) == 1500
+        assert index.count({"Price": (2990, None)}) == 10
+
+    def test_range_after_small_update_is_patched(self):
+        """Sorted columns are patched in place and stay correct."""
+        index = FacetIndex(numeric=["Price"])
+        index.update_many((str(i), {"Price": i}) for i in range(100))
+        assert index.count({"Price": (None, 9)}) == 10
+
+        index.update("50", {"Price": 1.5})
+        index.update("3", {"Price": "n/a"})
+        index.remove("7")
+        assert index.items({"Price": (None, 9)}) == [
+            "0",
+            "1",
+            "2",
+            "4",
+            "5",
+            "6",
+            "8",
+            "9",
+            "50",
+        ]
+        assert index.value_range("Price") == (0.0, 99.0)
@@ -0,0 +1,112 @@
+"""
+Import-time regression tests.
+
+Runs fresh interpreters with -X importtime. Checks that the heavy
+modules stay unloaded and that the import cost stays within budget.
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).parent.parent
+VALID_FILE = Path(__file__).parent / "vectors" / "valid" / "full_product.txt"
+
+# Generous budgets (microseconds, best of RUNS). The eager layout took
+# about 170ms and 200ms on the machine they were set on.
+IMPORT_BUDGET_US = 120_000
+VALIDATE_BUDGET_US = 160_000
+RUNS = 3
+
+_LINE_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$")
+
+# Modules the parser and the validator never need.
+HEAVY_MODULES = {
+    "asyncio",
+    "commercetxt.bridge",
+    "commercetxt.rag",
+    "commercetxt.rag.async_pipeline",
+    "concurrent.futures.process",
+    "hashlib",
+    "multiprocessing",
+    "socket",
+}
+
+VALIDATE_CODE = f"""
+import sys
+from commercetxt.cli import main
+sys.argv = ["commercetxt", {str(VALID_FILE)!r}, "--validate"]
+try:
+    main()
+except SystemExit:
+    pass
+"""
+
+
+def import_profile(code: str) -> tuple[int, set[str]]:
+    """
+    Run code in a fresh interpreter.
+    Returns the cumulative import time after startup and the modules loaded.
+    """
+    proc = subprocess.run(  # noqa: S603 - fixed argv, our own code
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PACKAGE_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    started = False
+    modules = set()
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = match.groups()
+        modules.add(name)
+        if indent:
+            continue
+        # Top-level entries after "site" come from the code itself.
+        if started:
+            total += int(cumulative)
+        elif name == "site":
+            started = True
+    return total, modules
+
+
+def best_profile(code: str) -> tuple[int, set[str]]:
+    runs = [import_profile(code) for _ in range(RUNS)]
+    return min(t for t, _ in runs), runs[0][1]
+
+
+def test_import_skips_heavy_modules():
+    _, modules = import_profile("import commercetxt")
+    assert "commercetxt.parser" in modules
+    assert not modules & (HEAVY_MODULES | {"commercetxt.validator"})
+
+
+def test_validate_skips_heavy_modules():
+    _, modules = import_profile(VALIDATE_CODE)
+    assert "commercetxt.validator" in modules
+    assert not modules & HEAVY_MODULES
+
+
+def test_lazy_attributes_resolve():
+    code = (
+        "import commercetxt as c; "
+        "assert c.CommerceTXTValidator.__module__ == 'commercetxt.validator'; "
+        "assert c.RAGGenerator.__name__ == 'RAGGenerator'; "
+        "assert 'is_safe_url' in dir(c)"
+    )
+    import_profile(code)
+
+
+def test_import_within_budget():
+    total, _ = best_profile("import commercetxt")
+    assert total < IMPORT_BUDGET_US, f"import commercetxt took {total}us"
+
+
+def test_validate_within_budget():
+    total, _ = best_profile(VALIDATE_CODE)
+    assert total < VALIDATE_BUDGET_US, f"commercetxt --validate took {total}us"
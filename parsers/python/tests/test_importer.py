@@ -0,0 +1,206 @@
+"""
+Feed importer tests.
+
+Covers CSV and JSONL feeds, the root/category/product layout, value
+cleaning, skipped and duplicate rows, the audit CSV and parallel writes.
+"""
+
+import csv
+import dataclasses
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from commercetxt import parse_file
+from commercetxt.importer import (
+    AUDIT_COLUMNS,
+    FeedMapping,
+    clean_value,
+    import_feed,
+    read_feed,
+    slugify,
+)
+from commercetxt.limits import MAX_LINE_LENGTH
+
+AUDIT_CSV = (
+    Path(__file__).resolve().parents[3]
+    / "examples"
+    / "ikea-us"
+    / "token_savings_audit.csv"
+)
+
+MAPPING = FeedMapping(
+    {
+        "title": "PRODUCT.Name",
+        "sku": "PRODUCT.SKU",
+        "price": "OFFER.Price",
+        "details": "PRODUCT.Description",
+    },
+    id_column="sku",
+    category_column="type",
+    constants={"OFFER": {"Currency": "USD"}},
+)
+
+ROWS = [
+    {"sku": "L-1", "title": "Desk lamp", "price": "19.99", "type": "Lighting"},
+    {"sku": "L-2", "title": "Floor lamp", "price": "89.00", "type": "Lighting"},
+    {
+        "sku": "R-1",
+        "title": "Rug: wool",
+        "price": "120",
+        "type": "Rugs & mats",
+        "details": "Soft\nwool | hand made",
+    },
+]
+
+
+def test_tree_layout(tmp_path):
+    mapping = dataclasses.replace(MAPPING, root={"IDENTITY": {"Name": "Shop"}})
+    report = import_feed(ROWS, tmp_path, mapping)
+    assert report["products"] == 3
+    assert report["categories"] == 2
+
+    root = parse_file(tmp_path / "commerce.txt")
+    assert root.level == "root"
+    assert root.directives["IDENTITY"] == {"Name": "Shop"}
+    assert [e["path"] for e in root.directives["CATALOG"]["items"]] == [
+        "/categories/lighting.txt",
+        "/categories/rugs-and-mats.txt",
+    ]
+
+    category = parse_file(tmp_path / "categories" / "lighting.txt")
+    assert category.directives["CATEGORY"] == {"Name": "Lighting", "ProductCount": "2"}
+    assert category.directives["FILTERS"]["PriceRange"] == "19.99 - 89"
+    for entry in category.directives["ITEMS"]["items"]:
+        assert (tmp_path / entry["path"].lstrip("/")).is_file()
+
+    rug = parse_file(tmp_path / "products" / "rugs-and-mats" / "r-1.txt")
+    assert rug.directives["PRODUCT"]["Description"] == "Soft wool / hand made"
+    assert rug.directives["OFFER"] == {"Currency": "USD", "Price": "120"}
+    rugs = parse_file(tmp_path / "categories" / "rugs-and-mats.txt")
+    assert rugs.directives["ITEMS"]["items"][0]["name"] == "Rug - wool"
+
+
+def test_csv_and_jsonl_feeds(tmp_path):
+    feed = tmp_path / "feed.csv"
+    with feed.open("w", newline="", encoding="utf-8") as fp:
+        writer = csv.DictWriter(fp, ["sku", "title", "price", "type"])
+        writer.writeheader()
+        writer.writerows({k: row[k] for k in writer.fieldnames} for row in ROWS)
+    assert [r["sku"] for r in read_feed(feed)] == ["L-1", "L-2", "R-1"]
+
+    jsonl = tmp_path / "feed.jsonl"
+    jsonl.write_text(
+        '{"id": "1", "PRODUCT.Name": "Lamp", "offer": {"price": 5}}\n\n'
+        '{"id": "2", "PRODUCT.Name": "Rug", "tags": ["a", "b"]}\n'
+    )
+    rows = list(read_feed(jsonl))
+    assert len(rows) == 2
+
+    # Without fields, columns named like targets map to themselves.
+    directives = FeedMapping().directives(rows[0])
+    assert directives == {"PRODUCT": {"Name": "Lamp"}}
+    nested = FeedMapping({"offer.price": "OFFER.Price", "tags": "PRODUCT.Tags"})
+    assert nested.directives(rows[0]) == {"OFFER": {"Price": "5"}}
+    assert nested.directives(rows[1]) == {"PRODUCT": {"Tags": "a, b"}}
+
+    with pytest.raises(ValueError, match="Unknown feed format"):
+        list(read_feed(tmp_path / "feed.xml"))
+
+
+def test_skipped_and_duplicate_rows(tmp_path):
+    rows = [*ROWS, {"sku": "", "title": "No id"}, dict(ROWS[0], title="Again")]
+    report = import_feed(rows, tmp_path, MAPPING)
+    assert report["products"] == 3
+    assert report["skipped"] == 1
+    assert report["duplicates"] == 1
+
+
+def test_non_finite_prices_stay_out_of_price_range(tmp_path):
+    rows = [
+        *ROWS,
+        {"sku": "L-3", "title": "Wall lamp", "price": "nan", "type": "Lighting"},
+        {"sku": "L-4", "title": "Desk fan", "price": "inf", "type": "Lighting"},
+    ]
+    import_feed(rows, tmp_path, MAPPING)
+    category = parse_file(tmp_path / "categories" / "lighting.txt")
+    assert category.directives["CATEGORY"]["ProductCount"] == "4"
+    assert category.directives["FILTERS"]["PriceRange"] == "19.99 - 89"
+
+
+def test_unwritable_row_fails_alone(tmp_path):
+    """A value the writer rejects fails its row. The tree is still written."""
+    long_title = "x" * (MAX_LINE_LENGTH + 1)
+    rows = [*ROWS, {"sku": "L-3", "title": long_title, "type": "Lighting"}]
+    audit = io.StringIO()
+    report = import_feed(rows, tmp_path, MAPPING, audit=audit)
+
+    assert report["products"] == 3
+    assert report["failed"] == 1
+    assert report["errors"][0]["product_id"] == "L-3"
+    assert "max length" in report["errors"][0]["error"]
+    assert len(audit.getvalue().splitlines()) == 4
+
+    category = parse_file(tmp_path / "categories" / "lighting.txt")
+    assert category.directives["CATEGORY"]["ProductCount"] == "2"
+    for entry in category.directives["ITEMS"]["items"]:
+        assert (tmp_path / entry["path"].lstrip("/")).is_file()
+    assert (tmp_path / "commerce.txt").is_file()
+
+
+def test_audit_matches_example_columns(tmp_path):
+    with AUDIT_CSV.open(encoding="utf-8") as fp:
+        assert tuple(next(csv.reader(fp))) == AUDIT_COLUMNS
+
+    audit = io.StringIO()
+    report = import_feed(ROWS, tmp_path, MAPPING, audit=audit)
+    records = list(csv.DictReader(io.StringIO(audit.getvalue())))
+    assert [r["product_id"] for r in records] == ["L-1", "L-2", "R-1"]
+    for record in records:
+        saved = int(record["json_tokens"]) - int(record["commercetxt_tokens"])
+        assert int(record["tokens_saved"]) == saved
+    assert report["tokens_saved"] == sum(int(r["tokens_saved"]) for r in records)
+    assert report["json_tokens"] == sum(int(r["json_tokens"]) for r in records)
+
+
+def test_parallel_writes_match_serial(tmp_path):
+    rows = [
+        {"sku": f"P-{i}", "title": f"Item {i}", "price": str(i), "type": f"C{i % 3}"}
+        for i in range(40)
+    ]
+    import_feed(rows, tmp_path / "serial", MAPPING)
+    report = import_feed(iter(rows), tmp_path / "parallel", MAPPING, workers=2)
+    assert report["products"] == 40
+
+    def tree(root):
+        return {
+            p.relative_to(root): p.read_text(encoding="utf-8")
+            for p in root.rglob("*.txt")
+        }
+
+    assert tree(tmp_path / "serial") == tree(tmp_path / "parallel")
+
+
+def test_mapping_from_dict():
+    mapping = FeedMapping.from_dict(
+        json.loads(
+            '{"fields": {"t": "PRODUCT.Name"}, "id": "sku",'
+            ' "root": {"IDENTITY": {"Name": "Shop"}}}'
+        )
+    )
+    assert mapping.id_column == "sku"
+    assert mapping.root == {"IDENTITY": {"Name": "Shop"}}
+    assert mapping.category_column == "category"
+    with pytest.raises(ValueError, match="SECTION.Key"):
+        FeedMapping({"t": "product.name"})
+
+
+def test_clean_value_and_slugify():
+    assert clean_value("  a\r\nb |  c ") == "a b / c"
+    assert clean_value(["x", None, 3]) == "x, 3"
+    assert clean_value({"nested": 1}) == ""
+    assert slugify("Accent & throw pillows") == "accent-and-throw-pillows"
+    assert slugify("ZEBRASÄV") == "zebrasav"
+    assert slugify("../..") == ""
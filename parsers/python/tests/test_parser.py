@@ -469,6 +469,16 @@ def test_detect_indent_extra_cases(parser):
     assert p.indent_width == 2
 
 
+def test_detect_indent_deep_levels_outnumber_first():
+    """Grandchildren outnumber children. Width still 2, levels kept."""
+    content = "# @S\n- A\n  - B\n    - C\n    - D\n    - E"
+    p = CommerceTXTParser(auto_detect_indent=True)
+    result = p.parse(content)
+    assert p.indent_width == 2
+    child = result.directives["S"]["items"][0]["children"][0]
+    assert [c["value"] for c in child["children"]] == ["C", "D", "E"]
+
+
 def test_try_read_encoding_failures(tmp_path):
     """Invalid sequence returns None from try_read."""
     f = tmp_path / "test.txt"
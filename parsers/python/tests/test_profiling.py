@@ -0,0 +1,143 @@
+"""
+Profiling hook tests.
+
+Covers cProfile and collapsed-stack output, per-stage memory reports,
+pipeline stages and the CLI flags.
+"""
+
+import asyncio
+import pstats
+from unittest.mock import MagicMock
+
+import pytest
+
+from commercetxt.profiling import MemoryReport, Profiler, profile, stage
+from commercetxt.rag.async_pipeline import AsyncRAGPipeline
+from commercetxt.rag.pipeline import RAGPipeline
+
+from .test_cli import run_cli_internal
+
+
+def leaf(n):
+    return sum(range(n))
+
+
+def branch():
+    return leaf(20000) + leaf(20000)
+
+
+def test_cprofile_writes_pstats(tmp_path):
+    out = tmp_path / "run.prof"
+    with profile("cprofile", out):
+        branch()
+    stats = pstats.Stats(str(out))
+    assert any(func[2] == "branch" for func in stats.stats)
+
+
+def test_collapsed_stacks(tmp_path):
+    out = tmp_path / "run.folded"
+    with profile("collapsed", out) as profiler:
+        branch()
+    lines = out.read_text().splitlines()
+    assert lines == profiler.collapsed().splitlines()
+    stacks = dict(line.rsplit(" ", 1) for line in lines)
+    key = f"{__name__}.branch;{__name__}.leaf;builtins.sum"
+    assert key in stacks
+    assert all(int(us) > 0 for us in stacks.values())
+
+
+def test_unknown_profile_mode():
+    with pytest.raises(ValueError):
+        Profiler("perf")
+
+
+def test_stage_without_report_is_noop():
+    with stage("parse"):
+        pass
+
+
+def test_memory_report_per_stage():
+    with MemoryReport() as report:
+        with stage("parse"):
+            kept = [bytes(1000) for _ in range(100)]
+        with stage("validate"):
+            big = bytearray(2_000_000)
+            del big
+    stats = report.to_dict()
+    assert list(stats) == ["parse", "validate"]
+    assert stats["parse"]["net_bytes"] >= 100_000
+    assert stats["validate"]["peak_bytes"] >= 2_000_000
+    assert stats["validate"]["net_bytes"] < 100_000
+    assert __file__ in stats["parse"]["top_sites"][0]["site"]
+    assert "parse: peak" in report.format()
+    assert kept
+
+
+def test_memory_report_nested_stage_keeps_outer_peak():
+    with MemoryReport() as report:
+        with stage("outer"):
+            big = bytearray(3_000_000)
+            del big
+            with stage("inner"):
+                pass
+    stats = report.to_dict()
+    assert stats["outer"]["peak_bytes"] >= 3_000_000
+    assert stats["inner"]["peak_bytes"] < 1_000_000
+
+
+def _mock_pipeline(pipeline):
+    pipeline.health_checker = MagicMock()
+    pipeline.health_checker.assess.return_value = {"score": 100}
+    pipeline.generator = MagicMock()
+    pipeline.generator.generate.return_value = [{"text": "a"}, {"text": "b"}]
+    pipeline.container = MagicMock()
+    pipeline.container.embedder.embed_shards.side_effect = lambda s: s
+    pipeline.container.vector_store.upsert.side_effect = lambda s, **_: len(s)
+    return pipeline
+
+
+def test_pipeline_profile_and_stages():
+    pipeline = _mock_pipeline(RAGPipeline(container=MagicMock()))
+    with MemoryReport() as report, pipeline.profile("collapsed") as profiler:
+        assert pipeline.ingest({"ITEM": "x"}) == 2
+    assert list(report.to_dict()) == ["generate", "embed", "upsert"]
+    stacks = profiler.collapsed()
+    assert "RAGPipeline.ingest" in stacks
+    # Snapshot bookkeeping is one opaque frame, not thousands of calls.
+    assert "commercetxt.profiling._snapshot " in stacks
+    assert "_snapshot;" not in stacks
+
+
+def test_async_pipeline_stages():
+    pipeline = _mock_pipeline(AsyncRAGPipeline(enable_cache=False))
+    with MemoryReport() as report, pipeline.profile() as profiler:
+        assert asyncio.run(pipeline.ingest({"ITEM": "x"})) == 2
+    assert list(report.to_dict()) == ["generate", "embed", "upsert"]
+    assert profiler.mode == "cprofile"
+
+
+def test_cli_profile_and_memory_report(tmp_path):
+    product = tmp_path / "p.txt"
+    product.write_text(
+        "# @IDENTITY\nName: Store\nCurrency: USD\n# @PRODUCT\nName: Lamp\nSKU: L-1"
+    )
+    out = tmp_path / "cli.folded"
+    code, _, stderr = run_cli_internal(
+        [
+            str(product),
+            "--prompt",
+            "--profile",
+            "collapsed",
+            "--profile-output",
+            str(out),
+            "--memory-report",
+        ]
+    )
+    assert code == 0
+    assert "_load_and_merge" in out.read_text()
+    for name in ("parse:", "validate:", "generate:"):
+        assert name in stderr
+
+    code, _, stderr = run_cli_internal([str(product), "--profile", "cprofile"])
+    assert code == 0
+    assert "Ordered by: cumulative time" in stderr
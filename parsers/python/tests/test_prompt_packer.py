@@ -0,0 +1,113 @@
+"""
+Multi-product prompt packer tests.
+
+Covers detail levels, budget compliance, coverage-first packing,
+shared store lines and custom estimators.
+"""
+
+import pytest
+
+from commercetxt.bridge import CommerceAIBridge
+from commercetxt.constants import (
+    DETAIL_CORE,
+    DETAIL_FULL,
+    DETAIL_MINIMAL,
+    DETAIL_TRIMMED,
+)
+from commercetxt.model import ParseResult
+from commercetxt.prompt_packer import PromptPacker, estimate_tokens, pack_prompts
+
+
+def product(i, store="TechStore", currency="USD"):
+    return ParseResult(
+        directives={
+            "IDENTITY": {"Name": store, "Currency": currency},
+            "PRODUCT": {"Name": f"Widget {i}", "SKU": f"W-{i}", "Brand": "Acme"},
+            "OFFER": {"Price": f"{10 + i}.00", "Availability": "InStock"},
+            "SPECS": {f"Spec{k}": f"value {k}" for k in range(6)},
+            "VARIANTS": {
+                "Type": "Color",
+                "Options": [{"name": c} for c in ("Red", "Blue", "Green", "Black")],
+            },
+        }
+    )
+
+
+class TestDetailLevels:
+    """CommerceAIBridge.render_lines()."""
+
+    def test_full_matches_low_token_prompt(self):
+        bridge = CommerceAIBridge(product(1))
+        assert "\n".join(bridge.render_lines()) == bridge.generate_low_token_prompt()
+
+    def test_levels_shrink(self):
+        bridge = CommerceAIBridge(product(1))
+        sizes = [
+            len(bridge.render_lines(level))
+            for level in (DETAIL_FULL, DETAIL_TRIMMED, DETAIL_CORE, DETAIL_MINIMAL)
+        ]
+        assert sizes == sorted(sizes, reverse=True)
+        assert bridge.render_lines(DETAIL_MINIMAL, identity=False) == [
+            "ITEM: Widget 1",
+            "PRICE: 11.00",
+            "AVAILABILITY: InStock",
+        ]
+
+    def test_trimmed_caps_specs_and_variants(self):
+        lines = CommerceAIBridge(product(1)).render_lines(DETAIL_TRIMMED)
+        assert sum(line.startswith("  Spec") for line in lines) == 2
+        assert "COLOR: Red, Blue" in lines
+        assert "  (+2 more)" in lines
+
+
+class TestPacking:
+    """Budget, coverage and shared lines."""
+
+    def test_stays_within_budget(self):
+        packed = pack_prompts([product(i) for i in range(50)], budget=500)
+        assert packed.tokens <= 500
+        assert packed.tokens == estimate_tokens(packed.text)
+
+    def test_coverage_before_detail(self):
+        """Everyone fits minimal before anyone gets more."""
+        results = [product(i) for i in range(20)]
+        minimal_only = pack_prompts(results, budget=300)
+        assert not minimal_only.dropped
+        assert set(minimal_only.details.values()) <= {DETAIL_MINIMAL, DETAIL_CORE}
+
+    def test_large_budget_is_full_detail(self):
+        packed = pack_prompts([product(i) for i in range(3)], budget=100_000)
+        assert set(packed.details.values()) == {DETAIL_FULL}
+        assert packed.text.count("SPECS:") == 3
+
+    def test_upgrades_follow_rank(self):
+        """Higher ranked products are upgraded first."""
+        packed = pack_prompts([product(i) for i in range(10)], budget=450)
+        levels = [packed.details[i] for i in sorted(packed.details)]
+        assert levels == sorted(levels)
+
+    def test_drops_what_does_not_fit(self):
+        packed = pack_prompts([product(i) for i in range(100)], budget=200)
+        assert packed.dropped
+        assert packed.dropped == list(range(100))[len(packed.details) :]
+
+    def test_store_lines_printed_once(self):
+        results = [product(i) for i in range(4)] + [product(9, "Other", "EUR")]
+        text = pack_prompts(results, budget=100_000).text
+        assert text.count("STORE: TechStore") == 1
+        assert text.startswith("STORE: TechStore\nCURRENCY: USD\n---")
+        assert text.count("STORE: Other") == 1
+
+    def test_custom_estimator(self):
+        """One token per line."""
+        packer = PromptPacker(estimator=lambda text: len(text.splitlines()))
+        packed = packer.pack([product(i) for i in range(5)], budget=12)
+        assert packed.tokens == 12
+        assert packed.details == {0: DETAIL_CORE, 1: DETAIL_MINIMAL}
+
+    def test_empty_and_invalid(self):
+        packed = pack_prompts([], budget=10)
+        assert packed.text == ""
+        assert packed.tokens == 0
+        with pytest.raises(ValueError, match="budget must be positive"):
+            pack_prompts([product(1)], budget=0)
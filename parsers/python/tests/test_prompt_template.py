@@ -0,0 +1,242 @@
+"""
+Compiled prompt template tests.
+
+Covers byte-for-byte parity of the default template with the bridge,
+custom layouts, field conditions, format handling and spec validation.
+"""
+
+import ast
+from pathlib import Path
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from commercetxt.bridge import CommerceAIBridge
+from commercetxt.model import ParseResult
+from commercetxt.parser import CommerceTXTParser
+from commercetxt.prompt_template import (
+    DEFAULT_TEMPLATE,
+    Field,
+    PromptTemplate,
+    Section,
+    default_template,
+)
+
+VECTORS_DIR = Path(__file__).parent / "vectors"
+
+
+def full_directives():
+    return {
+        "IDENTITY": {"Name": "TechStore", "Currency": "EUR"},
+        "PRODUCT": {"Name": "Phone", "SKU": "P-1", "Brand": "", "URL": None},
+        "OFFER": {"Price": "499.00", "Condition": "New"},
+        "INVENTORY": {"Stock": "0", "LastUpdated": "2026-01-01"},
+        "REVIEWS": {"Rating": "4.5", "Count": "", "TopTags": "fast"},
+        "SPECS": {f"Spec{i}": i for i in range(7)} | {"items": []},
+        "VARIANTS": {
+            "Type": "Color",
+            "Options": [{"name": "Red"}, {"value": "Blue"}, "x", {"name": "Black"}],
+        },
+        "SHIPPING": {"items": [{"name": "Express", "path": "9.99"}, "x", {}]},
+        "PROMOS": {"items": [{"value": "10% off"}]},
+        "COMPATIBILITY": {"Works": "Android", "items": [1]},
+        "IMAGES": {"items": [{"name": "Main", "Alt": '"Front"'}, {"path": "a.jpg"}]},
+        "AGE_RESTRICTION": {"MinimumAge": 0},
+        "SEMANTIC_LOGIC": {
+            "items": [{"name": "if x", "path": "y"}, {"value": "be nice"}, "plain"]
+        },
+        "BRAND_VOICE": {"Guidelines": "Short"},
+    }
+
+
+# Values that hit every None / "" / numeric branch of the bridge.
+scalars = st.sampled_from([None, "", 0, -1, "5", "-3", "abc", True, 1.5, "text"])
+
+
+def section(*keys):
+    return st.dictionaries(st.sampled_from(keys), scalars)
+
+
+item_dicts = section("name", "path", "value")
+mixed_items = st.lists(item_dicts | scalars, max_size=5)
+
+directives = st.fixed_dictionaries(
+    {},
+    optional={
+        "IDENTITY": section("Name", "Currency"),
+        "PRODUCT": section("Name", "SKU", "Brand", "URL"),
+        "OFFER": section("Price", "Availability", "Condition", "URL"),
+        "INVENTORY": section("Stock", "LastUpdated"),
+        "REVIEWS": section("Rating", "Count", "TopTags"),
+        "SPECS": section("A", "B", "C", "D", "E", "F", "items"),
+        "VARIANTS": st.fixed_dictionaries(
+            {"Options": mixed_items}, optional={"Type": st.just("Size")}
+        ),
+        "SHIPPING": st.fixed_dictionaries({"items": mixed_items}),
+        # The bridge expects dicts here.
+        "PROMOS": st.fixed_dictionaries({"items": st.lists(item_dicts, max_size=3)}),
+        "IMAGES": st.fixed_dictionaries(
+            {
+                "items": st.lists(
+                    st.fixed_dictionaries(
+                        {"Alt": st.sampled_from(["", "alt", '"q"'])},
+                        optional={"name": scalars, "path": scalars},
+                    ),
+                    max_size=3,
+                )
+            }
+        ),
+        "COMPATIBILITY": section("X", "Y"),
+        "AGE_RESTRICTION": section("MinimumAge"),
+        "SEMANTIC_LOGIC": st.fixed_dictionaries({"items": mixed_items}),
+        "BRAND_VOICE": section("Tone", "Guidelines"),
+    },
+)
+
+
+class TestDefaultTemplate:
+    """DEFAULT_TEMPLATE reproduces generate_low_token_prompt()."""
+
+    def test_matches_bridge_on_vectors(self):
+        parser = CommerceTXTParser()
+        paths = sorted(VECTORS_DIR.rglob("*.txt"))
+        assert paths
+        for path in paths:
+            result = parser.parse(path.read_text(encoding="utf-8"))
+            result.trust_flags.append("inventory_stale")
+            bridge = CommerceAIBridge(result)
+            assert (
+                bridge.generate_template_prompt() == bridge.generate_low_token_prompt()
+            ), path.name
+
+    def test_matches_bridge_on_edge_values(self):
+        result = ParseResult(directives=full_directives())
+        bridge = CommerceAIBridge(result)
+        assert bridge.generate_template_prompt() == bridge.generate_low_token_prompt()
+
+    @settings(max_examples=300)
+    @given(directives, st.booleans())
+    def test_matches_bridge_on_generated_directives(self, data, stale):
+        flags = ["inventory_stale"] if stale else []
+        result = ParseResult(directives=data, trust_flags=flags)
+        expected = CommerceAIBridge(result).generate_low_token_prompt()
+        assert default_template().render(result) == expected
+
+    def test_empty_result(self):
+        assert default_template().render(ParseResult()) == ""
+
+    def test_compiled_once(self):
+        assert default_template() is default_template()
+
+
+class TestCustomTemplates:
+    """Merchant layouts without subclassing."""
+
+    def test_order_labels_and_caps(self):
+        template = PromptTemplate(
+            (
+                Section("OFFER", fields=(Field("{Price} {Currency}"),)),
+                Section("PRODUCT", fields=(Field("Item: {Name}", {"Name": "?"}),)),
+                Section("SPECS", "mapping", header="Specs", cap=2),
+            )
+        ).compile()
+        text = template.render_directives(full_directives())
+        assert text == "Item: Phone\nSpecs\n  Spec0: 0\n  Spec1: 1"
+
+    def test_line_needs_every_placeholder(self):
+        template = PromptTemplate(
+            (Section("OFFER", fields=(Field("{Price} {Currency}"),)),)
+        ).compile()
+        assert template.render_directives({"OFFER": {"Price": 1}}) == ""
+        both = {"OFFER": {"Price": 1, "Currency": "USD"}}
+        assert template.render_directives(both) == "1 USD"
+
+    def test_list_items(self):
+        template = PromptTemplate(
+            (
+                Section(
+                    "SHIPPING",
+                    "list",
+                    fields=(Field("- {name} ({path})", {"path": "free"}),),
+                    header="Delivery:",
+                ),
+            )
+        ).compile()
+        shipping = {"items": [{"name": "A", "path": "5"}, {"name": "B"}, {"x": 1}]}
+        text = template.render_directives({"SHIPPING": shipping})
+        assert text == "Delivery:\n- A (5)\n- B (free)"
+
+    def test_trust_flag_line(self):
+        template = PromptTemplate(
+            (Section("OFFER", fields=(Field("CHECK PRICE", flag="price_stale"),)),)
+        ).compile()
+        offer = {"OFFER": {"Price": 1}}
+        assert template.render_directives(offer) == ""
+        assert template.render_directives(offer, ["price_stale"]) == "CHECK PRICE"
+
+    def test_format_specs_and_conversions(self):
+        template = PromptTemplate(
+            (
+                Section(
+                    "OFFER",
+                    fields=(Field("{Price:>6.2f}|{Name!r}|{{literal}}"),),
+                ),
+            )
+        ).compile()
+        text = template.render_directives({"OFFER": {"Price": 9.5, "Name": "x"}})
+        assert text == "  9.50|'x'|{literal}"
+
+    def test_specs_with_mixed_quotes(self):
+        template = PromptTemplate(
+            (
+                Section("OFFER", fields=(Field('It\'s "on sale": {Price:>5}'),)),
+                Section("SPECS", kind="mapping", item_format='{key}: "{value:\'^5}"'),
+            )
+        ).compile()
+        text = template.render_directives(
+            {"OFFER": {"Price": 9}, "SPECS": {"Size": "M"}}
+        )
+        assert text == "It's \"on sale\":     9\nSize: \"''M''\""
+
+    def test_spec_text_is_not_code(self):
+        hostile = '\'"\\n__import__(\'os\')""" x'
+        template = PromptTemplate(
+            (Section(hostile, fields=(Field("'''\\ {" + hostile + '}"'),)),)
+        ).compile()
+        names = {
+            n.id
+            for n in ast.walk(ast.parse(template.source))
+            if isinstance(n, ast.Name)
+        }
+        assert "__import__" not in names
+        text = template.render_directives({hostile: {hostile: 1}})
+        assert text == "'''\\ 1\""
+
+    def test_bridge_custom_template(self):
+        template = PromptTemplate(
+            (Section("PRODUCT", fields=(Field("{Name}"),)),)
+        ).compile()
+        bridge = CommerceAIBridge(ParseResult(directives=full_directives()))
+        assert bridge.generate_template_prompt(template) == "Phone"
+
+    @pytest.mark.parametrize(
+        "section",
+        [
+            Section("X", "table"),
+            Section("X", "mapping", cap=0),
+            Section("X", "options", cap="3]; import os; x = [0"),
+            Section("X", fields=(Field("{}"),)),
+            Section("X", fields=(Field("{a!z}"),)),
+            Section("X", fields=(Field("{a}", when="sometimes"),)),
+            Section("X", "mapping", item_format="{key} {other}"),
+        ],
+    )
+    def test_invalid_specs(self, section):
+        with pytest.raises(ValueError):
+            PromptTemplate((section,)).compile()
+
+    def test_default_template_is_data(self):
+        directives = [s.directive for s in DEFAULT_TEMPLATE.sections]
+        assert directives[:3] == ["IDENTITY", "PRODUCT", "OFFER"]
+        assert len(set(directives)) == len(directives)
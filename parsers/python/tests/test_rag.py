@@ -19,6 +19,7 @@ from commercetxt.rag.core.filters import (
     SustainabilityFilter,
 )
 from commercetxt.rag.core.generator import RAGGenerator
+from commercetxt.rag.core.keywords import KeywordMatcher
 from commercetxt.rag.core.semantic_tags import SemanticTagger
 from commercetxt.rag.core.shards import ShardBuilder
 
@@ -126,6 +127,42 @@ def test_seasonality_detection():
     # Should not have seasonal tags unless current month matches
 
 
+def test_seasonality_for_given_month():
+    """An explicit month makes seasonal tags deterministic."""
+    assert SeasonalityFilter.detect_seasonality("Warm Winter Coat", 1) == [
+        "winter_seasonal"
+    ]
+    assert SeasonalityFilter.detect_seasonality("Warm Winter Coat", 7) == []
+    assert SeasonalityFilter.detect_seasonality("Warm Christmas lights", 12) == [
+        "winter_seasonal",
+        "holiday_seasonal",
+    ]
+
+
+def test_batch_reads_month_once(monkeypatch):
+    """A batch reads the clock once, not once per product."""
+    from commercetxt.rag.core import filters, generator
+
+    calls = []
+    monkeypatch.setattr(generator, "current_month", lambda: calls.append(1) or 1)
+    monkeypatch.setattr(filters, "current_month", lambda: pytest.fail("per product"))
+
+    gen = RAGGenerator()
+    shards = gen.generate_batch([{"ITEM": f"Winter coat {i}"} for i in range(5)])
+    assert calls == [1]
+    assert "winter_seasonal" in shards[0]["metadata"]["semantic_tags"][0].values()
+    assert gen.tagger.month is None
+
+
+def test_keyword_matcher_finds_overlapping_keywords():
+    """Same hits as `kw in text` per keyword, in one scan."""
+    matcher = KeywordMatcher({"a": ["wood", "wooden"], "b": ["hardwood", "den"]})
+    assert matcher.keywords("hardwooden") == {"wood", "wooden", "hardwood", "den"}
+    assert matcher.labels("hardwood") == {"a", "b"}
+    assert matcher.labels("plastic") == set()
+    assert KeywordMatcher({}).labels("anything") == set()
+
+
 # ========== Sustainability Filter Tests ==========
 
 
@@ -1333,6 +1370,43 @@ def test_generator_groups_variants_by_primary_attribute():
     assert len(shards) >= 1
 
 
+VOLATILE_PRODUCT = {
+    "PRODUCT": {"SKU": "mug-1"},
+    "ITEM": "Mug",
+    "BRAND": "Acme",
+    "PRICE": "12",
+    "CURRENCY": "USD",
+    "AVAILABILITY": "InStock",
+    "SPECS": {"Material": "Ceramic"},
+    "VARIANTS": {
+        "Type": "Color",
+        "Options": ["Blue: 12.00 | SKU: MUG-B | Stock: 3", "Red"],
+    },
+}
+
+
+def test_generator_volatile_fields_left_out_of_shards():
+    """Volatile values go to live_attributes(), not shard text or tags."""
+    from commercetxt.rag.core.constants import DEFAULT_VOLATILE_FIELDS
+
+    gen = RAGGenerator(volatile_fields=DEFAULT_VOLATILE_FIELDS)
+    shards = gen.generate(dict(VOLATILE_PRODUCT))
+
+    texts = [s["text"] for s in shards]
+    assert texts == ["Acme Mug", "Ceramic", "Color: Blue", "Color: Red"]
+    tags = {t["tag"] for t in shards[0]["metadata"]["semantic_tags"]}
+    assert not tags & {"budget_friendly", "ready_to_ship"}
+    assert "PRICE" not in shards[0]["metadata"]["original_data"]
+
+    assert gen.live_attributes(VOLATILE_PRODUCT) == {
+        "price": "12",
+        "currency": "USD",
+        "availability": "InStock",
+        "variants": {"MUG-B": {"price": "12.00", "stock": 3}},
+    }
+    assert RAGGenerator().live_attributes(VOLATILE_PRODUCT) == {}
+
+
 def test_generator_handles_very_long_text_fields():
     """Generator processes long text without memory issues."""
     gen = RAGGenerator()
@@ -1343,3 +1417,243 @@ def test_generator_handles_very_long_text_fields():
 
     shards = gen.generate(data)
     assert len(shards) > 0
+
+
+def test_pipeline_manifest_ingests_only_changed_shards(tmp_path: Path):
+    import sqlite3
+
+    from commercetxt.rag.core.manifest import ShardManifest
+    from commercetxt.rag.drivers.faiss_store import FaissStore
+    from commercetxt.rag.exceptions import VectorStoreError
+    from commercetxt.rag.pipeline import RAGPipeline
+
+    class H:
+        def assess(self, data):
+            return {"score": 100, "warnings": []}
+
+    class E:
+        def __init__(self):
+            self.texts: list[str] = []
+
+        def embed_shards(self, shards):
+            for s in shards:
+                self.texts.append(s["text"])
+                s["values"] = [1.0, float(len(s["text"])), 0.5, 0.0]
+            return shards
+
+    class C:
+        def __init__(self, store):
+            self.embedder = E()
+            self.vector_store = store
+
+    store = FaissStore(root_dir=str(tmp_path), dimension=4, enable_logging=False)
+    p = RAGPipeline(manifest=ShardManifest(tmp_path / "manifest.sqlite"))
+    p.health_checker = H()
+    p.container = C(store)
+    embedder = p.container.embedder
+    product = {
+        "PRODUCT": {"SKU": "mug-1"},
+        "ITEM": "Mug",
+        "BRAND": "Acme",
+        "PRICE": "12",
+        "SPECS": {"Material": "Ceramic", "Color": "Blue"},
+    }
+
+    first = p.ingest(product)
+    assert first == len(embedder.texts) > 0
+
+    # Nothing changed: nothing embedded or upserted.
+    embedder.texts.clear()
+    assert p.ingest(product) == 0
+    assert embedder.texts == []
+
+    # A changed price is re-embedded, a dropped spec deleted.
+    product["PRICE"] = "14"
+    product["SPECS"] = {"Material": "Ceramic"}
+    assert p.ingest(product) == 1
+    assert embedder.texts == ["14"]
+    assert p.manifest.stats == {
+        "changed": first + 1,
+        "unchanged": 2 * first - 2,
+        "removed": 1,
+    }
+    conn = sqlite3.connect(tmp_path / "default.meta.sqlite")
+    assert conn.execute("SELECT COUNT(*) FROM shards").fetchone()[0] == first - 1
+    store.close()
+
+    # Removed shards cannot be deleted from a store without stable IDs.
+    class VS:
+        def connect(self):
+            return True
+
+    p.container = C(VS())
+    with pytest.raises(VectorStoreError):
+        p.ingest(product)
+
+
+def test_pipeline_manifest_refreshes_payloads_of_unchanged_shards(tmp_path: Path):
+    """Every shard of a re-ingested product returns its current data."""
+    import sqlite3
+
+    from commercetxt.rag.core.manifest import ShardManifest
+    from commercetxt.rag.drivers.faiss_store import FaissStore
+    from commercetxt.rag.pipeline import RAGPipeline
+
+    class H:
+        def assess(self, data):
+            return {"score": 100, "warnings": []}
+
+    class E:
+        def __init__(self):
+            self.texts: list[str] = []
+
+        def embed_shards(self, shards):
+            for s in shards:
+                self.texts.append(s["text"])
+                s["values"] = [1.0, float(len(s["text"])), 0.5, 0.0]
+            return shards
+
+    class C:
+        def __init__(self, store):
+            self.embedder = E()
+            self.vector_store = store
+
+    store = FaissStore(root_dir=str(tmp_path), dimension=4, enable_logging=False)
+    p = RAGPipeline(manifest=ShardManifest())
+    p.health_checker = H()
+    p.container = C(store)
+    product = {
+        "PRODUCT": {"SKU": "mug-1"},
+        "ITEM": "Mug",
+        "PRICE": "10",
+        "CURRENCY": "USD",
+        "SPECS": {"Material": "Ceramic"},
+    }
+    total = p.ingest(product)
+
+    product["PRICE"] = "12"
+    p.container.embedder.texts.clear()
+    assert p.ingest(product) == 1
+    assert p.container.embedder.texts == ["12"]
+
+    hits = store.search([1.0, 3.0, 0.5, 0.0], top_k=total, with_payloads=True)
+    assert len(hits) == total
+    assert {h["metadata"]["original_data"]["PRICE"] for h in hits} == {"12"}
+    conn = sqlite3.connect(tmp_path / "default.meta.sqlite")
+    assert conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0] == 1
+    conn.close()
+    store.close()
+
+
+def test_pipeline_volatile_fields_go_to_realtime_storage(tmp_path: Path):
+    from commercetxt.rag.core.constants import DEFAULT_VOLATILE_FIELDS
+    from commercetxt.rag.core.manifest import ShardManifest
+    from commercetxt.rag.drivers.faiss_store import FaissStore
+    from commercetxt.rag.pipeline import RAGPipeline
+
+    class H:
+        def assess(self, data):
+            return {"score": 100, "warnings": []}
+
+    class E:
+        def __init__(self):
+            self.texts: list[str] = []
+
+        def embed_shards(self, shards):
+            for s in shards:
+                self.texts.append(s["text"])
+                s["values"] = [1.0, float(len(s["text"])), 0.5, 0.0]
+            return shards
+
+    class S:
+        def __init__(self):
+            self.live: dict[str, dict[str, Any]] = {}
+
+        def set_live_attributes(self, product_id, attributes):
+            self.live[product_id] = attributes
+            return True
+
+    class C:
+        def __init__(self, store):
+            self.embedder = E()
+            self.vector_store = store
+
+    store = FaissStore(root_dir=str(tmp_path), dimension=4, enable_logging=False)
+    p = RAGPipeline(manifest=ShardManifest(), volatile_fields=DEFAULT_VOLATILE_FIELDS)
+    p.health_checker = H()
+    p.container = C(store)
+    p.enricher.storage = S()
+    product = dict(VOLATILE_PRODUCT)
+
+    assert p.ingest(product) == len(p.container.embedder.texts) == 4
+    assert p.enricher.storage.live["mug-1"]["price"] == "12"
+    hits = store.search([1.0, 8.0, 0.5, 0.0], top_k=4)
+    assert {h["metadata"]["product_id"] for h in hits} == {"mug-1"}
+
+    # A new price and stock level are storage writes; no shard changes.
+    product["PRICE"] = "9"
+    product["AVAILABILITY"] = "OutOfStock"
+    assert p.ingest(product) == 0
+    assert p.enricher.storage.live["mug-1"]["price"] == "9"
+    assert p.enricher.storage.live["mug-1"]["availability"] == "OutOfStock"
+    store.close()
+
+
+def test_faiss_variant_and_review_shards_keep_their_ids(tmp_path: Path):
+    """New stock, prices or review counts overwrite rows, even without a manifest."""
+    import sqlite3
+
+    from commercetxt.rag.drivers.faiss_store import FaissStore
+
+    store = FaissStore(root_dir=str(tmp_path), dimension=4, enable_logging=False)
+    product = {
+        "SKU": "mug-1",
+        "ITEM": "Mug",
+        "VARIANTS": {"Type": "Color", "Options": []},
+        "REVIEWS": {"Rating": "4.5", "Count": "10"},
+    }
+    for stock in (3, 2, 0):
+        product["VARIANTS"]["Options"] = [
+            f"Blue: 12.00 | SKU: MUG-B | Stock: {stock}",
+            f"Red: 1{stock}.00 | Stock: {stock}",
+        ]
+        product["REVIEWS"]["Count"] = str(10 + stock)
+        shards = RAGGenerator().generate(product)
+        for s in shards:
+            s["values"] = [1.0, float(len(s["text"])), 0.5, 0.0]
+        store.upsert(shards)
+
+    conn = sqlite3.connect(tmp_path / "default.meta.sqlite")
+    ids = [row[0] for row in conn.execute("SELECT str_id FROM shards")]
+    assert sorted(i for i in ids if ":variant:" in i or ":reviews:" in i) == [
+        "mug-1:reviews:0",
+        "mug-1:variant:Color=Red",
+        "mug-1:variant:MUG-B",
+    ]
+    conn.close()
+    store.close()
+
+
+def test_faiss_id_mapper_get_or_create_batch(monkeypatch):
+    import sqlite3
+
+    from commercetxt.rag.drivers.faiss_store import SQLITE_MAX_KEYS, FaissIDMapper
+
+    mapper = FaissIDMapper(sqlite3.connect(":memory:"))
+    known = mapper.get_or_create("a")
+    ids = [f"id-{i}" for i in range(SQLITE_MAX_KEYS * 2 + 1)]
+
+    created = mapper.get_or_create_batch(["a", *ids, "a"])
+    assert created["a"] == known
+    assert len(set(created.values())) == len(ids) + 1
+    # Persisted: a fresh mapper over the same DB reads the same IDs.
+    assert FaissIDMapper(mapper.conn).get_batch(ids) == {k: created[k] for k in ids}
+
+    # A faiss_id collision moves on to the next salt, as get_or_create does.
+    hash63 = FaissIDMapper._hash63
+    monkeypatch.setattr(
+        FaissIDMapper,
+        "_hash63",
+        staticmethod(lambda s, salt=0: known if salt == 0 else hash63(s, salt)),
+    )
+    assert mapper.get_or_create_batch(["b"])["b"] == hash63("b", 1)
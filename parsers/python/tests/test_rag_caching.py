@@ -249,6 +249,47 @@ class TestEmbeddingCacheComprehensive:
         cache = EmbeddingCache(backend="sqlite", ttl=7200, db_path=temp_db_path)
         assert cache.default_ttl == 7200
 
+    @pytest.mark.asyncio
+    async def test_cache_texts_round_trip_in_one_query(self, temp_db_path):
+        """cache_texts/get_cached_texts batch many texts per backend call."""
+        from commercetxt.rag.core.caching.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(backend="sqlite", db_path=temp_db_path)
+        vectors = {f"text {i}": [float(i), 0.5] for i in range(600)}
+        assert await cache.cache_texts(vectors)
+
+        texts = ["text 3", "missing", "text 599", "text 3"]
+        assert await cache.get_cached_texts(texts) == [
+            [3.0, 0.5],
+            None,
+            [599.0, 0.5],
+            [3.0, 0.5],
+        ]
+        assert cache.get_stats()["hits"] == 2  # Repeated texts looked up once
+        assert cache.get_stats()["misses"] == 1
+
+        found = await cache.get_many([cache._compute_key(t) for t in vectors])
+        assert len(found) == 600  # Over SQLITE_MAX_KEYS: chunked
+
+    @pytest.mark.asyncio
+    async def test_get_many_without_backend_batching(self, temp_db_path):
+        """Backends without get_many/set_many fall back to single calls."""
+        from commercetxt.rag.core.caching.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(backend="sqlite", db_path=temp_db_path)
+        store: dict[str, list[float]] = {}
+        cache._backend = MagicMock(spec=["get", "set"])
+        cache._backend.get = AsyncMock(side_effect=store.get)
+        cache._backend.set = AsyncMock(
+            side_effect=lambda k, v, ttl: store.__setitem__(k, v)
+        )
+
+        assert await cache.set_many({"a": [1.0], "b": [2.0]})
+        assert await cache.get_many(["a", "c", "b"]) == {"a": [1.0], "b": [2.0]}
+
+        cache._backend.get = AsyncMock(side_effect=Exception("Get error"))
+        assert await cache.get_many(["a"]) == {}
+
 
 # =============================================================================
 # SearchResultCache Tests
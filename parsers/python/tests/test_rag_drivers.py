@@ -2,11 +2,14 @@
 RAG Drivers Tests.
 
 Tests LocalStorage, RedisStorage, SLMTagger, PineconeStore, QdrantStore,
-RAGPipeline, RAGContainer, RealtimeEnricher, and Embedders.
+FaissStore, RAGPipeline, RAGContainer, RealtimeEnricher, and Embedders.
 """
 
+import asyncio
 import inspect
+import sqlite3
 import sys
+import threading
 import types
 from pathlib import Path
 from typing import Any
@@ -16,11 +19,16 @@ import pytest
 
 from commercetxt.rag.async_pipeline import AsyncRAGPipeline
 from commercetxt.rag.container import RAGContainer
+from commercetxt.rag.core.embed_batcher import EmbedBatcher
+from commercetxt.rag.core.embed_dedup import AsyncDedupEmbedder, DedupEmbedder
+from commercetxt.rag.drivers.faiss_store import FaissStore
 from commercetxt.rag.drivers.local_storage import LocalStorage
 from commercetxt.rag.drivers.pinecone_store import PineconeStore, retry_with_backoff
 from commercetxt.rag.drivers.qdrant_store import QdrantStore
 from commercetxt.rag.drivers.redis_storage import RedisStorage
 from commercetxt.rag.drivers.slm_tagger import SLMTagger
+from commercetxt.rag.exceptions import EmbeddingError
+from commercetxt.rag.interfaces.async_embedder import AsyncBaseEmbedder
 from commercetxt.rag.interfaces.base_embedder import BaseEmbedder
 from commercetxt.rag.interfaces.base_storage import BaseRealtimeStorage
 from commercetxt.rag.interfaces.base_vector_store import BaseVectorStore
@@ -112,6 +120,43 @@ Currency: USD
         result = storage.refresh_product("nonexistent")
         assert result is False
 
+    def test_set_live_attributes_overlays_cache(self, storage_with_files):
+        """Written fields are read back over the file's values."""
+        assert storage_with_files.set_live_attributes("TEST-PRODUCT", {"price": "89"})
+        result = storage_with_files.get_live_attributes(["test-product"], ["price"])
+        assert result["test-product"]["price"] == "89"
+        assert not storage_with_files.set_live_attributes("test-product", {})
+
+    def test_set_live_attributes_outlive_cache_ttl(self, storage_with_files):
+        """Expiry and rebuilds re-read the file but keep written fields."""
+        storage_with_files.cache_ttl = 1
+        storage_with_files.set_live_attributes("test-product", {"price": "89"})
+        storage_with_files.set_live_attributes("unlisted", {"price": "5"})
+        storage_with_files.get_live_attributes(["test-product"], ["price"])
+        storage_with_files._cache_timestamps["test-product"] -= 10
+        assert storage_with_files.prune_expired() == 1
+        storage_with_files.rebuild_cache()
+
+        result = storage_with_files.get_live_attributes(
+            ["test-product", "unlisted"], ["price", "availability"]
+        )
+        assert result["test-product"] == {"price": "89", "availability": "InStock"}
+        assert result["unlisted"] == {"price": "5"}
+        storage_with_files.clear_cache()
+        result = storage_with_files.get_live_attributes(["test-product"], ["price"])
+        assert result["test-product"]["price"] == "99.99"
+
+    def test_set_live_attributes_replaces_the_overlay(self, storage_with_files):
+        """A field dropped from the next publish is read from the file again."""
+        storage_with_files.set_live_attributes(
+            "test-product", {"price": "89", "availability": "OutOfStock"}
+        )
+        storage_with_files.set_live_attributes("test-product", {"price": "79"})
+        result = storage_with_files.get_live_attributes(
+            ["test-product"], ["price", "availability"]
+        )
+        assert result["test-product"] == {"price": "79", "availability": "InStock"}
+
 
 class TestLocalStorageWithRealFiles:
     """Integration tests with actual example files."""
@@ -495,6 +540,20 @@ class TestRealtimeEnricher:
         # Should not crash, just skip
         assert len(enriched) == 2
 
+    def test_publish_stamps_shards_and_writes_storage(self, mock_storage):
+        """publish() keys shards and live values by the same product ID."""
+        enricher = RealtimeEnricher(storage=mock_storage)
+        shards = [{"text": "Mug", "metadata": {}}, {"text": "Blue"}]
+        enricher.publish("mug-1", shards, {"price": "12"})
+        assert [s["metadata"]["product_id"] for s in shards] == ["mug-1", "mug-1"]
+        mock_storage.set_live_attributes.assert_called_once_with(
+            "mug-1", {"price": "12"}
+        )
+
+        mock_storage.reset_mock()
+        enricher.publish("mug-1", shards, {})
+        mock_storage.set_live_attributes.assert_not_called()
+
 
 # =============================================================================
 # RAGPipeline Tests
@@ -568,6 +627,227 @@ class TestEmbedderInterfaces:
         assert hasattr(BaseVectorStore, "search")
 
 
+class _CountingEmbedder(BaseEmbedder):
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def embed_text(self, text):
+        return self.embed_shards([{"text": text}])[0]["values"]
+
+    def embed_shards(self, shards):
+        self.batches.append([s["text"] for s in shards])
+        for s in shards:
+            s["values"] = [float(len(s["text"])), 1.0]
+            s["model"] = "counting"
+        return shards
+
+
+class _AsyncCountingEmbedder(AsyncBaseEmbedder):
+    model = "counting"
+
+    def __init__(self, fail: bool = False):
+        self.batches: list[list[str]] = []
+        self.fail = fail
+
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise EmbeddingError("provider down")
+        return [[float(len(t)), 1.0] for t in texts]
+
+    async def embed_shards(self, shards):
+        raise AssertionError("DedupEmbedder embeds through embed_texts")
+
+
+class TestDedupEmbedder:
+    """DedupEmbedder embeds each distinct text once."""
+
+    def test_batch_embeds_unique_texts_once(self):
+        """Identical normalized texts share one embedding."""
+        inner = _CountingEmbedder()
+        embedder = DedupEmbedder(inner)
+        shards = [{"text": t} for t in ["USD", "EUR", " USD", "USD\n"]]
+
+        assert embedder.embed_shards(shards) is shards
+        assert inner.batches == [["USD", "EUR"]]
+        assert [s["values"] for s in shards] == [[3.0, 1.0], [3.0, 1.0]] * 2
+        assert shards[0]["values"] is not shards[2]["values"]
+        assert {s["model"] for s in shards} == {"counting"}
+
+    def test_memo_spans_batches(self):
+        """Texts seen in an earlier batch are not embedded again."""
+        inner = _CountingEmbedder()
+        embedder = DedupEmbedder(inner, memo_size=2)
+        embedder.embed_shards([{"text": "USD"}, {"text": "EUR"}])
+        embedder.embed_shards([{"text": "USD"}, {"text": "GBP"}])
+        assert embedder.embed_text("EUR") == [3.0, 1.0]  # Evicted
+        assert inner.batches == [["USD", "EUR"], ["GBP"], ["EUR"]]
+        assert embedder.get_stats() == {
+            "texts": 5,
+            "embedded": 4,
+            "duplicates": 1,
+            "dedup_ratio": 0.2,
+            "memo_size": 2,
+        }
+
+    def test_memo_size_zero_dedups_within_batch_only(self):
+        inner = _CountingEmbedder()
+        embedder = DedupEmbedder(inner, memo_size=0)
+        embedder.embed_shards([{"text": "USD"}, {"text": "USD"}])
+        embedder.embed_shards([{"text": "USD"}])
+        assert inner.batches == [["USD"], ["USD"]]
+
+    def test_eviction_waits_for_a_lookup(self):
+        """A put() from another thread cannot evict a text mid-get()."""
+        from collections import OrderedDict
+
+        embedder = DedupEmbedder(_CountingEmbedder(), memo_size=1)
+        embedder.embed_text("USD")
+        memo = embedder._memo
+        writer = threading.Thread(target=memo.put, args=("EUR", [3.0, 1.0]))
+
+        class Vectors(OrderedDict):
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                # Evict key between its lookup and move_to_end().
+                writer.start()
+                writer.join(timeout=0.2)
+                return value
+
+        memo._vectors = Vectors(memo._vectors)
+        assert embedder.embed_text("USD") == [3.0, 1.0]
+        writer.join()
+        assert list(memo._vectors) == ["EUR"]
+        assert embedder.get_stats()["texts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_async_concurrent_batches_share_embeddings(self):
+        """A text in flight for one batch is awaited by the others."""
+        inner = _AsyncCountingEmbedder()
+        embedder = AsyncDedupEmbedder(inner)
+        batches = [
+            [{"text": "USD"}, {"text": "Blue"}],
+            [{"text": "USD"}, {"text": "Red"}],
+            [{"text": "Blue"}, {"text": "USD"}],
+        ]
+        await asyncio.gather(*(embedder.embed_shards(b) for b in batches))
+
+        assert sorted(t for batch in inner.batches for t in batch) == [
+            "Blue",
+            "Red",
+            "USD",
+        ]
+        assert batches[2][1]["values"] == [3.0, 1.0]
+        assert batches[2][1]["model"] == "counting"
+        assert embedder.get_stats()["dedup_ratio"] == 0.5
+        assert await embedder.embed_texts(["Red", "Red"]) == [[3.0, 1.0]] * 2
+        assert len(inner.batches) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_failure_reaches_waiting_batches(self):
+        embedder = AsyncDedupEmbedder(_AsyncCountingEmbedder(fail=True))
+        results = await asyncio.gather(
+            embedder.embed_texts(["USD"]),
+            embedder.embed_texts(["USD"]),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, EmbeddingError) for r in results)
+        assert embedder._in_flight == {}
+
+
+class TestEmbedBatcher:
+    """EmbedBatcher coalesces concurrent embed_text calls."""
+
+    def test_threads_share_one_batch(self):
+        """A full batch is embedded at once, each caller gets its vector."""
+        inner = _CountingEmbedder()
+        texts = [f"query {'x' * i}" for i in range(8)]
+        results: dict[str, list[float]] = {}
+
+        with EmbedBatcher(inner, max_batch_size=8, max_wait_ms=5000) as batcher:
+
+            def search(text):
+                results[text] = batcher.embed_text(text)
+
+            threads = [threading.Thread(target=search, args=(t,)) for t in texts]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(inner.batches) == 1
+        assert sorted(inner.batches[0]) == sorted(texts)
+        assert all(results[t] == [float(len(t)), 1.0] for t in texts)
+        assert batcher.get_stats() == {
+            "batches": 1,
+            "texts": 8,
+            "mean_batch_size": 8.0,
+        }
+
+    def test_batches_capped_and_wait_bounded(self):
+        """No batch exceeds max_batch_size; a lone call waits max_wait_ms."""
+        inner = _CountingEmbedder()
+        with EmbedBatcher(inner, max_batch_size=3, max_wait_ms=1) as batcher:
+            futures = [batcher.submit(str(i)) for i in range(7)]
+            assert [f.result() for f in futures] == [[1.0, 1.0]] * 7
+            assert batcher.embed_text("lone") == [4.0, 1.0]
+        assert all(len(batch) <= 3 for batch in inner.batches)
+        assert inner.batches[-1] == ["lone"]
+
+    @pytest.mark.asyncio
+    async def test_asyncio_tasks_share_batches(self):
+        inner = _CountingEmbedder()
+        with EmbedBatcher(inner, max_batch_size=16, max_wait_ms=5000) as batcher:
+            vectors = await asyncio.gather(
+                *(batcher.aembed_text("t" * i) for i in range(16))
+            )
+        assert vectors == [[float(i), 1.0] for i in range(16)]
+        assert len(inner.batches) == 1
+
+    def test_failure_reaches_every_caller(self):
+        """A failed batch fails its callers; the worker keeps serving."""
+        inner = MagicMock(spec=BaseEmbedder)
+        inner.embed_shards.side_effect = [
+            EmbeddingError("model crashed"),
+            [{"text": "b", "values": [2.0]}],
+        ]
+        with EmbedBatcher(inner, max_batch_size=2, max_wait_ms=100) as batcher:
+            futures = [batcher.submit("a"), batcher.submit("a")]
+            for future in futures:
+                with pytest.raises(EmbeddingError):
+                    future.result()
+            assert batcher.embed_text("b") == [2.0]
+
+    def test_submit_after_close_is_rejected(self):
+        """Queued texts are embedded on close; later submits fail fast."""
+        inner = _CountingEmbedder()
+        batcher = EmbedBatcher(inner, max_batch_size=4, max_wait_ms=5000)
+        future = batcher.submit("queued")
+        batcher.close()
+        assert future.result(timeout=5) == [6.0, 1.0]
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit("late")
+        batcher.close()
+
+    @pytest.mark.asyncio
+    async def test_async_pipeline_search_awaits_batcher(self):
+        """AsyncRAGPipeline embeds queries without blocking the event loop."""
+        inner = _CountingEmbedder()
+        pipeline = AsyncRAGPipeline(enable_cache=False)
+        pipeline.container = MagicMock()
+        with EmbedBatcher(inner, max_batch_size=4, max_wait_ms=5000) as batcher:
+            pipeline.container.embedder = batcher
+            vectors = await asyncio.gather(
+                *(pipeline._embed_text_cached(q) for q in ["a", "bb", "a", "c"])
+            )
+        assert vectors[1] == [2.0, 1.0]
+        assert len(inner.batches) == 1
+
+
 class _FakePipeline:
     def __init__(self, redis: "_FakeRedis"):
         self.redis = redis
@@ -1230,3 +1510,76 @@ def test_qdrant_store_connect_upsert_search_delete(monkeypatch: pytest.MonkeyPat
     leaves2 = list(_walk(points_selector2))
     assert "namespace" in leaves2
     assert "ns2" in leaves2
+
+
+# =============================================================================
+# FaissStore Payloads
+# =============================================================================
+
+
+def _product_shards(sku: str, price: str) -> list[dict[str, Any]]:
+    product = {"ITEM": f"Item {sku}", "PRICE": price, "PRODUCT": {"SKU": sku}}
+    return [
+        {
+            "text": f"{sku} shard {i}",
+            "values": [1.0, float(i), 0.5, 0.0],
+            "metadata": {"SKU": sku, "index": i, "original_data": product},
+        }
+        for i in range(5)
+    ]
+
+
+def test_faiss_store_stores_each_payload_once(tmp_path: Path):
+    store = FaissStore(root_dir=str(tmp_path), dimension=4, enable_logging=False)
+    store.upsert(_product_shards("A-1", "10") + _product_shards("B-2", "20"))
+    conn = sqlite3.connect(tmp_path / "default.meta.sqlite")
+
+    def payload_count() -> int:
+        return conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+
+    assert conn.execute("SELECT COUNT(*) FROM shards").fetchone()[0] == 10
+    assert payload_count() == 2
+
+    results = store.search([1.0, 1.0, 0.5, 0.0], top_k=3)
+    meta = results[0]["metadata"]
+    assert "original_data" not in meta
+    assert meta["product_id"] in ("A-1", "B-2")
+    payloads = store.get_payloads(r["metadata"]["payload_id"] for r in results)
+    assert payloads[meta["payload_id"]]["PRODUCT"]["SKU"] == meta["product_id"]
+
+    resolved = store.search([1.0, 1.0, 0.5, 0.0], top_k=3, with_payloads=True)
+    assert resolved[0]["metadata"]["original_data"] == payloads[meta["payload_id"]]
+
+    # Re-ingesting a changed product replaces its payload, deleting drops it.
+    store.upsert(_product_shards("A-1", "12"))
+    assert payload_count() == 2
+    store.delete([f"B-2:misc:{i}" for i in range(5)])
+    assert payload_count() == 1
+    (payload,) = conn.execute("SELECT payload_json FROM payloads").fetchone()
+    assert '"12"' in payload
+    store.close()
+
+
+def test_faiss_store_chunks_payload_queries(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(
+        "commercetxt.rag.drivers.faiss_store.SQLITE_MAX_KEYS", 4, raising=True
+    )
+    store = FaissStore(root_dir=str(tmp_path), dimension=4, enable_logging=False)
+    skus = [f"S-{i}" for i in range(6)]
+    store.upsert([s for sku in skus for s in _product_shards(sku, "10")])
+    statements: list[str] = []
+    store._open_db("default").set_trace_callback(statements.append)
+
+    def queries(prefix: str) -> int:
+        return sum(s.lstrip().startswith(prefix) for s in statements)
+
+    # Re-ingesting 30 shards looks up their payload refs 4 keys at a time.
+    store.upsert([s for sku in skus for s in _product_shards(sku, "12")])
+    assert queries("SELECT DISTINCT payload_id") == 8
+
+    results = store.search([1.0, 1.0, 0.5, 0.0], top_k=30)
+    payloads = store.get_payloads(r["metadata"]["payload_id"] for r in results)
+    assert queries("SELECT payload_id, payload_json") == 2
+    assert sorted(p["PRODUCT"]["SKU"] for p in payloads.values()) == skus
+    assert all(p["PRICE"] == "12" for p in payloads.values())
+    store.close()
@@ -7,6 +7,14 @@ images, compatibility, promos, sustainability, and semantic logic.
 
 from __future__ import annotations
 
+import pytest
+
+from commercetxt.rag.core.dedup import (
+    BloomDeduplicator,
+    DigestSet,
+    DiskDeduplicator,
+    content_digest,
+)
 from commercetxt.rag.core.generator import RAGGenerator
 
 
@@ -129,6 +137,23 @@ class TestRAGGeneratorVariants:
         result = generator.generate(data)
         assert isinstance(result, list)
 
+    def test_parsed_variant_options_generate_shards(self):
+        """Parser output (dict options) yields the same shards as text options."""
+        generator = RAGGenerator()
+        text = {"Type": "Size", "Options": ["S: 10.00 | SKU: S-1 | Stock: 3"]}
+        parsed = {
+            "Type": "Size",
+            "Options": [{"name": "S", "path": "10.00", "SKU": "S-1", "Stock": "3"}],
+        }
+
+        shards = [
+            generator._generate_variant_shards({"VARIANTS": variants}, [])
+            for variants in (text, parsed)
+        ]
+
+        assert [s["text"] for s in shards[0]] == [s["text"] for s in shards[1]]
+        assert shards[1][0]["metadata"]["variant_stock"] == "3"
+
 
 class TestRAGGeneratorReviews:
     """Tests for review shard generation."""
@@ -676,12 +701,46 @@ class TestRAGGeneratorBatchMode:
 
         assert isinstance(result, str)
 
+    def test_iter_generate_batch_matches_batch(self):
+        """Streaming and parallel generation give generate_batch's shards."""
+        items = [
+            {"ITEM": f"Product {i % 50}", "BRAND": "Brand", "CURRENCY": "USD"}
+            for i in range(80)
+        ]
+        expected = RAGGenerator().generate_batch(items)
+
+        generator = RAGGenerator()
+        assert list(generator.iter_generate_batch(items)) == expected
+        assert list(generator.iter_generate_batch(iter(items), workers=2)) == expected
+
+        per_product = RAGGenerator().generate_batch(
+            items, deduplicate_across_products=False
+        )
+        parallel = generator.iter_generate_batch(
+            items, workers=2, deduplicate_across_products=False
+        )
+        assert list(parallel) == per_product
+
+    def test_iter_generate_batch_is_lazy(self):
+        """The first shard comes before later products are read."""
+        read = []
+
+        def items():
+            for i in range(100):
+                read.append(i)
+                yield {"ITEM": f"Product {i}"}
+
+        shards = RAGGenerator().iter_generate_batch(items())
+        first = next(shards)
+        assert first["text"] == "Product 0"
+        assert read == [0]
+
     def test_reset_deduplication(self):
         """reset_deduplication clears seen hashes."""
         generator = RAGGenerator()
 
         # Generate once
-        generator.generate({"ITEM": "Test"})
+        generator.generate_batch([{"ITEM": "Test"}])
         assert len(generator._seen_hashes) > 0
 
         # Reset
@@ -689,6 +748,85 @@ class TestRAGGeneratorBatchMode:
         assert len(generator._seen_hashes) == 0
 
 
+class TestRAGGeneratorDedupBackends:
+    """Tests for pluggable deduplication backends."""
+
+    ITEMS = [
+        {"ITEM": "A", "CURRENCY": "USD"},
+        {"ITEM": "B", "CURRENCY": "USD"},
+        {"ITEM": "A", "CURRENCY": "EUR"},
+    ]
+
+    @pytest.mark.parametrize(
+        "make",
+        [
+            lambda tmp: DigestSet(),
+            lambda tmp: BloomDeduplicator(capacity=1000, error_rate=1e-9),
+            lambda tmp: DiskDeduplicator(tmp / "seen.sqlite"),
+        ],
+    )
+    def test_backends_dedupe_across_products(self, make, tmp_path):
+        """Every backend keeps one shard per (attr_type, text)."""
+        generator = RAGGenerator(dedup=make(tmp_path))
+        shards = generator.generate_batch(self.ITEMS)
+
+        keys = [(s["metadata"]["attr_type"], s["text"]) for s in shards]
+        assert len(keys) == len(set(keys))
+        assert keys.count(("currency", "USD")) == 1
+        assert keys.count(("subject_anchor", "A")) == 1
+        assert len(generator._seen_hashes) == len(keys)
+        generator._seen_hashes.close()
+
+    def test_disk_backend_resumes_batches(self, tmp_path):
+        """A reopened disk backend still knows shards of earlier runs."""
+        path = tmp_path / "seen.sqlite"
+        first = RAGGenerator(dedup=DiskDeduplicator(path))
+        assert first.generate_batch(self.ITEMS[:2])
+        first._seen_hashes.close()
+
+        dedup = DiskDeduplicator(path)
+        resumed = RAGGenerator(dedup=dedup).generate_batch(self.ITEMS)
+        assert [s["text"] for s in resumed] == ["EUR"]
+        dedup.clear()
+        assert len(dedup) == 0
+        dedup.close()
+
+    def test_disk_backend_survives_single_and_per_product_calls(self, tmp_path):
+        """Only an explicit reset clears a persistent backend."""
+        dedup = DiskDeduplicator(tmp_path / "seen.sqlite")
+        generator = RAGGenerator(dedup=dedup)
+        generator.generate_batch(self.ITEMS)
+        seen = len(dedup)
+        assert seen > 0
+
+        assert generator.generate({"ITEM": "A", "CURRENCY": "USD"})
+        shards = generator.generate_batch(self.ITEMS, deduplicate_across_products=False)
+        assert len(shards) == 6
+        assert len(dedup) == seen
+
+        generator.reset_deduplication()
+        assert len(dedup) == 0
+        dedup.close()
+
+    def test_bloom_sizing_and_digests(self):
+        """Bloom memory follows capacity and error rate; digests are keyed."""
+        bloom = BloomDeduplicator(capacity=10_000, error_rate=0.01)
+        assert 11_000 < bloom.nbytes < 12_500
+        assert bloom.num_hashes == 7
+
+        digests = [content_digest("spec", f"text {i}") for i in range(10_000)]
+        assert sum(map(bloom.add, digests)) > 9_900
+        assert not any(map(bloom.add, digests))
+        fresh = [content_digest("spec", f"other {i}") for i in range(10_000)]
+        assert sum(d in bloom for d in fresh) < 200  # 1% of 10k, with slack
+
+        assert len(digests[0]) == 16
+        assert content_digest("spec", "x", key=b"k") != content_digest("spec", "x")
+        assert DigestSet().key != DigestSet().key
+        with pytest.raises(ValueError):
+            BloomDeduplicator(error_rate=1.5)
+
+
 class TestRAGGeneratorMetadata:
     """Tests for metadata handling."""
 
@@ -118,6 +118,27 @@ class TestSchemaBridgeVariants:
         # Should not crash and should process valid option
         assert "@type" in result
 
+    def test_parsed_variant_options_become_offers(self):
+        """Parser output (dict options) maps to offers with numeric stock."""
+        sb = SchemaBridge()
+
+        data = {
+            "PRODUCT": {"Name": "Phone"},
+            "OFFER": {"Price": "999", "Currency": "USD"},
+            "VARIANTS": {
+                "Type": "Storage",
+                "Options": [
+                    {"name": "128GB", "path": "999.00", "SKU": "P-128", "Stock": "4"},
+                    {"name": "256GB", "path": "1099.00", "Stock": "0"},
+                ],
+            },
+        }
+
+        offers = json.loads(sb.to_json_ld(data))["offers"][1:]
+        assert offers[0]["sku"] == "P-128"
+        assert offers[0]["inventoryLevel"]["value"] == 4
+        assert offers[1]["availability"] == "https://schema.org/OutOfStock"
+
 
 class TestSchemaBridgeSubscription:
     """Tests for subscription handling in SchemaBridge."""
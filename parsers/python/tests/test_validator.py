@@ -696,3 +696,228 @@ class TestValidatorMutationKills:
                 with patch.object(v, "_validate_variant_group", return_value=True):
                     v.validate({"items": []}, {"Price": "10"})
                     assert any("combinations" in w for w in v.warnings)
+
+
+class TestCorpusValidation:
+    """Many files. One report."""
+
+    @staticmethod
+    def _write_corpus(tmp_path):
+        good = "# @IDENTITY\nName: Store\nCurrency: USD\n"
+        bad = "# @IDENTITY\nCurrency: USD\n"
+        for i in range(3):
+            (tmp_path / f"good{i}.txt").write_text(good, encoding="utf-8")
+        for i in range(2):
+            (tmp_path / f"bad{i}.txt").write_text(bad, encoding="utf-8")
+        return sorted(tmp_path.glob("*.txt"))
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_validate_many_counts(self, tmp_path, workers):
+        """Serial and parallel runs report the same totals."""
+        paths = self._write_corpus(tmp_path)
+        report = CommerceTXTValidator().validate_many(paths, workers=workers)
+
+        assert report["files"] == 5
+        assert report["valid_files"] == 3
+        assert report["invalid_files"] == 2
+        assert report["total_errors"] == 2
+        assert sum(report["error_types"].values()) == 2
+        assert len(report["error_types"]) == 1
+        assert {e["source"] for e in report["worst_files"]} == {
+            str(p) for p in paths if p.name.startswith("bad")
+        }
+
+    def test_validate_many_accepts_parse_results(self):
+        """Parsed results are validated without touching the disk."""
+        result = ParseResult(directives={"IDENTITY": {"Name": "Store"}})
+        report = CommerceTXTValidator().validate_many([result])
+        assert report["files"] == 1
+        assert report["invalid_files"] == 1
+
+    def test_missing_file_becomes_error(self, tmp_path):
+        """A load failure is reported, not raised."""
+        outcomes = []
+        report = CommerceTXTValidator().validate_many(
+            [tmp_path / "missing.txt"], on_outcome=outcomes.append
+        )
+        assert report["invalid_files"] == 1
+        assert outcomes[0]["errors"][0].startswith("Failed to load")
+
+    def test_validator_crash_becomes_error(self, tmp_path, monkeypatch):
+        """An unexpected validator exception fails that file only."""
+        paths = self._write_corpus(tmp_path)
+        validate = CommerceTXTValidator.validate
+
+        def crashing(self, result):
+            if result.source_file.endswith("good1.txt"):
+                raise KeyError("boom")
+            return validate(self, result)
+
+        monkeypatch.setattr(CommerceTXTValidator, "validate", crashing)
+        outcomes = []
+        report = CommerceTXTValidator().validate_many(
+            paths, on_outcome=outcomes.append
+        )
+
+        assert report["files"] == 5
+        assert report["invalid_files"] == 3
+        crashed = [o for o in outcomes if o["source"].endswith("good1.txt")]
+        assert crashed[0]["errors"][0].startswith("Failed to validate")
+
+    def test_worst_files_bounded(self, tmp_path):
+        """Only top_n files are kept. The worst come first."""
+        paths = self._write_corpus(tmp_path)
+        report = CommerceTXTValidator().validate_many(paths, top_n=1)
+        assert len(report["worst_files"]) == 1
+        assert report["worst_files"][0]["errors"] == 1
+
+    def test_negative_workers_rejected(self):
+        """Negative worker counts make no sense."""
+        with pytest.raises(ValueError, match="workers"):
+            CommerceTXTValidator().validate_many([], workers=-1)
+
+    def test_iter_ordered_keeps_input_order(self):
+        """Parallel results come back in input order."""
+        from commercetxt.parallel import iter_ordered
+
+        words = [f"w{i}" for i in range(30)]
+        upper = [w.upper() for w in words]
+        assert list(iter_ordered(str.upper, iter(words), workers=2)) == upper
+        assert list(iter_ordered(str.upper, words)) == upper
+
+    def test_message_type_groups_variants(self):
+        """Line numbers and values do not split issue types."""
+        from commercetxt.validators.corpus import message_type
+
+        assert message_type("Line 3: Unknown syntax: foo") == message_type(
+            "Line 9: Unknown syntax: bar"
+        )
+        assert message_type("Missing required 'Name'") != message_type(
+            "Missing required 'Currency'"
+        )
+
+
+class TestIncrementalValidation:
+    """Unchanged sections are not checked twice."""
+
+    @staticmethod
+    def _result(price="10.00", stock="5"):
+        return ParseResult(
+            directives={
+                "IDENTITY": {"Name": "Store", "Currency": "USD"},
+                "PRODUCT": {"Name": "Shirt", "SKU": "S1"},
+                "OFFER": {"Price": price, "Availability": "InStock"},
+                "INVENTORY": {
+                    "Stock": stock,
+                    "LastUpdated": datetime.now(timezone.utc).isoformat(),
+                },
+                "VARIANTS": {
+                    "Type": "Size",
+                    "Options": [{"name": "S", "value": "S: 10.00"}],
+                },
+                "REVIEWS": {"Rating": "9", "RatingScale": "5"},
+            }
+        )
+
+    def test_same_output_as_full_validation(self):
+        """Cached and uncached runs report the same issues."""
+        from commercetxt.validators import ValidationCache
+
+        cache = ValidationCache()
+        expected = CommerceTXTValidator().validate(self._result())
+        first = CommerceTXTValidator(cache=cache).validate(self._result())
+        second = CommerceTXTValidator(cache=cache).validate(self._result())
+
+        for got in (first, second):
+            assert sorted(got.errors) == sorted(expected.errors)
+            assert sorted(got.warnings) == sorted(expected.warnings)
+            assert got.trust_flags == expected.trust_flags
+        assert cache.hits > 0
+
+    def test_inventory_change_reuses_other_rules(self):
+        """Only @INVENTORY changed. Nothing else re-runs."""
+        from commercetxt.validators import ValidationCache
+
+        validator = CommerceTXTValidator(cache=ValidationCache())
+        validator.validate(self._result(stock="5"))
+
+        with (
+            patch(
+                "commercetxt.enhanced_variants_validator.EnhancedVariantsValidator.validate"
+            ) as variants,
+            patch.object(
+                validator.core,
+                "_validate_inventory",
+                wraps=validator.core._validate_inventory,
+            ) as inventory,
+        ):
+            validator.validate(self._result(stock="6"))
+
+        variants.assert_not_called()
+        inventory.assert_called_once()
+
+    def test_offer_change_reruns_variants(self):
+        """@VARIANTS declares @OFFER. A price change re-runs it."""
+        from commercetxt.validators import ValidationCache
+
+        validator = CommerceTXTValidator(cache=ValidationCache())
+        validator.validate(self._result(price="10.00"))
+
+        with patch(
+            "commercetxt.enhanced_variants_validator.EnhancedVariantsValidator.validate"
+        ) as variants:
+            validator.validate(self._result(price="12.00"))
+
+        variants.assert_called_once()
+
+    def test_strict_replay_raises(self):
+        """A cached strict error still stops validation."""
+        from commercetxt.validators import ValidationCache
+
+        cache = ValidationCache()
+        bad = {"IDENTITY": {"Currency": "USD"}}
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Name"):
+                CommerceTXTValidator(strict=True, cache=cache).validate(
+                    ParseResult(directives=dict(bad))
+                )
+        assert cache.hits == 1
+
+    def test_cache_is_bounded(self):
+        """Old outcomes are evicted first."""
+        from commercetxt.validators import ValidationCache
+        from commercetxt.validators.incremental import RuleOutcome
+
+        cache = ValidationCache(max_size=2)
+        for i in range(3):
+            cache.put((i,), RuleOutcome((), (), ()))
+        assert len(cache) == 2
+        assert cache.get((0,)) is None
+
+    def test_every_rule_declares_dependencies(self):
+        """Declared rules exist. Volatile rules are declared rules."""
+        from commercetxt.validators import CoreValidator
+
+        for cls in (CoreValidator, AttributeValidator, PolicyValidator):
+            for rule, sections in cls.RULE_DEPENDENCIES.items():
+                assert callable(getattr(cls, rule))
+                assert sections
+            assert cls.VOLATILE_RULES <= set(cls.RULE_DEPENDENCIES)
+
+    def test_line_numbers_follow_the_source(self):
+        """Moved sections report their new lines, not cached ones."""
+        from commercetxt.validators import ValidationCache
+
+        validator = CommerceTXTValidator(cache=ValidationCache())
+        messages = []
+        for line in (3, 7):
+            result = ParseResult(
+                directives={"OFFER": {"Price": "1.00", "Availability": "Maybe"}},
+                source_map={"OFFER": line, "OFFER.Availability": line + 2},
+            )
+            messages.append(validator.validate(result).errors[-1])
+
+        assert messages == [
+            "Line 5: Invalid Availability: Maybe",
+            "Line 9: Invalid Availability: Maybe",
+        ]
@@ -0,0 +1,147 @@
+"""
+Shared variant model tests.
+
+Covers text and parser-shaped options, multi-dimension items,
+price modifiers, sparse availability and the validator's dict-only mode.
+"""
+
+import math
+
+import pytest
+
+from commercetxt.variants import (
+    UNKNOWN_STOCK,
+    VariantDimension,
+    VariantMatrix,
+    parse_option_text,
+    split_label,
+)
+
+
+class TestParseOptionText:
+    """The text option grammar."""
+
+    def test_full_option(self):
+        """Every known key is read."""
+        parsed = parse_option_text(
+            "Obsidian / 128GB: 999.00 | SKU: A-1 | Stock: 22 units"
+            " | Hex: #000 | Note: New"
+        )
+        assert parsed == {
+            "name": "Obsidian / 128GB",
+            "price": "999.00",
+            "sku": "A-1",
+            "stock": "22",
+            "hex_color": "#000",
+            "note": "New",
+        }
+
+    def test_name_only(self):
+        """No colon, no price."""
+        assert parse_option_text("Red") == {"name": "Red"}
+
+    def test_split_label(self):
+        """Flattened labels split on slashes."""
+        assert split_label("Obsidian / 128GB") == ["Obsidian", "128GB"]
+
+
+class TestVariantDimension:
+    """Columns, prices and skipped options."""
+
+    def test_text_and_dict_options_share_columns(self):
+        """Both layouts land in the same columns."""
+        dim = VariantDimension(
+            "Size",
+            [
+                "S: 10.00 | SKU: S-1 | Stock: 3",
+                {"name": "M", "path": "+2.50", "SKU": "M-1", "Stock": "0"},
+                {"name": "L", "value": "-1"},
+            ],
+        )
+        assert dim.labels == ("S", "M", "L")
+        assert dim.skus == ("S-1", "M-1", None)
+        assert list(dim.stocks) == [3, 0, UNKNOWN_STOCK]
+        assert list(dim.modifiers) == [0, 1, -1]
+        assert dim.final_price(0, 20.0) == 10.0
+        assert dim.final_price(1, 20.0) == 22.5
+        assert dim.final_price(2, 20.0) == 19.0
+        assert list(dim.price_deltas(20.0)) == [-10.0, 2.5, -1.0]
+        assert dim.in_stock() == [0]
+
+    def test_malformed_price_is_nan(self):
+        """Unreadable prices keep their text and read as NaN."""
+        dim = VariantDimension("Size", ["S: abc"])
+        assert dim.prices == ("abc",)
+        assert math.isnan(dim.amounts[0])
+
+    def test_unreadable_options_are_skipped(self):
+        """Junk is recorded with its position, not dropped silently."""
+        dim = VariantDimension("Size", [123, None, {"other": "x"}, "Valid: 1.00"])
+        assert dim.labels == ("Valid",)
+        assert [pos for pos, _ in dim.skipped] == [0, 1, 2]
+        assert dim.size == 4
+
+    def test_dict_only_mode(self):
+        """The validator's view: text skipped, unnamed dicts labelled."""
+        dim = VariantDimension("Size", ["S: 1.00", {"path": "2.00"}], dict_only=True)
+        assert dim.labels == ("Option 1",)
+        assert dim.skipped == ((0, str),)
+
+
+class TestVariantMatrix:
+    """Dimensions, counts and availability."""
+
+    def test_single_dimension_layout(self):
+        """Type and Options form one dimension."""
+        matrix = VariantMatrix.from_directive(
+            {"Type": "Color", "Options": ["Red: 1.00", "Blue: 2.00"]}
+        )
+        assert len(matrix) == 1
+        assert matrix.dimensions[0].name == "Color"
+        assert matrix.total_options == 2
+
+    def test_items_layout(self):
+        """Each Type in items starts a new dimension."""
+        matrix = VariantMatrix.from_directive(
+            {
+                "items": [
+                    {"Type": "Size"},
+                    {"name": "S"},
+                    {"name": "M"},
+                    {"Type": "Color"},
+                    {"name": "Red"},
+                ]
+            }
+        )
+        assert [d.name for d in matrix.dimensions] == ["Size", "Color"]
+        assert matrix.combinations == 2
+
+    def test_combinations_are_counted_not_built(self):
+        """Five dimensions of 100 options: 10^10 combinations, 500 rows."""
+        items = []
+        for d in range(5):
+            items.append({"Type": f"D{d}"})
+            items.extend({"name": f"o{i}"} for i in range(100))
+        matrix = VariantMatrix.from_directive({"items": items})
+        assert matrix.combinations == 100**5
+        assert matrix.total_options == 500
+
+    def test_sparse_availability(self):
+        """Only listed combinations appear."""
+        matrix = VariantMatrix.from_directive(
+            {
+                "Type": "Configuration",
+                "Options": [
+                    "Black / 128GB: 999 | Stock: 4",
+                    "White / 256GB: 1099 | Stock: 0",
+                ],
+            }
+        )
+        assert matrix.availability() == {("Black", "128GB"): 4, ("White", "256GB"): 0}
+
+    @pytest.mark.parametrize("data", [None, "invalid", {}])
+    def test_empty_inputs(self, data):
+        """Nothing to read. Nothing built."""
+        matrix = VariantMatrix.from_directive(data)
+        assert len(matrix) == 0
+        assert matrix.combinations == 0
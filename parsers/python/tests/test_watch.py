@@ -0,0 +1,157 @@
+"""
+Directory watcher tests.
+
+Covers change detection by stat signature, re-checking descendants,
+re-parenting on removal, cycles and carrying over unread records.
+"""
+
+import os
+
+import pytest
+
+from commercetxt.watch import MerchantWatcher
+
+ROOT = """# @IDENTITY
+Name: Shop
+Currency: USD
+
+# @CATALOG
+- Audio: /categories/audio.txt
+"""
+
+CATEGORY = """# @ITEMS
+- Phone: /products/phone.txt
+"""
+
+PRODUCT = """# @PRODUCT
+Name: Phone
+SKU: P-1
+
+# @OFFER
+Price: 10
+Availability: InStock
+"""
+
+
+@pytest.fixture
+def shop(tmp_path):
+    (tmp_path / "categories").mkdir()
+    (tmp_path / "products").mkdir()
+    (tmp_path / "commerce.txt").write_text(ROOT)
+    (tmp_path / "categories" / "audio.txt").write_text(CATEGORY)
+    (tmp_path / "products" / "phone.txt").write_text(PRODUCT)
+    (tmp_path / "products" / "case.txt").write_text(PRODUCT.replace("P-1", "C-1"))
+    return tmp_path
+
+
+def events(records):
+    return [(r["file"], r["event"]) for r in records]
+
+
+def bump(path, text):
+    """Write and move mtime forward, so coarse clocks still see a change."""
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_first_poll_checks_parents_first(shop):
+    watcher = MerchantWatcher(shop)
+    records = list(watcher.poll())
+    assert events(records) == [
+        ("commerce.txt", "added"),
+        ("products/case.txt", "added"),
+        ("categories/audio.txt", "added"),
+        ("products/phone.txt", "added"),
+    ]
+    assert all(r["ok"] for r in records)
+    assert list(watcher.poll()) == []
+
+
+def test_children_inherit_without_listing_sections(shop):
+    watcher = MerchantWatcher(shop)
+    list(watcher.poll())
+    phone = watcher.resolved[shop / "products" / "phone.txt"]
+    assert phone.directives["IDENTITY"]["Name"] == "Shop"
+    assert "CATALOG" not in phone.directives
+    assert "ITEMS" not in phone.directives
+    assert phone.level == "product"
+
+
+def test_touch_without_edit_is_ignored(shop):
+    watcher = MerchantWatcher(shop)
+    list(watcher.poll())
+    bump(shop / "commerce.txt", ROOT)
+    assert list(watcher.poll()) == []
+
+
+def test_root_change_rechecks_descendants_only(shop):
+    watcher = MerchantWatcher(shop)
+    list(watcher.poll())
+    bump(shop / "commerce.txt", ROOT.replace("USD", "EUR"))
+    assert events(watcher.poll()) == [
+        ("commerce.txt", "changed"),
+        ("categories/audio.txt", "inherited"),
+        ("products/phone.txt", "inherited"),
+    ]
+    phone = watcher.resolved[shop / "products" / "phone.txt"]
+    assert phone.directives["IDENTITY"]["Currency"] == "EUR"
+
+
+def test_leaf_change_stays_local(shop):
+    watcher = MerchantWatcher(shop)
+    list(watcher.poll())
+    bump(shop / "products" / "phone.txt", PRODUCT.replace("10", "-5"))
+    records = list(watcher.poll())
+    assert events(records) == [("products/phone.txt", "changed")]
+    assert not records[0]["ok"]
+
+
+def test_removed_parent_reparents_children(shop):
+    watcher = MerchantWatcher(shop)
+    list(watcher.poll())
+    (shop / "categories" / "audio.txt").unlink()
+    assert events(watcher.poll()) == [
+        ("categories/audio.txt", "removed"),
+        ("products/phone.txt", "inherited"),
+    ]
+    assert shop / "products" / "phone.txt" not in watcher.parents
+
+
+def test_directory_root_fallback(tmp_path):
+    (tmp_path / "commerce.txt").write_text("# @IDENTITY\nName: Shop\nCurrency: USD\n")
+    (tmp_path / "phone.txt").write_text(PRODUCT)
+    watcher = MerchantWatcher(tmp_path)
+    list(watcher.poll())
+    assert watcher.parents == {tmp_path / "phone.txt": tmp_path / "commerce.txt"}
+
+
+def test_cycle_is_reported(tmp_path):
+    (tmp_path / "a.txt").write_text("# @ITEMS\n- B: b.txt\n")
+    (tmp_path / "b.txt").write_text("# @ITEMS\n- A: a.txt\n")
+    records = list(MerchantWatcher(tmp_path).poll())
+    assert len(records) == 2
+    for record in records:
+        assert any("Circular dependency" in e for e in record["errors"])
+
+
+def test_unread_records_carry_over(shop):
+    watcher = MerchantWatcher(shop)
+    first = watcher.poll()
+    next(first)
+    files = {r["file"] for r in watcher.poll()}
+    assert files == {"products/case.txt", "categories/audio.txt", "products/phone.txt"}
+
+
+def test_health_and_watch_loop(shop):
+    watcher = MerchantWatcher(shop, actions=("health",))
+    records = list(watcher.watch(interval=0, polls=2))
+    assert len(records) == 4
+    assert all("health" in r and "errors" not in r for r in records)
+
+
+def test_invalid_arguments(shop):
+    with pytest.raises(NotADirectoryError):
+        MerchantWatcher(shop / "commerce.txt")
+    with pytest.raises(ValueError):
+        MerchantWatcher(shop, actions=("schema",))
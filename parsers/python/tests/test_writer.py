@@ -0,0 +1,239 @@
+"""
+Writer tests.
+
+Covers dump/dumps, the streaming writer, values the parser would read
+back differently, and a round-trip property: parse(dumps(d)) == d.
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from commercetxt import CommerceTXTParser, CommerceTXTWriter, dump, dumps, parse_file
+from commercetxt.limits import MAX_NESTING_DEPTH
+from commercetxt.model import ParseResult
+
+VECTORS_DIR = Path(__file__).parent / "vectors"
+
+# ---------------------------------------------------------
+# Strategies: directives in the shapes the parser produces
+# ---------------------------------------------------------
+
+_NAME_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _line_text(blacklist=""):
+    """Words joined by spaces: no pipes, no edge or line-breaking whitespace."""
+    chars = st.characters(
+        blacklist_categories=("Cs", "Cc", "Zs", "Zl", "Zp"),
+        blacklist_characters="|" + blacklist,
+    )
+    word = st.text(chars, min_size=1, max_size=8)
+    return st.lists(word, min_size=1, max_size=3).map(" ".join)
+
+
+def _identifier(first, rest):
+    return st.builds(
+        lambda a, b: a + b, st.sampled_from(first), st.text(rest, max_size=10)
+    )
+
+
+SCALAR = _line_text()
+UNNAMED = _line_text(":").filter(lambda s: not s.startswith("-"))
+SECTION = _identifier(_NAME_CHARS[26:], _NAME_CHARS[26:] + "0123456789_")
+KEY = _identifier(_NAME_CHARS, _NAME_CHARS + "0123456789_-")
+META_KEY = KEY.filter(
+    lambda k: k.lower() not in ("http", "https")
+    and k not in ("name", "path", "value", "values", "url", "children")
+)
+URL = st.builds(
+    "https://example.com/{}".format,
+    st.from_regex(r"[a-z0-9/?=&.-]{0,15}", fullmatch=True),
+)
+
+
+def _unique(keys):
+    return len({k.lower() for k in keys}) == len(keys)
+
+
+META = st.dictionaries(META_KEY, SCALAR | st.just(""), max_size=3).filter(_unique)
+
+
+@st.composite
+def multi_value(draw, unnamed=True):
+    """Pipe metadata: keyed parts, optional url and unnamed parts."""
+    meta = draw(META)
+    if draw(st.booleans()):
+        meta["url"] = draw(URL)
+    if unnamed:
+        parts = draw(st.lists(UNNAMED, max_size=3))
+        if parts:
+            meta["value"] = parts[0]
+        if len(parts) > 1:
+            meta["values"] = parts
+    return meta
+
+
+def entry(children):
+    named = st.builds(
+        lambda name, path, meta: {"name": name, "path": path, **meta},
+        _line_text(":").filter(lambda s: s.lower() not in ("http", "https")),
+        st.none() | SCALAR,
+        multi_value(),
+    )
+    url = st.builds(
+        lambda url, meta: {"value": url, **meta}, URL, multi_value(unnamed=False)
+    )
+    plain = st.builds(lambda value: {"value": value}, UNNAMED)
+    base = named | url | plain
+    return st.builds(
+        lambda e, kids: {**e, "children": kids} if kids else e,
+        base,
+        st.lists(children, max_size=2),
+    )
+
+
+ENTRY = st.recursive(
+    st.builds(lambda value: {"value": value}, UNNAMED),
+    entry,
+    max_leaves=5,
+)
+VALUE = (
+    SCALAR
+    | multi_value().filter(
+        lambda m: m and not (len(m) == 1 and ("url" in m or "value" in m))
+    )
+    | st.lists(ENTRY, min_size=1, max_size=3)
+)
+DIRECTIVES = st.dictionaries(
+    SECTION,
+    st.dictionaries(KEY | st.just("items"), VALUE, max_size=4).filter(_unique),
+    max_size=3,
+)
+
+
+@settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow])
+@given(DIRECTIVES)
+def test_round_trip(directives):
+    """Whatever dumps writes, the parser reads back the same."""
+    result = CommerceTXTParser(strict=True).parse(dumps(directives))
+    assert result.directives == directives
+    assert not result.warnings
+
+
+# ---------------------------------------------------------
+# Examples
+# ---------------------------------------------------------
+
+
+def test_vectors_round_trip():
+    parser = CommerceTXTParser()
+    for path in sorted(VECTORS_DIR.rglob("*.txt")):
+        original = parse_file(path)
+        result = parser.parse(dumps(original))
+        assert result.directives == original.directives, path.name
+        assert result.version == original.version
+
+
+def test_dumps_layout():
+    result = ParseResult(
+        directives={
+            "IDENTITY": {"Name": "Shop", "Currency": "USD"},
+            "SHIPPING": {
+                "items": [{"name": "Standard", "path": "Free", "Time": "3-5 days"}],
+                "Regions": "US",
+            },
+            "VARIANTS": {
+                "Type": "Size",
+                "Options": [
+                    {"name": "S", "path": "10.00", "children": [{"value": "Red"}]}
+                ],
+            },
+            "PRODUCT": {"Price": 9.5, "InStock": True, "Note": None},
+        },
+        version="1.0.3",
+    )
+    assert dumps(result) == (
+        "Version: 1.0.3\n"
+        "\n"
+        "# @IDENTITY\nName: Shop\nCurrency: USD\n"
+        "\n"
+        "# @SHIPPING\n- Standard: Free | Time: 3-5 days\nRegions: US\n"
+        "\n"
+        "# @VARIANTS\nType: Size\nOptions:\n- S: 10.00\n  - Red\n"
+        "\n"
+        "# @PRODUCT\nPrice: 9.5\nInStock: True\n"
+    )
+
+
+def test_streaming_writer():
+    out = io.StringIO()
+    writer = CommerceTXTWriter(out)
+    writer.write_header(version="1.0")
+    writer.write_section("PRODUCT", {"Name": "Lamp"})
+    writer.write_section("OFFER", {"Price": "10", "Tax": {"Note": "extra"}})
+    result = CommerceTXTParser().parse(out.getvalue())
+    assert result.version == "1.0"
+    assert result.directives["OFFER"]["Tax"] == {"Note": "extra"}
+
+    with pytest.raises(ValueError, match="already written"):
+        writer.write_section("PRODUCT", {})
+    with pytest.raises(ValueError, match="before the first section"):
+        writer.write_header(version="1.0")
+
+
+def test_dump_to_file(tmp_path):
+    path = tmp_path / "p.txt"
+    with path.open("w", encoding="utf-8") as fp:
+        dump({"PRODUCT": {"Name": "Lamp", "SKU": "L-1"}}, fp)
+    assert parse_file(path).directives == {"PRODUCT": {"Name": "Lamp", "SKU": "L-1"}}
+
+
+def test_bare_list_after_keyed_list():
+    """After "Options:" bare items would join Options. They go first."""
+    section = {"Options": [{"value": "a"}], "items": [{"value": "b"}]}
+    text = dumps({"S": section})
+    assert text.index("- b") < text.index("Options:")
+    assert CommerceTXTParser().parse(text).directives == {"S": section}
+
+
+def test_deep_nesting_keeps_levels():
+    """Deeper levels outnumber the first. Indent detection still finds 2."""
+    leaves = [{"value": f"leaf{i}"} for i in range(5)]
+    items = [{"value": "top", "children": [{"value": "mid", "children": leaves}]}]
+    text = dumps({"S": {"items": items}})
+    assert CommerceTXTParser().parse(text).directives == {"S": {"items": items}}
+
+
+@pytest.mark.parametrize(
+    "directives, error",
+    [
+        ({"product": {}}, ValueError),
+        ({"S": {"Bad key": "x"}}, ValueError),
+        ({"S": {"K": "a | b"}}, ValueError),
+        ({"S": {"K": "two\nlines"}}, ValueError),
+        ({"S": {"K": " padded"}}, ValueError),
+        ({"S": {"K": "x", "k": "y"}}, ValueError),
+        ({"S": {"K": {"value": "lone"}}}, ValueError),
+        ({"S": {"K": {"values": ["a", "b"]}}}, ValueError),
+        ({"S": {"items": [{"value": "a: b"}]}}, ValueError),
+        ({"S": {"items": [{"name": "a", "path": ""}]}}, ValueError),
+        ({"S": {"items": [{"Note": "x"}]}}, ValueError),
+        ({"S": {"items": ["plain"]}}, TypeError),
+        ({"S": {"K": object()}}, TypeError),
+    ],
+)
+def test_rejects_what_reads_back_differently(directives, error):
+    with pytest.raises(error):
+        dumps(directives)
+
+
+def test_rejects_too_deep_nesting():
+    item: dict = {"value": "x"}
+    for _ in range(MAX_NESTING_DEPTH):
+        item = {"value": "x", "children": [item]}
+    with pytest.raises(ValueError, match="nesting depth"):
+        dumps({"S": {"items": [item]}})